@@ -0,0 +1,82 @@
+/* eslint-disable no-console */
+//
+// Benchmark: franchise resolution over the full all-time series_results table.
+//
+// Compares the old per-record scan (currentTeams.find + matchesFranchise, i.e. what
+// findTeamForRecord did before utils/franchiseIndex.js) against the franchise index, and
+// checks that both resolve every record to the same franchise. Read-only.
+//
+// Usage (run from apps/backend):
+//   node bench-franchise-resolver.js              # 20 passes over every series_results row
+//   node bench-franchise-resolver.js --passes 100
+//
+require('dotenv').config();
+const { pool } = require('./db');
+const { matchesFranchise, getMappedIds } = require('./utils/franchiseUtils');
+const { cleanRecordName, getFranchiseIndex } = require('./utils/franchiseIndex');
+
+const args = process.argv.slice(2);
+const passesIdx = args.indexOf('--passes');
+const PASSES = passesIdx >= 0 ? parseInt(args[passesIdx + 1], 10) || 20 : 20;
+
+const scanResolve = (name, id, currentTeams) => {
+  const cleanName = cleanRecordName(name);
+  const matched = currentTeams.find(t => matchesFranchise(cleanName, id, t, currentTeams, getMappedIds(t.team_id)));
+  return matched ? matched.team_id : null;
+};
+
+const time = (label, fn) => {
+  const start = process.hrtime.bigint();
+  const out = fn();
+  const ms = Number(process.hrtime.bigint() - start) / 1e6;
+  console.log(`${label.padEnd(28)} ${ms.toFixed(1).padStart(9)} ms`);
+  return { ms, out };
+};
+
+(async () => {
+  try {
+    const [teamsRes, seriesRes] = await Promise.all([
+      pool.query('SELECT * FROM teams'),
+      pool.query('SELECT winning_team_name, winning_team_id, losing_team_name, losing_team_id FROM series_results')
+    ]);
+    const teams = teamsRes.rows;
+    const rows = seriesRes.rows;
+    const lookups = rows.length * 2 * PASSES;
+    console.log(`${rows.length} series_results rows, ${teams.length} teams, ${PASSES} passes (${lookups} lookups)\n`);
+
+    const scan = time('scan (findTeamForRecord)', () => {
+      const out = [];
+      for (let p = 0; p < PASSES; p++) {
+        for (const r of rows) {
+          out.push(scanResolve(r.winning_team_name, r.winning_team_id, teams));
+          out.push(scanResolve(r.losing_team_name, r.losing_team_id, teams));
+        }
+      }
+      return out;
+    });
+
+    const build = time('index build', () => getFranchiseIndex(teams));
+    const index = build.out;
+
+    const indexed = time('index lookups', () => {
+      const out = [];
+      for (let p = 0; p < PASSES; p++) {
+        for (const r of rows) {
+          out.push(index.resolve(r.winning_team_name, r.winning_team_id).team_id);
+          out.push(index.resolve(r.losing_team_name, r.losing_team_id).team_id);
+        }
+      }
+      return out;
+    });
+
+    const mismatches = scan.out.filter((id, i) => id !== indexed.out[i]).length;
+    console.log(`\nspeedup: ${(scan.ms / Math.max(indexed.ms, 0.001)).toFixed(1)}x, ` +
+      `${index.size()} distinct (name, id) keys, ${mismatches} mismatches`);
+    process.exitCode = mismatches ? 1 : 0;
+  } catch (err) {
+    console.error('Benchmark failed:', err);
+    process.exitCode = 1;
+  } finally {
+    await pool.end();
+  }
+})();
@@ -0,0 +1,313 @@
+/* eslint-disable no-console */
+//
+// Microbenchmark for the game engine (gameLogic.js) and the box-score code (utils/gameSummary.js),
+// driven by recorded game states rather than hand-built ones.
+//
+// States come from the mock fixtures at the repo root (mock_game_state.json: an early PA with a
+// runner on first; mock_completed_game.json: a finished game), a late-game state built by playing
+// the first fixture forward for nine innings (so atBatLog and pitcherStats are game-sized), and
+// every JSON file in --states (bench-states/ by default). `--snapshots N` refreshes that directory
+// from the N newest dev snapshots (routes/dev.js, the game_snapshots table) first, so later runs
+// work without a database.
+//
+// Each case is warmed up, then timed for --ms milliseconds and reported as ops/sec. Allocations
+// per call are measured as heap growth right after a forced GC, so they need node --expose-gc
+// and a fixed 32 MB young generation (the npm script passes both).
+// Results are compared with the stored baseline (bench-game-logic.baseline.json; write it with
+// --update) and the run fails (exit code 1) if any case got more than --max-slowdown times slower
+// or allocates more than --max-slowdown times as much per call. Compare runs on the same machine.
+//
+// Usage (run from apps/backend):
+//   npm run bench:game-logic                                   # compare with the baseline
+//   npm run bench:game-logic -- --update                       # record a new baseline
+//   npm run bench:game-logic -- --only applyOutcome --ms 1000 --max-slowdown 1.25
+//   npm run bench:game-logic -- --snapshots 20                 # pull dev snapshots into bench-states/
+//
+require('dotenv').config();
+const fs = require('fs');
+const path = require('path');
+const {
+  applyOutcome, resolveThrow, calculateStealResult, checkGameOverOrInningChange, recordRunForPitcher,
+} = require('./gameLogic');
+const {
+  computeLinescore, computePitchingDecisions, computeHomeRuns, computeBoxLines, buildGameSummary, normalizeKey,
+} = require('./utils/gameSummary');
+
+const args = process.argv.slice(2);
+const argValue = (flag, fallback) => {
+  const i = args.indexOf(flag);
+  return i >= 0 && args[i + 1] !== undefined ? args[i + 1] : fallback;
+};
+const UPDATE = args.includes('--update');
+const ONLY = argValue('--only', null);
+const MS = parseInt(argValue('--ms', '300'), 10);
+const MAX_SLOWDOWN = parseFloat(argValue('--max-slowdown', '1.5'));
+const SNAPSHOTS = parseInt(argValue('--snapshots', '0'), 10);
+const STATES_DIR = path.resolve(__dirname, argValue('--states', 'bench-states'));
+const BASELINE_FILE = path.join(__dirname, argValue('--baseline', 'bench-game-logic.baseline.json'));
+const ROUNDS = 5;
+const ALLOC_BATCHES = 5;
+const ALLOC_BATCH_BYTES = 8 * 1024 * 1024;
+
+const OUTCOMES = ['SO', 'PU', 'GB', 'FB', 'BB', 'IBB', '1B', '1B+', '2B', '3B', 'HR', 'BUNT'];
+
+// Same mapping as the server's getSpeedValue.
+const getSpeedValue = (runner) => {
+  if (runner.control !== null && typeof runner.control !== 'undefined') return 10;
+  if (runner.speed === 'A') return 20;
+  if (runner.speed === 'B') return 15;
+  if (runner.speed === 'C') return 10;
+  return parseInt(runner.speed, 10) || 15;
+};
+
+const TEAM_INFO = { home_team_abbr: 'HOME', away_team_abbr: 'AWAY' };
+
+// Fills in what the engine expects of a live state but the fixtures and older snapshots may lack.
+function normalizeState(raw) {
+  const state = JSON.parse(JSON.stringify(raw));
+  state.bases = state.bases || { first: null, second: null, third: null };
+  state.homeScore = state.homeScore || 0;
+  state.awayScore = state.awayScore || 0;
+  state.outs = state.outs || 0;
+  state.pitcherStats = state.pitcherStats || {};
+  state.atBatLog = state.atBatLog || [];
+  state.homeTeam = { userId: 1, ...state.homeTeam };
+  state.awayTeam = { userId: 2, ...state.awayTeam };
+  const atBat = state.currentAtBat = state.currentAtBat || {};
+  atBat.batter = atBat.batter || { card_id: 1, name: 'Batter' };
+  atBat.pitcher = atBat.pitcher || { card_id: 2, name: 'Pitcher', control: 4 };
+  [atBat.batter, atBat.pitcher].forEach((card) => { card.displayName = card.displayName || card.display_name || card.name; });
+  atBat.pitchRollResult = atBat.pitchRollResult || { advantage: 'batter' };
+  atBat.basesBeforePlay = atBat.basesBeforePlay || { ...state.bases };
+  atBat.outsBeforePlay = atBat.outsBeforePlay != null ? atBat.outsBeforePlay : state.outs;
+  atBat.swingRollResult = atBat.swingRollResult || { outcome: '1B' };
+  return state;
+}
+
+// A fresh PA at `state`'s position, reusing its batter and pitcher.
+function nextAtBat(state) {
+  state.currentAtBat = {
+    ...state.currentAtBat,
+    basesBeforePlay: { ...state.bases },
+    outsBeforePlay: state.outs,
+    atBatIndex: undefined,
+  };
+}
+
+// Plays `state` forward with a fixed outcome sequence (flipping half innings the way the server's
+// next-hitter handler does) until the game ends, for a state with a full game's atBatLog.
+function playForward(start) {
+  let state = normalizeState(start);
+  state.gameOver = false;
+  const sequence = ['SO', 'GB', '1B', 'FB', 'BB', '2B', 'PU', 'HR', 'GB', '1B+', 'SO', '3B', 'FB'];
+  for (let i = 0; i < 400 && !state.gameOver; i++) {
+    const { currentAtBat } = state;
+    state = applyOutcome(state, sequence[i % sequence.length], currentAtBat.batter, currentAtBat.pitcher,
+      0, 0, getSpeedValue, 10, null, TEAM_INFO).newState;
+    if (state.isBetweenHalfInningsAway || state.isBetweenHalfInningsHome) {
+      if (!state.isTopInning) state.inning++;
+      state.isTopInning = !state.isTopInning;
+      state.outs = 0;
+      state.bases = { first: null, second: null, third: null };
+      state.isBetweenHalfInningsAway = false;
+      state.isBetweenHalfInningsHome = false;
+    }
+    nextAtBat(state);
+  }
+  return state;
+}
+
+// Dev snapshots -> STATES_DIR, one file per snapshot.
+async function exportSnapshots(limit) {
+  const { pool } = require('./db');
+  try {
+    const { rows } = await pool.query(
+      `SELECT snapshot_id, game_id, snapshot_name, latest_state_data FROM game_snapshots
+       ORDER BY created_at DESC LIMIT $1`,
+      [limit]
+    );
+    fs.mkdirSync(STATES_DIR, { recursive: true });
+    rows.forEach((row) => {
+      const state = row.latest_state_data && row.latest_state_data.state_data;
+      if (!state) return;
+      const file = path.join(STATES_DIR, `snapshot-${row.snapshot_id}.json`);
+      fs.writeFileSync(file, JSON.stringify({ name: `game ${row.game_id} "${row.snapshot_name}"`, state_data: state }));
+    });
+    console.log(`Exported ${rows.length} snapshot(s) to ${path.relative(process.cwd(), STATES_DIR) || '.'}`);
+  } finally {
+    await pool.end();
+  }
+}
+
+function loadFixtures() {
+  const fixtureState = (file) => {
+    const data = JSON.parse(fs.readFileSync(path.join(__dirname, '..', '..', file), 'utf8'));
+    return data.gameState.state_data;
+  };
+  const early = normalizeState(fixtureState('mock_game_state.json'));
+  const fixtures = [
+    { name: 'mock_game_state', state: early },
+    { name: 'mock_completed_game', state: normalizeState(fixtureState('mock_completed_game.json')) },
+    { name: 'played_forward', state: playForward(early) },
+  ];
+  if (fs.existsSync(STATES_DIR)) {
+    fs.readdirSync(STATES_DIR).filter(f => f.endsWith('.json')).sort().forEach((file) => {
+      const data = JSON.parse(fs.readFileSync(path.join(STATES_DIR, file), 'utf8'));
+      // Accepts an exported snapshot, a game_states row or a bare state.
+      const state = data.state_data || data;
+      fixtures.push({ name: path.basename(file, '.json'), state: normalizeState(state) });
+    });
+  }
+  return fixtures;
+}
+
+// The cases for one state. Each `fn` must leave its input reusable, so the mutating functions get
+// a reset step (which is timed with them, but is a handful of property writes).
+function casesFor({ name, state }) {
+  const { batter, pitcher } = state.currentAtBat;
+  const cases = [];
+  const add = (label, fn) => cases.push({ name: `${name} ${label}`, fn });
+
+  // applyOutcome's PA bookkeeping assumes the PA hasn't been resolved yet.
+  const live = { ...state, gameOver: false, outs: Math.min(state.outs, 2) };
+  OUTCOMES.forEach((outcome) => {
+    add(`applyOutcome ${outcome}`, () => applyOutcome(live, outcome, batter, pitcher, 0, 0, getSpeedValue, 10, null, TEAM_INFO));
+  });
+
+  const runner = { card_id: 901, name: 'Runner', displayName: 'Runner', speed: 'B' };
+  const withRunners = { ...live, bases: { first: runner, second: runner, third: runner } };
+  const noop = () => {};
+  add('resolveThrow ADVANCE', () => resolveThrow({ ...withRunners, currentPlay: { type: 'ADVANCE' } }, 4, 0, getSpeedValue, noop, '', TEAM_INFO));
+  add('resolveThrow TAG_UP', () => resolveThrow({ ...withRunners, currentPlay: { type: 'TAG_UP' } }, 4, 0, getSpeedValue, noop, '', TEAM_INFO));
+  add('calculateStealResult', () => calculateStealResult(runner, 2, 2, getSpeedValue, { team_id: 1 }));
+
+  const inningOver = { ...live, outs: 3 };
+  const events = [];
+  add('checkGameOverOrInningChange', () => {
+    inningOver.gameOver = false;
+    inningOver.isBetweenHalfInningsAway = false;
+    inningOver.isBetweenHalfInningsHome = false;
+    events.length = 0;
+    checkGameOverOrInningChange(inningOver, events, TEAM_INFO);
+  });
+
+  // Charges the run to the last logged PA, or none for a state without one.
+  const scoring = JSON.parse(JSON.stringify(live));
+  scoring.currentAtBat.atBatIndex = scoring.atBatLog.length ? scoring.atBatLog.length - 1 : undefined;
+  const entry = scoring.atBatLog[scoring.currentAtBat.atBatIndex];
+  add('recordRunForPitcher', () => {
+    if (entry) {
+      entry.scoredRunnerIds.length = 0;
+      entry.rbi = 0;
+    }
+    recordRunForPitcher(scoring, runner, pitcher);
+  });
+
+  const { atBatLog } = state;
+  const homeUserId = state.homeTeam.userId;
+  const awayUserId = state.awayTeam.userId;
+  const teams = { away: { user_id: awayUserId }, home: { user_id: homeUserId } };
+  const outsByKey = {};
+  Object.entries(state.pitcherStats).forEach(([k, v]) => { outsByKey[normalizeKey(k)] = v.outs_recorded || 0; });
+  add('computeLinescore', () => computeLinescore(atBatLog));
+  add('computePitchingDecisions', () => computePitchingDecisions(atBatLog, teams, outsByKey));
+  add('computeHomeRuns', () => computeHomeRuns(atBatLog));
+  add('computeBoxLines', () => computeBoxLines(state, awayUserId));
+  add('buildGameSummary', () => buildGameSummary({
+    gameId: 1, gameInSeries: 1, completedAt: null, homeUserId, awayUserId, startingPitchers: null, state,
+  }));
+  return cases;
+}
+
+// Bytes allocated per call, or null without --expose-gc: heap growth over a batch of calls made
+// right after a forced GC, as the smallest of several batches (the others can pick up unrelated
+// runtime allocations). Heap usage moves in whole pages, so batches are sized to allocate about
+// ALLOC_BATCH_BYTES; that has to fit in the young generation or a scavenge lands inside the
+// batch, hence the semi-space flags in the npm script.
+function allocationsPerCall(fn) {
+  if (typeof global.gc !== 'function') return null;
+  const batch = (calls) => {
+    global.gc();
+    const before = process.memoryUsage().heapUsed;
+    for (let i = 0; i < calls; i++) fn();
+    return (process.memoryUsage().heapUsed - before) / calls;
+  };
+  const calls = Math.min(10000, Math.max(10, Math.floor(ALLOC_BATCH_BYTES / Math.max(batch(10), 1))));
+  const samples = [];
+  for (let b = 0; b < ALLOC_BATCHES; b++) samples.push(batch(calls));
+  return Math.max(0, Math.min(...samples));
+}
+
+// ops/sec over --ms, as the best of ROUNDS equal rounds: noise (other processes, a GC landing in a
+// round) only ever slows a round down, so the fastest one is the most repeatable figure.
+function measure(fn) {
+  const deadline = ms => process.hrtime.bigint() + BigInt(Math.round(ms * 1e6));
+  // Warm up so the timed loop runs optimized code.
+  for (let end = deadline(Math.max(50, MS / 5)); process.hrtime.bigint() < end;) fn();
+  let opsPerSec = 0;
+  for (let round = 0; round < ROUNDS; round++) {
+    let calls = 0;
+    const start = process.hrtime.bigint();
+    const end = deadline(MS / ROUNDS);
+    let now = start;
+    while (now < end) {
+      for (let i = 0; i < 50; i++) fn();
+      calls += 50;
+      now = process.hrtime.bigint();
+    }
+    opsPerSec = Math.max(opsPerSec, calls / (Number(now - start) / 1e9));
+  }
+  return { opsPerSec, bytesPerCall: allocationsPerCall(fn) };
+}
+
+const fmtOps = n => Math.round(n).toLocaleString('en-US');
+const fmtBytes = n => (n == null ? '-' : `${Math.round(n).toLocaleString('en-US')} B`);
+const fmtChange = (current, base) => (base ? `${current >= base ? '+' : ''}${((current / base - 1) * 100).toFixed(1)}%` : 'new');
+
+(async () => {
+  try {
+    if (SNAPSHOTS > 0) await exportSnapshots(SNAPSHOTS);
+    if (typeof global.gc !== 'function') {
+      console.log('Run with node --expose-gc (npm run bench:game-logic) to measure allocations.');
+    }
+
+    const baseline = fs.existsSync(BASELINE_FILE) ? JSON.parse(fs.readFileSync(BASELINE_FILE, 'utf8')) : {};
+    const results = {};
+    const failures = [];
+    const cases = loadFixtures().flatMap(casesFor).filter(c => !ONLY || c.name.includes(ONLY));
+    const width = Math.max(...cases.map(c => c.name.length));
+
+    console.log(`${'case'.padEnd(width)}  ${'ops/sec'.padStart(12)}  ${'vs base'.padStart(8)}  ${'alloc/call'.padStart(12)}  ${'vs base'.padStart(8)}`);
+    cases.forEach(({ name, fn }) => {
+      const result = measure(fn);
+      const base = baseline[name];
+      results[name] = { opsPerSec: Math.round(result.opsPerSec), bytesPerCall: result.bytesPerCall == null ? null : Math.round(result.bytesPerCall) };
+      console.log(`${name.padEnd(width)}  ${fmtOps(result.opsPerSec).padStart(12)}  ${fmtChange(result.opsPerSec, base && base.opsPerSec).padStart(8)}  ` +
+        `${fmtBytes(result.bytesPerCall).padStart(12)}  ${(result.bytesPerCall == null ? '' : fmtChange(result.bytesPerCall, base && base.bytesPerCall)).padStart(8)}`);
+
+      if (!base || UPDATE) return;
+      if (result.opsPerSec * MAX_SLOWDOWN < base.opsPerSec) {
+        failures.push(`${name}: ${fmtOps(result.opsPerSec)} ops/sec vs ${fmtOps(base.opsPerSec)} in the baseline`);
+      }
+      // Floor the baseline at 64 bytes so near-zero allocations don't trip on noise.
+      if (result.bytesPerCall != null && base.bytesPerCall != null &&
+          result.bytesPerCall > Math.max(base.bytesPerCall, 64) * MAX_SLOWDOWN) {
+        failures.push(`${name}: ${fmtBytes(result.bytesPerCall)} allocated per call vs ${fmtBytes(base.bytesPerCall)} in the baseline`);
+      }
+    });
+
+    if (UPDATE) {
+      // Keep baseline entries for cases not run this time (--only, or states that aren't present).
+      fs.writeFileSync(BASELINE_FILE, `${JSON.stringify({ ...baseline, ...results }, null, 2)}\n`);
+      console.log(`\nWrote ${Object.keys(results).length} case(s) to ${path.basename(BASELINE_FILE)}`);
+    } else if (failures.length) {
+      console.error(`\nFAIL (limit ${MAX_SLOWDOWN}x):\n  ${failures.join('\n  ')}`);
+      process.exitCode = 1;
+    } else {
+      console.log(`\nOK (${cases.length} case(s), limit ${MAX_SLOWDOWN}x)`);
+    }
+  } catch (error) {
+    console.error('Benchmark failed:', error);
+    process.exitCode = 1;
+  }
+})();
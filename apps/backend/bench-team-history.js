@@ -0,0 +1,139 @@
+/* eslint-disable no-console */
+//
+// Regression benchmark: team page query count and latency as the league history grows.
+//
+// Inside one transaction that is always rolled back, this adds synthetic seasons (a full round
+// robin between every current team plus a Golden Spaceship, and a roster for the measured team)
+// in steps, and after each step times loadTeamHistory / loadTeamSeason through a wrapper that
+// counts every query they issue. It fails (exit code 1) if the query count changes between steps
+// or the largest step's median latency exceeds --max-growth times the smallest step's.
+// Captaincy is served from its own TTL cache and warmed up first, so it isn't counted.
+//
+// Usage (run from apps/backend):
+//   node bench-team-history.js                          # team = first team, steps 0,10,40 extra seasons
+//   node bench-team-history.js --team 3 --steps 0,25,100 --runs 7 --max-growth 2.5
+//
+require('dotenv').config();
+const { pool } = require('./db');
+const { loadTeamHistory, loadTeamSeason } = require('./services/teamHistoryService');
+
+const args = process.argv.slice(2);
+const argValue = (flag, fallback) => {
+  const i = args.indexOf(flag);
+  return i >= 0 && args[i + 1] !== undefined ? args[i + 1] : fallback;
+};
+const STEPS = argValue('--steps', '0,10,40').split(',').map(n => parseInt(n, 10)).sort((a, b) => a - b);
+const RUNS = parseInt(argValue('--runs', '5'), 10);
+const MAX_GROWTH = parseFloat(argValue('--max-growth', '3'));
+
+// Wraps a client so every query() is counted.
+const countingDb = (client) => {
+  const db = {
+    count: 0,
+    query: (...q) => {
+      db.count++;
+      return client.query(...q);
+    }
+  };
+  return db;
+};
+
+const median = (xs) => [...xs].sort((a, b) => a - b)[Math.floor(xs.length / 2)];
+
+async function measure(client, label, fn) {
+  const db = countingDb(client);
+  await fn(db); // warm-up (franchise index, captaincy cache, plan cache)
+  const times = [];
+  let queries = null;
+  for (let i = 0; i < RUNS; i++) {
+    db.count = 0;
+    const start = process.hrtime.bigint();
+    await fn(db);
+    times.push(Number(process.hrtime.bigint() - start) / 1e6);
+    if (queries !== null && queries !== db.count) {
+      throw new Error(`${label}: query count changed between identical runs (${queries} vs ${db.count})`);
+    }
+    queries = db.count;
+  }
+  return { queries, ms: median(times) };
+}
+
+async function addSyntheticSeasons(client, teams, team, from, to, cardIds) {
+  for (let i = from; i < to; i++) {
+    const season = `Bench Season ${i + 1}`;
+    const date = new Date(Date.UTC(1990, 0, 1) + i * 86400000 * 7).toISOString();
+    const names = teams.map(t => t.city);
+    await client.query(`
+      INSERT INTO series_results (date, season_name, round, winning_team_name, losing_team_name, winning_score, losing_score)
+      SELECT $1, $2, 'Round Robin', w, l, 4, 2
+      FROM unnest($3::text[]) WITH ORDINALITY a(w, wi)
+      JOIN unnest($3::text[]) WITH ORDINALITY b(l, li) ON wi < li
+    `, [date, season, names]);
+    await client.query(`
+      INSERT INTO series_results (date, season_name, round, winning_team_name, losing_team_name, winning_score, losing_score)
+      VALUES ($1, $2, 'Golden Spaceship', $3, $4, 4, 3)
+    `, [date, season, names[i % names.length], names[(i + 1) % names.length]]);
+    await client.query(`
+      INSERT INTO historical_rosters (season, team_name, player_name, position, card_id)
+      SELECT $1, $2, 'Bench Player ' || card_id, 'B', card_id FROM unnest($3::int[]) AS card_id
+    `, [season, team.city, cardIds]);
+  }
+}
+
+(async () => {
+  const client = await pool.connect();
+  let failed = false;
+  try {
+    await client.query('BEGIN');
+    const teams = (await client.query('SELECT * FROM teams ORDER BY team_id')).rows;
+    const teamId = parseInt(argValue('--team', teams[0] && teams[0].team_id), 10);
+    const team = teams.find(t => t.team_id === teamId);
+    if (!team) throw new Error(`Team ${teamId} not found.`);
+    const cardIds = (await client.query('SELECT card_id FROM cards_player ORDER BY card_id LIMIT 20')).rows.map(r => r.card_id);
+    const latest = (await client.query(
+      "SELECT season_name FROM series_results WHERE style IS DISTINCT FROM 'Classic' AND season_name IS NOT NULL ORDER BY date DESC LIMIT 1"
+    )).rows[0];
+    const seasonName = latest ? latest.season_name : 'Bench Season 1';
+
+    console.log(`Team ${team.team_id} (${team.city}), ${RUNS} runs per step, season view: "${seasonName}"\n`);
+    console.log('extra seasons   history q   history ms   season q   season ms');
+
+    const rows = [];
+    let added = 0;
+    for (const step of STEPS) {
+      await addSyntheticSeasons(client, teams, team, added, step, cardIds);
+      added = step;
+      await client.query('ANALYZE series_results');
+      const history = await measure(client, 'history', db => loadTeamHistory(db, team.team_id));
+      const season = await measure(client, 'season', db => loadTeamSeason(db, team.team_id, seasonName));
+      rows.push({ step, history, season });
+      console.log(`${String(step).padStart(13)} ${String(history.queries).padStart(11)} ${history.ms.toFixed(1).padStart(12)}` +
+        ` ${String(season.queries).padStart(10)} ${season.ms.toFixed(1).padStart(11)}`);
+    }
+
+    const first = rows[0];
+    const last = rows[rows.length - 1];
+    ['history', 'season'].forEach(view => {
+      const counts = new Set(rows.map(r => r[view].queries));
+      if (counts.size > 1) {
+        failed = true;
+        console.log(`FAIL ${view}: query count grew with seasons (${[...counts].join(' -> ')})`);
+      }
+      // Floor the baseline at 1 ms so sub-millisecond noise doesn't read as growth.
+      const growth = last[view].ms / Math.max(first[view].ms, 1);
+      if (growth > MAX_GROWTH) {
+        failed = true;
+        console.log(`FAIL ${view}: latency grew ${growth.toFixed(2)}x from ${first.step} to ${last.step} extra seasons (limit ${MAX_GROWTH}x)`);
+      }
+    });
+    console.log(failed ? '\nRegression detected.' : '\nQuery count constant and latency within budget.');
+  } catch (err) {
+    console.error('Benchmark failed:', err);
+    failed = true;
+  } finally {
+    await client.query('ROLLBACK').catch(() => {});
+    client.release();
+    await pool.end();
+  }
+  if (failed) process.exitCode = 1;
+})();
@@ -0,0 +1,380 @@
+/* eslint-disable no-console */
+//
+// Query plan regression check for the hot queries in server.js, routes/ and services/.
+//
+// Runs each query below under EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON), inside one transaction that
+// is always rolled back, with parameters sampled from the database (the latest season, a rostered
+// card, a played game, ...). It fails (exit code 1) if a plan reads a table with --min-rows or more
+// rows by sequential scan, or if a plan's estimated cost grew more than --max-growth times over the
+// stored baseline (query-plans.baseline.json; write it with --update). A missing baseline, or
+// a query missing from it, is a failure too: the cost check would otherwise pass silently. Point
+// it at a seeded database so the planner sees production-like sizes:
+//
+//   node generate-synthetic-league.js --teams 60 --seasons 30 --played 0.05
+//
+// The SQL is copied from the call sites named in `source`; keep the two in sync when a query
+// changes (and re-run with --update once the new plan is reviewed).
+//
+// Usage (run from apps/backend):
+//   node check-query-plans.js                          # check against the baseline
+//   node check-query-plans.js --update                 # record the current plans as the baseline
+//   node check-query-plans.js --only series_results --min-rows 5000 --max-growth 1.5 --verbose
+//
+require('dotenv').config();
+const fs = require('fs');
+const path = require('path');
+const { pool } = require('./db');
+const { summarizePlan, checkPlan } = require('./utils/queryPlans');
+
+const args = process.argv.slice(2);
+const argValue = (flag, fallback) => {
+  const i = args.indexOf(flag);
+  return i >= 0 && args[i + 1] !== undefined ? args[i + 1] : fallback;
+};
+const UPDATE = args.includes('--update');
+const VERBOSE = args.includes('--verbose');
+const ONLY = argValue('--only', null);
+const MIN_ROWS = parseInt(argValue('--min-rows', '10000'), 10);
+const MAX_GROWTH = parseFloat(argValue('--max-growth', '2'));
+const BASELINE_FILE = path.join(__dirname, argValue('--baseline', 'query-plans.baseline.json'));
+
+// Parameter values for the queries, sampled once from the data being planned against.
+async function sampleParams(client) {
+  const one = async (sql) => (await client.query(sql)).rows[0] || {};
+  const season = await one(`SELECT season_name FROM series_results
+                            WHERE season_name IS NOT NULL AND style IS DISTINCT FROM 'Classic'
+                            ORDER BY date DESC LIMIT 1`);
+  const team = await one('SELECT team_id, user_id, city, name FROM teams WHERE user_id IS NOT NULL ORDER BY team_id LIMIT 1');
+  const card = await one('SELECT card_id FROM historical_rosters WHERE card_id IS NOT NULL GROUP BY card_id ORDER BY COUNT(*) DESC LIMIT 1');
+  const game = await one(`SELECT g.game_id, g.series_id FROM games g
+                          WHERE g.status = 'completed' AND g.series_id IS NOT NULL ORDER BY g.game_id DESC LIMIT 1`);
+  const result = await one('SELECT series_result_id FROM series WHERE series_result_id IS NOT NULL ORDER BY id DESC LIMIT 1');
+  const pointSet = await one(`SELECT point_set_id FROM point_sets ORDER BY (name = 'Upcoming Season') DESC, point_set_id DESC LIMIT 1`);
+  const draftSeason = await one('SELECT season_name FROM draft_history ORDER BY id DESC LIMIT 1');
+  return {
+    season: season.season_name || null,
+    teamId: team.team_id || null,
+    userId: team.user_id || null,
+    teamNames: team.city ? [team.city, `${team.city} ${team.name}`] : [],
+    teamPatterns: team.city ? [`%${team.city}%`] : [],
+    cardId: card.card_id || null,
+    gameId: game.game_id || null,
+    seriesId: game.series_id || null,
+    seriesResultId: result.series_result_id || null,
+    pointSetId: pointSet.point_set_id || null,
+    draftSeason: draftSeason.season_name || null,
+  };
+}
+
+// name: stable key in the baseline. allowSeqScan: tables the query has to read in full by design.
+const HOT_QUERIES = [
+  {
+    name: 'series_results.latest_league_season',
+    source: 'routes/league.js, server.js (/api/series/mine)',
+    sql: `SELECT season_name FROM series_results
+          WHERE season_name IS NOT NULL AND style IS DISTINCT FROM 'Classic'
+          ORDER BY date DESC LIMIT 1`,
+    params: () => [],
+  },
+  {
+    name: 'series_results.latest_season',
+    source: 'routes/draft.js checkSeasonOver, server.js',
+    sql: 'SELECT season_name FROM series_results ORDER BY date DESC LIMIT 1',
+    params: () => [],
+  },
+  {
+    name: 'series_results.season_results',
+    source: 'services/playoffOddsService.js, services/playoffSchedulingService.js',
+    sql: `SELECT * FROM series_results
+          WHERE style IS DISTINCT FROM 'Classic' AND season_name = $1
+          ORDER BY date DESC`,
+    params: p => [p.season],
+  },
+  {
+    name: 'series_results.season_with_live_series',
+    source: 'services/teamHistoryService.js loadTeamSeason, services/leagueAggregateService.js',
+    sql: `SELECT sr.*,
+                 (SELECT s.id FROM series s WHERE s.series_result_id = sr.id ORDER BY s.id DESC LIMIT 1) AS live_series_id
+          FROM series_results sr
+          WHERE sr.season_name = $1
+          ORDER BY sr.date DESC`,
+    params: p => [p.season],
+  },
+  {
+    name: 'series_results.seeds_clinched',
+    source: 'server.js (/api/series/mine), routes/league.js',
+    sql: `SELECT EXISTS(SELECT 1 FROM series_results
+            WHERE season_name = $1 AND round IN ('Golden Spaceship', 'Wooden Spoon')) AS clinched`,
+    params: p => [p.season],
+  },
+  {
+    name: 'series_results.last_wooden_spoon',
+    source: 'routes/draft.js calculateDraftOrder',
+    sql: `SELECT winning_team_id, losing_team_id, season_name
+          FROM series_results
+          WHERE round = 'Wooden Spoon'
+          ORDER BY date DESC LIMIT 1`,
+    params: () => [],
+  },
+  {
+    name: 'series_results.team_dashboard',
+    source: 'server.js (/api/series/mine)',
+    sql: `SELECT sr.id, sr.round, sr.season_name, sr.status, sr.winning_score, sr.losing_score, sr.date,
+                 (SELECT s.id FROM series s WHERE s.series_result_id = sr.id ORDER BY s.id DESC LIMIT 1) AS live_series_id
+          FROM series_results sr
+          WHERE (sr.winning_team_id = $1 OR sr.losing_team_id = $1)
+            AND sr.result_source IS DISTINCT FROM 'auto'
+            AND (EXISTS (SELECT 1 FROM series s WHERE s.series_result_id = sr.id)
+                 OR (sr.status <> 'completed' AND sr.season_name = $2))
+          ORDER BY sr.date DESC`,
+    params: p => [p.teamId, p.season],
+  },
+  {
+    name: 'series_results.team_history',
+    source: 'services/teamHistoryService.js loadTeamHistory',
+    sql: `SELECT season_name, round, date, winning_team_id, losing_team_id, winning_team_name, losing_team_name,
+                 winning_score, losing_score, style, mva, lvsc, tgaoot
+          FROM series_results
+          WHERE (winning_team_id = ANY($2::int[]) OR losing_team_id = ANY($2::int[])
+                 OR winning_team_name ILIKE ANY($1::text[]) OR losing_team_name ILIKE ANY($1::text[]))
+          ORDER BY date DESC`,
+    params: p => [p.teamPatterns, [p.teamId]],
+    // Legacy rows are matched by name pattern, which no btree index can serve.
+    allowSeqScan: ['series_results'],
+  },
+  {
+    name: 'historical_rosters.by_card',
+    source: 'server.js (/api/players/:cardId/league-history)',
+    sql: 'SELECT season, team_name, position FROM historical_rosters WHERE card_id = $1',
+    params: p => [p.cardId],
+  },
+  {
+    name: 'historical_rosters.season_with_points',
+    source: 'routes/league.js (/api/league)',
+    sql: `SELECT hr.*, cp.display_name, cp.name as card_name, cp.fielding_ratings, cp.control, cp.ip, cp.image_url,
+                 ppv.points
+          FROM historical_rosters hr
+          LEFT JOIN cards_player cp ON hr.card_id = cp.card_id
+          LEFT JOIN player_point_values ppv ON cp.card_id = ppv.card_id AND ppv.point_set_id = $2
+          WHERE hr.season = $1`,
+    params: p => [p.season, p.pointSetId],
+  },
+  {
+    name: 'historical_rosters.by_team_names',
+    source: 'services/teamHistoryService.js loadTeamHistory',
+    sql: `SELECT hr.*, cp.display_name, cp.name as card_name, cp.fielding_ratings, cp.control, cp.ip, cp.image_url
+          FROM historical_rosters hr
+          LEFT JOIN cards_player cp ON hr.card_id = cp.card_id
+          WHERE hr.team_name = ANY($1::text[])`,
+    params: p => [p.teamNames],
+  },
+  {
+    name: 'roster_cards.classic_by_card',
+    source: 'server.js (/api/players/:cardId/league-history)',
+    sql: `SELECT r.classic_id, r.user_id, rc.assignment, cp.control, cp.ip
+          FROM rosters r
+          JOIN roster_cards rc ON r.roster_id = rc.roster_id
+          JOIN cards_player cp ON rc.card_id = cp.card_id
+          WHERE r.roster_type = 'classic' AND rc.card_id = $1`,
+    params: p => [p.cardId],
+  },
+  {
+    name: 'player_point_values.rollover',
+    source: 'services/seasonRolloverService.js rolloverPointSets (the SELECT feeding its INSERT)',
+    sql: `SELECT p.card_id, CASE WHEN p.ever_rostered THEN GREATEST(p.points, 10) ELSE p.points END
+          FROM (
+              SELECT ppv.card_id,
+                     ppv.points + CASE
+                         WHEN NOT EXISTS (SELECT 1 FROM historical_rosters hr WHERE hr.season = $2 AND hr.card_id = ppv.card_id) THEN -10
+                         WHEN EXISTS (SELECT 1 FROM historical_rosters hr WHERE hr.season = $3 AND hr.card_id = ppv.card_id) THEN 10
+                         ELSE 0
+                     END AS points,
+                     EXISTS (SELECT 1 FROM historical_rosters hr WHERE hr.card_id = ppv.card_id) AS ever_rostered
+              FROM player_point_values ppv
+              WHERE ppv.point_set_id = $1
+          ) p`,
+    params: p => [p.pointSetId, p.season, p.season],
+  },
+  {
+    name: 'series_results.phantom_ledger',
+    source: 'jobs/phantomMonitor.js getPhantomSeason',
+    sql: `WITH season AS (
+              SELECT season_name, MIN(date) AS draft_date
+              FROM series_results
+              WHERE style IS DISTINCT FROM 'Classic'
+                AND season_name IS NOT NULL
+                AND winning_team_name IS DISTINCT FROM 'Phantoms'
+              GROUP BY season_name
+              ORDER BY MAX(date) DESC
+              LIMIT 1
+          ),
+          ledger AS (
+              SELECT side.team_id,
+                     COUNT(*) FILTER (
+                         WHERE sr.style IS DISTINCT FROM 'Classic'
+                           AND sr.winning_score IS NOT NULL
+                           AND COALESCE(sr.round, '') <> ALL($1::text[])
+                           AND sr.winning_team_name IS DISTINCT FROM 'Phantoms'
+                           AND sr.losing_team_name IS DISTINCT FROM 'Phantoms'
+                     )::int AS played,
+                     COALESCE(SUM(sr.winning_score) FILTER (
+                         WHERE side.is_loser AND sr.winning_team_name = 'Phantoms'
+                     ), 0)::int AS phantom_losses
+              FROM season
+              JOIN series_results sr ON sr.season_name = season.season_name
+              CROSS JOIN LATERAL (VALUES (sr.winning_team_id, false), (sr.losing_team_id, true)) AS side(team_id, is_loser)
+              WHERE side.team_id IS NOT NULL
+              GROUP BY side.team_id
+              HAVING bool_or(sr.style IS DISTINCT FROM 'Classic')
+          )
+          SELECT season.season_name, season.draft_date,
+                 EXISTS (
+                     SELECT 1 FROM series_results
+                     WHERE season_name = season.season_name AND round = 'Golden Spaceship'
+                 ) AS is_over,
+                 t.team_id, t.city, t.logo_url, l.played, l.phantom_losses
+          FROM season
+          LEFT JOIN (ledger l JOIN teams t ON t.team_id = l.team_id) ON true
+          ORDER BY t.city`,
+    params: () => [['Golden Spaceship', 'Wooden Spoon', 'Silver Submarine']],
+    // Picking the latest season groups every result; one pass, as the job has always done.
+    allowSeqScan: ['series_results'],
+  },
+  {
+    name: 'standings_history.as_of',
+    source: 'services/leagueAggregateService.js getStandingsAsOf',
+    sql: `SELECT season_name, to_char(as_of, 'YYYY-MM-DD') AS as_of, team_key, team_id, name,
+                 wins, losses, games_behind, spaceship_odds, spoon_odds
+          FROM standings_history
+          WHERE season_name = $1
+            AND as_of = (SELECT max(as_of) FROM standings_history WHERE season_name = $1 AND as_of <= $2)
+          ORDER BY games_behind, wins DESC, team_key`,
+    params: p => [p.season, '2100-01-01'],
+  },
+  {
+    name: 'draft_history.season',
+    source: 'routes/draft.js loadDraftHistory',
+    sql: `SELECT dh.*, cp.display_name, t.city, ppv.points
+          FROM draft_history dh
+          LEFT JOIN cards_player cp ON dh.card_id = cp.card_id
+          LEFT JOIN teams t ON dh.team_id = t.team_id OR (dh.team_id IS NULL AND t.city = dh.team_name)
+          LEFT JOIN player_point_values ppv ON cp.card_id = ppv.card_id AND ppv.point_set_id = $2
+          WHERE dh.season_name = $1
+          ORDER BY dh.pick_number ASC, dh.created_at ASC`,
+    params: p => [p.draftSeason, p.pointSetId],
+  },
+  {
+    name: 'game_events.game_log',
+    source: 'server.js getAndProcessGameData, game actions',
+    sql: 'SELECT * FROM game_events WHERE game_id = $1 ORDER BY "timestamp" ASC',
+    params: p => [p.gameId],
+  },
+  {
+    name: 'game_states.latest',
+    source: 'server.js getAndProcessGameData, game actions',
+    sql: 'SELECT * FROM game_states WHERE game_id = $1 ORDER BY turn_number DESC LIMIT 1',
+    params: p => [p.gameId],
+  },
+  {
+    name: 'games.by_series',
+    source: 'server.js (/api/series/:id)',
+    sql: `SELECT game_id, status, game_in_series, home_team_user_id, winning_side, home_score, away_score
+          FROM games WHERE series_id = $1 ORDER BY game_in_series ASC`,
+    params: p => [p.seriesId],
+  },
+  {
+    name: 'games.my_games',
+    source: 'server.js (/api/games)',
+    sql: `SELECT g.game_id, g.status, g.current_turn_user_id, g.home_team_user_id, g.game_in_series, g.created_at,
+                 g.completed_at, g.series_id, g.winning_side, g.home_score, g.away_score, g.final_inning
+          FROM games g JOIN game_participants gp ON g.game_id = gp.game_id
+          WHERE gp.user_id = $1 AND (gp.is_hidden IS FALSE OR gp.is_hidden IS NULL)
+          ORDER BY g.created_at DESC`,
+    params: p => [p.userId],
+  },
+  {
+    name: 'games.open',
+    source: 'server.js (/api/games/open)',
+    sql: `SELECT g.game_id, t.city, t.name, COALESCE(s.series_type, 'exhibition') as series_type
+          FROM games g
+          LEFT JOIN series s ON g.series_id = s.id
+          JOIN game_participants gp ON g.game_id = gp.game_id
+          JOIN users u ON gp.user_id = u.user_id
+          JOIN teams t ON u.team_id = t.team_id
+          WHERE g.status = 'pending' AND
+          (SELECT COUNT(*) FROM game_participants WHERE game_id = g.game_id) = 1`,
+    params: () => [],
+  },
+  {
+    name: 'series.by_series_result',
+    source: 'server.js, services/playoffSchedulingService.js',
+    sql: 'SELECT id FROM series WHERE series_result_id = $1 ORDER BY id DESC LIMIT 1',
+    params: p => [p.seriesResultId],
+  },
+];
+
+async function tableRowEstimates(client) {
+  const { rows } = await client.query(`
+    SELECT c.relname, c.reltuples
+    FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE c.relkind = 'r' AND n.nspname = current_schema()`);
+  return Object.fromEntries(rows.map(r => [r.relname, Number(r.reltuples)]));
+}
+
+(async () => {
+  const client = await pool.connect();
+  let failed = false;
+  try {
+    await client.query('BEGIN');
+    await client.query('ANALYZE');
+    const tableRows = await tableRowEstimates(client);
+    const params = await sampleParams(client);
+    const baseline = !UPDATE && fs.existsSync(BASELINE_FILE) ? JSON.parse(fs.readFileSync(BASELINE_FILE, 'utf8')) : {};
+    const recorded = {};
+
+    if (!UPDATE && Object.keys(baseline).length === 0) {
+      console.log(`No baseline at ${path.basename(BASELINE_FILE)}: plan costs can't be checked. ` +
+        'Record one against the generate-synthetic-league.js seed with --update.\n');
+      failed = true;
+    }
+    console.log('query                                          cost        ms   buffers  result');
+
+    for (const q of HOT_QUERIES.filter(h => !ONLY || h.name.includes(ONLY))) {
+      const values = q.params(params);
+      if (values.some(v => v === null)) {
+        console.log(`${q.name.padEnd(44)} skipped: no sample data for its parameters`);
+        continue;
+      }
+      const { rows } = await client.query(`EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ${q.sql}`, values);
+      const summary = summarizePlan(rows[0]['QUERY PLAN']);
+      recorded[q.name] = { source: q.source, ...summary };
+
+      const failures = UPDATE ? [] : checkPlan(summary, baseline[q.name] || null, {
+        tableRows, minRows: MIN_ROWS, maxGrowth: MAX_GROWTH, allowSeqScan: q.allowSeqScan,
+      });
+      if (!UPDATE && Object.keys(baseline).length > 0 && !baseline[q.name]) {
+        failures.push('no baseline cost for this query; review its plan and re-run with --update');
+      }
+      if (failures.length > 0) failed = true;
+      console.log(`${q.name.padEnd(44)} ${summary.totalCost.toFixed(1).padStart(8)} ${(summary.executionMs ?? 0).toFixed(2).padStart(9)}` +
+        ` ${String(summary.sharedHit + summary.sharedRead).padStart(9)}  ${failures.length ? 'FAIL' : 'ok'}`);
+      failures.forEach(f => console.log(`    ${f}`));
+      if (VERBOSE || failures.length > 0) console.log(`    plan: ${summary.nodes.join(' > ')}   (${q.source})`);
+    }
+
+    if (UPDATE) {
+      fs.writeFileSync(BASELINE_FILE, JSON.stringify(recorded, null, 2) + '\n');
+      console.log(`\nWrote ${Object.keys(recorded).length} plans to ${path.basename(BASELINE_FILE)}.`);
+    } else {
+      console.log(failed ? '\nQuery plan regression detected.' : '\nAll hot query plans within budget.');
+    }
+  } catch (err) {
+    console.error('Query plan check failed:', err);
+    failed = true;
+  } finally {
+    await client.query('ROLLBACK').catch(() => {});
+    client.release();
+    await pool.end();
+  }
+  if (failed) process.exitCode = 1;
+})();
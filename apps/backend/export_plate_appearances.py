@@ -0,0 +1,304 @@
+import os
+import json
+import shutil
+import time
+import argparse
+from collections import defaultdict
+
+import psycopg2
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dotenv import load_dotenv
+
+# Exports every completed game's plate appearances, pitcher lines and game events to Parquet
+# for analysis, so questions like "how often does the advantage backfire?" or "OBP by inning"
+# don't need ad-hoc SQL over game_states.state_data on the production database.
+#
+#   python export_plate_appearances.py                 # append games completed since the last run
+#   python export_plate_appearances.py --full          # delete the export and start over
+#
+# Output (hive-partitioned by the month the game completed):
+#
+#   analytics/plate_appearances/completed_month=2026-07/part-<first>-<last>.parquet
+#   analytics/pitcher_games/completed_month=.../part-....parquet
+#   analytics/game_events/completed_month=.../part-....parquet
+#   analytics/_export_state.json       # watermark: last (completed_at, game_id) exported
+#
+# Read it with e.g. pyarrow.dataset.dataset("analytics/plate_appearances", partitioning="hive")
+# or DuckDB's read_parquet('analytics/plate_appearances/*/*.parquet', hive_partitioning = 1).
+#
+# Only each game's final state is read (games.final_game_state_id, falling back to the newest
+# state for games completed before that column was linked), and only the three JSON paths we
+# flatten are pulled out of it. Rows stream through a server-side cursor in batches; each batch
+# is written as its own files and then the watermark advances, so an interrupted run resumes
+# where it stopped and a routine run only touches newly completed games.
+#
+# games.completed_at is NOW() inside the completing transaction, i.e. when that transaction
+# started, not when it committed. A game can therefore become visible after a game stamped later
+# than it has already been exported. To make sure the watermark never moves past it, only games
+# completed more than SETTLE_MINUTES ago are exported; they show up in the next run.
+
+load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"))
+
+# Constants
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+OUT_DIR = os.path.join(BACKEND_DIR, "analytics")
+STATE_FILE = "_export_state.json"
+BATCH_GAMES = 500
+SETTLE_MINUTES = 5
+
+PLATE_APPEARANCES = pa.schema([
+    ("game_id", pa.int64()),
+    ("series_id", pa.int64()),
+    ("game_in_series", pa.int16()),
+    ("completed_at", pa.timestamp("us", tz="UTC")),
+    ("pa_index", pa.int32()),
+    ("inning", pa.int16()),
+    ("is_top_inning", pa.bool_()),
+    ("batter_team", pa.dictionary(pa.int8(), pa.string())),
+    ("batter_user_id", pa.int64()),
+    ("batter_card_id", pa.int64()),
+    ("pitcher_user_id", pa.int64()),
+    ("pitcher_card_id", pa.int64()),
+    ("outcome", pa.dictionary(pa.int8(), pa.string())),
+    ("advantage", pa.dictionary(pa.int8(), pa.string())),
+    ("ab", pa.int8()),
+    ("h", pa.int8()),
+    ("double", pa.int8()),
+    ("triple", pa.int8()),
+    ("hr", pa.int8()),
+    ("bb", pa.int8()),
+    ("so", pa.int8()),
+    ("rbi", pa.int8()),
+    ("runs_scored", pa.int8()),
+    ("is_fly_out", pa.bool_()),
+])
+
+PITCHER_GAMES = pa.schema([
+    ("game_id", pa.int64()),
+    ("series_id", pa.int64()),
+    ("completed_at", pa.timestamp("us", tz="UTC")),
+    ("pitcher_key", pa.string()),
+    ("user_id", pa.int64()),
+    ("card_id", pa.int64()),
+    ("outs_recorded", pa.int16()),
+    ("batters_faced", pa.int16()),
+    ("runs", pa.int16()),
+    ("innings", pa.int16()),
+    ("pitched_while_tired", pa.bool_()),
+])
+
+GAME_EVENTS = pa.schema([
+    ("game_id", pa.int64()),
+    ("completed_at", pa.timestamp("us", tz="UTC")),
+    ("event_id", pa.int64()),
+    ("turn_number", pa.int32()),
+    ("user_id", pa.int64()),
+    ("event_type", pa.dictionary(pa.int16(), pa.string())),
+    ("log_message", pa.string()),
+    ("offense_side", pa.dictionary(pa.int8(), pa.string())),
+    ("pitch_roll", pa.int8()),
+    ("swing_roll", pa.int8()),
+    ("throw_roll", pa.int8()),
+    ("created_at", pa.timestamp("us", tz="UTC")),
+])
+
+GAMES_QUERY = """
+    SELECT g.game_id, g.series_id, g.game_in_series, g.completed_at,
+           s.state_data->'atBatLog', s.state_data->'pitcherStats',
+           (s.state_data->'homeTeam'->>'userId')::bigint, (s.state_data->'awayTeam'->>'userId')::bigint
+    FROM games g
+    JOIN LATERAL (
+        SELECT gs.state_data FROM game_states gs
+        WHERE gs.game_id = g.game_id
+          AND (g.final_game_state_id IS NULL OR gs.game_state_id = g.final_game_state_id)
+        ORDER BY gs.turn_number DESC
+        LIMIT 1
+    ) s ON true
+    WHERE g.status = 'completed' AND g.completed_at IS NOT NULL
+      AND (g.completed_at, g.game_id) > (%s, %s)
+      AND g.completed_at < now() - make_interval(mins => %s)
+    ORDER BY g.completed_at, g.game_id
+"""
+
+EVENTS_QUERY = """
+    SELECT game_id, event_id, turn_number, user_id, event_type, log_message,
+           roll_data->>'offenseSide', (roll_data->>'pitch')::int, (roll_data->>'swing')::int,
+           (roll_data->>'throw')::int, "timestamp"
+    FROM game_events
+    WHERE game_id = ANY(%s)
+    ORDER BY game_id, event_id
+"""
+
+
+def get_db_connection():
+    """Connects with DATABASE_URL, as the node scripts do."""
+    return psycopg2.connect(os.getenv('DATABASE_URL'))
+
+
+def split_key(key):
+    """Pitcher stat keys are "<userId>_<cardId>" (or a bare card_id on old games)."""
+    if key is None:
+        return None, None
+    parts = str(key).split("_")
+    try:
+        if len(parts) >= 2:
+            return int(parts[-2]), int(parts[-1])
+        return None, int(parts[0])
+    except ValueError:
+        return None, None
+
+
+def as_int(value):
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def flatten_game(row, pas, pitchers):
+    game_id, series_id, game_in_series, completed_at, at_bats, pitcher_stats, home_user, away_user = row
+    for i, pa_entry in enumerate(at_bats or []):
+        batter_team = pa_entry.get("batterTeam")
+        pitcher_user, pitcher_card = split_key(pa_entry.get("pitcherKey"))
+        pas["game_id"].append(game_id)
+        pas["series_id"].append(series_id)
+        pas["game_in_series"].append(game_in_series)
+        pas["completed_at"].append(completed_at)
+        pas["pa_index"].append(i)
+        pas["inning"].append(as_int(pa_entry.get("inning")))
+        pas["is_top_inning"].append(pa_entry.get("isTopInning"))
+        pas["batter_team"].append(batter_team)
+        pas["batter_user_id"].append(away_user if batter_team == "away" else home_user if batter_team == "home" else None)
+        pas["batter_card_id"].append(as_int(pa_entry.get("batterId")))
+        pas["pitcher_user_id"].append(pitcher_user)
+        pas["pitcher_card_id"].append(pitcher_card)
+        pas["outcome"].append(pa_entry.get("outcome"))
+        pas["advantage"].append(pa_entry.get("advantage"))
+        for stat in ("ab", "h", "double", "triple", "hr", "bb", "so", "rbi"):
+            pas[stat].append(as_int(pa_entry.get(stat)) or 0)
+        pas["runs_scored"].append(len(pa_entry.get("scoredRunnerIds") or []))
+        pas["is_fly_out"].append(bool(pa_entry.get("isFlyOut")))
+
+    for key, stats in (pitcher_stats or {}).items():
+        user_id, card_id = split_key(key)
+        pitchers["game_id"].append(game_id)
+        pitchers["series_id"].append(series_id)
+        pitchers["completed_at"].append(completed_at)
+        pitchers["pitcher_key"].append(str(key))
+        pitchers["user_id"].append(user_id)
+        pitchers["card_id"].append(card_id)
+        pitchers["outs_recorded"].append(as_int(stats.get("outs_recorded")) or 0)
+        pitchers["batters_faced"].append(as_int(stats.get("batters_faced")) or 0)
+        pitchers["runs"].append(as_int(stats.get("runs")) or 0)
+        pitchers["innings"].append(len(stats.get("innings_pitched") or []))
+        pitchers["pitched_while_tired"].append(bool(stats.get("pitchedWhileTired")))
+
+
+def flatten_events(rows, completed_by_game, events):
+    for game_id, event_id, turn, user_id, event_type, message, side, pitch, swing, throw, created in rows:
+        events["game_id"].append(game_id)
+        events["completed_at"].append(completed_by_game[game_id])
+        events["event_id"].append(event_id)
+        events["turn_number"].append(turn)
+        events["user_id"].append(user_id)
+        events["event_type"].append(event_type)
+        events["log_message"].append(message)
+        events["offense_side"].append(side)
+        events["pitch_roll"].append(pitch)
+        events["swing_roll"].append(swing)
+        events["throw_roll"].append(throw)
+        events["created_at"].append(created)
+
+
+def write_partitioned(out_dir, name, schema, columns, first_id, last_id):
+    """Writes one batch of a table, one file per completed month. Returns rows written."""
+    if not columns["game_id"]:
+        return 0
+    table = pa.Table.from_pydict(dict(columns), schema=schema)
+    months = [c.strftime("%Y-%m") for c in columns["completed_at"]]
+    by_month = defaultdict(list)
+    for i, month in enumerate(months):
+        by_month[month].append(i)
+    for month, rows in by_month.items():
+        part_dir = os.path.join(out_dir, name, f"completed_month={month}")
+        os.makedirs(part_dir, exist_ok=True)
+        path = os.path.join(part_dir, f"part-{first_id}-{last_id}.parquet")
+        pq.write_table(table.take(pa.array(rows)), path + ".tmp", compression="zstd")
+        os.replace(path + ".tmp", path)
+    return table.num_rows
+
+
+def load_watermark(out_dir):
+    try:
+        with open(os.path.join(out_dir, STATE_FILE)) as f:
+            state = json.load(f)
+        return state["completed_at"], state["game_id"]
+    except FileNotFoundError:
+        return "-infinity", 0
+
+
+def save_watermark(out_dir, completed_at, game_id, last_run):
+    path = os.path.join(out_dir, STATE_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump({"completed_at": completed_at.isoformat(), "game_id": game_id, "last_run": last_run}, f)
+    os.replace(path + ".tmp", path)
+
+
+def export(out_dir, full=False, batch_games=BATCH_GAMES):
+    os.makedirs(out_dir, exist_ok=True)
+    if full:
+        for name in ("plate_appearances", "pitcher_games", "game_events"):
+            shutil.rmtree(os.path.join(out_dir, name), ignore_errors=True)
+        if os.path.exists(os.path.join(out_dir, STATE_FILE)):
+            os.remove(os.path.join(out_dir, STATE_FILE))
+    since_at, since_id = load_watermark(out_dir)
+    totals = {"games": 0, "plate_appearances": 0, "pitcher_games": 0, "game_events": 0}
+    start = time.perf_counter()
+
+    conn = get_db_connection()
+    conn.set_session(readonly=True)
+    try:
+        games = conn.cursor(name="plate_appearance_export")
+        games.itersize = batch_games
+        games.execute(GAMES_QUERY, (since_at, since_id, SETTLE_MINUTES))
+        events_cur = conn.cursor()
+        while True:
+            batch = games.fetchmany(batch_games)
+            if not batch:
+                break
+            pas, pitchers, events = defaultdict(list), defaultdict(list), defaultdict(list)
+            for row in batch:
+                flatten_game(row, pas, pitchers)
+            ids = [row[0] for row in batch]
+            events_cur.execute(EVENTS_QUERY, (ids,))
+            flatten_events(events_cur.fetchall(), {row[0]: row[3] for row in batch}, events)
+
+            first_id, last_id = min(ids), max(ids)
+            totals["plate_appearances"] += write_partitioned(out_dir, "plate_appearances", PLATE_APPEARANCES, pas, first_id, last_id)
+            totals["pitcher_games"] += write_partitioned(out_dir, "pitcher_games", PITCHER_GAMES, pitchers, first_id, last_id)
+            totals["game_events"] += write_partitioned(out_dir, "game_events", GAME_EVENTS, events, first_id, last_id)
+            totals["games"] += len(batch)
+            save_watermark(out_dir, batch[-1][3], batch[-1][0], totals)
+            print(f"  exported {totals['games']} games ({totals['plate_appearances']} PAs)")
+        games.close()
+        events_cur.close()
+    finally:
+        conn.close()
+
+    print(f"Exported {totals['games']} new games, {totals['plate_appearances']} plate appearances, "
+          f"{totals['pitcher_games']} pitcher lines and {totals['game_events']} events "
+          f"in {time.perf_counter() - start:.1f}s -> {out_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append newly completed games to the Parquet analytics export.")
+    parser.add_argument("--out", default=OUT_DIR)
+    parser.add_argument("--full", action="store_true", help="Ignore the watermark and export every completed game.")
+    parser.add_argument("--batch", type=int, default=BATCH_GAMES, help="Games per batch (and per file).")
+    args = parser.parse_args()
+    export(args.out, full=args.full, batch_games=args.batch)
+
+
+if __name__ == "__main__":
+    main()
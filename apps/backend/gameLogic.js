@@ -1,3 +1,5 @@
+const { rollD20 } = require('./utils/dice');
+
 function getOrdinal(n) {
   const s = ["th", "st", "nd", "rd"];
   const v = n % 100;
@@ -343,7 +345,7 @@ function applyOutcome(state, outcome, batter, pitcher, infieldDefense = 0, outfi
     }
     // --- End Infield In Logic ---
     else if (newState.outs <= 1 && newState.bases.first) {
-        const dpRoll = Math.floor(Math.random() * 20) + 1;
+        const dpRoll = rollD20();
         const batterSpeed = parseInt(getSpeedValue(batter), 10);
         const isDoublePlay = (infieldDefense + dpRoll) > batterSpeed;
         const dpOutcome = isDoublePlay ? 'DOUBLE_PLAY' : 'FIELDERS_CHOICE';
@@ -817,7 +819,7 @@ function resolveThrow(state, throwTo, outfieldDefense, getSpeedValue, finalizeEv
   const runnerToChallenge = newState.bases[baseMap[fromBaseOfThrow]];
 
   if (runnerToChallenge) {
-    const d20Roll = Math.floor(Math.random() * 20) + 1;
+    const d20Roll = rollD20();
     const baseSpeed = parseInt(getSpeedValue(runnerToChallenge), 10);
     let speed = baseSpeed;
     const adjustments = [];
@@ -917,7 +919,7 @@ function resolveThrow(state, throwTo, outfieldDefense, getSpeedValue, finalizeEv
 }
 
 function calculateStealResult(runner, toBase, catcherArm, getSpeedValue, offensiveTeam) {
-    const d20Roll = Math.floor(Math.random() * 20) + 1;
+    const d20Roll = rollD20();
     const defenseTotal = catcherArm + d20Roll;
     const originalRunnerSpeed = getSpeedValue(runner);
     let runnerSpeed = originalRunnerSpeed;
@@ -1042,4 +1044,4 @@ function recordStealAttempt(state, runner, success) {
 
 module.exports = { applyOutcome, resolveThrow, calculateStealResult, appendScoreToLog,
   recordOutsForPitcher, recordBatterFaced, checkGameOverOrInningChange, recordRunForPitcher,
-  recordStealAttempt, toRunnerCard, getPitcherKey };
+  recordStealAttempt, toRunnerCard, getPitcherKey, lookupChartOutcome, fillBattingResult };
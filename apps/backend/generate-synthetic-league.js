@@ -0,0 +1,710 @@
+/* eslint-disable no-console */
+//
+// Synthetic league generator for scale and soak testing.
+//
+// Fills a local database (local_schema.sql + migrations, with cards loaded) with a synthetic
+// league so standings, odds, team history and the game endpoints can be benchmarked at many
+// times today's volume. Every season gets:
+//
+//   * a point set named after the season, priced off each card's base points
+//   * a 20-card roster per team under the 5000-point cap (historical_rosters), turned over a few
+//     cards at a time through draft_history ADDED / DROPPED picks
+//   * a full round robin of 7-game series plus Semifinals, Golden Spaceship and Wooden Spoon
+//     (series_results)
+//   * for --played of those series, the series played in app: series, games, game_participants,
+//     one game_states snapshot per plate appearance (atBatLog, pitcherStats, bases, ...) and the
+//     matching game_events with roll_data, from a simplified sim that rolls the real card charts
+//     and keeps the box score through gameLogic's own bookkeeping (about 100 states per game,
+//     each carrying the full atBatLog so far, just like live games - this is where the bytes go)
+//
+// Rows are streamed in with COPY (utils/bulkLoad.js), one transaction per season. Ids are claimed
+// from each table's sequence up front so rows can reference each other inside the same COPY.
+// Games are simulated from a per-game seed: once to get the results and again while streaming
+// their states, so no season is ever held in memory.
+//
+// Synthetic teams belong to users with @synthetic.invalid emails (they can't log in) and play
+// seasons dated from 1900 on, so they sort before the real league. Running again adds more
+// seasons to the same teams; --reset deletes everything the generator created.
+//
+// Usage (run from apps/backend):
+//   node generate-synthetic-league.js                                   # 30 teams, 10 seasons, 2% played in app
+//   node generate-synthetic-league.js --teams 120 --seasons 50 --played 0.2 --seed 7
+//   node generate-synthetic-league.js --reset
+//
+// Afterwards rebuild the derived tables: npm run rebuild:league-aggregates, node rebuild-series-summaries.js
+//
+require('dotenv').config();
+const { pool } = require('./db');
+const { copyRows } = require('./utils/bulkLoad');
+const { getSeasonName } = require('./utils/seasonUtils');
+const { seriesTypeForRound } = require('./utils/seriesUtils');
+const {
+  lookupChartOutcome, fillBattingResult, getPitcherKey, toRunnerCard, recordBatterFaced,
+  recordOutsForPitcher, recordRunForPitcher, checkGameOverOrInningChange, appendScoreToLog,
+} = require('./gameLogic');
+
+const args = process.argv.slice(2);
+const argValue = (flag, fallback) => {
+  const i = args.indexOf(flag);
+  return i >= 0 && args[i + 1] !== undefined ? args[i + 1] : fallback;
+};
+const TEAMS = parseInt(argValue('--teams', '30'), 10);
+const SEASONS = parseInt(argValue('--seasons', '10'), 10);
+const PLAYED = parseFloat(argValue('--played', '0.02'));
+const SEED = parseInt(argValue('--seed', '1'), 10);
+const RESET = args.includes('--reset');
+const FORCE = args.includes('--yes');
+
+const EMAIL_DOMAIN = 'synthetic.invalid';
+const POINT_CAP = 5000;
+const ROSTER = { hitters: 14, starters: 4, relievers: 2 };
+const LINEUP_POSITIONS = ['C', '1B', '2B', 'SS', '3B', 'LF', 'CF', 'RF', 'DH'];
+const TURNOVER = 3;                       // cards each team swaps between seasons
+const FIRST_SEASON = Date.UTC(1900, 1, 15);
+const SEASON_MS = 91 * 86400000;          // one getSeasonName() quarter
+const PLAY_MS = 30000;                    // gap between a game's turns
+
+// --- Deterministic randomness -------------------------------------------------------------------
+
+function mulberry32(seed) {
+  let a = seed >>> 0;
+  return () => {
+    a = (a + 0x6D2B79F5) >>> 0;
+    let t = a;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+const d20 = (rng) => 1 + Math.floor(rng() * 20);
+const pick = (rng, xs) => xs[Math.floor(rng() * xs.length)];
+const gameRng = (gameId) => mulberry32(Math.imul(SEED, 2654435761) ^ gameId);
+
+// --- Setup --------------------------------------------------------------------------------------
+
+// Refuses anything that doesn't look like a local database unless --yes is passed.
+function assertLocalDatabase() {
+  const host = process.env.DB_HOST || 'localhost';
+  const local = ['localhost', '127.0.0.1', '::1'].includes(host) || host.startsWith('/');
+  if ((process.env.NODE_ENV === 'production' || !local) && !FORCE) {
+    throw new Error(`Refusing to write a synthetic league to ${process.env.NODE_ENV === 'production' ? 'production' : host}; pass --yes if you mean it.`);
+  }
+}
+
+// Claims `count` consecutive ids from a serial column's sequence and returns the first.
+async function reserveIds(client, table, column, count) {
+  if (count === 0) return 0;
+  const { rows } = await client.query(
+    `SELECT setval(s.seq::regclass, nextval(s.seq::regclass) + $1::bigint - 1) - $1::bigint + 1 AS first
+     FROM (SELECT pg_get_serial_sequence($2, $3) AS seq) s`,
+    [count, table, column]
+  );
+  return Number(rows[0].first);
+}
+
+async function loadCards(client) {
+  const { rows } = await client.query(`
+    SELECT card_id, name, COALESCE(display_name, name) AS display_name, points, on_base, control, ip,
+           speed, fielding_ratings, chart_data
+    FROM cards_player WHERE chart_data IS NOT NULL ORDER BY card_id`);
+  const cards = rows.map(c => ({ ...c, points: c.points || 100, displayName: c.display_name }));
+  const byRole = {
+    hitters: cards.filter(c => c.control == null && c.on_base != null),
+    starters: cards.filter(c => c.control != null && c.ip > 3),
+    relievers: cards.filter(c => c.control != null && !(c.ip > 3)),
+  };
+  Object.entries(ROSTER).forEach(([slot, n]) => {
+    if (byRole[slot].length < n * 2) throw new Error(`Not enough ${slot} in cards_player (${byRole[slot].length}); load the card data first.`);
+  });
+  return byRole;
+}
+
+async function loadSynthTeams(client) {
+  const { rows } = await client.query(`
+    SELECT t.team_id, t.city, t.name, t.abbreviation, u.user_id, r.roster_id
+    FROM teams t
+    JOIN users u ON u.user_id = t.user_id
+    LEFT JOIN rosters r ON r.user_id = u.user_id AND r.roster_type = 'league'
+    WHERE u.email LIKE $1
+    ORDER BY t.team_id`, [`%@${EMAIL_DOMAIN}`]);
+  return rows;
+}
+
+async function createTeams(client, count) {
+  const firstUser = await reserveIds(client, 'users', 'user_id', count);
+  const firstTeam = await reserveIds(client, 'teams', 'team_id', count);
+  const firstRoster = await reserveIds(client, 'rosters', 'roster_id', count);
+  const teams = Array.from({ length: count }, (_, i) => ({
+    user_id: firstUser + i,
+    team_id: firstTeam + i,
+    roster_id: firstRoster + i,
+    city: `Synth ${i + 1}`,
+    name: 'Simulators',
+    abbreviation: `S${i + 1}`,
+  }));
+  await copyRows(client, 'users', ['user_id', 'email', 'hashed_password', 'owner_first_name', 'owner_last_name'],
+    teams.map((t, i) => [t.user_id, `owner${i + 1}@${EMAIL_DOMAIN}`, '!', 'Synthetic', `Owner ${i + 1}`]));
+  await copyRows(client, 'teams', ['team_id', 'city', 'name', 'abbreviation', 'user_id', 'primary_color', 'secondary_color'],
+    teams.map(t => [t.team_id, t.city, t.name, t.abbreviation, t.user_id, '#336699', '#ffffff']));
+  await client.query(`UPDATE users u SET team_id = t.team_id FROM teams t WHERE t.user_id = u.user_id AND u.user_id BETWEEN $1 AND $2`,
+    [firstUser, firstUser + count - 1]);
+  await copyRows(client, 'rosters', ['roster_id', 'user_id', 'roster_type'],
+    teams.map(t => [t.roster_id, t.user_id, 'league']));
+  return teams;
+}
+
+// --- Rosters ------------------------------------------------------------------------------------
+
+const rosterCost = (roster) => roster.reduce((sum, c) => sum + c.points, 0);
+
+// Fills the empty slots with random cards, keeping enough budget for the cheapest card in every
+// slot still to fill so the roster always lands under the cap.
+function fillRoster(rng, cardPool, roster) {
+  const slots = [];
+  Object.entries(ROSTER).forEach(([slot, n]) => {
+    const have = roster.filter(c => c.slot === slot).length;
+    for (let i = have; i < n; i++) slots.push(slot);
+  });
+  const cheapest = {};
+  Object.keys(ROSTER).forEach(slot => { cheapest[slot] = Math.min(...cardPool[slot].map(c => c.points)); });
+  const taken = new Set(roster.map(c => c.card_id));
+  let budget = POINT_CAP - rosterCost(roster);
+  slots.forEach((slot, i) => {
+    const reserve = slots.slice(i + 1).reduce((sum, s) => sum + cheapest[s], 0);
+    const options = cardPool[slot].filter(c => !taken.has(c.card_id) && c.points <= budget - reserve);
+    const card = options.length > 0 ? pick(rng, options) : cardPool[slot].find(c => !taken.has(c.card_id));
+    taken.add(card.card_id);
+    budget -= card.points;
+    roster.push({ ...card, slot });
+  });
+  return roster;
+}
+
+const playsPosition = (card, pos) => {
+  const ratings = card.fielding_ratings || {};
+  return pos === 'DH' || ratings[pos] != null || ((pos === 'LF' || pos === 'RF') && ratings.LFRF != null);
+};
+
+// Nine hitters with a position each (the rest ride the bench) and the pitching staff.
+function depthChart(roster) {
+  const hitters = roster.filter(c => c.slot === 'hitters').sort((a, b) => b.on_base - a.on_base);
+  const used = new Set();
+  const lineup = LINEUP_POSITIONS.map((pos) => {
+    const card = hitters.find(c => !used.has(c.card_id) && playsPosition(c, pos))
+      || hitters.find(c => !used.has(c.card_id));
+    used.add(card.card_id);
+    return { card, position: pos };
+  });
+  return {
+    lineup,
+    bench: hitters.filter(c => !used.has(c.card_id)),
+    starters: roster.filter(c => c.slot === 'starters'),
+    relievers: roster.filter(c => c.slot === 'relievers'),
+  };
+}
+
+function historicalPosition(card, chart) {
+  if (card.slot === 'starters') return 'SP';
+  if (card.slot === 'relievers') return 'RP';
+  const spot = chart.lineup.find(s => s.card.card_id === card.card_id);
+  return spot ? spot.position : 'BENCH';
+}
+
+// --- Game simulation ----------------------------------------------------------------------------
+
+const slim = (card) => ({
+  card_id: card.card_id, name: card.name, displayName: card.displayName,
+  control: card.control, on_base: card.on_base, ip: card.ip, speed: card.speed,
+});
+
+const PLAY_TEXT = {
+  SO: 'strikes out.', PU: 'pops out.', GB: 'grounds out.', FB: 'flies out.', BB: 'draws a walk.',
+  '1B': 'singles.', '2B': 'doubles.', '3B': 'triples!', HR: 'homers!', DP: 'grounds into a double play.',
+};
+const normalizeOutcome = (o) => ({ '1B+': '1B', IBB: 'BB', 'GB?': 'GB' }[o] || o);
+
+// Plays one game with the card charts: a pitch roll for the advantage, a swing roll on the
+// winner's chart, then simplified baserunning (no steals, bunts or throws). Runs, outs and
+// batters faced go through gameLogic's own bookkeeping so atBatLog and pitcherStats have the
+// shape the box score, linescore and stats code expect. Yields every state and event in order.
+function* playGame(rng, game) {
+  const { home, away, teamInfo } = game;
+  const state = {
+    inning: 1, isTopInning: true, awayScore: 0, homeScore: 0, outs: 0,
+    bases: { first: null, second: null, third: null },
+    pitcherStats: {},
+    atBatLog: [],
+    isBetweenHalfInningsAway: false,
+    isBetweenHalfInningsHome: false,
+    awayTeam: { userId: away.user_id, team_id: away.team_id, rosterId: away.roster_id, battingOrderPosition: 0, used_player_ids: [] },
+    homeTeam: { userId: home.user_id, team_id: home.team_id, rosterId: home.roster_id, battingOrderPosition: 0, used_player_ids: [] },
+    currentAwayPitcher: slim(away.staff[0]),
+    currentHomePitcher: slim(home.staff[0]),
+    currentAtBat: null,
+    gameOver: false,
+    winningTeam: null,
+  };
+  const staffIndex = { home: 0, away: 0 };
+  let turn = 1;
+
+  const halfInningEvent = (defense) => ({
+    type: 'system',
+    userId: null,
+    message: `<div class="inning-change-message"><b>${state.isTopInning ? 'Top' : 'Bottom'} ${state.inning}</b></div>` +
+      `<div class="pitcher-announcement">${defense.abbreviation} Pitcher: ${defense.staff[staffIndex[defense.side]].displayName}</div>`,
+  });
+
+  yield { turn, state };
+  yield { turn, event: halfInningEvent(home) };
+
+  while (!state.gameOver) {
+    const offense = state.isTopInning ? away : home;
+    const defense = state.isTopInning ? home : away;
+    const offenseState = state.isTopInning ? state.awayTeam : state.homeTeam;
+    const pitcherField = state.isTopInning ? 'currentHomePitcher' : 'currentAwayPitcher';
+
+    // Go to the pen once the pitcher has thrown his IP.
+    let pitcher = defense.staff[staffIndex[defense.side]];
+    const pitched = state.pitcherStats[getPitcherKey(state, pitcher)];
+    if (pitched && pitched.outs_recorded >= (pitcher.ip || 1) * 3 && staffIndex[defense.side] < defense.staff.length - 1) {
+      staffIndex[defense.side] += 1;
+      pitcher = defense.staff[staffIndex[defense.side]];
+      state[pitcherField] = slim(pitcher);
+      yield { turn, event: { type: 'system', userId: defense.user_id, message: `${defense.abbreviation} Pitcher: ${pitcher.displayName}` } };
+    }
+
+    const batter = offense.lineup[offenseState.battingOrderPosition].card;
+    const pitch = d20(rng);
+    const advantage = pitch + (pitcher.control || 0) > batter.on_base ? 'pitcher' : 'batter';
+    const swing = d20(rng);
+    const chartOutcome = lookupChartOutcome(advantage === 'pitcher' ? pitcher : batter, swing) || 'GB';
+    let outcome = normalizeOutcome(chartOutcome);
+
+    const originalAway = state.awayScore;
+    const originalHome = state.homeScore;
+    const originalOuts = state.outs;
+    const scoreKey = state.isTopInning ? 'awayScore' : 'homeScore';
+    const pitcherKey = getPitcherKey(state, pitcher);
+    const entry = {
+      inning: state.inning,
+      isTopInning: state.isTopInning,
+      batterId: batter.card_id,
+      batterTeam: state.isTopInning ? 'away' : 'home',
+      pitcherKey,
+      outcome: chartOutcome,
+      ab: 0, h: 0, double: 0, triple: 0, hr: 0, bb: 0, so: 0,
+      rbi: 0,
+      scoredRunnerIds: [],
+      pitcherDeltas: { [pitcherKey]: { outs: 0, runs: 0, bf: 1 } },
+      advantage,
+    };
+    state.currentAtBat = {
+      batter: slim(batter),
+      pitcher: slim(pitcher),
+      pitchRollResult: { roll: pitch, advantage },
+      swingRollResult: { roll: swing, outcome: chartOutcome },
+      atBatIndex: state.atBatLog.length,
+    };
+    state.atBatLog.push(entry);
+    recordBatterFaced(state, pitcher);
+
+    const events = [];
+    const bases = state.bases;
+    const runner = { ...toRunnerCard(batter), pitcherOfRecordId: pitcherKey };
+    const score = (r, rbiEligible = true) => {
+      if (!r) return;
+      state[scoreKey] += 1;
+      recordRunForPitcher(state, r, pitcher, { rbiEligible });
+      events.push(`${r.name} scores!`);
+      if (!state.isTopInning && state.inning >= 9 && state.homeScore > state.awayScore && !state.gameOver) {
+        state.gameOver = true;
+        state.winningTeam = 'home';
+        events.push('WALK-OFF!');
+      }
+    };
+    const out = (n) => recordOutsForPitcher(state, pitcher, n);
+
+    if (outcome === 'SO' || outcome === 'PU') {
+      out(1);
+    } else if (outcome === 'FB') {
+      out(1);
+      if (state.outs < 3 && bases.third) { score(bases.third); bases.third = null; }
+    } else if (outcome === 'GB') {
+      if (bases.first && originalOuts < 2) {
+        outcome = 'DP';
+        out(2);
+        if (state.outs < 3) { score(bases.third, false); bases.third = bases.second; bases.second = null; }
+        bases.first = null;
+      } else {
+        out(1);
+        if (state.outs < 3) { score(bases.third); bases.third = bases.second; bases.second = bases.first; bases.first = null; }
+      }
+    } else if (outcome === 'BB') {
+      if (bases.first) {
+        if (bases.second) { if (bases.third) score(bases.third); bases.third = bases.second; }
+        bases.second = bases.first;
+      }
+      bases.first = runner;
+    } else if (outcome === '1B') {
+      score(bases.third); score(bases.second);
+      bases.third = null; bases.second = bases.first; bases.first = runner;
+    } else if (outcome === '2B') {
+      score(bases.third); score(bases.second);
+      bases.third = bases.first; bases.second = runner; bases.first = null;
+    } else if (outcome === '3B') {
+      score(bases.third); score(bases.second); score(bases.first);
+      bases.first = null; bases.second = null; bases.third = runner;
+    } else if (outcome === 'HR') {
+      score(bases.third); score(bases.second); score(bases.first); score(runner);
+      bases.first = null; bases.second = null; bases.third = null;
+    }
+    fillBattingResult(entry, outcome === 'DP' ? 'GB' : outcome);
+    events.unshift(`${batter.displayName} ${PLAY_TEXT[outcome]}`);
+    checkGameOverOrInningChange(state, events, teamInfo);
+    offenseState.battingOrderPosition = (offenseState.battingOrderPosition + 1) % offense.lineup.length;
+
+    let message = events.join(' ');
+    if (state.outs > originalOuts) message += ` <strong>Outs: ${Math.min(state.outs, 3)}</strong>`;
+    turn += 1;
+    yield { turn, state };
+    yield {
+      turn,
+      event: {
+        type: 'game_event',
+        userId: offense.user_id,
+        message: appendScoreToLog(message, state, originalAway, originalHome),
+        rollData: {
+          offenseSide: state.isTopInning ? 'away' : 'home',
+          defenseSide: state.isTopInning ? 'home' : 'away',
+          pitch,
+          swing,
+        },
+      },
+    };
+
+    if (!state.gameOver && (state.isBetweenHalfInningsAway || state.isBetweenHalfInningsHome)) {
+      state.isBetweenHalfInningsAway = false;
+      state.isBetweenHalfInningsHome = false;
+      state.outs = 0;
+      state.bases = { first: null, second: null, third: null };
+      if (state.isTopInning) state.isTopInning = false;
+      else { state.inning += 1; state.isTopInning = true; }
+      turn += 1;
+      yield { turn, state };
+      yield { turn, event: halfInningEvent(state.isTopInning ? home : away) };
+    }
+  }
+}
+
+function finalResult(rng, game) {
+  let last = null;
+  let turns = 0;
+  for (const step of playGame(rng, game)) {
+    if (step.state) { last = step.state; turns = step.turn; }
+  }
+  return { homeScore: last.homeScore, awayScore: last.awayScore, inning: last.inning, winningSide: last.winningTeam, turns };
+}
+
+// --- Seasons ------------------------------------------------------------------------------------
+
+// Plays out one series between two team-seasons: in app (simulated games) when given a first
+// game id, otherwise as coin flips weighted by each team's strength. Regular-season series
+// play all 7 games; everything else is best-of-7.
+function playSeries(rng, round, a, b, firstGameId) {
+  const toWin = round === 'Regular Season' ? Infinity : 4;
+  const wins = { [a.team_id]: 0, [b.team_id]: 0 };
+  const games = [];
+  for (let g = 1; g <= 7 && wins[a.team_id] < toWin && wins[b.team_id] < toWin; g++) {
+    const home = g % 2 === 1 ? a : b;
+    const away = home === a ? b : a;
+    let homeWon;
+    if (firstGameId) {
+      const game = {
+        game_id: firstGameId + games.length,
+        game_in_series: g,
+        home: gameSide(home, 'home', g),
+        away: gameSide(away, 'away', g),
+        teamInfo: { home_team_abbr: home.abbreviation, away_team_abbr: away.abbreviation },
+      };
+      game.result = finalResult(gameRng(game.game_id), game);
+      homeWon = game.result.winningSide === 'home';
+      games.push(game);
+    } else {
+      homeWon = rng() < home.strength / (home.strength + away.strength);
+    }
+    wins[(homeWon ? home : away).team_id] += 1;
+  }
+  const aWon = wins[a.team_id] > wins[b.team_id] || (wins[a.team_id] === wins[b.team_id] && rng() < 0.5);
+  const [winner, loser] = aWon ? [a, b] : [b, a];
+  return { round, winner, loser, winningScore: wins[winner.team_id], losingScore: wins[loser.team_id], games };
+}
+
+function gameSide(team, side, gameInSeries) {
+  const { lineup, starters, relievers } = team.chart;
+  return {
+    side,
+    user_id: team.user_id,
+    team_id: team.team_id,
+    roster_id: team.roster_id,
+    abbreviation: team.abbreviation,
+    lineup,
+    staff: [starters[(gameInSeries - 1) % starters.length], ...relievers],
+  };
+}
+
+function* historicalRows(seasonName, teams) {
+  for (const t of teams) {
+    for (const card of t.roster) {
+      yield [seasonName, `${t.city} ${t.name}`, card.display_name, historicalPosition(card, t.chart), card.points, card.card_id];
+    }
+  }
+}
+
+function* stateRows(games, startedAt, events) {
+  for (const game of games) {
+    const base = startedAt + game.game_in_series * 3600000;
+    for (const step of playGame(gameRng(game.game_id), game)) {
+      const at = new Date(base + step.turn * PLAY_MS).toISOString();
+      if (step.event) {
+        const e = step.event;
+        events.push([game.game_id, step.turn, e.userId, e.type, e.message, at, e.rollData ? JSON.stringify(e.rollData) : null]);
+      } else {
+        const s = step.state;
+        yield [game.game_id, step.turn, JSON.stringify(s), at, s.isBetweenHalfInningsHome, s.isBetweenHalfInningsAway];
+      }
+    }
+  }
+}
+
+async function generateSeason(client, rng, index, teams, cardPool) {
+  const date = new Date(FIRST_SEASON + index * SEASON_MS);
+  const seasonName = getSeasonName(date);
+  const dateStr = date.toISOString().slice(0, 10);
+
+  // Point set for the season: every card repriced by up to +/-20%, in steps of 10.
+  const { rows: [pointSet] } = await client.query(
+    'INSERT INTO point_sets (name) VALUES ($1) ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name RETURNING point_set_id', [seasonName]);
+  const allCards = [...cardPool.hitters, ...cardPool.starters, ...cardPool.relievers];
+  await client.query('DELETE FROM player_point_values WHERE point_set_id = $1', [pointSet.point_set_id]);
+  await copyRows(client, 'player_point_values', ['card_id', 'point_set_id', 'points'],
+    allCards.map(c => [c.card_id, pointSet.point_set_id, Math.max(10, Math.round(c.points * (0.8 + rng() * 0.4) / 10) * 10)]));
+
+  // Rosters: the first season is a full draft; after that each team swaps TURNOVER cards.
+  const draft = [];
+  let pickNumber = 0;
+  teams.forEach((t) => {
+    const before = t.roster || [];
+    const kept = [...before];
+    for (let i = 0; i < TURNOVER && before.length > 0; i++) kept.splice(Math.floor(rng() * kept.length), 1);
+    t.roster = fillRoster(rng, cardPool, kept);
+    const keptIds = new Set(kept.map(c => c.card_id));
+    before.filter(c => !keptIds.has(c.card_id)).forEach(c => draft.push([seasonName, 'Add/Drop 1', t.team_id, c.card_id, 'DROPPED', ++pickNumber]));
+    t.roster.filter(c => !keptIds.has(c.card_id))
+      .forEach(c => draft.push([seasonName, before.length ? 'Add/Drop 1' : '1', t.team_id, c.card_id, 'ADDED', ++pickNumber]));
+    t.chart = depthChart(t.roster);
+    t.strength = 0.5 + rng();
+  });
+
+  // Schedule: round robin, then the top four play Semifinals and the Golden Spaceship, the
+  // bottom two the Wooden Spoon.
+  const pairs = [];
+  for (let i = 0; i < teams.length; i++) {
+    for (let j = i + 1; j < teams.length; j++) pairs.push([teams[i], teams[j]]);
+  }
+  const playedCount = Math.round(pairs.length * PLAYED);
+  let nextGame = await reserveIds(client, 'games', 'game_id', (playedCount + 4) * 7);
+  const series = [];
+  const play = (round, a, b, inApp) => {
+    const s = playSeries(rng, round, a, b, inApp ? nextGame : 0);
+    nextGame += s.games.length;
+    series.push(s);
+    return s;
+  };
+  pairs.forEach(([a, b], i) => play('Regular Season', a, b, i < playedCount));
+
+  const gameWins = new Map(teams.map(t => [t.team_id, 0]));
+  series.forEach(s => {
+    gameWins.set(s.winner.team_id, gameWins.get(s.winner.team_id) + s.winningScore);
+    gameWins.set(s.loser.team_id, gameWins.get(s.loser.team_id) + s.losingScore);
+  });
+  const standings = [...teams].sort((x, y) => gameWins.get(y.team_id) - gameWins.get(x.team_id));
+  const postseasonInApp = playedCount > 0;
+  const semi1 = play('Semifinal', standings[0], standings[3], postseasonInApp);
+  const semi2 = play('Semifinal', standings[1], standings[2], postseasonInApp);
+  play('Golden Spaceship', semi1.winner, semi2.winner, postseasonInApp);
+  play('Wooden Spoon', standings[standings.length - 2], standings[standings.length - 1], postseasonInApp);
+
+  // series_results, and for the in-app ones their live series.
+  const firstResult = await reserveIds(client, 'series_results', 'id', series.length);
+  const inApp = series.filter(s => s.games.length > 0);
+  const firstSeries = await reserveIds(client, 'series', 'id', inApp.length);
+  series.forEach((s, i) => { s.resultId = firstResult + i; });
+  inApp.forEach((s, i) => { s.seriesId = firstSeries + i; });
+
+  await copyRows(client, 'series_results',
+    ['id', 'date', 'season_name', 'round', 'winning_team_name', 'losing_team_name', 'winning_team_id', 'losing_team_id',
+      'winning_score', 'losing_score', 'mva', 'status', 'result_source'],
+    series.map(s => [s.resultId, dateStr, seasonName, s.round, s.winner.city, s.loser.city, s.winner.team_id, s.loser.team_id,
+      s.winningScore, s.losingScore, s.round === 'Golden Spaceship' ? s.winner.chart.lineup[0].card.display_name : null,
+      'completed', s.games.length > 0 ? 'in_app' : 'offline']));
+
+  const games = inApp.flatMap(s => s.games.map(g => ({ ...g, seriesId: s.seriesId })));
+  const startedAt = date.getTime();
+  await copyRows(client, 'series',
+    ['id', 'series_type', 'series_home_user_id', 'series_away_user_id', 'home_wins', 'away_wins', 'status', 'created_at', 'series_result_id'],
+    inApp.map(s => {
+      const { home, away } = s.games[0];
+      const homeWins = s.games.filter(g => (g.result.winningSide === 'home' ? g.home : g.away).user_id === home.user_id).length;
+      return [s.seriesId, seriesTypeForRound(s.round), home.user_id, away.user_id, homeWins, s.games.length - homeWins,
+        'completed', date.toISOString(), s.resultId];
+    }));
+  await copyRows(client, 'games',
+    ['game_id', 'status', 'created_at', 'completed_at', 'home_team_user_id', 'use_dh', 'series_id', 'game_in_series',
+      'winning_side', 'winning_user_id', 'home_score', 'away_score', 'final_inning'],
+    games.map(g => {
+      const start = startedAt + g.game_in_series * 3600000;
+      const r = g.result;
+      return [g.game_id, 'completed', new Date(start).toISOString(), new Date(start + r.turns * PLAY_MS).toISOString(),
+        g.home.user_id, true, g.seriesId, g.game_in_series, r.winningSide,
+        r.winningSide === 'home' ? g.home.user_id : g.away.user_id, r.homeScore, r.awayScore, r.inning];
+    }));
+  const lineupJson = (side) => JSON.stringify({
+    battingOrder: side.lineup.map(s => ({ card_id: s.card.card_id, position: s.position })),
+    startingPitcher: side.staff[0].card_id,
+  });
+  await copyRows(client, 'game_participants',
+    ['game_id', 'user_id', 'roster_id', 'home_or_away', 'league_designation', 'lineup', 'starting_lineup'],
+    games.flatMap(g => ['home', 'away'].map(side => {
+      const lineup = lineupJson(g[side]);
+      return [g.game_id, g[side].user_id, g[side].roster_id, side, 'AL', lineup, lineup];
+    })));
+
+  const events = [];
+  await copyRows(client, 'game_states',
+    ['game_id', 'turn_number', 'state_data', 'created_at', 'is_between_half_innings_home', 'is_between_half_innings_away'],
+    stateRows(games, startedAt, events));
+  await copyRows(client, 'game_events',
+    ['game_id', 'turn_number', 'user_id', 'event_type', 'log_message', 'timestamp', 'roll_data'], events);
+  if (games.length > 0) {
+    await client.query(`
+      UPDATE games g SET final_game_state_id = s.game_state_id
+      FROM (SELECT DISTINCT ON (game_id) game_id, game_state_id FROM game_states
+            WHERE game_id BETWEEN $1 AND $2 ORDER BY game_id, turn_number DESC) s
+      WHERE g.game_id = s.game_id`, [games[0].game_id, games[games.length - 1].game_id]);
+  }
+
+  await copyRows(client, 'historical_rosters', ['season', 'team_name', 'player_name', 'position', 'points', 'card_id'],
+    historicalRows(seasonName, teams));
+  await copyRows(client, 'draft_history', ['season_name', 'round', 'team_id', 'card_id', 'action', 'pick_number'], draft);
+
+  return { seasonName, series: series.length, games: games.length, events: events.length };
+}
+
+// The live league roster of each synthetic team is its last season's roster.
+async function saveCurrentRosters(client, teams) {
+  await client.query('DELETE FROM roster_cards WHERE roster_id = ANY($1::int[])', [teams.map(t => t.roster_id)]);
+  await copyRows(client, 'roster_cards', ['roster_id', 'card_id', 'is_starter', 'assignment'],
+    teams.flatMap(t => t.roster.map(c => {
+      const pos = historicalPosition(c, t.chart);
+      const assignment = pos === 'SP' || pos === 'RP' ? 'PITCHING_STAFF' : pos;
+      return [t.roster_id, c.card_id, assignment !== 'BENCH', assignment];
+    })));
+}
+
+// Rebuilds each team's last roster from historical_rosters so a rerun continues where it left off.
+async function resumeRosters(client, teams, cardPool) {
+  const bySlot = new Map();
+  Object.keys(ROSTER).forEach(slot => cardPool[slot].forEach(c => bySlot.set(c.card_id, { ...c, slot })));
+  const { rows } = await client.query(`
+    SELECT DISTINCT ON (team_name, card_id) team_name, card_id
+    FROM historical_rosters hr
+    WHERE team_name = ANY($1::text[])
+      AND season = (SELECT season FROM historical_rosters WHERE team_name = ANY($1::text[]) ORDER BY id DESC LIMIT 1)`,
+  [teams.map(t => `${t.city} ${t.name}`)]);
+  teams.forEach(t => {
+    t.roster = rows.filter(r => r.team_name === `${t.city} ${t.name}`).map(r => bySlot.get(r.card_id)).filter(Boolean);
+  });
+}
+
+async function reset(client) {
+  const teams = await loadSynthTeams(client);
+  if (teams.length === 0) {
+    console.log('No synthetic league found.');
+    return;
+  }
+  const userIds = teams.map(t => t.user_id);
+  const teamIds = teams.map(t => t.team_id);
+  const seasons = (await client.query(
+    'SELECT DISTINCT season_name FROM series_results WHERE winning_team_id = ANY($1::int[]) OR losing_team_id = ANY($1::int[])',
+    [teamIds])).rows.map(r => r.season_name);
+  await client.query('DELETE FROM games WHERE home_team_user_id = ANY($1::int[])', [userIds]);
+  await client.query('DELETE FROM series WHERE series_home_user_id = ANY($1::int[])', [userIds]);
+  await client.query('DELETE FROM series_results WHERE winning_team_id = ANY($1::int[]) OR losing_team_id = ANY($1::int[])', [teamIds]);
+  await client.query('DELETE FROM historical_rosters WHERE team_name = ANY($1::text[])', [teams.map(t => `${t.city} ${t.name}`)]);
+  await client.query('DELETE FROM draft_history WHERE team_id = ANY($1::int[])', [teamIds]);
+  await client.query('DELETE FROM point_sets WHERE name = ANY($1::text[])', [seasons]);
+  await client.query('UPDATE users SET team_id = NULL WHERE user_id = ANY($1::int[])', [userIds]);
+  await client.query('DELETE FROM teams WHERE team_id = ANY($1::int[])', [teamIds]);
+  await client.query('DELETE FROM users WHERE user_id = ANY($1::int[])', [userIds]);
+  console.log(`Removed ${teams.length} synthetic teams and ${seasons.length} seasons.`);
+}
+
+(async () => {
+  const client = await pool.connect();
+  try {
+    assertLocalDatabase();
+    if (RESET) {
+      await client.query('BEGIN');
+      await reset(client);
+      await client.query('COMMIT');
+      return;
+    }
+    if (!(TEAMS >= 6 && TEAMS <= 999)) throw new Error('--teams must be between 6 and 999.');
+
+    const started = process.hrtime.bigint();
+    const rng = mulberry32(SEED);
+    const cardPool = await loadCards(client);
+
+    await client.query('BEGIN');
+    let teams = await loadSynthTeams(client);
+    let firstSeason = 0;
+    if (teams.length > 0) {
+      await resumeRosters(client, teams, cardPool);
+      firstSeason = (await client.query(
+        'SELECT COUNT(DISTINCT season_name)::int AS n FROM series_results WHERE winning_team_id = ANY($1::int[])',
+        [teams.map(t => t.team_id)])).rows[0].n;
+      console.log(`Adding ${SEASONS} seasons to the existing synthetic league (${teams.length} teams, ${firstSeason} seasons).`);
+    } else {
+      teams = await createTeams(client, TEAMS);
+      console.log(`Created ${teams.length} synthetic teams.`);
+    }
+    await client.query('COMMIT');
+
+    const totals = { series: 0, games: 0, events: 0 };
+    for (let i = firstSeason; i < firstSeason + SEASONS; i++) {
+      const seasonStart = process.hrtime.bigint();
+      await client.query('BEGIN');
+      const s = await generateSeason(client, rng, i, teams, cardPool);
+      await client.query('COMMIT');
+      Object.keys(totals).forEach(k => { totals[k] += s[k]; });
+      console.log(`${s.seasonName.padEnd(12)} ${String(s.series).padStart(5)} series ${String(s.games).padStart(5)} games` +
+        ` ${String(s.events).padStart(7)} events  ${(Number(process.hrtime.bigint() - seasonStart) / 1e9).toFixed(1)}s`);
+    }
+
+    await client.query('BEGIN');
+    await saveCurrentRosters(client, teams);
+    await client.query('COMMIT');
+    await client.query('ANALYZE');
+
+    const secs = Number(process.hrtime.bigint() - started) / 1e9;
+    console.log(`\nDone in ${secs.toFixed(1)}s: ${totals.series} series, ${totals.games} games, ${totals.events} game events.`);
+    console.log('Rebuild the derived tables next: npm run rebuild:league-aggregates && node rebuild-series-summaries.js');
+  } catch (err) {
+    await client.query('ROLLBACK').catch(() => {});
+    console.error('Synthetic league generation failed:', err);
+    process.exitCode = 1;
+  } finally {
+    client.release();
+    await pool.end();
+  }
+})();
@@ -3,6 +3,7 @@ const fs = require('fs');
 const path = require('path');
 const csv = require('csv-parser');
 const { Pool } = require('pg');
+const { copyIntoStaging, swapFromStaging } = require('./utils/bulkLoad');
 
 const dbConfig = {
   // jatuh: I updated this to use DATABASE_URL to be consistent with other scripts.
@@ -13,25 +14,19 @@ const pool = new Pool(dbConfig);
 
 // These are the columns in prices.csv that are NOT point sets
 const NON_POINT_SET_COLUMNS = ['Team', 'Player', 'Tm', 'Pos', 'ASG'];
+const POINT_VALUE_COLUMNS = ['card_id', 'point_set_id', 'points'];
 
 async function importAllPoints() {
   console.log('Starting full points import process...');
   const client = await pool.connect();
 
   try {
-    await client.query('BEGIN');
-    console.log('Database transaction started.');
-
-    // 1. Clear the player_point_values table
-    console.log('Clearing existing data from player_point_values table...');
-    await client.query('TRUNCATE TABLE player_point_values RESTART IDENTITY');
-    console.log('Table cleared.');
-
     const records = [];
-    const csvPath = path.join(__dirname, 'prices.csv');
+    // Optional path argument, e.g. a proposal from price_point_set.py; defaults to prices.csv.
+    const csvPath = process.argv[2] ? path.resolve(process.argv[2]) : path.join(__dirname, 'prices.csv');
     const pointSetNames = new Set();
 
-    // 2. Read the CSV and identify all unique point sets from the headers
+    // 1. Read the CSV and identify all unique point sets from the headers
     await new Promise((resolve, reject) => {
       fs.createReadStream(csvPath)
         .pipe(csv())
@@ -46,27 +41,33 @@ async function importAllPoints() {
         .on('end', resolve)
         .on('error', reject);
     });
-    console.log(`Found ${records.length} records in prices.csv.`);
+    console.log(`Found ${records.length} records in ${path.basename(csvPath)}.`);
     console.log(`Identified ${pointSetNames.size} unique point sets.`);
 
-    // 3. Ensure all point sets exist in the database and get their IDs
-    const pointSetMap = new Map();
+    await client.query('BEGIN');
+    console.log('Database transaction started.');
+
+    // 2. Ensure all point sets exist in the database and get their IDs in one round trip
     console.log('Syncing point sets with the database...');
-    for (const name of pointSetNames) {
-      // Use INSERT ... ON CONFLICT to avoid a separate SELECT check
-      const res = await client.query(
-        `INSERT INTO point_sets (name) VALUES ($1)
-         ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
-         RETURNING point_set_id`,
-        [name]
-      );
-      pointSetMap.set(name, res.rows[0].point_set_id);
-    }
+    const pointSetRes = await client.query(
+      `INSERT INTO point_sets (name) SELECT unnest($1::text[])
+       ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+       RETURNING point_set_id, name`,
+      [[...pointSetNames]]
+    );
+    const pointSetMap = new Map(pointSetRes.rows.map(r => [r.name, r.point_set_id]));
     console.log('Point sets synced.');
 
-    // 4. Iterate through players and insert their point values
+    // 3. Resolve card ids from a single display_name lookup instead of one query per row
+    const cardRes = await client.query('SELECT display_name, card_id FROM cards_player ORDER BY card_id');
+    const cardIdByName = new Map();
+    for (const r of cardRes.rows) {
+      if (!cardIdByName.has(r.display_name)) cardIdByName.set(r.display_name, r.card_id);
+    }
+
+    // 4. Unpivot the wide CSV into (card_id, point_set_id, points) rows in memory
     let notFoundCount = 0;
-    console.log('Importing player point values...');
+    const valueRows = [];
     for (const row of records) {
       const playerName = row['Player'];
       if (!playerName) {
@@ -74,29 +75,19 @@ async function importAllPoints() {
         continue;
       }
 
-      // Find player card_id based on display_name
-      const playerRes = await client.query("SELECT card_id FROM cards_player WHERE display_name = $1", [playerName]);
-
-      if (playerRes.rows.length === 0) {
+      const cardId = cardIdByName.get(playerName);
+      if (cardId === undefined) {
         console.warn(`Player not found in database: "${playerName}". Skipping.`);
         notFoundCount++;
         continue;
       }
-      const cardId = playerRes.rows[0].card_id;
 
-      // Insert a point value for each point set column
       for (const pointSetName of pointSetNames) {
         const points = row[pointSetName];
         if (points !== undefined && points !== null && points !== '') {
-          const pointSetId = pointSetMap.get(pointSetName);
           const pointValue = parseInt(points, 10);
-
           if (!isNaN(pointValue)) {
-            await client.query(
-              `INSERT INTO player_point_values (card_id, point_set_id, points)
-               VALUES ($1, $2, $3)`,
-              [cardId, pointSetId, pointValue]
-            );
+            valueRows.push([cardId, pointSetMap.get(pointSetName), pointValue]);
           }
         }
       }
@@ -106,6 +97,13 @@ async function importAllPoints() {
       console.warn(`Warning: ${notFoundCount} players from the CSV were not found in the database.`);
     }
 
+    // 5. COPY into a staging table, then swap it in. player_point_values is
+    //    only truncated at the very end, inside the same transaction.
+    console.log(`Loading ${valueRows.length} point values...`);
+    await copyIntoStaging(client, 'player_point_values', POINT_VALUE_COLUMNS, valueRows);
+    const swapped = await swapFromStaging(client, 'player_point_values', POINT_VALUE_COLUMNS);
+    console.log(`Swapped in ${swapped} point values.`);
+
     await client.query('COMMIT');
     console.log('✅ Full points import complete! Transaction committed.');
 
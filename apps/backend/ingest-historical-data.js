@@ -5,6 +5,7 @@ const fs = require('fs');
 const path = require('path');
 const csv = require('csv-parser');
 const { execSync } = require('child_process');
+const { tableExists, copyIntoStaging, swapFromStaging } = require('./utils/bulkLoad');
 
 const dbConfig = process.env.NODE_ENV === 'production'
   ? {
@@ -416,75 +417,63 @@ function downloadCSVs() {
     console.log('Download complete.');
 }
 
-async function ingestSeriesResults(client) {
-    try {
-        console.log('Ingesting Series Results...');
-        try {
-            await client.query('TRUNCATE TABLE series_results RESTART IDENTITY');
-        } catch (e) {
-            if (e.code === '42P01') {
-                console.warn('Table series_results does not exist. Skipping series results ingestion.');
-                return;
-            }
-            throw e;
+// Column lists for each table loaded through the staging/COPY path. Every
+// parse step below produces row arrays in exactly this order.
+const SERIES_RESULT_COLUMNS = ['date', 'season_name', 'style', 'round', 'winning_team_name', 'losing_team_name', 'winning_team_id', 'losing_team_id', 'winning_score', 'losing_score', 'notes'];
+const ROSTER_COLUMNS = ['season', 'team_name', 'player_name', 'position', 'card_id'];
+const RANDOM_REMOVAL_COLUMNS = ['season', 'player_name', 'card_id', 'team_name'];
+const DRAFT_HISTORY_COLUMNS = ['season_name', 'round', 'pick_number', 'team_name', 'player_name', 'notes', 'card_id'];
+
+function parseSeriesResults() {
+    console.log('Parsing Series Results...');
+    const rows = [];
+    const lines = rawSeriesData.trim().split('\n');
+
+    for (const line of lines) {
+        if (!line.trim()) continue;
+
+        let parts = line.split('\t');
+        if (parts.length < 5) continue;
+
+        const style = parts[0].trim();
+        const dateStr = parts[1].trim();
+        const team1Name = parts[2].trim();
+        const score1Str = parts[3].trim();
+        const team2Name = parts[4].trim();
+        const score2Str = parts[5].trim();
+        const round = parts[6] ? parts[6].trim() : '';
+        const notes = parts[7] ? parts[7].trim() : '';
+
+        if (!score1Str || !score2Str || score1Str === 'N/A' || score2Str === 'N/A') continue;
+
+        const score1 = parseInt(score1Str, 10);
+        const score2 = parseInt(score2Str, 10);
+
+        if (isNaN(score1) || isNaN(score2)) continue;
+
+        let winningTeamName, losingTeamName, winningScore, losingScore, winningTeamId, losingTeamId;
+
+        if (score1 > score2) {
+            winningTeamName = team1Name;
+            losingTeamName = team2Name;
+            winningScore = score1;
+            losingScore = score2;
+        } else {
+            winningTeamName = team2Name;
+            losingTeamName = team1Name;
+            winningScore = score2;
+            losingScore = score1;
         }
 
-        const lines = rawSeriesData.trim().split('\n');
-        let insertedCount = 0;
-
-        for (const line of lines) {
-            if (!line.trim()) continue;
-
-            let parts = line.split('\t');
-            if (parts.length < 5) continue;
-
-            const style = parts[0].trim();
-            const dateStr = parts[1].trim();
-            const team1Name = parts[2].trim();
-            const score1Str = parts[3].trim();
-            const team2Name = parts[4].trim();
-            const score2Str = parts[5].trim();
-            const round = parts[6] ? parts[6].trim() : '';
-            const notes = parts[7] ? parts[7].trim() : '';
-
-            if (!score1Str || !score2Str || score1Str === 'N/A' || score2Str === 'N/A') continue;
-
-            const score1 = parseInt(score1Str, 10);
-            const score2 = parseInt(score2Str, 10);
-
-            if (isNaN(score1) || isNaN(score2)) continue;
+        winningTeamId = teamIdMap[winningTeamName] || null;
+        losingTeamId = teamIdMap[losingTeamName] || null;
 
-            let winningTeamName, losingTeamName, winningScore, losingScore, winningTeamId, losingTeamId;
+        const seasonName = seasonMap[dateStr] || 'Unknown Season';
 
-            if (score1 > score2) {
-                winningTeamName = team1Name;
-                losingTeamName = team2Name;
-                winningScore = score1;
-                losingScore = score2;
-            } else {
-                winningTeamName = team2Name;
-                losingTeamName = team1Name;
-                winningScore = score2;
-                losingScore = score1;
-            }
-
-            winningTeamId = teamIdMap[winningTeamName] || null;
-            losingTeamId = teamIdMap[losingTeamName] || null;
-
-            const seasonName = seasonMap[dateStr] || 'Unknown Season';
-
-            await client.query(
-                `INSERT INTO series_results
-                (date, season_name, style, round, winning_team_name, losing_team_name, winning_team_id, losing_team_id, winning_score, losing_score, notes)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)`,
-                [dateStr, seasonName, style, round, winningTeamName, losingTeamName, winningTeamId, losingTeamId, winningScore, losingScore, notes]
-            );
-            insertedCount++;
-        }
-        console.log(`Successfully ingested ${insertedCount} series results.`);
-    } catch (err) {
-        console.error('Error ingesting series results:', err);
+        rows.push([dateStr, seasonName, style, round, winningTeamName, losingTeamName, winningTeamId, losingTeamId, winningScore, losingScore, notes]);
     }
+    console.log(`Parsed ${rows.length} series results.`);
+    return rows;
 }
 
 async function getCardIdMap(client) {
@@ -527,15 +516,9 @@ const historicalRosterMap = {};
 // Global map for historical team names: seasonName -> teamId -> teamName
 const seasonTeamNameMap = {};
 
-async function ingestRosters(client, cardIdMap) {
-    console.log('Ingesting Rosters...');
-    try {
-        await client.query('TRUNCATE TABLE historical_rosters RESTART IDENTITY');
-    } catch (e) {
-        console.warn('Table historical_rosters does not exist. Skipping.');
-        return;
-    }
-
+async function parseRosters(cardIdMap) {
+    console.log('Parsing Rosters...');
+    const rosterRows = [];
     const rosterTabs = ['Ann Arbor', 'Boston', 'Detroit', 'New York', 'NY South'];
 
     for (const teamName of rosterTabs) {
@@ -586,33 +569,19 @@ async function ingestRosters(client, cardIdMap) {
                         historicalRosterMap[seasonName][cardId] = teamName;
                     }
 
-                    await client.query(
-                        `INSERT INTO historical_rosters (season, team_name, player_name, position, card_id)
-                         VALUES ($1, $2, $3, $4, $5)`,
-                        [seasonName, teamName, playerName.trim(), position, cardId]
-                    );
+                    rosterRows.push([seasonName, teamName, playerName.trim(), position, cardId]);
                 }
             }
         }
     }
-    console.log('Roster ingestion complete.');
+    console.log(`Parsed ${rosterRows.length} roster entries.`);
+    return rosterRows;
 }
 
-async function ingestDrafts(client, cardIdMap) {
-    console.log('Ingesting Drafts...');
-    try {
-        await client.query('TRUNCATE TABLE draft_history RESTART IDENTITY');
-    } catch (e) {
-        console.warn('Table draft_history does not exist. Skipping.');
-        return;
-    }
-
-    try {
-        await client.query('TRUNCATE TABLE random_removals RESTART IDENTITY');
-    } catch (e) {
-        console.warn('Table random_removals does not exist. Skipping.');
-        // We continue, as this table might be optional or handled elsewhere if user didn't migrate
-    }
+async function parseDrafts(cardIdMap) {
+    console.log('Parsing Drafts...');
+    const draftRows = [];
+    const removalRows = [];
 
     const files = fs.readdirSync(DATA_DIR).filter(f => f.startsWith('RRD') || f === 'Full Draft.csv');
     // Sort files so we process in order: Full Draft, RRD1, RRD2...
@@ -717,15 +686,7 @@ async function ingestDrafts(client, cardIdMap) {
 
                 if (!removalTeam) removalTeam = 'Unknown Team';
 
-                try {
-                    await client.query(
-                        `INSERT INTO random_removals (season, player_name, card_id, team_name)
-                         VALUES ($1, $2, $3, $4)`,
-                        [seasonName, cleanLostPlayer, lostCardId, removalTeam]
-                    );
-                } catch (e) {
-                    if (e.code !== '42P01') console.error('Error inserting random removal:', e);
-                }
+                removalRows.push([seasonName, cleanLostPlayer, lostCardId, removalTeam]);
             }
 
             // Skip ADD/DROP rounds
@@ -750,15 +711,28 @@ async function ingestDrafts(client, cardIdMap) {
             }
 
             if (finalPlayerName && team) {
-                await client.query(
-                    `INSERT INTO draft_history (season_name, round, pick_number, team_name, player_name, notes, card_id)
-                     VALUES ($1, $2, $3, $4, $5, $6, $7)`,
-                    [seasonName, round, pick, team, finalPlayerName, notes, finalCardId]
-                );
+                draftRows.push([seasonName, round, pick, team, finalPlayerName, notes, finalCardId]);
             }
         }
     }
-    console.log('Draft ingestion complete.');
+    console.log(`Parsed ${draftRows.length} draft picks and ${removalRows.length} random removals.`);
+    return { draftRows, removalRows };
+}
+
+// Rejects rows that would violate NOT NULL columns before anything touches
+// the database, so a bad CSV fails the whole ingest instead of half of it.
+function validateRows(table, columns, rows, requiredColumns) {
+    const requiredIdx = requiredColumns.map(c => columns.indexOf(c));
+    rows.forEach((row, i) => {
+        if (row.length !== columns.length) {
+            throw new Error(`${table} row ${i} has ${row.length} values, expected ${columns.length}`);
+        }
+        for (const idx of requiredIdx) {
+            if (row[idx] === null || row[idx] === undefined || row[idx] === '') {
+                throw new Error(`${table} row ${i} is missing required column ${columns[idx]}`);
+            }
+        }
+    });
 }
 
 async function ingest() {
@@ -767,13 +741,39 @@ async function ingest() {
     // Download data first
     downloadCSVs();
 
+    const cardIdMap = await getCardIdMap(client);
+
+    // Parse, unpivot and validate everything in memory first.
+    const seriesRows = parseSeriesResults();
+    const rosterRows = await parseRosters(cardIdMap);
+    const { draftRows, removalRows } = await parseDrafts(cardIdMap);
+
+    const loads = [
+      { table: 'series_results', columns: SERIES_RESULT_COLUMNS, rows: seriesRows, required: ['winning_team_name', 'losing_team_name'] },
+      { table: 'historical_rosters', columns: ROSTER_COLUMNS, rows: rosterRows, required: ['season', 'team_name', 'player_name'] },
+      { table: 'draft_history', columns: DRAFT_HISTORY_COLUMNS, rows: draftRows, required: ['season_name', 'team_name', 'player_name'] },
+      { table: 'random_removals', columns: RANDOM_REMOVAL_COLUMNS, rows: removalRows, required: ['season', 'player_name'] },
+    ];
+    loads.forEach(l => validateRows(l.table, l.columns, l.rows, l.required));
+
     await client.query('BEGIN');
 
-    const cardIdMap = await getCardIdMap(client);
+    // Stage every table before touching any live one, so the live tables are
+    // only locked for the short truncate+insert swap at the end.
+    const staged = [];
+    for (const load of loads) {
+      if (!(await tableExists(client, load.table))) {
+        console.warn(`Table ${load.table} does not exist. Skipping.`);
+        continue;
+      }
+      await copyIntoStaging(client, load.table, load.columns, load.rows);
+      staged.push(load);
+    }
 
-    await ingestSeriesResults(client);
-    await ingestRosters(client, cardIdMap);
-    await ingestDrafts(client, cardIdMap);
+    for (const load of staged) {
+      const count = await swapFromStaging(client, load.table, load.columns);
+      console.log(`Loaded ${count} rows into ${load.table}.`);
+    }
 
     await client.query('COMMIT');
     console.log('Ingestion process finished successfully.');
@@ -1,6 +1,7 @@
 const cron = require('node-cron');
 const { pool } = require('../db');
 const { sendPhantomWarningEmail, sendPhantomLossesEmail } = require('../services/emailService');
+const { refreshSeasonAggregates } = require('../services/leagueAggregateService');
 
 // --- Phantom Losses ---------------------------------------------------------
 //
@@ -16,6 +17,12 @@ const { sendPhantomWarningEmail, sendPhantomLossesEmail } = require('../services
 //     emails the league). It is idempotent — re-runs assign nothing.
 //   - sendPhantomWarnings runs each morning and, on the single day one week
 //     before a mark, emails the league naming the teams at risk.
+//   - projectPhantomLosses (POST /api/dev/phantom-check, mode 'project') reports
+//     every team's ledger against any date, e.g. an upcoming mark.
+//
+// Each run reads every team's played and charged counts in one query
+// (getPhantomSeason) and charges all new losses in one insert, so a run costs the
+// same handful of round trips however many teams the league has.
 //
 // PHANTOM_ENFORCEMENT_START gates WHEN enforcement begins: no warnings or losses
 // are issued for any mark before this date (see latestMark / nextMarkAfter). It
@@ -98,11 +105,11 @@ function nextMarkAfter(asOf, draftDate, floor) {
 
 // --- data access ------------------------------------------------------------
 
-// Identify the current phantom-eligible season: the most recent non-Classic
-// season whose regular season is still in progress (no Golden Spaceship yet).
-// Returns { seasonName, draftDate, teams: [{ team_id, city, logo_url }] } or null.
-async function getPhantomSeason(db) {
-    const seasonRes = await db.query(`
+// One pass over the latest season's results: the season itself, whether its postseason is set,
+// and every team's ledger (real series played, phantom losses already charged). The season is
+// the most recent non-Classic season; its teams are those with a non-Classic result row in it.
+const PHANTOM_SEASON_SQL = `
+    WITH season AS (
         SELECT season_name, MIN(date) AS draft_date
         FROM series_results
         WHERE style IS DISTINCT FROM 'Classic'
@@ -111,63 +118,84 @@ async function getPhantomSeason(db) {
         GROUP BY season_name
         ORDER BY MAX(date) DESC
         LIMIT 1
-    `);
-    if (seasonRes.rows.length === 0) return null;
+    ),
+    ledger AS (
+        SELECT side.team_id,
+               COUNT(*) FILTER (
+                   WHERE sr.style IS DISTINCT FROM 'Classic'
+                     AND sr.winning_score IS NOT NULL
+                     AND COALESCE(sr.round, '') <> ALL($1::text[])
+                     AND sr.winning_team_name IS DISTINCT FROM 'Phantoms'
+                     AND sr.losing_team_name IS DISTINCT FROM 'Phantoms'
+               )::int AS played,
+               COALESCE(SUM(sr.winning_score) FILTER (
+                   WHERE side.is_loser AND sr.winning_team_name = 'Phantoms'
+               ), 0)::int AS phantom_losses
+        FROM season
+        JOIN series_results sr ON sr.season_name = season.season_name
+        CROSS JOIN LATERAL (VALUES (sr.winning_team_id, false), (sr.losing_team_id, true)) AS side(team_id, is_loser)
+        WHERE side.team_id IS NOT NULL
+        GROUP BY side.team_id
+        HAVING bool_or(sr.style IS DISTINCT FROM 'Classic')
+    )
+    SELECT season.season_name, season.draft_date,
+           EXISTS (
+               SELECT 1 FROM series_results
+               WHERE season_name = season.season_name AND round = 'Golden Spaceship'
+           ) AS is_over,
+           t.team_id, t.city, t.logo_url, l.played, l.phantom_losses
+    FROM season
+    LEFT JOIN (ledger l JOIN teams t ON t.team_id = l.team_id) ON true
+    ORDER BY t.city
+`;
 
-    const seasonName = seasonRes.rows[0].season_name;
-    const draftDate = seasonRes.rows[0].draft_date;
-    if (!draftDate) return null;
+// Identify the current phantom-eligible season: the most recent non-Classic
+// season whose regular season is still in progress (no Golden Spaceship yet).
+// Returns { seasonName, draftDate, teams: [{ team_id, city, logo_url, played, phantom_losses }] }
+// or null. `played` counts completed, real (non-Phantoms, regular) series; `phantom_losses` is
+// summed, since one row can carry several.
+async function getPhantomSeason(db) {
+    const { rows } = await db.query(PHANTOM_SEASON_SQL, [POSTSEASON_ROUNDS]);
+    if (rows.length === 0) return null;
 
-    const overRes = await db.query(
-        `SELECT 1 FROM series_results WHERE season_name = $1 AND round = 'Golden Spaceship' LIMIT 1`,
-        [seasonName]
-    );
-    if (overRes.rows.length > 0) return null; // postseason set — season is over
-
-    const teamsRes = await db.query(
-        `SELECT team_id, city, logo_url FROM teams WHERE team_id IN (
-            SELECT winning_team_id FROM series_results
-                WHERE season_name = $1 AND style IS DISTINCT FROM 'Classic' AND winning_team_id IS NOT NULL
-            UNION
-            SELECT losing_team_id FROM series_results
-                WHERE season_name = $1 AND style IS DISTINCT FROM 'Classic' AND losing_team_id IS NOT NULL
-         )
-         ORDER BY city`,
-        [seasonName]
-    );
+    const { season_name: seasonName, draft_date: draftDate, is_over: isOver } = rows[0];
+    if (!draftDate) return null;
+    if (isOver) return null; // postseason set — season is over
 
-    return { seasonName, draftDate, teams: teamsRes.rows };
+    const teams = rows
+        .filter(r => r.team_id != null)
+        .map(r => ({ team_id: r.team_id, city: r.city, logo_url: r.logo_url, played: r.played, phantom_losses: r.phantom_losses }));
+    return { seasonName, draftDate, teams };
 }
 
-// Completed, real (non-Classic, non-Phantoms, regular) series this team has played.
-async function countRealSeries(db, seasonName, teamId) {
-    const res = await db.query(
-        `SELECT COUNT(*)::int AS n FROM series_results
-         WHERE season_name = $1
-           AND style IS DISTINCT FROM 'Classic'
-           AND winning_score IS NOT NULL
-           AND round IS DISTINCT FROM 'Golden Spaceship'
-           AND round IS DISTINCT FROM 'Wooden Spoon'
-           AND round IS DISTINCT FROM 'Silver Submarine'
-           AND winning_team_name IS DISTINCT FROM 'Phantoms'
-           AND losing_team_name IS DISTINCT FROM 'Phantoms'
-           AND (winning_team_id = $2 OR losing_team_id = $2)`,
-        [seasonName, teamId]
-    );
-    return res.rows[0].n;
+// Teams short of `required` series: [{ teamId, city, logo_url, count }].
+function phantomShortfalls(teams, required) {
+    const short = [];
+    for (const team of teams) {
+        const count = Math.max(0, required - team.played - team.phantom_losses);
+        if (count > 0) short.push({ teamId: team.team_id, city: team.city, logo_url: team.logo_url, count });
+    }
+    return short;
 }
 
-// Phantom losses already charged to this team this season (summed, since one row
-// can carry multiple).
-async function countPhantomLosses(db, seasonName, teamId) {
-    const res = await db.query(
-        `SELECT COALESCE(SUM(winning_score), 0)::int AS n FROM series_results
-         WHERE season_name = $1
-           AND winning_team_name = 'Phantoms'
-           AND losing_team_id = $2`,
-        [seasonName, teamId]
+// Charges every assignment in one statement.
+async function insertPhantomLosses(db, seasonName, markDate, required, assignments) {
+    await db.query(
+        `INSERT INTO series_results
+            (season_name, round, date, winning_team_id, losing_team_id,
+             winning_team_name, losing_team_name, winning_score, losing_score, notes, status, result_source, completed_at)
+         SELECT $1, 'Regular Season', $2, NULL, a.team_id, 'Phantoms', a.city, a.losses, 0, a.notes, 'completed', 'auto', now()
+         FROM unnest($3::int[], $4::text[], $5::int[], $6::text[]) AS a(team_id, city, losses, notes)`,
+        [
+            seasonName,
+            markDate,
+            assignments.map(a => a.teamId),
+            assignments.map(a => a.city),
+            assignments.map(a => a.count),
+            assignments.map(a => `Auto-assigned phantom ${a.count === 1 ? 'loss' : 'losses'}: ` +
+                `${required} series required by this point in the season.`),
+        ]
     );
-    return res.rows[0].n;
 }
 
 // --- core operations --------------------------------------------------------
@@ -184,36 +212,13 @@ async function applyPhantomLosses(db = pool, asOf = new Date(), opts = {}) {
         return { season: season.seasonName, required, markDate, assignments: [] };
     }
 
-    const assignments = [];
-    for (const team of season.teams) {
-        const realSeries = await countRealSeries(db, season.seasonName, team.team_id);
-        const existingPhantom = await countPhantomLosses(db, season.seasonName, team.team_id);
-        const assign = Math.max(0, required - realSeries - existingPhantom);
-        if (assign > 0) {
-            assignments.push({ teamId: team.team_id, city: team.city, logo_url: team.logo_url, count: assign });
-        }
-    }
+    const assignments = phantomShortfalls(season.teams, required);
 
     if (!opts.dryRun && assignments.length > 0) {
-        for (const a of assignments) {
-            const lossWord = a.count === 1 ? 'loss' : 'losses';
-            await db.query(
-                `INSERT INTO series_results
-                    (season_name, round, date, winning_team_id, losing_team_id,
-                     winning_team_name, losing_team_name, winning_score, losing_score, notes, status, result_source)
-                 VALUES ($1, 'Regular Season', $2, NULL, $3, 'Phantoms', $4, $5, 0, $6, 'completed', 'auto')`,
-                [
-                    season.seasonName,
-                    markDate,
-                    a.teamId,
-                    a.city,
-                    a.count,
-                    `Auto-assigned phantom ${lossWord}: ${required} series required by this point in the season.`
-                ]
-            );
-        }
+        await insertPhantomLosses(db, season.seasonName, markDate, required, assignments);
         console.log(`[phantomMonitor] Charged phantom losses for ${season.seasonName}:`,
             assignments.map(a => `${a.city} (${a.count})`).join(', '));
+        await refreshSeasonAggregates(db, season.seasonName);
         await sendPhantomLossesEmail(assignments, markDate, db);
     }
 
@@ -236,15 +241,7 @@ async function sendPhantomWarnings(db = pool, asOf = new Date(), opts = {}) {
     }
 
     const requiredAtMark = requiredSeries(nextMark, season.draftDate);
-    const teamsAtRisk = [];
-    for (const team of season.teams) {
-        const realSeries = await countRealSeries(db, season.seasonName, team.team_id);
-        const existingPhantom = await countPhantomLosses(db, season.seasonName, team.team_id);
-        const projected = Math.max(0, requiredAtMark - realSeries - existingPhantom);
-        if (projected > 0) {
-            teamsAtRisk.push({ teamId: team.team_id, city: team.city, logo_url: team.logo_url, count: projected });
-        }
-    }
+    const teamsAtRisk = phantomShortfalls(season.teams, requiredAtMark);
 
     if (!opts.dryRun && teamsAtRisk.length > 0) {
         console.log(`[phantomMonitor] Phantom warning for ${season.seasonName} (mark ${warnDay ? nextMark.toDateString() : ''}):`,
@@ -255,6 +252,29 @@ async function sendPhantomWarnings(db = pool, asOf = new Date(), opts = {}) {
     return { season: season.seasonName, nextMark, warnDay, teamsAtRisk };
 }
 
+// Projection for any date (past or future): every team's ledger against the cadence owed by
+// `asOf`, assuming nothing else is played. Charges and emails nothing. `shortfall` is what
+// applyPhantomLosses would charge at the latest enforced mark on or before `asOf`.
+// Returns { season, asOf, required, markDate, teams: [{ teamId, city, logo_url, played,
+// phantomLosses, owed, shortfall }] }.
+async function projectPhantomLosses(db = pool, asOf = new Date()) {
+    const season = await getPhantomSeason(db);
+    if (!season) return { season: null, teams: [] };
+
+    const required = requiredSeries(asOf, season.draftDate);
+    const markDate = latestMark(asOf, season.draftDate, PHANTOM_ENFORCEMENT_START);
+    const teams = season.teams.map(t => ({
+        teamId: t.team_id,
+        city: t.city,
+        logo_url: t.logo_url,
+        played: t.played,
+        phantomLosses: t.phantom_losses,
+        owed: required,
+        shortfall: markDate ? Math.max(0, required - t.played - t.phantom_losses) : 0,
+    }));
+    return { season: season.seasonName, asOf, required, markDate, teams };
+}
+
 function startPhantomMonitor() {
     // Apply phantom losses at 11:59 PM daily. Acts on a mark's calendar day; on
     // other days the reconciliation finds nothing new to charge.
@@ -275,8 +295,10 @@ module.exports = {
     startPhantomMonitor,
     applyPhantomLosses,
     sendPhantomWarnings,
+    projectPhantomLosses,
     getPhantomSeason,
     // exported for testing
+    phantomShortfalls,
     requiredSeries,
     latestMark,
     nextMarkAfter,
@@ -0,0 +1,209 @@
+import os
+import csv
+import json
+import time
+import argparse
+import numpy as np
+
+# Exact hitter-vs-pitcher plate appearance outcomes for every card in hitters.csv x pitchers.csv.
+#
+#   python matchup_matrix.py build                    # writes matchups/ (matrix + summaries)
+#   python matchup_matrix.py query --hitter "Base|1"  # card X vs the league's pitchers
+#   python matchup_matrix.py query --hitter "Base|1" --pitcher "PR|3"
+#
+# One PA is the same two rolls the game makes (see the pitch in server.js): the pitch roll
+# (d20 + Ctl > OB gives the pitcher the advantage, so P(pitcher) = (20 - clip(OB - Ctl, 0, 20)) / 20)
+# and then a d20 on the advantaged side's chart. The chart columns are the widths
+# createChartData() in ingest-data.js turns into chart_data, so the outcome distribution is
+#
+#   P(outcome | h, p) = P(pitcher) * pitcher_chart[p] + (1 - P(pitcher)) * hitter_chart[h]
+#
+# computed for the whole hitter x pitcher matrix at once and saved as float32 .npy, which
+# queries open memory-mapped. Cards are keyed "Set|Num" (cards_player.set_name/card_number).
+#
+# The build also writes matchup_summaries.json: each card's expected line against the league
+# (hitters vs every pitcher, pitchers vs every hitter). The backend attaches these to the
+# opponent scouting view (/api/games/:gameId/opponent-roster via utils/matchupSummaries.js).
+
+# Constants
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+HITTERS_CSV = os.path.join(BACKEND_DIR, "hitters.csv")
+PITCHERS_CSV = os.path.join(BACKEND_DIR, "pitchers.csv")
+OUT_DIR = os.path.join(BACKEND_DIR, "matchups")
+MATRIX_FILE = "matchups.npy"
+INDEX_FILE = "matchup_index.json"
+SUMMARY_FILE = "matchup_summaries.json"
+
+# Outcome axis of the matrix: the union of the hitter and pitcher chart columns.
+OUTCOMES = ['PU', 'SO', 'GB', 'FB', 'BB', '1B', '1B+', '2B', '3B', 'HR']
+HITTER_COLUMNS = ['SO', 'GB', 'FB', 'BB', '1B', '1B+', '2B', '3B', 'HR']
+PITCHER_COLUMNS = ['PU', 'SO', 'GB', 'FB', 'BB', '1B', '2B', 'HR']
+
+ON_BASE = np.array([o in ('BB', '1B', '1B+', '2B', '3B', 'HR') for o in OUTCOMES], dtype=np.float64)
+TOTAL_BASES = np.array([{'1B': 1, '1B+': 1, '2B': 2, '3B': 3, 'HR': 4}.get(o, 0) for o in OUTCOMES], dtype=np.float64)
+WALK = np.array([o == 'BB' for o in OUTCOMES], dtype=np.float64)
+
+
+def card_key(row):
+    return f"{row['Set']}|{row['Num']}"
+
+
+def read_cards(path, columns, rating):
+    """Reads a card CSV into (index, ratings, charts). Hitters have one row per fielding
+    position, so rows are de-duplicated by Set|Num the same way ingest-data.js does."""
+    index, ratings, charts = [], [], []
+    seen = set()
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            key = card_key(row)
+            if key in seen:
+                continue
+            seen.add(key)
+            widths = [int(row[c] or 0) for c in columns]
+            total = sum(widths)
+            if total <= 0:
+                continue
+            chart = np.zeros(len(OUTCOMES))
+            for column, width in zip(columns, widths):
+                chart[OUTCOMES.index(column)] = width / total
+            index.append({"key": key, "name": " ".join(p for p in (row['First'], row['Last']) if p), "team": row['Tm']})
+            ratings.append(int(row[rating] or 0))
+            charts.append(chart)
+    return index, np.array(ratings, dtype=np.float64), np.array(charts, dtype=np.float64)
+
+
+def build_matrix(on_base, hitter_charts, control, pitcher_charts):
+    """The (hitters, pitchers, outcomes) distribution tensor, in one broadcast pass."""
+    gap = np.clip(on_base[:, None] - control[None, :], 0, 20)
+    pitcher_adv = (20 - gap) / 20
+    return (pitcher_adv[:, :, None] * pitcher_charts[None, :, :]
+            + (1 - pitcher_adv)[:, :, None] * hitter_charts[:, None, :])
+
+
+def slash_line(dist):
+    """Expected OBP / SLG (per AB, so walks are excluded) / OPS from outcome distributions
+    along the last axis."""
+    obp = dist @ ON_BASE
+    at_bats = 1 - dist @ WALK
+    slg = np.divide(dist @ TOTAL_BASES, at_bats, out=np.zeros_like(obp), where=at_bats > 0)
+    return obp, slg, obp + slg
+
+
+def summary_rows(index, dist):
+    obp, slg, ops = slash_line(dist)
+    out = {}
+    for i, card in enumerate(index):
+        out[card["key"]] = {
+            "name": card["name"],
+            "obp": round(float(obp[i]), 4),
+            "slg": round(float(slg[i]), 4),
+            "ops": round(float(ops[i]), 4),
+            "outcomes": {o: round(float(dist[i, j]), 4) for j, o in enumerate(OUTCOMES)},
+        }
+    return out
+
+
+def build(out_dir):
+    """Builds the matrix from the CSVs and writes it with its index and summaries."""
+    start = time.perf_counter()
+    hitters, on_base, hitter_charts = read_cards(HITTERS_CSV, HITTER_COLUMNS, 'OB')
+    pitchers, control, pitcher_charts = read_cards(PITCHERS_CSV, PITCHER_COLUMNS, 'Ctl')
+    matrix = build_matrix(on_base, hitter_charts, control, pitcher_charts)
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, MATRIX_FILE), matrix.astype(np.float32))
+    with open(os.path.join(out_dir, INDEX_FILE), 'w') as f:
+        json.dump({"outcomes": OUTCOMES, "hitters": hitters, "pitchers": pitchers}, f)
+
+    # Each card against the whole other side, every opponent weighted equally.
+    summaries = {
+        "outcomes": OUTCOMES,
+        "hitters": summary_rows(hitters, matrix.mean(axis=1)),
+        "pitchers": summary_rows(pitchers, matrix.mean(axis=0)),
+    }
+    with open(os.path.join(out_dir, SUMMARY_FILE), 'w') as f:
+        json.dump(summaries, f, separators=(',', ':'))
+
+    print(f"Built {len(hitters)} x {len(pitchers)} matchups in {(time.perf_counter() - start) * 1000:.0f} ms -> {out_dir}")
+
+
+class MatchupMatrix:
+    """Read side of a built matrix. The tensor is memory-mapped, so opening it is cheap and a
+    query only touches the rows it reads."""
+
+    def __init__(self, out_dir=OUT_DIR):
+        self.matrix = np.load(os.path.join(out_dir, MATRIX_FILE), mmap_mode='r')
+        with open(os.path.join(out_dir, INDEX_FILE)) as f:
+            index = json.load(f)
+        self.hitters = {card["key"]: i for i, card in enumerate(index["hitters"])}
+        self.pitchers = {card["key"]: i for i, card in enumerate(index["pitchers"])}
+        self.names = {card["key"]: card["name"] for card in index["hitters"] + index["pitchers"]}
+        # Per-card league lines are precomputed so the common question is a row lookup.
+        self._hitter_league = np.asarray(self.matrix.mean(axis=1), dtype=np.float64)
+        self._pitcher_league = np.asarray(self.matrix.mean(axis=0), dtype=np.float64)
+
+    def distribution(self, hitter, pitcher):
+        """Outcome probabilities for one PA of `hitter` against `pitcher` (Set|Num keys)."""
+        return np.asarray(self.matrix[self.hitters[hitter], self.pitchers[pitcher]], dtype=np.float64)
+
+    def hitter_line(self, hitter, pitchers=None):
+        """Expected (OBP, SLG, OPS) of a hitter against the league's pitchers, or against just
+        `pitchers` (e.g. an opponent's staff)."""
+        if pitchers is None:
+            dist = self._hitter_league[self.hitters[hitter]]
+        else:
+            cols = [self.pitchers[p] for p in pitchers]
+            dist = np.asarray(self.matrix[self.hitters[hitter], cols], dtype=np.float64).mean(axis=0)
+        return tuple(float(v) for v in slash_line(dist))
+
+    def pitcher_line(self, pitcher, hitters=None):
+        """Expected (OBP, SLG, OPS) allowed by a pitcher to the league's hitters, or to `hitters`."""
+        if hitters is None:
+            dist = self._pitcher_league[self.pitchers[pitcher]]
+        else:
+            rows = [self.hitters[h] for h in hitters]
+            dist = np.asarray(self.matrix[rows, self.pitchers[pitcher]], dtype=np.float64).mean(axis=0)
+        return tuple(float(v) for v in slash_line(dist))
+
+
+def query(args):
+    engine = MatchupMatrix(args.out)
+    start = time.perf_counter()
+    if args.hitter and args.pitcher:
+        dist = engine.distribution(args.hitter, args.pitcher)
+        obp, slg, ops = (float(v) for v in slash_line(dist))
+        label = f"{engine.names[args.hitter]} vs {engine.names[args.pitcher]}"
+        detail = "  ".join(f"{o} {p:.3f}" for o, p in zip(OUTCOMES, dist))
+    elif args.hitter:
+        obp, slg, ops = engine.hitter_line(args.hitter)
+        label, detail = f"{engine.names[args.hitter]} vs league pitching", ""
+    else:
+        obp, slg, ops = engine.pitcher_line(args.pitcher)
+        label, detail = f"League hitters vs {engine.names[args.pitcher]}", ""
+    elapsed_us = (time.perf_counter() - start) * 1e6
+    print(f"{label}: OBP {obp:.3f}  SLG {slg:.3f}  OPS {ops:.3f}  ({elapsed_us:.0f} us)")
+    if detail:
+        print(detail)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hitter x pitcher matchup matrix from the card CSVs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_parser = sub.add_parser("build", help="Compute the matrix and summaries from the CSVs.")
+    build_parser.add_argument("--out", default=OUT_DIR)
+    query_parser = sub.add_parser("query", help="Expected line for a card (keys are Set|Num).")
+    query_parser.add_argument("--out", default=OUT_DIR)
+    query_parser.add_argument("--hitter")
+    query_parser.add_argument("--pitcher")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build(args.out)
+    else:
+        if not args.hitter and not args.pitcher:
+            parser.error("query needs --hitter and/or --pitcher")
+        query(args)
+
+
+if __name__ == "__main__":
+    main()
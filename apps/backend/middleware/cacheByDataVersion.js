@@ -0,0 +1,106 @@
+// Response cache for read-only GET endpoints: the JSON a handler sends is compressed once and
+// kept in a small LRU (utils/snapshotResponse.js), tagged with the request's route, params/query and
+// the current versions of the tables the handler reads ('table:<name>' data_versions keys, see
+// the 20260724 migration). Any write to one of those tables moves the tag on.
+//
+// The tag is computed from in-memory counters (services/dataVersions.js), so a reload whose
+// If-None-Match still matches is a 304 and a cached payload is served without running the
+// handler — neither touches the database. Concurrent misses for the same tag wait for one
+// handler run. Only 200 responses sent with res.json() are cached.
+
+const crypto = require('crypto');
+const { getDataVersion } = require('../services/dataVersions');
+const { pickEncoding, etagFor, isNotModified, createSnapshotCache } = require('../utils/snapshotResponse');
+
+const tableVersionKey = (table) => `table:${table}`;
+
+// The route is part of the key, so an instance shared between routes can't answer one with the
+// other's payload.
+function requestKey(req, perUser) {
+    const route = `${req.baseUrl || ''}${req.path || ''}`;
+    const query = Object.keys(req.query || {}).sort().map(k => [k, req.query[k]]);
+    const user = perUser ? (req.user && req.user.userId) : null;
+    return JSON.stringify([route, req.params || {}, query, user]);
+}
+
+/**
+ * @param {string} name - Prefix for the cache's ETags (e.g. 'season-summary').
+ * @param {object} options
+ * @param {string[]} options.tables - Tables the handler reads.
+ * @param {boolean} [options.perUser] - The payload depends on who is asking.
+ * @param {function} [options.version] - `req => string|null` for inputs that aren't tables
+ *   (e.g. the captaincy document a service will serve); null skips the cache for the request.
+ * @param {number} [options.max] - Payloads to keep.
+ */
+function cacheByDataVersion(name, { tables, perUser = false, version = null, max = 16 }) {
+    const cache = createSnapshotCache(max);
+
+    const tagFor = async (req) => {
+        const versions = await Promise.all(tables.map(t => getDataVersion(tableVersionKey(t))));
+        if (version) {
+            const extra = version(req);
+            if (extra == null) return null;
+            versions.push(extra);
+        }
+        const hash = crypto.createHash('sha1')
+            .update(requestKey(req, perUser))
+            .update(versions.join('.'))
+            .digest('base64url')
+            .slice(0, 20);
+        return `${name}-${hash}`;
+    };
+
+    return async (req, res, next) => {
+        let tag;
+        try {
+            tag = await tagFor(req);
+        } catch (err) {
+            console.error(`[responseCache] ${name}: could not read data versions:`, err.message);
+        }
+        if (!tag) return next();
+
+        const encoding = pickEncoding(req);
+        const etag = etagFor(tag, encoding);
+        const cacheHeaders = { ETag: etag, 'Cache-Control': 'private, no-cache', Vary: 'Accept-Encoding' };
+        if (isNotModified(req, etag)) {
+            return res.set(cacheHeaders).status(304).end();
+        }
+
+        // On a miss the handler builds the payload: its res.json() body becomes the snapshot.
+        let handledHere = false;
+        const snapshot = cache.get(tag, () => new Promise((resolve, reject) => {
+            handledHere = true;
+            const json = res.json.bind(res);
+            res.json = (body) => {
+                res.json = json;
+                if (res.statusCode !== 200) {
+                    reject(new Error(`not cached (status ${res.statusCode})`));
+                    return json(body);
+                }
+                resolve(body);
+                return res;
+            };
+            // Responded some other way, or the client went away first: nothing to cache.
+            res.once('close', () => reject(new Error('response closed before it was cached')));
+            next();
+        }));
+
+        try {
+            const payload = await snapshot;
+            res.set(cacheHeaders);
+            res.set('Content-Type', 'application/json; charset=utf-8');
+            if (encoding !== 'identity') res.set('Content-Encoding', encoding);
+            return res.status(200).end(payload[encoding]);
+        } catch (err) {
+            // Another request's handler run didn't produce a payload; answer this one ourselves.
+            if (!handledHere) return next();
+            if (!res.headersSent) {
+                console.error(`[responseCache] ${name}:`, err.message);
+                res.status(500).json({ message: 'Server error.' });
+            }
+        }
+    };
+}
+
+module.exports = cacheByDataVersion;
+module.exports.tableVersionKey = tableVersionKey;
@@ -0,0 +1,25 @@
+exports.shorthands = undefined;
+
+// Stored league-page aggregates (standings, head-to-head matrix, season summary) so the
+// League pages are a single indexed read instead of a calculateStandings pass over raw
+// series_results on every request. One row per (scope, kind): scope is a season name or
+// '__all_time__'; kind is 'summary', 'matrix' or 'partial' (a season's contribution to the
+// all-time table). Maintained by services/leagueAggregateService.js on every result write,
+// and rebuildable from scratch with `node rebuild-league-aggregates.js`.
+exports.up = pgm => {
+  pgm.createTable('league_aggregates', {
+    scope: { type: 'varchar(255)', notNull: true },
+    kind: { type: 'varchar(32)', notNull: true },
+    payload: { type: 'jsonb', notNull: true },
+    updated_at: {
+      type: 'timestamptz',
+      notNull: true,
+      default: pgm.func('now()'),
+    },
+  });
+  pgm.addConstraint('league_aggregates', 'league_aggregates_pkey', { primaryKey: ['scope', 'kind'] });
+};
+
+exports.down = pgm => {
+  pgm.dropTable('league_aggregates');
+};
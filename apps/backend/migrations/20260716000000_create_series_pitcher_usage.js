@@ -0,0 +1,39 @@
+exports.shorthands = undefined;
+
+// Per-series pitcher usage ledger. One row per (game, participant, pitcher) that started or
+// pitched in a completed series game, written when the game completes (handleSeriesProgression).
+// Pitching-rotation availability and carried-over reliever fatigue for the next game are folded
+// from these rows in a single indexed read, instead of replaying every earlier game's
+// participants, rosters and final game_states on each lineup screen.
+//
+// games.pitcher_usage_recorded_at marks games whose usage has been written, so games completed
+// before this ledger existed are detected and backfilled on first read (see
+// services/pitcherUsageService.js).
+exports.up = pgm => {
+  pgm.createTable('series_pitcher_usage', {
+    series_id: { type: 'integer', notNull: true, references: 'series', onDelete: 'CASCADE' },
+    game_id: { type: 'integer', notNull: true, references: 'games(game_id)', onDelete: 'CASCADE' },
+    game_in_series: { type: 'integer', notNull: true },
+    user_id: { type: 'integer', notNull: true },
+    card_id: { type: 'integer', notNull: true },
+    started: { type: 'boolean', notNull: true, default: false },
+    innings_pitched: { type: 'integer', notNull: true, default: 0 },
+    batters_faced: { type: 'integer', notNull: true, default: 0 },
+    runs: { type: 'integer', notNull: true, default: 0 },
+    pitched_while_tired: { type: 'boolean', notNull: true, default: false },
+  });
+  pgm.addConstraint('series_pitcher_usage', 'series_pitcher_usage_pkey', { primaryKey: ['game_id', 'user_id', 'card_id'] });
+  pgm.createIndex('series_pitcher_usage', ['series_id', 'game_in_series']);
+
+  pgm.addColumns('games', {
+    pitcher_usage_recorded_at: { type: 'timestamptz' },
+  });
+  // Earlier games of a series are looked up by (series_id, game_in_series) on every lineup screen.
+  pgm.sql('CREATE INDEX IF NOT EXISTS idx_games_series_game ON games (series_id, game_in_series)');
+};
+
+exports.down = pgm => {
+  pgm.sql('DROP INDEX IF EXISTS idx_games_series_game');
+  pgm.dropColumns('games', ['pitcher_usage_recorded_at']);
+  pgm.dropTable('series_pitcher_usage');
+};
@@ -0,0 +1,60 @@
+exports.shorthands = undefined;
+
+// Monotonic version counters for data that HTTP responses are cached against (see
+// services/dataVersions.js). Statement-level triggers bump a key whenever one of its source
+// tables changes — from the app or from an import script — and pg_notify the new key on the
+// 'data_versions' channel so running servers invalidate immediately.
+//
+//   card_catalog     — static card fields and point values (cards_player, player_point_values,
+//                      point_sets): the /api/cards/player snapshots.
+//   roster_ownership — which league team owns which card (roster_cards, rosters, users.team_id,
+//                      teams' display fields): the /api/cards/ownership document.
+const SOURCES = [
+  { table: 'cards_player', key: 'card_catalog' },
+  { table: 'player_point_values', key: 'card_catalog' },
+  { table: 'point_sets', key: 'card_catalog' },
+  { table: 'roster_cards', key: 'roster_ownership' },
+  { table: 'rosters', key: 'roster_ownership' },
+  { table: 'users', key: 'roster_ownership', columns: 'team_id' },
+  { table: 'teams', key: 'roster_ownership', columns: 'name, city, logo_url' },
+];
+
+const triggerName = (s) => `${s.table}_${s.key}_version`;
+
+exports.up = pgm => {
+  pgm.createTable('data_versions', {
+    key: { type: 'varchar(64)', primaryKey: true },
+    version: { type: 'bigint', notNull: true, default: 1 },
+    updated_at: {
+      type: 'timestamptz',
+      notNull: true,
+      default: pgm.func('now()'),
+    },
+  });
+  pgm.sql(`INSERT INTO data_versions (key) VALUES ('card_catalog'), ('roster_ownership')`);
+
+  pgm.sql(`
+    CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+    BEGIN
+      UPDATE data_versions SET version = version + 1, updated_at = now() WHERE key = TG_ARGV[0];
+      PERFORM pg_notify('data_versions', TG_ARGV[0]);
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+  `);
+
+  SOURCES.forEach(s => {
+    const events = s.columns ? `INSERT OR UPDATE OF ${s.columns} OR DELETE` : 'INSERT OR UPDATE OR DELETE OR TRUNCATE';
+    pgm.sql(`
+      CREATE TRIGGER ${triggerName(s)}
+      AFTER ${events} ON ${s.table}
+      FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('${s.key}')
+    `);
+  });
+};
+
+exports.down = pgm => {
+  SOURCES.forEach(s => pgm.sql(`DROP TRIGGER IF EXISTS ${triggerName(s)} ON ${s.table}`));
+  pgm.sql('DROP FUNCTION IF EXISTS bump_data_version()');
+  pgm.dropTable('data_versions');
+};
@@ -0,0 +1,20 @@
+exports.shorthands = undefined;
+
+// Per-series summary document: for each completed game, the compact result the series page and
+// the cumulative series box score show (score, linescore, pitcher decisions, home runs, starting
+// pitchers and per-side batting/pitching lines), plus the roster cards those lines name.
+// Written when a game completes (handleSeriesProgression), so the series page reads one row
+// instead of every game's final state_data. `games` is keyed by game_id and `cards` by card_id;
+// see services/seriesSummaryService.js.
+exports.up = pgm => {
+  pgm.createTable('series_summaries', {
+    series_id: { type: 'integer', primaryKey: true, references: 'series', onDelete: 'CASCADE' },
+    games: { type: 'jsonb', notNull: true, default: pgm.func("'{}'::jsonb") },
+    cards: { type: 'jsonb', notNull: true, default: pgm.func("'{}'::jsonb") },
+    updated_at: { type: 'timestamptz', notNull: true, default: pgm.func('now()') },
+  });
+};
+
+exports.down = pgm => {
+  pgm.dropTable('series_summaries');
+};
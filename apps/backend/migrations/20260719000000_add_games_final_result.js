@@ -0,0 +1,52 @@
+exports.shorthands = undefined;
+
+// Final result of a completed game, denormalized onto games so "who won" / "what was the score"
+// is a plain column read instead of a lookup of the game's newest game_state JSONB. Written in
+// the same statement that marks the game completed (services/gameResultService.js);
+// final_game_state_id is linked once the final state has committed.
+exports.up = pgm => {
+  pgm.addColumns('games', {
+    winning_side: { type: 'text' },        // 'home' | 'away'
+    winning_user_id: { type: 'integer' },
+    home_score: { type: 'integer' },
+    away_score: { type: 'integer' },
+    final_inning: { type: 'integer' },
+    final_game_state_id: { type: 'integer', references: 'game_states(game_state_id)', onDelete: 'SET NULL' },
+  });
+
+  // Backfill every completed game from its newest game_state.
+  pgm.sql(`
+    UPDATE games g
+    SET winning_side = r.winning_side,
+        winning_user_id = CASE r.winning_side
+          WHEN 'home' THEN g.home_team_user_id
+          WHEN 'away' THEN (SELECT gp.user_id FROM game_participants gp
+                            WHERE gp.game_id = g.game_id AND gp.user_id <> g.home_team_user_id LIMIT 1)
+        END,
+        home_score = r.home_score,
+        away_score = r.away_score,
+        final_inning = r.final_inning,
+        final_game_state_id = r.game_state_id
+    FROM (
+      SELECT s.game_id, s.game_state_id, s.home_score, s.away_score, s.final_inning,
+             COALESCE(NULLIF(s.winning_team, ''),
+                      CASE WHEN s.home_score > s.away_score THEN 'home'
+                           WHEN s.away_score > s.home_score THEN 'away' END) AS winning_side
+      FROM (
+        SELECT DISTINCT ON (gs.game_id) gs.game_id, gs.game_state_id,
+               gs.state_data->>'winningTeam' AS winning_team,
+               (gs.state_data->>'homeScore')::int AS home_score,
+               (gs.state_data->>'awayScore')::int AS away_score,
+               (gs.state_data->>'inning')::int AS final_inning
+        FROM game_states gs
+        JOIN games cg ON cg.game_id = gs.game_id AND cg.status = 'completed'
+        ORDER BY gs.game_id, gs.turn_number DESC
+      ) s
+    ) r
+    WHERE g.game_id = r.game_id
+  `);
+};
+
+exports.down = pgm => {
+  pgm.dropColumns('games', ['winning_side', 'winning_user_id', 'home_score', 'away_score', 'final_inning', 'final_game_state_id']);
+};
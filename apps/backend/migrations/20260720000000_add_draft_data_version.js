@@ -0,0 +1,25 @@
+exports.shorthands = undefined;
+
+// 'draft' data_versions key (see 20260717000000_create_data_versions.js): bumped whenever the
+// draft board's source tables change, so GET /api/draft/state can serve a cached document tagged
+// with the version (routes/draft.js) and only rebuild it after a pick, a roster submission, the
+// draft kickoff or a change to the season results that decide whether the season is over.
+const SOURCES = ['draft_state', 'draft_history', 'random_removals', 'series_results'];
+
+const triggerName = (table) => `${table}_draft_version`;
+
+exports.up = pgm => {
+  pgm.sql(`INSERT INTO data_versions (key) VALUES ('draft') ON CONFLICT (key) DO NOTHING`);
+  SOURCES.forEach(table => {
+    pgm.sql(`
+      CREATE TRIGGER ${triggerName(table)}
+      AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ${table}
+      FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('draft')
+    `);
+  });
+};
+
+exports.down = pgm => {
+  SOURCES.forEach(table => pgm.sql(`DROP TRIGGER IF EXISTS ${triggerName(table)} ON ${table}`));
+  pgm.sql(`DELETE FROM data_versions WHERE key = 'draft'`);
+};
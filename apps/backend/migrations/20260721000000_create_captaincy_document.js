@@ -0,0 +1,40 @@
+exports.shorthands = undefined;
+
+// Persisted captaincy results (services/captaincyService.js). computeCaptaincies reads every
+// team, series result, historical roster and point value, so its output is stored as a
+// document tagged with the 'captaincy' data_versions key it was computed from (see
+// 20260717000000_create_data_versions.js). The key is bumped by any change to those inputs; a
+// server that sees a newer version recomputes in the background while requests keep getting
+// the stored document, and every worker shares the one stored copy.
+const SOURCES = ['teams', 'series_results', 'historical_rosters', 'player_point_values', 'point_sets'];
+
+const triggerName = (table) => `${table}_captaincy_version`;
+
+exports.up = pgm => {
+  pgm.sql(`INSERT INTO data_versions (key) VALUES ('captaincy') ON CONFLICT (key) DO NOTHING`);
+  SOURCES.forEach(table => {
+    pgm.sql(`
+      CREATE TRIGGER ${triggerName(table)}
+      AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ${table}
+      FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('captaincy')
+    `);
+  });
+
+  pgm.createTable('captaincy_documents', {
+    id: { type: 'smallint', primaryKey: true, default: 1 },
+    source_version: { type: 'bigint', notNull: true },
+    payload: { type: 'jsonb', notNull: true },
+    computed_at: {
+      type: 'timestamptz',
+      notNull: true,
+      default: pgm.func('now()'),
+    },
+  });
+  pgm.addConstraint('captaincy_documents', 'captaincy_documents_single_row', { check: 'id = 1' });
+};
+
+exports.down = pgm => {
+  pgm.dropTable('captaincy_documents');
+  SOURCES.forEach(table => pgm.sql(`DROP TRIGGER IF EXISTS ${triggerName(table)} ON ${table}`));
+  pgm.sql(`DELETE FROM data_versions WHERE key = 'captaincy'`);
+};
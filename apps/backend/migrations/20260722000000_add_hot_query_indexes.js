@@ -0,0 +1,41 @@
+exports.shorthands = undefined;
+
+// Indexes for the hot queries covered by check-query-plans.js. Against a seeded league
+// (generate-synthetic-league.js) each of these replaced a sequential scan, or a scan plus sort,
+// in at least one of them:
+//
+//   * series_results by season (standings, odds, season pages, playoff scheduling), newest first;
+//     by date alone for "latest season"; by round for the last Golden Spaceship / Wooden Spoon; by
+//     either team for the dashboard (a BitmapOr of the two)
+//   * historical_rosters by card (player history), season (league page) and team name (team history)
+//   * game_events by game in timestamp order (every game load)
+//   * series by the series_results row it plays, draft_history by season, player_point_values by
+//     point set (the primary key leads with card_id), and the handful of pending games
+//
+// roster_cards(card_id) is already indexed by the initial schema. The existing single-column
+// game_events(game_id) index is left in place.
+const INDEXES = [
+  ['idx_series_results_season_date', 'series_results (season_name, date DESC)'],
+  ['idx_series_results_date', 'series_results (date DESC)'],
+  ['idx_series_results_round_date', 'series_results (round, date DESC)'],
+  ['idx_series_results_winning_team', 'series_results (winning_team_id)'],
+  ['idx_series_results_losing_team', 'series_results (losing_team_id)'],
+  ['idx_historical_rosters_card', 'historical_rosters (card_id)'],
+  ['idx_historical_rosters_season', 'historical_rosters (season)'],
+  ['idx_historical_rosters_team_name', 'historical_rosters (team_name)'],
+  ['idx_game_events_game_timestamp', 'game_events (game_id, "timestamp")'],
+  ['idx_series_series_result', 'series (series_result_id)'],
+  ['idx_draft_history_season_pick', 'draft_history (season_name, pick_number)'],
+  ['idx_player_point_values_set', 'player_point_values (point_set_id)'],
+  ['idx_games_pending', "games (game_id) WHERE status = 'pending'"],
+];
+
+exports.up = pgm => {
+  INDEXES.forEach(([name, definition]) => {
+    pgm.sql(`CREATE INDEX IF NOT EXISTS ${name} ON ${definition}`);
+  });
+};
+
+exports.down = pgm => {
+  INDEXES.forEach(([name]) => pgm.sql(`DROP INDEX IF EXISTS ${name}`));
+};
@@ -0,0 +1,34 @@
+exports.shorthands = undefined;
+
+// Per-game action log (services/actionLogService.js), so a game can be re-run headlessly by
+// replay-game-actions.js instead of hand-restoring a dev snapshot:
+//
+//   * game_action_starts: the game as it was just before its first recorded action, in the dev
+//     snapshot shape (services/gameSnapshotService.js)
+//   * game_actions: every successful action after that, in the order the responses went out —
+//     the endpoint's last path segment ('pitch', 'swing', ...), the acting user, the request
+//     body (null when empty) and the d20 rolls the handler drew, in draw order
+exports.up = pgm => {
+  pgm.createTable('game_action_starts', {
+    game_id: { type: 'integer', primaryKey: true, references: 'games', onDelete: 'CASCADE' },
+    snapshot: { type: 'jsonb', notNull: true },
+    created_at: { type: 'timestamptz', notNull: true, default: pgm.func('now()') },
+  });
+
+  pgm.createTable('game_actions', {
+    id: { type: 'bigserial', primaryKey: true },
+    game_id: { type: 'integer', notNull: true, references: 'games', onDelete: 'CASCADE' },
+    action: { type: 'text', notNull: true },
+    user_id: { type: 'integer' },
+    payload: { type: 'jsonb' },
+    rolls: { type: 'smallint[]', notNull: true, default: pgm.func("'{}'") },
+    status: { type: 'smallint', notNull: true },
+    recorded_at: { type: 'timestamptz', notNull: true, default: pgm.func('now()') },
+  });
+  pgm.createIndex('game_actions', ['game_id', 'id']);
+};
+
+exports.down = pgm => {
+  pgm.dropTable('game_actions');
+  pgm.dropTable('game_action_starts');
+};
@@ -0,0 +1,56 @@
+exports.shorthands = undefined;
+
+// Per-table data_versions keys ('table:<name>', see 20260717000000_create_data_versions.js) for
+// the response cache in middleware/cacheByDataVersion.js: a cached GET is tagged with the
+// versions of the tables it reads, so any write to one of them — from the app or a script —
+// retires it. Columns are listed where a table takes frequent writes the cached reads don't
+// depend on:
+//
+//   users — only the owner name and team link show up in league pages (logins etc. don't).
+//   games — current_turn_user_id and setup_rolls change on every action; the league leaders
+//           only care about which games are completed, and with which final state.
+//
+// game_states is deliberately not versioned: it takes a row per action, and a completed game's
+// states only change alongside games.final_game_state_id.
+const SOURCES = [
+  { table: 'series_results' },
+  { table: 'series' },
+  { table: 'league_aggregates' },
+  { table: 'teams' },
+  { table: 'users', columns: 'team_id, owner_first_name, owner_last_name' },
+  { table: 'historical_rosters' },
+  { table: 'cards_player' },
+  { table: 'player_point_values' },
+  { table: 'point_sets' },
+  { table: 'rosters' },
+  { table: 'roster_cards' },
+  { table: 'draft_state' },
+  { table: 'classics' },
+  { table: 'games', columns: 'status, home_team_user_id, series_id, final_game_state_id' },
+  { table: 'game_participants' },
+  { table: 'game_rosters' },
+];
+
+const versionKey = (s) => `table:${s.table}`;
+const triggerName = (s) => `${s.table}_table_version`;
+
+exports.up = pgm => {
+  pgm.sql(`
+    INSERT INTO data_versions (key)
+    VALUES ${SOURCES.map(s => `('${versionKey(s)}')`).join(', ')}
+    ON CONFLICT (key) DO NOTHING
+  `);
+  SOURCES.forEach(s => {
+    const events = s.columns ? `INSERT OR UPDATE OF ${s.columns} OR DELETE` : 'INSERT OR UPDATE OR DELETE OR TRUNCATE';
+    pgm.sql(`
+      CREATE TRIGGER ${triggerName(s)}
+      AFTER ${events} ON ${s.table}
+      FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('${versionKey(s)}')
+    `);
+  });
+};
+
+exports.down = pgm => {
+  SOURCES.forEach(s => pgm.sql(`DROP TRIGGER IF EXISTS ${triggerName(s)} ON ${s.table}`));
+  pgm.sql(`DELETE FROM data_versions WHERE key LIKE 'table:%'`);
+};
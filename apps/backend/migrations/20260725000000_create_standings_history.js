@@ -0,0 +1,36 @@
+exports.shorthands = undefined;
+
+// Per-season standings history: one row per (season, date with games played, team) holding the
+// team's cumulative record, games behind and — where it was known at the time — its playoff
+// odds, as of the end of that date. Standings "as of D" and whole-season race curves are then a
+// primary-key range read instead of a standings pass over a filtered series_results set per
+// chart point. Maintained by services/leagueAggregateService.js alongside league_aggregates
+// (rebuilt with `node rebuild-league-aggregates.js`); versioned for the response cache like the
+// tables in 20260724000000_add_table_data_versions.js.
+exports.up = pgm => {
+  pgm.createTable('standings_history', {
+    season_name: { type: 'varchar(255)', notNull: true },
+    as_of: { type: 'date', notNull: true },
+    team_key: { type: 'varchar(255)', notNull: true },
+    team_id: { type: 'integer' },
+    name: { type: 'varchar(255)' },
+    wins: { type: 'integer', notNull: true },
+    losses: { type: 'integer', notNull: true },
+    games_behind: { type: 'real', notNull: true },
+    spaceship_odds: { type: 'real' },
+    spoon_odds: { type: 'real' },
+  });
+  pgm.addConstraint('standings_history', 'standings_history_pkey', { primaryKey: ['season_name', 'as_of', 'team_key'] });
+
+  pgm.sql(`INSERT INTO data_versions (key) VALUES ('table:standings_history') ON CONFLICT (key) DO NOTHING`);
+  pgm.sql(`
+    CREATE TRIGGER standings_history_table_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON standings_history
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('table:standings_history')
+  `);
+};
+
+exports.down = pgm => {
+  pgm.dropTable('standings_history');
+  pgm.sql(`DELETE FROM data_versions WHERE key = 'table:standings_history'`);
+};
@@ -0,0 +1,30 @@
+exports.shorthands = undefined;
+
+// When a series_results row's games were actually played. `date` is the schedule date —
+// generateSchedule stamps a whole regular season with the draft day and nothing moves it when
+// a series is played — so per-date standings (standings_history) are keyed on this instead.
+// Every path that records a result sets it to now(): offline result entry, in-app series
+// progression (each game, so an in-progress series sits at its latest game), auto-stopped
+// series, phantom losses and Classic results.
+//
+// Backfill: an in-app series takes its last completed game's time; anything else (offline
+// entries, ingested history) only ever had `date`, so it keeps that.
+exports.up = pgm => {
+  pgm.addColumn('series_results', {
+    completed_at: { type: 'timestamptz' },
+  });
+  pgm.sql(`
+    UPDATE series_results sr
+    SET completed_at = COALESCE(
+      (SELECT max(g.completed_at)
+       FROM series s JOIN games g ON g.series_id = s.id
+       WHERE s.series_result_id = sr.id AND g.status = 'completed'),
+      sr.date::timestamptz
+    )
+    WHERE sr.winning_score IS NOT NULL
+  `);
+};
+
+exports.down = pgm => {
+  pgm.dropColumn('series_results', 'completed_at');
+};
@@ -0,0 +1,262 @@
+import os
+import csv
+import time
+import argparse
+import numpy as np
+import psycopg2
+from dotenv import load_dotenv
+
+from matchup_matrix import HITTERS_CSV, PITCHERS_CSV, HITTER_COLUMNS, PITCHER_COLUMNS, read_cards, build_matrix, slash_line
+
+# Proposes next season's prices as a new point-set column for prices.csv.
+#
+#   python price_point_set.py                              # -> prices.proposed.csv + pricing_diff.csv
+#   python price_point_set.py --name "3/1/26 Season" --max-change 0.1
+#   node import-all-points.js prices.proposed.csv          # load the proposal
+#
+# Each card gets a target price from three signals, all computed as arrays over the whole pool:
+#
+#   chart   - a per-role least-squares fit of the current price to the card's expected line
+#             against the league (matchup_matrix.py), i.e. what the chart "should" cost
+#   usage   - how often teams actually rostered it over recent seasons (historical_rosters),
+#             relative to its role: popular cards go up, ignored ones come down
+#   results - how the teams that rostered it did (series_results win pct - .500)
+#
+# The proposal is then the closest set of prices to those targets (least squares) subject to
+# a per-card step limit and one league-wide budget: the recently rostered cards must cost, in
+# total, what they cost now, so the same rosters still fit the 5000-point cap. That is a
+# projection onto a box intersected with a hyperplane; it's solved by bisecting the single
+# Lagrange multiplier, each step one clipped vector expression. Prices round to 10s.
+
+load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"))
+
+# Constants
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+PRICES_CSV = os.path.join(BACKEND_DIR, "prices.csv")
+DEFAULT_OUT = os.path.join(BACKEND_DIR, "prices.proposed.csv")
+DEFAULT_DIFF = os.path.join(BACKEND_DIR, "pricing_diff.csv")
+BASE_COLUMN = "Upcoming Season"
+# Kept last in the CSV; import-all-points.js treats every other non-descriptive column as a set.
+TRAILING_COLUMN = "ASG"
+
+CHART_WEIGHT = 0.5      # share of the target taken from the chart fit (rest: current price)
+USAGE_WEIGHT = 0.3      # price change per unit of usage above the role average
+RESULT_WEIGHT = 0.5     # price change per unit of win pct above .500
+MAX_CHANGE = 0.15       # per-card step limit, as a fraction of the current price...
+MIN_STEP = 20           # ...but never tighter than this many points
+PRICE_STEP = 10
+
+
+def get_db_connection():
+    """Connects with DATABASE_URL, as import-all-points.js does."""
+    return psycopg2.connect(os.getenv('DATABASE_URL'))
+
+
+def read_prices(path, base_column):
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames)
+        rows = [r for r in reader if r.get('Player') and r.get(base_column, '') != '']
+    return fieldnames, rows
+
+
+def as_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def role_of(pos):
+    return pos if pos in ('SP', 'RP') else 'H'
+
+
+def load_history(conn, seasons):
+    """Per-card usage and results over the last `seasons` seasons.
+
+    Returns (cards, usage, win_excess, season_count): cards maps display_name to
+    (card_id, set_name, card_number, speed, ip); usage[card_id] is the number of team-seasons
+    that rostered it; win_excess[card_id] is the mean of (team series win pct - .500) over those
+    team-seasons."""
+    cur = conn.cursor()
+    cur.execute("SELECT card_id, display_name, set_name, card_number, speed, ip FROM cards_player ORDER BY card_id")
+    cards = {}
+    for card_id, display_name, set_name, card_number, speed, ip in cur.fetchall():
+        cards.setdefault(display_name, (card_id, set_name, card_number, speed, ip))
+
+    cur.execute(
+        """SELECT season_name FROM series_results
+           WHERE style IS DISTINCT FROM 'Classic' AND season_name IS NOT NULL
+           GROUP BY season_name ORDER BY MAX(date) DESC LIMIT %s""",
+        (seasons,)
+    )
+    recent = [r[0] for r in cur.fetchall()]
+
+    cur.execute(
+        """SELECT season_name, winning_team_name, losing_team_name FROM series_results
+           WHERE style IS DISTINCT FROM 'Classic' AND season_name = ANY(%s)""",
+        (recent,)
+    )
+    record = {}
+    for season, winner, loser in cur.fetchall():
+        record.setdefault((season, winner), [0, 0])[0] += 1
+        record.setdefault((season, loser), [0, 0])[1] += 1
+
+    cur.execute(
+        "SELECT season, team_name, card_id FROM historical_rosters WHERE card_id IS NOT NULL AND season = ANY(%s)",
+        (recent,)
+    )
+    usage, win_sum = {}, {}
+    for season, team_name, card_id in cur.fetchall():
+        wins, losses = record.get((season, team_name), (0, 0))
+        excess = wins / (wins + losses) - 0.5 if wins + losses else 0.0
+        usage[card_id] = usage.get(card_id, 0) + 1
+        win_sum[card_id] = win_sum.get(card_id, 0.0) + excess
+    win_excess = {cid: win_sum[cid] / usage[cid] for cid in usage}
+    cur.close()
+    return cards, usage, win_excess, max(len(recent), 1)
+
+
+def league_lines():
+    """Each card's expected (OBP, SLG) vs the league, keyed Set|Num: hitters' own line, pitchers'
+    line allowed."""
+    hitters, on_base, hitter_charts = read_cards(HITTERS_CSV, HITTER_COLUMNS, 'OB')
+    pitchers, control, pitcher_charts = read_cards(PITCHERS_CSV, PITCHER_COLUMNS, 'Ctl')
+    matrix = build_matrix(on_base, hitter_charts, control, pitcher_charts)
+    lines = {}
+    for index, dist in ((hitters, matrix.mean(axis=1)), (pitchers, matrix.mean(axis=0))):
+        obp, slg, _ = slash_line(dist)
+        for i, card in enumerate(index):
+            lines[card["key"]] = (obp[i], slg[i])
+    return lines
+
+
+def chart_fit(roles, features, current):
+    """Per-role least-squares fit of current prices to chart features. Cards without features
+    keep their current price."""
+    fair = current.copy()
+    has = ~np.isnan(features).any(axis=1)
+    for role in ('H', 'SP', 'RP'):
+        mask = (roles == role) & has
+        if mask.sum() <= features.shape[1]:
+            continue
+        X = np.column_stack([np.ones(mask.sum()), features[mask]])
+        beta, *_ = np.linalg.lstsq(X, current[mask], rcond=None)
+        fair[mask] = X @ beta
+    return fair
+
+
+def project(target, lo, hi, weights, budget, iterations=100):
+    """argmin ||p - target||^2 s.t. weights . p = budget, lo <= p <= hi.
+
+    p(lam) = clip(target - lam * weights, lo, hi) and weights . p(lam) falls as lam grows, so
+    bisect lam. If the budget can't be met inside the bounds, the nearest bound wins."""
+    if not weights.any():
+        return np.clip(target, lo, hi)
+    spend = lambda lam: weights @ np.clip(target - lam * weights, lo, hi)
+    low, high = -1.0, 1.0
+    while spend(low) < budget and low > -1e9:
+        low *= 2
+    while spend(high) > budget and high < 1e9:
+        high *= 2
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        if spend(mid) > budget:
+            low = mid
+        else:
+            high = mid
+    return np.clip(target - ((low + high) / 2) * weights, lo, hi)
+
+
+def propose(rows, cards, usage, win_excess, season_count, lines, base_column, max_change):
+    n = len(rows)
+    current = np.array([int(r[base_column]) for r in rows], dtype=np.float64)
+    roles = np.array([role_of(r['Pos']) for r in rows])
+    card_ids = [cards.get(r['Player'], (None,))[0] for r in rows]
+
+    # [OBP, SLG, speed or IP]; NaN where the card or its chart wasn't found.
+    features = np.full((n, 3), np.nan)
+    for i, r in enumerate(rows):
+        card = cards.get(r['Player'])
+        if not card:
+            continue
+        line = lines.get(f"{card[1]}|{card[2]}")
+        if line is None:
+            continue
+        extra = card[4] if roles[i] != 'H' else card[3]
+        features[i] = (line[0], line[1], as_number(extra))
+
+    fair = chart_fit(roles, features, current)
+
+    rostered = np.array([usage.get(cid, 0) for cid in card_ids], dtype=np.float64)
+    rate = rostered / season_count
+    role_mean = {role: rate[roles == role].mean() if (roles == role).any() else 0.0 for role in ('H', 'SP', 'RP')}
+    usage_delta = rate - np.array([role_mean[r] for r in roles])
+    wins = np.array([win_excess.get(cid, 0.0) for cid in card_ids])
+
+    market = current * (1 + USAGE_WEIGHT * usage_delta + RESULT_WEIGHT * wins)
+    target = (1 - CHART_WEIGHT) * market + CHART_WEIGHT * fair
+
+    step = np.maximum(MIN_STEP, max_change * np.abs(current))
+    lo = np.maximum(current - step, np.minimum(current, PRICE_STEP))
+    hi = current + step
+    budget = rostered @ current
+    proposed = project(target, lo, hi, rostered, budget)
+    proposed = np.round(proposed / PRICE_STEP) * PRICE_STEP
+    return current, proposed, fair, rate, rostered, budget
+
+
+def write_outputs(fieldnames, rows, name, current, proposed, fair, rate, out_path, diff_path):
+    columns = [c for c in fieldnames if c not in (name, TRAILING_COLUMN)] + [name]
+    if TRAILING_COLUMN in fieldnames:
+        columns.append(TRAILING_COLUMN)
+    with open(out_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        for row, price in zip(rows, proposed):
+            writer.writerow({**row, name: int(price)})
+
+    order = np.argsort(-np.abs(proposed - current), kind='stable')
+    with open(diff_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Player', 'Tm', 'Pos', 'current', 'proposed', 'delta', 'chart_fit', 'usage_rate'])
+        for i in order:
+            r = rows[i]
+            writer.writerow([r['Player'], r['Tm'], r['Pos'], int(current[i]), int(proposed[i]),
+                             int(proposed[i] - current[i]), int(round(fair[i])), round(float(rate[i]), 3)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Propose a new point-set column for prices.csv.")
+    parser.add_argument("--name", default="Proposed Season", help="Header for the new point-set column.")
+    parser.add_argument("--base", default=BASE_COLUMN, help="Point-set column to start from.")
+    parser.add_argument("--seasons", type=int, default=4, help="Recent seasons of usage and results to use.")
+    parser.add_argument("--max-change", type=float, default=MAX_CHANGE)
+    parser.add_argument("--prices", default=PRICES_CSV)
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--diff", default=DEFAULT_DIFF)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    fieldnames, rows = read_prices(args.prices, args.base)
+    conn = get_db_connection()
+    try:
+        cards, usage, win_excess, season_count = load_history(conn, args.seasons)
+    finally:
+        conn.close()
+    lines = league_lines()
+
+    current, proposed, fair, rate, rostered, budget = propose(
+        rows, cards, usage, win_excess, season_count, lines, args.base, args.max_change
+    )
+    write_outputs(fieldnames, rows, args.name, current, proposed, fair, rate, args.out, args.diff)
+
+    changed = int((proposed != current).sum())
+    print(f"Priced {len(rows)} cards in {time.perf_counter() - start:.2f}s; {changed} changed.")
+    print(f"Rostered-card budget: {int(budget)} -> {int(rostered @ proposed)} after rounding.")
+    print(f"Wrote {args.out} (column '{args.name}') and {args.diff}.")
+    print(f"Load it with: node import-all-points.js {os.path.relpath(args.out, BACKEND_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+/* eslint-disable no-console */
+//
+// Rebuilds every stored League-page aggregate (league_aggregates and standings_history) from
+// series_results.
+//
+// The aggregates are normally maintained incrementally by the result-entry paths (see
+// services/leagueAggregateService.js). Run this after bulk data changes (ingest, dev edits)
+// or to check the incremental path: --verify recomputes the all-time standings and matrix
+// straight from raw series_results the old way and diffs them against the merged aggregates,
+// and checks every standings_history point against the season model over the results played by
+// that day.
+//
+// Usage (run from apps/backend):
+//   node rebuild-league-aggregates.js            # rebuild everything
+//   node rebuild-league-aggregates.js --verify   # rebuild, then diff all-time against a raw recompute
+//
+require('dotenv').config();
+const { pool } = require('./db');
+const { calculateStandings, findTeamForRecord, buildSeasonModel } = require('./utils/standingsUtils');
+const { buildMatrix, playedOn } = require('./utils/leagueAggregates');
+const {
+  rebuildAllAggregates, getLeagueAggregate, getStandingsHistory, ALL_TIME_SCOPE
+} = require('./services/leagueAggregateService');
+
+const VERIFY = process.argv.includes('--verify');
+const STANDINGS_FIELDS = ['wins', 'losses', 'phantomLosses', 'seasonsPlayed', 'totalRank', 'avgFinish',
+  'spaceships', 'submarines', 'spoons', 'spaceshipAppearances', 'spoonAppearances'];
+
+async function verify() {
+  const currentTeams = (await pool.query('SELECT team_id, name, city, logo_url FROM teams')).rows;
+  const rows = (await pool.query(
+    "SELECT * FROM series_results WHERE style IS DISTINCT FROM 'Classic' AND season_name IS NOT NULL ORDER BY date DESC"
+  )).rows;
+  const subs = (await pool.query(
+    "SELECT * FROM series_results WHERE round = 'Silver Submarine' AND season_name IS NOT NULL"
+  )).rows;
+
+  // What /season-summary?season=all-time computed on every request before the aggregates.
+  const expected = calculateStandings(rows, currentTeams, true);
+  expected.forEach(s => { s.submarines = 0; });
+  subs.forEach(sub => {
+    const winner = findTeamForRecord(sub.winning_team_name, sub.winning_team_id, currentTeams);
+    const entry = winner.team_id && expected.find(s => s.team_id === winner.team_id);
+    if (entry) entry.submarines++;
+  });
+
+  const stored = (await getLeagueAggregate(pool, ALL_TIME_SCOPE, 'summary')).standings;
+  let problems = 0;
+  const byId = new Map(stored.map(s => [s.team_id, s]));
+  expected.forEach(e => {
+    const s = byId.get(e.team_id);
+    if (!s) { problems++; console.log(`standings: team ${e.team_id} missing from aggregate`); return; }
+    STANDINGS_FIELDS.forEach(f => {
+      if (String(e[f]) !== String(s[f])) {
+        problems++;
+        console.log(`standings: team ${e.team_id} ${f} expected ${e[f]}, aggregate ${s[f]}`);
+      }
+    });
+  });
+  if (stored.length !== expected.length) {
+    problems++;
+    console.log(`standings: ${expected.length} teams expected, aggregate has ${stored.length}`);
+  }
+
+  const expectedMatrix = buildMatrix(rows, currentTeams);
+  const storedMatrix = await getLeagueAggregate(pool, ALL_TIME_SCOPE, 'matrix');
+  Object.values(expectedMatrix).forEach(entry => {
+    Object.entries(entry.opponents).forEach(([opp, cell]) => {
+      const got = storedMatrix[entry.id] && storedMatrix[entry.id].opponents[opp];
+      if (!got || got.wins !== cell.wins || got.losses !== cell.losses) {
+        problems++;
+        console.log(`matrix: ${entry.id} vs ${opp} expected ${cell.wins}-${cell.losses}, aggregate ${got ? `${got.wins}-${got.losses}` : 'missing'}`);
+      }
+    });
+  });
+
+  // Every point of each season's race curves is the season model over the results played by
+  // that day (completed_at, or the schedule date for rows without one).
+  const history = await getStandingsHistory(pool);
+  Object.entries(history).forEach(([season, curves]) => {
+    const seasonRows = rows.filter(r => r.season_name === season);
+    curves.dates.forEach((day, i) => {
+      const { teamStats } = buildSeasonModel(
+        seasonRows.filter(r => r.winning_score === null || playedOn(r) <= day), currentTeams
+      );
+      Object.entries(teamStats).forEach(([key, t]) => {
+        const team = curves.teams.find(c => c.team_key === key);
+        const point = team && team.points[i];
+        if (!point || point.wins !== t.wins || point.losses !== t.losses) {
+          problems++;
+          console.log(`history: ${season} ${key} on ${day} expected ${t.wins}-${t.losses}, stored ${point ? `${point.wins}-${point.losses}` : 'missing'}`);
+        }
+      });
+    });
+  });
+  const seasonsWithGames = new Set(rows.filter(r => r.winning_score !== null && r.winning_score + r.losing_score > 0).map(r => r.season_name));
+  seasonsWithGames.forEach(season => {
+    if (!history[season]) {
+      problems++;
+      console.log(`history: ${season} has results but no stored history`);
+    }
+  });
+
+  console.log(problems === 0 ? 'Verify: aggregates match a raw recompute.' : `Verify: ${problems} difference(s).`);
+  return problems === 0;
+}
+
+(async () => {
+  try {
+    const started = Date.now();
+    const seasons = await rebuildAllAggregates(pool);
+    console.log(`Rebuilt aggregates for ${seasons.length} season(s) + all-time in ${Date.now() - started} ms.`);
+    if (VERIFY && !(await verify())) process.exitCode = 1;
+  } catch (err) {
+    console.error('Rebuild failed:', err);
+    process.exitCode = 1;
+  } finally {
+    await pool.end();
+  }
+})();
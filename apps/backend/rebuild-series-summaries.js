@@ -0,0 +1,45 @@
+/* eslint-disable no-console */
+//
+// Rebuilds the stored series summaries (series_summaries) from each completed game's latest
+// game_state.
+//
+// Summaries are normally written as each series game completes (handleSeriesProgression) and any
+// missing one is filled in the first time its series page is read (see
+// services/seriesSummaryService.js). Run this to summarize old series up front, or after a
+// change to utils/gameSummary.js so stored entries pick it up.
+//
+// Usage (run from apps/backend):
+//   node rebuild-series-summaries.js               # every series with a completed game
+//   node rebuild-series-summaries.js --series 42   # one series
+//
+require('dotenv').config();
+const { pool } = require('./db');
+const { recordGameSummaries } = require('./services/seriesSummaryService');
+
+const seriesArg = process.argv.indexOf('--series');
+const ONLY_SERIES = seriesArg !== -1 ? parseInt(process.argv[seriesArg + 1], 10) : null;
+
+(async () => {
+  try {
+    const started = Date.now();
+    const seriesRes = await pool.query(
+      `SELECT series_id, array_agg(game_id ORDER BY game_in_series) AS game_ids
+       FROM games
+       WHERE status = 'completed' AND series_id IS NOT NULL AND ($1::int IS NULL OR series_id = $1)
+       GROUP BY series_id ORDER BY series_id`,
+      [ONLY_SERIES]
+    );
+    let games = 0;
+    for (const { series_id, game_ids } of seriesRes.rows) {
+      // Start from an empty document so entries for games no longer in the series are dropped.
+      await pool.query('DELETE FROM series_summaries WHERE series_id = $1', [series_id]);
+      games += await recordGameSummaries(pool, game_ids);
+    }
+    console.log(`Rebuilt summaries for ${seriesRes.rows.length} series (${games} games) in ${Date.now() - started} ms.`);
+  } catch (err) {
+    console.error('Rebuild failed:', err);
+    process.exitCode = 1;
+  } finally {
+    await pool.end();
+  }
+})();
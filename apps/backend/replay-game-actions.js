@@ -0,0 +1,234 @@
+/* eslint-disable no-console */
+//
+// Headless replay of recorded games (services/actionLogService.js) for bit-exact regression
+// checks and for benchmarking the whole action pipeline.
+//
+// Run it against a scratch copy of a database that has been recording (e.g. a restored dump):
+// it rewrites the games it replays. For each game it reads what the game produced (its states
+// from the start point on, its events and final status), puts the game back to its recorded
+// start point, then re-sends every recorded action, as the user who made it and with the dice
+// rolls it drew, to this process's own copy of the server (server.js on a loopback port, with
+// the same handlers, middleware and database code as production). It then compares what the
+// replay produced with the original and reports the first difference per game; a replayed
+// request that answers differently, or doesn't use exactly its recorded rolls, also fails the
+// game. Exit code 1 if any game diverged.
+//
+// Game completion runs its usual follow-up (series progression, summaries), so a replayed
+// series-deciding game can schedule the next game again. Another reason to use a scratch copy.
+//
+// Usage (run from apps/backend, with DB_* pointing at the scratch database):
+//   node replay-game-actions.js                              # the 100 most recently recorded games
+//   node replay-game-actions.js --games 812,815 --verbose
+//   node replay-game-actions.js --recent 2000 --concurrency 8 --repeat 3    # throughput
+//
+require('dotenv').config();
+const crypto = require('crypto');
+const jwt = require('jsonwebtoken');
+
+// Requests are signed and verified by this process, so a scratch database needs no real secret.
+process.env.JWT_SECRET = process.env.JWT_SECRET || crypto.randomBytes(32).toString('hex');
+
+const { pool, server, io } = require('./server');
+const { enableReplay, REPLAY_ROLLS_HEADER, REPLAY_ID_HEADER } = require('./services/actionLogService');
+const { restoreGameSnapshot } = require('./services/gameSnapshotService');
+
+const args = process.argv.slice(2);
+const argValue = (flag, fallback) => {
+  const i = args.indexOf(flag);
+  return i >= 0 && args[i + 1] !== undefined ? args[i + 1] : fallback;
+};
+const GAMES = argValue('--games', null);
+const RECENT = parseInt(argValue('--recent', '100'), 10);
+const CONCURRENCY = parseInt(argValue('--concurrency', '4'), 10);
+const REPEAT = parseInt(argValue('--repeat', '1'), 10);
+const VERBOSE = args.includes('--verbose');
+const FORCE = args.includes('--yes');
+
+function assertScratchDatabase() {
+  const host = process.env.DB_HOST || 'localhost';
+  const local = ['localhost', '127.0.0.1', '::1'].includes(host) || host.startsWith('/');
+  if ((process.env.NODE_ENV === 'production' || !local) && !FORCE) {
+    throw new Error(`Refusing to replay games into ${process.env.NODE_ENV === 'production' ? 'production' : host}; pass --yes if it is a scratch copy.`);
+  }
+}
+
+// Replayed requests report back (status, rolls left over) as they finish, keyed by replay id.
+const finished = new Map();
+let replayCount = 0;
+enableReplay((replayId, result) => {
+  const resolve = finished.get(replayId);
+  if (resolve) {
+    finished.delete(replayId);
+    resolve(result);
+  }
+});
+
+const tokens = new Map();
+const tokenFor = (userId) => {
+  if (!tokens.has(userId)) tokens.set(userId, jwt.sign({ userId }, process.env.JWT_SECRET));
+  return tokens.get(userId);
+};
+
+// The first path at which two JSON values differ, or null if they're equal.
+function firstDifference(a, b, path = '$') {
+  if (a === b) return null;
+  if (a === null || b === null || typeof a !== 'object' || typeof b !== 'object' || Array.isArray(a) !== Array.isArray(b)) {
+    return path;
+  }
+  for (const key of new Set([...Object.keys(a), ...Object.keys(b)])) {
+    const diff = firstDifference(a[key], b[key], Array.isArray(a) ? `${path}[${key}]` : `${path}.${key}`);
+    if (diff) return diff;
+  }
+  return null;
+}
+
+async function loadRecording(gameId) {
+  const start = await pool.query('SELECT snapshot FROM game_action_starts WHERE game_id = $1', [gameId]);
+  if (start.rows.length === 0) throw new Error(`Game ${gameId} has no recorded start point.`);
+  const actions = await pool.query(
+    'SELECT action, user_id, payload, rolls, status FROM game_actions WHERE game_id = $1 ORDER BY id',
+    [gameId]
+  );
+  const { snapshot } = start.rows[0];
+  const fromTurn = snapshot.latest_state_data ? snapshot.latest_state_data.turn_number : null;
+  return { gameId, snapshot, actions: actions.rows, fromTurn };
+}
+
+// What a replay has to reproduce: the states from the start point on, the events and the games row.
+async function loadOutcome({ gameId, fromTurn }) {
+  const states = await pool.query(
+    `SELECT turn_number, state_data FROM game_states
+     WHERE game_id = $1 AND ($2::int IS NULL OR turn_number >= $2)
+     ORDER BY turn_number, game_state_id`,
+    [gameId, fromTurn]
+  );
+  const events = await pool.query(
+    'SELECT turn_number, user_id, event_type, log_message FROM game_events WHERE game_id = $1 ORDER BY event_id',
+    [gameId]
+  );
+  const game = await pool.query(
+    'SELECT status, home_team_user_id, current_turn_user_id, use_dh, setup_rolls, winning_side FROM games WHERE game_id = $1',
+    [gameId]
+  );
+  return { states: states.rows, events: events.rows, game: game.rows[0] };
+}
+
+function compareOutcomes(expected, actual) {
+  if (expected.states.length !== actual.states.length) {
+    return `${actual.states.length} states, expected ${expected.states.length}`;
+  }
+  for (let i = 0; i < expected.states.length; i++) {
+    const diff = firstDifference(expected.states[i], actual.states[i]);
+    if (diff) return `state ${i} (turn ${expected.states[i].turn_number}) differs at ${diff.replace(/^\$\.state_data/, '$')}`;
+  }
+  const eventsDiff = firstDifference(expected.events, actual.events);
+  if (eventsDiff) return `events differ at ${eventsDiff}`;
+  const gameDiff = firstDifference(expected.game, actual.game);
+  if (gameDiff) return `games row differs at ${gameDiff}`;
+  return null;
+}
+
+async function restoreStart({ gameId, snapshot }) {
+  const client = await pool.connect();
+  try {
+    await client.query('BEGIN');
+    await restoreGameSnapshot(client, gameId, snapshot);
+    await client.query('COMMIT');
+  } catch (error) {
+    await client.query('ROLLBACK');
+    throw error;
+  } finally {
+    client.release();
+  }
+}
+
+// Replays one game; returns a description of the first divergence, or null.
+async function replayGame(recording, expected, baseUrl) {
+  await restoreStart(recording);
+  for (let i = 0; i < recording.actions.length; i++) {
+    const { action, user_id: userId, payload, rolls, status } = recording.actions[i];
+    const replayId = String(++replayCount);
+    const done = new Promise(resolve => finished.set(replayId, resolve));
+    const response = await fetch(`${baseUrl}/api/games/${recording.gameId}/${action}`, {
+      method: 'POST',
+      headers: {
+        authorization: `Bearer ${tokenFor(userId)}`,
+        'content-type': 'application/json',
+        [REPLAY_ROLLS_HEADER]: JSON.stringify(rolls),
+        [REPLAY_ID_HEADER]: replayId,
+      },
+      body: JSON.stringify(payload || {}),
+    });
+    await response.arrayBuffer();
+    const result = await done;
+    if (result.status !== status) {
+      return `action ${i + 1} (${action}) answered ${result.status}, recorded ${status}`;
+    }
+    if (result.unusedRolls > 0) {
+      return `action ${i + 1} (${action}) used ${rolls.length - result.unusedRolls} of its ${rolls.length} recorded rolls`;
+    }
+  }
+  return compareOutcomes(expected, await loadOutcome(recording));
+}
+
+async function gameIdsToReplay() {
+  if (GAMES) return GAMES.split(',').map(id => parseInt(id, 10));
+  const { rows } = await pool.query(
+    `SELECT s.game_id FROM game_action_starts s
+     WHERE EXISTS (SELECT 1 FROM game_actions a WHERE a.game_id = s.game_id)
+     ORDER BY s.created_at DESC LIMIT $1`,
+    [RECENT]
+  );
+  return rows.map(r => r.game_id);
+}
+
+(async () => {
+  try {
+    assertScratchDatabase();
+    await new Promise(resolve => server.listen(0, '127.0.0.1', resolve));
+    const baseUrl = `http://127.0.0.1:${server.address().port}`;
+
+    const gameIds = await gameIdsToReplay();
+    const games = [];
+    for (const gameId of gameIds) {
+      const recording = await loadRecording(gameId);
+      games.push({ recording, expected: await loadOutcome(recording) });
+    }
+    const actionCount = games.reduce((sum, g) => sum + g.recording.actions.length, 0);
+    console.log(`Replaying ${games.length} game(s), ${actionCount} action(s), ${REPEAT} time(s), ${CONCURRENCY} at a time`);
+
+    const failures = new Map();
+    const started = process.hrtime.bigint();
+    for (let round = 0; round < REPEAT; round++) {
+      let next = 0;
+      const worker = async () => {
+        while (next < games.length) {
+          const { recording, expected } = games[next++];
+          const problem = await replayGame(recording, expected, baseUrl).catch(error => `replay failed: ${error.message}`);
+          if (problem && !failures.has(recording.gameId)) failures.set(recording.gameId, problem);
+          if (VERBOSE) console.log(`  game ${recording.gameId}: ${problem || 'identical'}`);
+        }
+      };
+      await Promise.all(Array.from({ length: Math.max(1, CONCURRENCY) }, worker));
+    }
+    const seconds = Number(process.hrtime.bigint() - started) / 1e9;
+
+    console.log(`${(games.length * REPEAT / seconds * 60).toFixed(0)} games/min, ` +
+      `${(actionCount * REPEAT / seconds).toFixed(0)} actions/sec (${seconds.toFixed(1)}s)`);
+    if (failures.size) {
+      console.error(`\n${failures.size} game(s) diverged:`);
+      failures.forEach((problem, gameId) => console.error(`  game ${gameId}: ${problem}`));
+      process.exitCode = 1;
+    } else {
+      console.log(`All ${games.length} game(s) replayed identically.`);
+    }
+  } catch (error) {
+    console.error('Replay failed:', error);
+    process.exitCode = 1;
+  } finally {
+    // Let completion follow-ups (services/gameCompletionHooks.js) start before the pool closes.
+    await new Promise(resolve => setTimeout(resolve, 500));
+    io.close();
+    await pool.end();
+  }
+})();
@@ -3,9 +3,21 @@ const express = require('express');
 const router = express.Router();
 const { pool } = require('../db');
 const authenticateToken = require('../middleware/authenticateToken');
+const cacheByDataVersion = require('../middleware/cacheByDataVersion');
+const { refreshSeasonAggregates } = require('../services/leagueAggregateService');
+
+// Response caches (middleware/cacheByDataVersion.js). The Classic state is per user: whether
+// rosters are revealed depends on whether the requester has submitted one.
+const eligibilityCache = cacheByDataVersion('classic-eligibility', { tables: ['historical_rosters'], max: 2 });
+const classicStateCache = cacheByDataVersion('classic-state', {
+    tables: ['classics', 'series_results', 'series', 'teams', 'users', 'rosters', 'roster_cards',
+        'cards_player', 'point_sets', 'player_point_values'],
+    perUser: true,
+    max: 64,
+});
 
 // GET INELIGIBLE PLAYERS (>= 5 Historical Appearances)
-router.get('/eligibility', authenticateToken, async (req, res) => {
+router.get('/eligibility', authenticateToken, eligibilityCache, async (req, res) => {
     try {
         const query = `
             SELECT card_id, COUNT(*) as appearances
@@ -37,7 +49,7 @@ router.get('/list', authenticateToken, async (req, res) => {
 });
 
 // GET CLASSIC STATE (Bracket, Seeding, Rosters)
-router.get('/state', authenticateToken, async (req, res) => {
+router.get('/state', authenticateToken, classicStateCache, async (req, res) => {
     const { classicId } = req.query;
 
     try {
@@ -311,13 +323,13 @@ router.post('/result', authenticateToken, async (req, res) => {
                 winning_team_name, losing_team_name,
                 winning_team_id, losing_team_id,
                 winning_score, losing_score,
-                status, result_source, classic_id
+                status, result_source, classic_id, completed_at
             ) VALUES (
                 NOW(), $1, 'Classic', $2,
                 $3, $4,
                 $5, $6,
                 $7, $8,
-                'completed', 'offline', $9
+                'completed', 'offline', $9, NOW()
             )
         `, [seasonName, round, winningTeamName, losingTeamName, winner.team_id, loser.team_id, winningScore, losingScore, classicId]);
 
@@ -333,6 +345,10 @@ router.post('/result', authenticateToken, async (req, res) => {
         `, [winnerId, loserId, winningScore, losingScore, classicId]);
 
         await client.query('COMMIT');
+
+        // A Classic Silver Submarine is credited in the all-time league table. Best-effort.
+        await refreshSeasonAggregates(pool, seasonName);
+
         res.json({ message: 'Result recorded successfully.' });
 
     } catch (error) {
@@ -3,7 +3,9 @@ const router = express.Router();
 const { pool, io } = require('../server'); // Import io
 const authenticateToken = require('../middleware/authenticateToken');
 const { verifyConnection } = require('../services/emailService');
-const { applyPhantomLosses, sendPhantomWarnings } = require('../jobs/phantomMonitor');
+const { applyPhantomLosses, sendPhantomWarnings, projectPhantomLosses } = require('../jobs/phantomMonitor');
+const { captureGameSnapshot, restoreGameSnapshot } = require('../services/gameSnapshotService');
+const { startupReport } = require('../utils/startupProfile');
 
 // Middleware to check if the user is a superuser (optional, for dev routes)
 const isSuperuser = (req, res, next) => {
@@ -29,9 +31,16 @@ router.post('/test-email', async (req, res) => {
     }
 });
 
+// GET this process's startup profile: phase timings, time to first response and, with
+// STARTUP_PROFILE=1, the slowest requires (utils/startupProfile.js).
+router.get('/startup', (req, res) => {
+    res.json(startupReport());
+});
+
 // POST to manually exercise the phantom-loss logic.
-// Body: { asOf?: ISO date string, dryRun?: bool (default true), mode?: 'apply'|'warn'|'both' (default 'both') }
+// Body: { asOf?: ISO date string, dryRun?: bool (default true), mode?: 'apply'|'warn'|'both'|'project' (default 'both') }
 // dryRun=true computes assignments/at-risk teams WITHOUT inserting rows or sending email.
+// mode='project' returns every team's ledger (played, charged, owed, shortfall) as of asOf.
 router.post('/phantom-check', async (req, res) => {
     try {
         const { asOf, mode = 'both', force } = req.body || {};
@@ -42,6 +51,9 @@ router.post('/phantom-check', async (req, res) => {
         }
 
         const result = {};
+        if (mode === 'project') {
+            result.project = await projectPhantomLosses(pool, when);
+        }
         if (mode === 'apply' || mode === 'both') {
             result.apply = await applyPhantomLosses(pool, when, { dryRun });
         }
@@ -85,35 +97,13 @@ router.post('/games/:gameId/snapshots', async (req, res) => {
     try {
         await client.query('BEGIN');
 
-        // 1. Get game data
-        const gameResult = await client.query('SELECT * FROM games WHERE game_id = $1', [gameId]);
-        if (gameResult.rows.length === 0) {
+        const snapshot = await captureGameSnapshot(client, gameId);
+        if (!snapshot) {
             return res.status(404).json({ message: 'Game not found.' });
         }
-        const game_data = gameResult.rows[0];
-
-        // 2. Get participants data
-        const participantsResult = await client.query('SELECT * FROM game_participants WHERE game_id = $1', [gameId]);
-        const participants_data = participantsResult.rows;
-
-        // 3. Get latest game state data
-        const stateResult = await client.query('SELECT * FROM game_states WHERE game_id = $1 ORDER BY turn_number DESC LIMIT 1', [gameId]);
-        const latest_state_data = stateResult.rows[0];
+        const { game_data, participants_data, latest_state_data, events_data, rosters_data } = snapshot;
 
-        // 4. Get all game events data
-        const eventsResult = await client.query('SELECT * FROM game_events WHERE game_id = $1', [gameId]);
-        const events_data = eventsResult.rows;
-
-        // 5. Get game rosters data
-        const rostersResult = await client.query('SELECT * FROM game_rosters WHERE game_id = $1', [gameId]);
-        const rosters_data = rostersResult.rows;
-
-        // Ensure nested JSON is parsed, not double-stringified
-        if (latest_state_data && typeof latest_state_data.state_data === 'string') {
-            latest_state_data.state_data = JSON.parse(latest_state_data.state_data);
-        }
-        
-        // 6. Insert into snapshots table
+        // Insert into snapshots table
         const newSnapshot = await client.query(
             `INSERT INTO game_snapshots (game_id, snapshot_name, game_data, participants_data, latest_state_data, events_data, rosters_data)
              VALUES ($1, $2, $3, $4, $5, $6, $7)
@@ -156,63 +146,8 @@ router.post('/games/:gameId/snapshots/:snapshotId/restore', async (req, res) =>
         }
         const snapshot = snapshotResult.rows[0];
 
-        // 2. Clear existing game data
-        await client.query('DELETE FROM game_events WHERE game_id = $1', [gameId]);
-        await client.query('DELETE FROM game_states WHERE game_id = $1', [gameId]);
-        await client.query('DELETE FROM game_rosters WHERE game_id = $1', [gameId]);
-        await client.query('DELETE FROM game_participants WHERE game_id = $1', [gameId]);
-
-        // 3. Restore game table data (update existing record)
-        const gameData = snapshot.game_data;
-        await client.query(
-            `UPDATE games SET
-                status = $1,
-                completed_at = $2,
-                current_turn_user_id = $3,
-                home_team_user_id = $4,
-                use_dh = $5,
-                setup_rolls = $6
-             WHERE game_id = $7`,
-            [gameData.status, gameData.completed_at, gameData.current_turn_user_id, gameData.home_team_user_id, gameData.use_dh, gameData.setup_rolls, gameId]
-        );
-
-        // 4. Restore participants
-        const participantsData = snapshot.participants_data;
-        for (const p of participantsData) {
-            await client.query(
-                `INSERT INTO game_participants (game_id, user_id, roster_id, home_or_away, league_designation, lineup)
-                 VALUES ($1, $2, $3, $4, $5, $6)`,
-                [p.game_id, p.user_id, p.roster_id, p.home_or_away, p.league_designation, JSON.stringify(p.lineup)]
-            );
-        }
-
-        // 5. Restore rosters
-        const rostersData = snapshot.rosters_data;
-        for (const r of rostersData) {
-            await client.query(
-                'INSERT INTO game_rosters (game_id, user_id, roster_data) VALUES ($1, $2, $3)',
-                [r.game_id, r.user_id, JSON.stringify(r.roster_data)]
-            );
-        }
-
-        // 6. Restore game state (only the latest one)
-        const state = snapshot.latest_state_data;
-        if (state) {
-            await client.query(
-                'INSERT INTO game_states (game_id, turn_number, state_data, created_at) VALUES ($1, $2, $3, $4)',
-                [state.game_id, state.turn_number, JSON.stringify(state.state_data), state.created_at]
-            );
-        }
-
-        // 7. Restore game events
-        const eventsData = snapshot.events_data;
-        for (const e of eventsData) {
-            await client.query(
-                `INSERT INTO game_events (game_id, turn_number, user_id, event_type, log_message, timestamp)
-                 VALUES ($1, $2, $3, $4, $5, $6)`,
-                [e.game_id, e.turn_number, e.user_id, e.event_type, e.log_message, e.timestamp]
-            );
-        }
+        // 2. Replace the game's rows with the snapshot's
+        await restoreGameSnapshot(client, gameId, snapshot);
 
         await client.query('COMMIT');
 
@@ -448,9 +383,7 @@ router.get('/series-overview', async (req, res) => {
         const gamesRes = await pool.query(`
             SELECT g.game_id, g.series_id, g.game_in_series, g.status,
                    g.home_team_user_id, g.completed_at, g.created_at,
-                   COALESCE(e.cnt, 0) AS events,
-                   (SELECT gs.state_data->>'winningTeam' FROM game_states gs
-                     WHERE gs.game_id = g.game_id ORDER BY gs.turn_number DESC LIMIT 1) AS winning_side
+                   COALESCE(e.cnt, 0) AS events, g.winning_side
             FROM games g
             LEFT JOIN (SELECT game_id, count(*) AS cnt FROM game_events GROUP BY game_id) e
                    ON e.game_id = g.game_id
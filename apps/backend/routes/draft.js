@@ -4,8 +4,21 @@ const authenticateToken = require('../middleware/authenticateToken');
 const { pool, io } = require('../server');
 const { sendPickConfirmation, sendRandomRemovalsEmail } = require('../services/emailService');
 const { getSeasonName, sortSeasons, seasonMap, mapSeasonToPointSet } = require('../utils/seasonUtils');
-const { generateSchedule } = require('../services/seasonRolloverService');
 const { matchesFranchise, getMappedIds } = require('../utils/franchiseUtils');
+const { getDataVersion } = require('../services/dataVersions');
+const { createSnapshotCache, serveSnapshot } = require('../utils/snapshotResponse');
+const { getDraftBoard, syncDraftTeam, invalidateDraftBoard } = require('../services/draftRecommendationService');
+
+// Everyone on the draft page joins this socket.io room (see server.js). Picks and roster
+// submissions are pushed to it as 'draft-pick' events carrying just what changed; anything
+// else that moves the board (kickoff, a roster save mid-turn) sends 'draft-updated', on which
+// clients re-read GET /state.
+const DRAFT_ROOM = 'draft';
+
+// Compressed GET /state documents, one per requested season, tagged with the versions of
+// everything they're built from: draft tables + season results ('draft'), league rosters and
+// team display fields ('roster_ownership'), and card names/points ('card_catalog').
+const draftStateSnapshots = createSnapshotCache(8);
 
 // Helper to get the active draft state
 async function getDraftState(client, seasonName = null) {
@@ -149,6 +162,7 @@ async function advanceDraftState(client, currentState) {
 
         // --- NEW SEASON ROLLOVER LOGIC ---
         // 1. Generate empty schedule in series_results (marks season as "started/active")
+        const { generateSchedule } = require('../services/seasonRolloverService');
         await generateSchedule(client, season_name, order);
 
         // NOTE: Snapshotting and Point Rollover are now deferred until after the first game of the season.
@@ -172,6 +186,84 @@ async function advanceDraftState(client, currentState) {
     return { current_round, current_pick_number, active_team_id: nextTeamId, is_active: isActive };
 }
 
+// Draft history rows as the board shows them: official card names, position, the team's
+// current city/logo (backfilled by franchise for historical names) and the player's points in
+// `pointSetId`. `historyIds` limits it to specific rows (a pick broadcast).
+async function loadDraftHistory(client, seasonName, pointSetId, historyIds = null) {
+    const historyRes = await client.query(
+        `SELECT
+            dh.*,
+            COALESCE(cp.display_name, cp.name, dh.player_name) as player_name,
+            t.city,
+            t.logo_url,
+            COALESCE(dh.team_name, t.name) as team_name,
+            ppv.points,
+            CASE
+                WHEN cp.control IS NOT NULL THEN (CASE WHEN cp.ip > 3 THEN 'SP' ELSE 'RP' END)
+                ELSE array_to_string(ARRAY(SELECT jsonb_object_keys(cp.fielding_ratings)), '/')
+            END as position
+         FROM draft_history dh
+         LEFT JOIN cards_player cp ON dh.card_id = cp.card_id
+         LEFT JOIN teams t ON dh.team_id = t.team_id OR (dh.team_id IS NULL AND t.city = dh.team_name)
+         LEFT JOIN player_point_values ppv ON cp.card_id = ppv.card_id AND ppv.point_set_id = $2
+         WHERE dh.season_name = $1 AND ($3::int[] IS NULL OR dh.id = ANY($3::int[]))
+         ORDER BY dh.pick_number ASC, dh.created_at ASC`,
+        [seasonName, pointSetId, historyIds]
+    );
+
+    // Backfill missing logo_url for historical records (e.g. Fargo -> NY South Logo)
+    if (historyRes.rows.some(h => !h.logo_url && h.team_name)) {
+        const allTeamsRes = await client.query('SELECT team_id, name, city, logo_url FROM teams');
+        const allTeams = allTeamsRes.rows;
+        historyRes.rows.forEach(h => {
+            if (!h.logo_url && h.team_name) {
+                const teamIdToCheck = h.team_id || null;
+                const matchedTeam = allTeams.find(t => matchesFranchise(h.team_name, teamIdToCheck, t, allTeams, getMappedIds(t.team_id)));
+                if (matchedTeam) {
+                    h.logo_url = matchedTeam.logo_url;
+                }
+            }
+        });
+    }
+    return historyRes.rows;
+}
+
+// Pushes one completed turn to the draft room: the new history rows, the cards that changed
+// hands and where the draft moved to. Runs after COMMIT; if building the event fails, clients
+// are told to re-read the board instead. The room is shared, so recommendations (each team's
+// private targets) never ride along: the picking team's board is re-ranked here and each team
+// reads its own list from GET /recommendations.
+async function broadcastDraftTurn(client, { seasonName, historyIds, team, added = [], dropped = [], newState }) {
+    try {
+        const psRes = await client.query("SELECT point_set_id FROM point_sets WHERE name = 'Upcoming Season'");
+        const pointSetId = psRes.rows[0] ? psRes.rows[0].point_set_id : null;
+        const history = historyIds.length > 0 ? await loadDraftHistory(client, seasonName, pointSetId, historyIds) : [];
+
+        let activeTeam = null;
+        if (newState.active_team_id) {
+            const tRes = await client.query('SELECT * FROM teams WHERE team_id = $1', [newState.active_team_id]);
+            activeTeam = tRes.rows[0] || null;
+        }
+
+        // A recommendation failure shouldn't cost clients the pick itself.
+        try {
+            await syncDraftTeam(client, seasonName, team.team_id);
+        } catch (e) {
+            console.error('Draft recommendation sync error:', e);
+        }
+
+        io.to(DRAFT_ROOM).emit('draft-pick', {
+            season_name: seasonName,
+            history,
+            taken: { added, dropped, team },
+            state: { ...newState, activeTeam },
+        });
+    } catch (e) {
+        console.error('Draft broadcast error:', e);
+        io.to(DRAFT_ROOM).emit('draft-updated');
+    }
+}
+
 // GET AVAILABLE SEASONS
 router.get('/seasons', authenticateToken, async (req, res) => {
     const client = await pool.connect();
@@ -329,7 +421,8 @@ router.post('/start', authenticateToken, async (req, res) => {
         }
         // -------------------------
 
-        io.emit('draft-updated');
+        invalidateDraftBoard();
+        io.to(DRAFT_ROOM).emit('draft-updated');
         res.json({ message: "Random removals performed and draft started!" });
 
     } catch (error) {
@@ -341,224 +434,236 @@ router.post('/start', authenticateToken, async (req, res) => {
     }
 });
 
-// GET DRAFT STATE
-router.get('/state', authenticateToken, async (req, res) => {
-    const client = await pool.connect();
-    try {
-        let seasonName = req.query.season; // Optional query param
-
-        // Handle "Live Draft" alias from frontend
-        if (seasonName === "Live Draft") {
-             const activeRes = await client.query('SELECT season_name FROM draft_state WHERE is_active = true LIMIT 1');
-             if (activeRes.rows.length > 0) {
-                 seasonName = activeRes.rows[0].season_name;
-             }
-        }
+// The full draft board for `seasonName` ("Live Draft", a past season, or the latest when omitted).
+async function buildDraftStateDocument(client, seasonName) {
+    // Handle "Live Draft" alias from frontend
+    if (seasonName === "Live Draft") {
+         const activeRes = await client.query('SELECT season_name FROM draft_state WHERE is_active = true LIMIT 1');
+         if (activeRes.rows.length > 0) {
+             seasonName = activeRes.rows[0].season_name;
+         }
+    }
 
-        let state = await getDraftState(client, seasonName);
-        const seasonOver = await checkSeasonOver(client);
+    let state = await getDraftState(client, seasonName);
+    const seasonOver = await checkSeasonOver(client);
 
-        // Check for ANY active draft globally
-        const globalActiveRes = await client.query('SELECT 1 FROM draft_state WHERE is_active = true LIMIT 1');
-        const globalDraftActive = globalActiveRes.rows.length > 0;
+    // Check for ANY active draft globally
+    const globalActiveRes = await client.query('SELECT 1 FROM draft_state WHERE is_active = true LIMIT 1');
+    const globalDraftActive = globalActiveRes.rows.length > 0;
 
-        // Fallback to finding state from history if not found in draft_state
-        if (!state) {
-            let targetSeason = seasonName;
+    // Fallback to finding state from history if not found in draft_state
+    if (!state) {
+        let targetSeason = seasonName;
 
-            // If no specific season requested, find the latest from history via natural sort
-            if (!targetSeason) {
-                const historySeasonsRes = await client.query(
-                    'SELECT DISTINCT season_name FROM draft_history'
-                );
-                const seasons = historySeasonsRes.rows.map(r => r.season_name);
-                if (seasons.length > 0) {
-                    // Reverse map season name to date string
-                    const nameToDate = {};
-                    for (const [date, name] of Object.entries(seasonMap)) {
-                        nameToDate[name] = date;
-                    }
-                    seasons.sort((a, b) => {
-                        const dateA = nameToDate[a];
-                        const dateB = nameToDate[b];
-
-                        if (dateA && dateB) {
-                            // Parse date strings MM/DD/YY
-                            const dA = new Date(dateA);
-                            const dB = new Date(dateB);
-                            return dB - dA; // Descending (Newest first)
-                        }
-                        if (dateA) return -1; // A has date, B doesn't -> A first
-                        if (dateB) return 1;  // B has date, A doesn't -> B first
-
-                        // Fallback to alphabetical if neither has a date
-                        return a.localeCompare(b, undefined, { numeric: true, sensitivity: 'base' });
-                    });
-                    // Latest is last in ascending sort
-                    targetSeason = seasons[seasons.length - 1];
+        // If no specific season requested, find the latest from history via natural sort
+        if (!targetSeason) {
+            const historySeasonsRes = await client.query(
+                'SELECT DISTINCT season_name FROM draft_history'
+            );
+            const seasons = historySeasonsRes.rows.map(r => r.season_name);
+            if (seasons.length > 0) {
+                // Reverse map season name to date string
+                const nameToDate = {};
+                for (const [date, name] of Object.entries(seasonMap)) {
+                    nameToDate[name] = date;
                 }
-            }
+                seasons.sort((a, b) => {
+                    const dateA = nameToDate[a];
+                    const dateB = nameToDate[b];
+
+                    if (dateA && dateB) {
+                        // Parse date strings MM/DD/YY
+                        const dA = new Date(dateA);
+                        const dB = new Date(dateB);
+                        return dB - dA; // Descending (Newest first)
+                    }
+                    if (dateA) return -1; // A has date, B doesn't -> A first
+                    if (dateB) return 1;  // B has date, A doesn't -> B first
 
-            // If we have a target season, construct a read-only state
-            if (targetSeason) {
-                state = {
-                    season_name: targetSeason,
-                    is_active: false,
-                    current_round: 0,
-                    current_pick_number: 1,
-                    active_team_id: null,
-                    draft_order: [],
-                };
+                    // Fallback to alphabetical if neither has a date
+                    return a.localeCompare(b, undefined, { numeric: true, sensitivity: 'base' });
+                });
+                // Latest is last in ascending sort
+                targetSeason = seasons[seasons.length - 1];
             }
         }
 
-        // If still no state (no history, no active draft), return empty
-        if (!state) return res.json({ isActive: false, isSeasonOver: seasonOver, globalDraftActive });
+        // If we have a target season, construct a read-only state
+        if (targetSeason) {
+            state = {
+                season_name: targetSeason,
+                is_active: false,
+                current_round: 0,
+                current_pick_number: 1,
+                active_team_id: null,
+                draft_order: [],
+            };
+        }
+    }
 
-        // Find correct point set for stats
-        // 1. Map the season name from draft state/history (e.g. "1-7-25 Season") to Point Set format (e.g. "1/7/25 Season")
-        const targetPointSetName = mapSeasonToPointSet(state.season_name);
+    // If still no state (no history, no active draft), return empty
+    if (!state) return { isActive: false, isSeasonOver: seasonOver, globalDraftActive };
 
-        // 2. Find the ID of that point set
-        const allPsRes = await client.query('SELECT point_set_id, name FROM point_sets');
-        const pointSetMap = {};
-        allPsRes.rows.forEach(ps => pointSetMap[ps.name] = ps.point_set_id);
+    // Find correct point set for stats
+    // 1. Map the season name from draft state/history (e.g. "1-7-25 Season") to Point Set format (e.g. "1/7/25 Season")
+    const targetPointSetName = mapSeasonToPointSet(state.season_name);
 
-        let pointSetId = pointSetMap[targetPointSetName];
-        // FALLBACK: If mapSeasonToPointSet didn't find it, try the season name directly
-        // e.g. "Fall 2025" -> mapSeason returns "8/4/25 Season", but point_sets might have "Fall 2025" directly if it's new.
-        if (!pointSetId && pointSetMap[state.season_name]) {
-            pointSetId = pointSetMap[state.season_name];
-        }
+    // 2. Find the ID of that point set
+    const allPsRes = await client.query('SELECT point_set_id, name FROM point_sets');
+    const pointSetMap = {};
+    allPsRes.rows.forEach(ps => pointSetMap[ps.name] = ps.point_set_id);
 
-        // --- NEW: Live Draft Override ---
-        // If it's the active draft or explicitly "Live Draft", default to Upcoming Season if mapped set not found OR if we want to force it.
-        // We prefer "Upcoming Season" for the live draft experience unless the season name maps perfectly.
-        // mapSeasonToPointSet for "Live Draft" (passed as seasonName sometimes) returns "Original Pts", which is wrong for 2025.
-        // Also if state.is_active is true, we are likely in the "Upcoming Season" context.
-        if (state.is_active || seasonName === 'Live Draft') {
-             if (pointSetMap['Upcoming Season']) {
-                 pointSetId = pointSetMap['Upcoming Season'];
+    let pointSetId = pointSetMap[targetPointSetName];
+    // FALLBACK: If mapSeasonToPointSet didn't find it, try the season name directly
+    // e.g. "Fall 2025" -> mapSeason returns "8/4/25 Season", but point_sets might have "Fall 2025" directly if it's new.
+    if (!pointSetId && pointSetMap[state.season_name]) {
+        pointSetId = pointSetMap[state.season_name];
+    }
+
+    // --- NEW: Live Draft Override ---
+    // If it's the active draft or explicitly "Live Draft", default to Upcoming Season if mapped set not found OR if we want to force it.
+    // We prefer "Upcoming Season" for the live draft experience unless the season name maps perfectly.
+    // mapSeasonToPointSet for "Live Draft" (passed as seasonName sometimes) returns "Original Pts", which is wrong for 2025.
+    // Also if state.is_active is true, we are likely in the "Upcoming Season" context.
+    if (state.is_active || seasonName === 'Live Draft') {
+         if (pointSetMap['Upcoming Season']) {
+             pointSetId = pointSetMap['Upcoming Season'];
+         }
+    }
+
+    if (!pointSetId) {
+        pointSetId = pointSetMap["Original Pts"];
+    }
+
+    // Fetch History
+    const history = await loadDraftHistory(client, state.season_name, pointSetId);
+
+    // Fetch Random Removals (Historical)
+    const removalQuery = `
+        SELECT
+            rr.player_name,
+            rr.team_name,
+            rr.card_id,
+            ppv.points,
+            CASE
+                WHEN cp.control IS NOT NULL THEN (CASE WHEN cp.ip > 3 THEN 'SP' ELSE 'RP' END)
+                ELSE array_to_string(ARRAY(SELECT jsonb_object_keys(cp.fielding_ratings)), '/')
+            END as position
+        FROM random_removals rr
+        LEFT JOIN cards_player cp ON rr.card_id = cp.card_id
+        LEFT JOIN player_point_values ppv ON cp.card_id = ppv.card_id AND ppv.point_set_id = $2
+        WHERE rr.season = $1
+        ORDER BY rr.team_name, rr.player_name
+    `;
+
+    // reusing pointSetId derived above
+    const removalRes = await client.query(removalQuery, [state.season_name, pointSetId]);
+
+    // Fix for September 2020: Use 'Fargo' if team name missing or bad lookup
+    // Check if this is the target season
+    if (state.season_name.includes('September 2020')) {
+         removalRes.rows.forEach(row => {
+             if (!row.team_name || row.team_name.trim() === '') {
+                 row.team_name = 'Fargo';
              }
-        }
+             // If the stored team name was an ID or unmapped, logic could go here,
+             // but user said "revert to Fargo as the team", implying we force it.
+             // Also ensure it displays properly if the DB had null.
+         });
 
-        if (!pointSetId) {
-            pointSetId = pointSetMap["Original Pts"];
-        }
-
-        // Fetch History
-        // Prioritize official display_name from cards_player, then clean name, then raw history name
-        // Team Name priority: Historical (dh.team_name) -> Current (t.name)
-        const historyRes = await client.query(
-            `SELECT
-                dh.*,
-                COALESCE(cp.display_name, cp.name, dh.player_name) as player_name,
-                t.city,
-                t.logo_url,
-                COALESCE(dh.team_name, t.name) as team_name,
-                ppv.points,
-                CASE
-                    WHEN cp.control IS NOT NULL THEN (CASE WHEN cp.ip > 3 THEN 'SP' ELSE 'RP' END)
-                    ELSE array_to_string(ARRAY(SELECT jsonb_object_keys(cp.fielding_ratings)), '/')
-                END as position
-             FROM draft_history dh
-             LEFT JOIN cards_player cp ON dh.card_id = cp.card_id
-             LEFT JOIN teams t ON dh.team_id = t.team_id OR (dh.team_id IS NULL AND t.city = dh.team_name)
-             LEFT JOIN player_point_values ppv ON cp.card_id = ppv.card_id AND ppv.point_set_id = $2
-             WHERE dh.season_name = $1
-             ORDER BY dh.pick_number ASC, dh.created_at ASC`,
-            [state.season_name, pointSetId]
-        );
+         // Double check if any rows have null team_name even if not Sept 2020?
+         // User specific request was for Sept 2020.
+    }
 
-        // Fetch Random Removals (Historical)
-        const removalQuery = `
-            SELECT
-                rr.player_name,
-                rr.team_name,
-                rr.card_id,
-                ppv.points,
-                CASE
-                    WHEN cp.control IS NOT NULL THEN (CASE WHEN cp.ip > 3 THEN 'SP' ELSE 'RP' END)
-                    ELSE array_to_string(ARRAY(SELECT jsonb_object_keys(cp.fielding_ratings)), '/')
-                END as position
-            FROM random_removals rr
-            LEFT JOIN cards_player cp ON rr.card_id = cp.card_id
-            LEFT JOIN player_point_values ppv ON cp.card_id = ppv.card_id AND ppv.point_set_id = $2
-            WHERE rr.season = $1
-            ORDER BY rr.team_name, rr.player_name
-        `;
-
-        // reusing pointSetId derived above
-        const removalRes = await client.query(removalQuery, [state.season_name, pointSetId]);
-
-        // Fix for September 2020: Use 'Fargo' if team name missing or bad lookup
-        // Check if this is the target season
-        if (state.season_name.includes('September 2020')) {
-             removalRes.rows.forEach(row => {
-                 if (!row.team_name || row.team_name.trim() === '') {
-                     row.team_name = 'Fargo';
-                 }
-                 // If the stored team name was an ID or unmapped, logic could go here,
-                 // but user said "revert to Fargo as the team", implying we force it.
-                 // Also ensure it displays properly if the DB had null.
-             });
-
-             // Double check if any rows have null team_name even if not Sept 2020?
-             // User specific request was for Sept 2020.
-        }
-
-        // Backfill missing logo_url for historical records (e.g. Fargo -> NY South Logo)
-        // Fetch all teams for context
-        const allTeamsRes = await client.query('SELECT team_id, name, city, logo_url FROM teams');
-        const allTeams = allTeamsRes.rows;
+    let activeTeam = null;
+    if (state.active_team_id) {
+        const tRes = await client.query('SELECT * FROM teams WHERE team_id = $1', [state.active_team_id]);
+        activeTeam = tRes.rows[0];
+    }
 
-        historyRes.rows.forEach(h => {
-            if (!h.logo_url && h.team_name) {
-                const teamIdToCheck = h.team_id || null;
-                const matchedTeam = allTeams.find(t => matchesFranchise(h.team_name, teamIdToCheck, t, allTeams, getMappedIds(t.team_id)));
-                if (matchedTeam) {
-                    h.logo_url = matchedTeam.logo_url;
-                }
-            }
+    const takenRes = await client.query('SELECT card_id FROM roster_cards where roster_id in (select roster_id from rosters where roster_type=\'league\')');
+    const takenPlayerIds = takenRes.rows.map(r => r.card_id);
+
+    // Fetch team info for the draft order (to populate future rows)
+    let teamsMap = {};
+    if (state.draft_order && state.draft_order.length > 0) {
+        const teamsRes = await client.query('SELECT team_id, name, city, logo_url FROM teams WHERE team_id = ANY($1::int[])', [state.draft_order]);
+        teamsRes.rows.forEach(t => {
+            // For the draft table, we only want the City (as per requirements).
+            // Fallback to name if city is missing.
+            teamsMap[t.team_id] = {
+                name: t.city || t.name || "Unknown Team",
+                logo_url: t.logo_url
+            };
         });
+    }
 
-        let activeTeam = null;
-        if (state.active_team_id) {
-            const tRes = await client.query('SELECT * FROM teams WHERE team_id = $1', [state.active_team_id]);
-            activeTeam = tRes.rows[0];
-        }
+    return {
+        ...state,
+        history,
+        randomRemovals: removalRes.rows,
+        activeTeam,
+        takenPlayerIds,
+        isSeasonOver: seasonOver,
+        teams: teamsMap,
+        globalDraftActive
+    };
+}
 
-        const takenRes = await client.query('SELECT card_id FROM roster_cards where roster_id in (select roster_id from rosters where roster_type=\'league\')');
-        const takenPlayerIds = takenRes.rows.map(r => r.card_id);
+// GET DRAFT STATE
+// Served from a snapshot tagged with the data versions it's built from, so re-reading an
+// unchanged board (a tab refocus, a reconnect) is a 304 without touching the draft tables.
+// Live updates arrive over the draft room instead of by polling.
+router.get('/state', authenticateToken, async (req, res) => {
+    const seasonName = req.query.season || null; // Optional query param
+    try {
+        const [draftVersion, ownershipVersion, catalogVersion] = await Promise.all([
+            getDataVersion('draft'), getDataVersion('roster_ownership'), getDataVersion('card_catalog')
+        ]);
+        const tag = `draft-${encodeURIComponent(seasonName || 'latest')}-v${draftVersion}.${ownershipVersion}.${catalogVersion}`;
+        await serveSnapshot(req, res, draftStateSnapshots, tag, async () => {
+            const client = await pool.connect();
+            try {
+                return await buildDraftStateDocument(client, seasonName);
+            } finally {
+                client.release();
+            }
+        });
+    } catch (error) {
+        console.error("Get Draft State Error:", error);
+        res.status(500).json({ message: "Error fetching draft state." });
+    }
+});
 
-        // Fetch team info for the draft order (to populate future rows)
-        let teamsMap = {};
-        if (state.draft_order && state.draft_order.length > 0) {
-            const teamsRes = await client.query('SELECT team_id, name, city, logo_url FROM teams WHERE team_id = ANY($1::int[])', [state.draft_order]);
-            teamsRes.rows.forEach(t => {
-                // For the draft table, we only want the City (as per requirements).
-                // Fallback to name if city is missing.
-                teamsMap[t.team_id] = {
-                    name: t.city || t.name || "Unknown Team",
-                    logo_url: t.logo_url
-                };
-            });
+// GET RECOMMENDATIONS
+// The requesting team's best available cards in the live draft, ranked by value, value per
+// point, positional scarcity and roster fit, skipping any it can't fit under the point cap.
+// The board is kept in memory and re-ranked incrementally on each pick (see
+// services/draftRecommendationService.js), so this is a read of the current ranking.
+router.get('/recommendations', authenticateToken, async (req, res) => {
+    const limit = Math.min(Math.max(parseInt(req.query.limit, 10) || 25, 1), 200);
+    const client = await pool.connect();
+    try {
+        const state = await getDraftState(client);
+        if (!state || !state.is_active) {
+            return res.status(400).json({ message: "No active draft." });
         }
+        const teamRes = await client.query('SELECT team_id FROM teams WHERE user_id = $1', [req.user.userId]);
+        if (teamRes.rows.length === 0) {
+            return res.status(404).json({ message: "Team not found." });
+        }
+        const teamId = teamRes.rows[0].team_id;
 
+        const board = await getDraftBoard(client, state.season_name);
         res.json({
-            ...state,
-            history: historyRes.rows,
-            randomRemovals: removalRes.rows,
-            activeTeam,
-            takenPlayerIds,
-            isSeasonOver: seasonOver,
-            teams: teamsMap,
-            globalDraftActive
+            season_name: state.season_name,
+            team_id: teamId,
+            ...board.summary(teamId),
+            players: board.top(teamId, limit),
         });
-
     } catch (error) {
-        console.error("Get Draft State Error:", error);
-        res.status(500).json({ message: "Error fetching draft state." });
+        console.error("Draft Recommendations Error:", error);
+        res.status(500).json({ message: "Error fetching recommendations." });
     } finally {
         client.release();
     }
@@ -629,9 +734,9 @@ router.post('/pick', authenticateToken, async (req, res) => {
         }
 
         const roundName = state.current_round === 2 ? "1" : "2";
-        await client.query(
+        const pickRes = await client.query(
             `INSERT INTO draft_history (season_name, round, team_id, card_id, action, pick_number)
-             VALUES ($1, $2, $3, $4, 'ADDED', $5)`,
+             VALUES ($1, $2, $3, $4, 'ADDED', $5) RETURNING id`,
             [state.season_name, roundName, teamId, playerId, state.current_pick_number]
         );
 
@@ -671,9 +776,16 @@ router.post('/pick', authenticateToken, async (req, res) => {
         // --------------------------------
 
         await client.query('COMMIT');
-        io.emit('draft-updated');
         res.json(newState);
 
+        await broadcastDraftTurn(client, {
+            seasonName: state.season_name,
+            historyIds: [pickRes.rows[0].id],
+            team: { team_id: teamId, name: currentTeam.name, city: currentTeam.city, logo_url: currentTeam.logo_url },
+            added: [Number(playerId)],
+            newState
+        });
+
     } catch (error) {
         await client.query('ROLLBACK');
         console.error("Draft Pick Error:", error);
@@ -797,6 +909,9 @@ router.post('/submit-turn', authenticateToken, async (req, res) => {
 
         // If we are using the saved roster, no need to update or log history (already done by my-roster)
         const roundName = state.current_round === 4 ? "Add/Drop 1" : "Add/Drop 2";
+        const historyIds = [];
+        let addedIds = [];
+        let droppedIds = [];
         let loggedHistory = false;
         let addedNames = [];
         let droppedNames = [];
@@ -857,19 +972,23 @@ router.post('/submit-turn', authenticateToken, async (req, res) => {
                 }
 
                 for (const id of added) {
-                    await client.query(
+                    const h = await client.query(
                         `INSERT INTO draft_history (season_name, round, team_id, card_id, action, pick_number)
-                         VALUES ($1, $2, $3, $4, 'ADDED', $5)`,
+                         VALUES ($1, $2, $3, $4, 'ADDED', $5) RETURNING id`,
                         [state.season_name, roundName, teamId, id, state.current_pick_number]
                     );
+                    historyIds.push(h.rows[0].id);
                 }
                 for (const id of dropped) {
-                    await client.query(
+                    const h = await client.query(
                         `INSERT INTO draft_history (season_name, round, team_id, card_id, action, pick_number)
-                         VALUES ($1, $2, $3, $4, 'DROPPED', $5)`,
+                         VALUES ($1, $2, $3, $4, 'DROPPED', $5) RETURNING id`,
                         [state.season_name, roundName, teamId, id, state.current_pick_number]
                     );
+                    historyIds.push(h.rows[0].id);
                 }
+                addedIds = added.map(Number);
+                droppedIds = dropped.map(Number);
             }
         }
 
@@ -878,11 +997,12 @@ router.post('/submit-turn', authenticateToken, async (req, res) => {
             const teamInfoRes = await client.query('SELECT city, name FROM teams WHERE team_id = $1', [teamId]);
             const teamName = teamInfoRes.rows[0] ? `${teamInfoRes.rows[0].city} ${teamInfoRes.rows[0].name}` : null;
 
-            await client.query(
+            const h = await client.query(
                 `INSERT INTO draft_history (season_name, round, team_id, action, pick_number, player_name, team_name)
-                 VALUES ($1, $2, $3, 'ROSTER_CONFIRMED', $4, 'Roster Confirmed', $5)`,
+                 VALUES ($1, $2, $3, 'ROSTER_CONFIRMED', $4, 'Roster Confirmed', $5) RETURNING id`,
                 [state.season_name, roundName, teamId, state.current_pick_number, teamName]
             );
+            historyIds.push(h.rows[0].id);
         }
 
         const newState = await advanceDraftState(client, state);
@@ -920,9 +1040,17 @@ router.post('/submit-turn', authenticateToken, async (req, res) => {
         // --------------------------------
 
         await client.query('COMMIT');
-        io.emit('draft-updated');
         res.json(newState);
 
+        await broadcastDraftTurn(client, {
+            seasonName: state.season_name,
+            historyIds,
+            team: { team_id: teamId, name: currentTeam.name, city: currentTeam.city, logo_url: currentTeam.logo_url },
+            added: addedIds,
+            dropped: droppedIds,
+            newState
+        });
+
     } catch (error) {
         await client.query('ROLLBACK');
         console.error("Submit Turn Error:", error);
@@ -3,12 +3,30 @@ const express = require('express');
 const router = express.Router();
 const { pool } = require('../db');
 const authenticateToken = require('../middleware/authenticateToken');
+const cacheByDataVersion = require('../middleware/cacheByDataVersion');
 const { matchesFranchise, getMappedIds, parseHistoricalIdentity, getLogoForTeam } = require('../utils/franchiseUtils');
 const { mapSeasonToPointSet } = require('../utils/seasonUtils');
-const { calculateStandings, findTeamForRecord } = require('../utils/standingsUtils');
-const { checkAllTeamsPlayed, snapshotRosters, rolloverPointSets } = require('../services/seasonRolloverService');
-const { recomputeOdds, getCachedOddsMap } = require('../services/playoffOddsService');
+const { findTeamForRecord } = require('../utils/standingsUtils');
+const { recomputeOdds } = require('../services/playoffOddsService');
 const { schedulePlayoffsIfClinched } = require('../services/playoffSchedulingService');
+const {
+    refreshSeasonAggregates, getLeagueAggregate, getStandingsAsOf, getStandingsHistory, ALL_TIME_SCOPE
+} = require('../services/leagueAggregateService');
+
+// Response caches for the read-only league pages (middleware/cacheByDataVersion.js), tagged
+// with the versions of the tables each handler reads.
+const leagueRostersCache = cacheByDataVersion('league-rosters', {
+    tables: ['teams', 'users', 'draft_state', 'historical_rosters', 'series_results', 'point_sets',
+        'cards_player', 'player_point_values', 'rosters', 'roster_cards'],
+});
+const seasonSummaryCache = cacheByDataVersion('season-summary', { tables: ['series_results', 'league_aggregates'] });
+const matrixCache = cacheByDataVersion('matrix', { tables: ['series_results', 'league_aggregates'] });
+const standingsHistoryCache = cacheByDataVersion('standings-history', { tables: ['standings_history'] });
+const standingsAsOfCache = cacheByDataVersion('standings-as-of', { tables: ['standings_history'] });
+const leadersDataCache = cacheByDataVersion('leaders-data', {
+    tables: ['games', 'series', 'series_results', 'game_participants', 'teams', 'game_rosters'],
+    max: 4,
+});
 
 function processPlayers(playersToProcess) {
     if (!playersToProcess) return [];
@@ -45,7 +63,7 @@ router.get('/state', authenticateToken, async (req, res) => {
 });
 
 // GET LEAGUE ROSTERS (Modified to accept season)
-router.get('/', authenticateToken, async (req, res) => {
+router.get('/', authenticateToken, leagueRostersCache, async (req, res) => {
     let { point_set_id, season } = req.query;
     if (!point_set_id) {
         return res.status(400).json({ message: 'A point_set_id is required.' });
@@ -355,16 +373,19 @@ router.get('/seasons', authenticateToken, async (req, res) => {
 });
 
 // GET SEASON SUMMARY (Standings and Recent Results)
-router.get('/season-summary', authenticateToken, async (req, res) => {
+// Served from the stored aggregates (services/leagueAggregateService.js): one indexed read for
+// a season or for all-time, however many seasons have accumulated.
+router.get('/season-summary', authenticateToken, seasonSummaryCache, async (req, res) => {
     const { season } = req.query;
     try {
-        // 0. Fetch Current Teams for Mapping
-        const teamsRes = await pool.query('SELECT team_id, name, city, logo_url FROM teams');
-        const currentTeams = teamsRes.rows;
+        if (season === 'all-time') {
+            const doc = await getLeagueAggregate(pool, ALL_TIME_SCOPE, 'summary');
+            return res.json(doc || { standings: [], recentResults: [], finalSeries: [] });
+        }
 
         let currentSeason = season;
 
-        if (!currentSeason && season !== 'all-time') {
+        if (!currentSeason) {
             const seasonQuery = `
                 SELECT season_name
                 FROM series_results
@@ -380,137 +401,8 @@ router.get('/season-summary', authenticateToken, async (req, res) => {
             currentSeason = seasonResult.rows[0].season_name;
         }
 
-        // 2. Fetch Series Results. live_series_id links a row to the in-app series that produced it
-        // (if any), so the League page can deep-link to that series' page.
-        let resultsQuery = `
-            SELECT sr.*,
-                   (SELECT s.id FROM series s WHERE s.series_result_id = sr.id ORDER BY s.id DESC LIMIT 1) AS live_series_id
-            FROM series_results sr
-            WHERE sr.style IS DISTINCT FROM 'Classic'
-        `;
-        const params = [];
-
-        if (season !== 'all-time') {
-            resultsQuery += ` AND season_name = $1`;
-            params.push(currentSeason);
-        } else {
-             resultsQuery += ` AND season_name IS NOT NULL`;
-        }
-
-        resultsQuery += ` ORDER BY date DESC`;
-
-        const resultsResult = await pool.query(resultsQuery, params);
-        const seriesResults = resultsResult.rows;
-
-        // 3. Calculate Standings. For a single (in-progress) season we serve the
-        // spaceship/spoon odds from the precomputed cache instead of re-running the
-        // Monte Carlo simulation on every page load (the cache self-heals if stale).
-        let precomputedOdds = null;
-        let scenarios = {};
-        if (season !== 'all-time') {
-            const cache = await getCachedOddsMap(pool, currentSeason, seriesResults, currentTeams);
-            precomputedOdds = cache.odds;
-            scenarios = cache.scenarios || {};
-        }
-        const standings = calculateStandings(seriesResults, currentTeams, season === 'all-time', { precomputedOdds });
-
-        // Backfill: if this season's playoff field has clinched but the series were never created
-        // (e.g. it clinched before this feature existed), schedule them. Fire-and-forget and
-        // idempotent — they'll appear on the next load. New clinches are created on result entry.
-        if (season !== 'all-time') {
-            schedulePlayoffsIfClinched(pool, currentSeason, { standings, seriesResults }).catch(() => {});
-        }
-
-        if (season === 'all-time') {
-            // Fetch ALL Silver Submarines across all styles (Classic results are filtered out of
-            // seriesResults by the main query, so we query them separately here)
-            const allSubsRes = await pool.query(`
-                SELECT * FROM series_results
-                WHERE round = 'Silver Submarine' AND season_name IS NOT NULL
-                ORDER BY date ASC
-            `);
-            const allSubs = allSubsRes.rows;
-
-            // Recount submarines in standings from the authoritative full list
-            standings.forEach(s => { s.submarines = 0; });
-            allSubs.forEach(sub => {
-                const winner = findTeamForRecord(sub.winning_team_name, sub.winning_team_id, currentTeams);
-                if (!winner.team_id) return;
-                const entry = standings.find(s => s.team_id === winner.team_id);
-                if (entry) entry.submarines++;
-            });
-
-            const mapRow = (r) => {
-                const hasScore = r.winning_score !== null && r.losing_score !== null;
-                const winner = findTeamForRecord(r.winning_team_name, r.winning_team_id, currentTeams);
-                const loser = findTeamForRecord(r.losing_team_name, r.losing_team_id, currentTeams);
-                return {
-                    id: r.id,
-                    date: r.date,
-                    round: r.round,
-                    season: r.season_name,
-                    winner_name: winner.displayName,
-                    loser_name: loser.displayName,
-                    winner_city: winner.city || winner.displayName,
-                    loser_city: loser.city || loser.displayName,
-                    winner_logo: winner.logo_url,
-                    loser_logo: loser.logo_url,
-                    score: hasScore ? `${r.winning_score}-${r.losing_score}` : null,
-                    series_id: r.live_series_id, // linked in-app series (null if entered offline)
-                    mva: r.mva,
-                    lvsc: r.lvsc
-                };
-            };
-
-            const nonSubFinals = seriesResults
-                .filter(r => ['Golden Spaceship', 'Wooden Spoon'].includes(r.round))
-                .map(mapRow);
-            const subFinals = allSubs.map(mapRow);
-
-            const finalSeries = [...nonSubFinals, ...subFinals]
-                .sort((a, b) => new Date(a.date) - new Date(b.date));
-
-            res.json({
-                standings,
-                recentResults: [],
-                finalSeries
-            });
-        } else {
-            res.json({
-                standings,
-                recentResults: seriesResults.map(r => {
-                    const hasScore = r.winning_score !== null && r.losing_score !== null;
-                    const winner = findTeamForRecord(r.winning_team_name, r.winning_team_id, currentTeams);
-                    const loser = findTeamForRecord(r.losing_team_name, r.losing_team_id, currentTeams);
-
-                    return {
-                        id: r.id,
-                        date: r.date,
-                        round: r.round,
-                        style: r.style,
-                        status: r.status, // 'scheduled' | 'in_progress' | 'completed' — drives result-line rendering
-                        winning_team_id: r.winning_team_id,
-                        losing_team_id: r.losing_team_id,
-                        winner: r.winning_team_name,
-                        loser: r.losing_team_name,
-                        winner_name: winner.displayName,
-                        loser_name: loser.displayName,
-
-                        winner_logo: winner.logo_url,
-                        loser_logo: loser.logo_url,
-                        score: hasScore ? `${r.winning_score}-${r.losing_score}` : null,
-                        winning_score: r.winning_score, // Passed for sorting
-                        losing_score: r.losing_score, // Passed for sorting
-                        series_id: r.live_series_id, // linked in-app series (null if entered offline)
-                        mva: r.mva,
-                        lvsc: r.lvsc,
-                        // Per-win-count spaceship/spoon outlook for this upcoming series (null when the
-                        // result changes nothing / season decided). See computePlayoffScenarios.
-                        scenarios: scenarios[r.id] || null
-                    };
-                })
-            });
-        }
+        const doc = await getLeagueAggregate(pool, currentSeason, 'summary');
+        res.json(doc || { standings: [], recentResults: [] });
 
     } catch (error) {
         console.error('Error fetching season summary:', error);
@@ -518,64 +410,19 @@ router.get('/season-summary', authenticateToken, async (req, res) => {
     }
 });
 
-// GET HEAD-TO-HEAD MATRIX
-router.get('/matrix', authenticateToken, async (req, res) => {
+// GET HEAD-TO-HEAD MATRIX (stored aggregate, see above)
+router.get('/matrix', authenticateToken, matrixCache, async (req, res) => {
     const { season } = req.query;
     try {
-        const teamsRes = await pool.query('SELECT team_id, name, city, logo_url FROM teams');
-        const currentTeams = teamsRes.rows;
-
-        let currentSeason = season;
-        if (!currentSeason || currentSeason === 'all-time') {
-             if (!season) {
-                const seasonQuery = `SELECT season_name FROM series_results WHERE season_name IS NOT NULL AND style IS DISTINCT FROM 'Classic' ORDER BY date DESC LIMIT 1`;
-                const seasonResult = await pool.query(seasonQuery);
-                if (seasonResult.rows.length > 0) currentSeason = seasonResult.rows[0].season_name;
-             }
-        }
-
-        let query = `SELECT * FROM series_results WHERE style IS DISTINCT FROM 'Classic'`;
-        const params = [];
-        if (currentSeason && currentSeason !== 'all-time') {
-            query += ` AND season_name = $1`;
-            params.push(currentSeason);
+        let scope = season === 'all-time' ? ALL_TIME_SCOPE : season;
+        if (!scope) {
+            const seasonQuery = `SELECT season_name FROM series_results WHERE season_name IS NOT NULL AND style IS DISTINCT FROM 'Classic' ORDER BY date DESC LIMIT 1`;
+            const seasonResult = await pool.query(seasonQuery);
+            scope = seasonResult.rows.length > 0 ? seasonResult.rows[0].season_name : ALL_TIME_SCOPE;
         }
 
-        const result = await pool.query(query, params);
-
-        const matrix = {};
-
-        const getStatsKey = (t) => t.team_id ? `ID-${t.team_id}` : `NAME-${t.name}`;
-
-        result.rows.forEach(row => {
-            const wScore = row.winning_score || 0;
-            const lScore = row.losing_score || 0;
-
-            const winner = findTeamForRecord(row.winning_team_name, row.winning_team_id, currentTeams);
-            const loser = findTeamForRecord(row.losing_team_name, row.losing_team_id, currentTeams);
-
-            const wKey = getStatsKey(winner);
-            const lKey = getStatsKey(loser);
-
-            // For Matrix, we usually use Current Names for consistency, especially All-Time
-            const wName = winner.team_id ? winner.city : winner.name;
-            const lName = loser.team_id ? loser.city : loser.name;
-
-            if (!matrix[wKey]) matrix[wKey] = { id: wKey, name: wName, opponents: {} };
-            if (!matrix[lKey]) matrix[lKey] = { id: lKey, name: lName, opponents: {} };
-
-            // Initialize opponent entries
-            if (!matrix[wKey].opponents[lKey]) matrix[wKey].opponents[lKey] = { wins: 0, losses: 0 };
-            if (!matrix[lKey].opponents[wKey]) matrix[lKey].opponents[wKey] = { wins: 0, losses: 0 };
-
-            matrix[wKey].opponents[lKey].wins += wScore;
-            matrix[wKey].opponents[lKey].losses += lScore;
-
-            matrix[lKey].opponents[wKey].wins += lScore;
-            matrix[lKey].opponents[wKey].losses += wScore;
-        });
-
-        res.json(Object.values(matrix));
+        const matrix = await getLeagueAggregate(pool, scope, 'matrix');
+        res.json(Object.values(matrix || {}));
 
     } catch (error) {
         console.error('Error fetching matrix:', error);
@@ -583,6 +430,33 @@ router.get('/matrix', authenticateToken, async (req, res) => {
     }
 });
 
+// STANDINGS HISTORY (stored per-date records, see services/leagueAggregateService.js)
+// ?season=S1,S2 limits it to those seasons; without it every season's race curves come back at once.
+router.get('/standings-history', authenticateToken, standingsHistoryCache, async (req, res) => {
+    const { season } = req.query;
+    try {
+        const seasons = season ? String(season).split(',').map(s => s.trim()).filter(Boolean) : null;
+        res.json(await getStandingsHistory(pool, seasons));
+    } catch (error) {
+        console.error('Error fetching standings history:', error);
+        res.status(500).json({ message: 'Server error fetching standings history.' });
+    }
+});
+
+// STANDINGS AS OF A DATE: ?season=S1&asOf=YYYY-MM-DD
+router.get('/standings-as-of', authenticateToken, standingsAsOfCache, async (req, res) => {
+    const { season, asOf } = req.query;
+    if (!season || !/^\d{4}-\d{2}-\d{2}$/.test(asOf || '')) {
+        return res.status(400).json({ message: 'season and asOf (YYYY-MM-DD) are required.' });
+    }
+    try {
+        res.json(await getStandingsAsOf(pool, season, asOf));
+    } catch (error) {
+        console.error('Error fetching standings as of date:', error);
+        res.status(500).json({ message: 'Server error fetching standings.' });
+    }
+});
+
 // SUBMIT/UPDATE RESULT (POST)
 router.post('/result', authenticateToken, async (req, res) => {
     const { id, team1_score, team2_score, team1_id, team2_id, mva, lvsc } = req.body;
@@ -642,7 +516,7 @@ router.post('/result', authenticateToken, async (req, res) => {
                 winning_team_id = $3, losing_team_id = $4,
                 winning_team_name = $5, losing_team_name = $6,
                 mva = $8, lvsc = $9,
-                status = 'completed', result_source = 'offline'
+                status = 'completed', result_source = 'offline', completed_at = now()
             WHERE id = $7
         `;
 
@@ -656,31 +530,21 @@ router.post('/result', authenticateToken, async (req, res) => {
 
         // --- NEW: Check for Season Rollover ---
         const seasonName = original.season_name;
-        // Check if this game being finished triggers the "All Teams Played" condition
-        const allPlayed = await checkAllTeamsPlayed(client, seasonName);
-
-        if (allPlayed) {
-            const histCheck = await client.query('SELECT 1 FROM historical_rosters WHERE season = $1 LIMIT 1', [seasonName]);
-            if (histCheck.rows.length === 0) {
-                console.log(`Triggering Season Rollover for ${seasonName}...`);
-                await snapshotRosters(client, seasonName);
-
-                const psCheck = await client.query('SELECT 1 FROM point_sets WHERE name = $1', [seasonName]);
-                if (psCheck.rows.length === 0) {
-                    await rolloverPointSets(client, seasonName);
-                }
-            }
-        }
+        // If this result completes the "All Teams Played" condition, snapshot the rosters and roll
+        // the point sets (the rollover service is only loaded when it's needed).
+        const { rolloverSeasonIfComplete } = require('../services/seasonRolloverService');
+        await rolloverSeasonIfComplete(client, seasonName);
         // ------------------------------------
 
         await client.query('COMMIT');
 
-        // Warm the spaceship/spoon odds cache, then auto-create the Golden Spaceship / Wooden Spoon
-        // series if this result has clinched the whole playoff field. Both are best-effort and never
-        // throw into the response; the read path self-heals the cache if the warm hasn't finished.
+        // Warm the spaceship/spoon odds cache, auto-create the Golden Spaceship / Wooden Spoon series
+        // if this result has clinched the whole playoff field, then refresh the stored league
+        // aggregates. All best-effort and never throw into the response; the read paths self-heal.
         try {
             const odds = await recomputeOdds(pool, seasonName);
             await schedulePlayoffsIfClinched(pool, seasonName, { precomputedOdds: odds ? odds.odds : null });
+            await refreshSeasonAggregates(pool, seasonName);
         } catch (e) {
             console.error('Post-result odds/playoff scheduling error:', e.message);
         }
@@ -705,7 +569,7 @@ router.post('/result', authenticateToken, async (req, res) => {
 // can rebuild each game's box score with the same buildBoxScore() used everywhere else and fold them
 // into league-wide per-player totals. We deliberately do NOT reuse getAndProcessGameData here (it
 // re-reads every card + full event log per game); this ships only what the box score needs.
-router.get('/leaders-data', authenticateToken, async (req, res) => {
+router.get('/leaders-data', authenticateToken, leadersDataCache, async (req, res) => {
     const { season } = req.query;
     if (!season) return res.status(400).json({ message: 'season is required.' });
     const client = await pool.connect();
@@ -3,6 +3,8 @@ const path = require('path');
 if (process.env.NODE_ENV !== 'production') {
   require('dotenv').config({ path: path.join(__dirname, '.env') });
 }
+const { markStartup, profileRequires, trackFirstResponse, logStartup } = require('./utils/startupProfile');
+if (process.env.STARTUP_PROFILE) profileRequires();
 const express = require('express');
 const http = require('http');
 const { Server } = require("socket.io");
@@ -10,19 +12,29 @@ const cors = require('cors');
 const bcrypt = require('bcrypt');
 const jwt = require('jsonwebtoken');
 const authenticateToken = require('./middleware/authenticateToken');
+const cacheByDataVersion = require('./middleware/cacheByDataVersion');
 const { applyOutcome, resolveThrow, calculateStealResult, appendScoreToLog,
   recordOutsForPitcher, recordBatterFaced, checkGameOverOrInningChange, recordRunForPitcher,
   recordStealAttempt, toRunnerCard } = require('./gameLogic');
 const { pool } = require('./db');
-const { startDraftMonitor } = require('./jobs/draftMonitor');
-const { startPhantomMonitor } = require('./jobs/phantomMonitor');
-const { verifyConnection } = require('./services/emailService');
-const { checkTeamHasPlayed } = require('./services/seasonRolloverService');
 const { matchesFranchise, getMappedIds, getFranchiseAliases } = require('./utils/franchiseUtils');
 const { mapSeasonToPointSet } = require('./utils/seasonUtils');
 const { resolveSeriesResultUpdate, seriesTypeForRound } = require('./utils/seriesUtils');
 const { schedulePlayoffsIfClinched } = require('./services/playoffSchedulingService');
-const { computeLinescore, computePitchingDecisions, computeHomeRuns, normalizeKey, cardIdOf } = require('./utils/gameSummary');
+const { refreshSeasonAggregates } = require('./services/leagueAggregateService');
+const { afterGameCompleted } = require('./services/gameCompletionHooks');
+const { recordPitcherUsage, getPitcherAvailability, initializePitcherFatigue } = require('./services/pitcherUsageService');
+const { getDataVersion, startDataVersionListener } = require('./services/dataVersions');
+const { recordGameSummary, loadSeriesSummary } = require('./services/seriesSummaryService');
+const { completeGame } = require('./services/gameResultService');
+const { syncDraftTeam } = require('./services/draftRecommendationService');
+const { matchupFor } = require('./utils/matchupSummaries');
+const { createSnapshotCache, serveSnapshot } = require('./utils/snapshotResponse');
+const { computeLinescore, computeHomeRuns, cardIdOf } = require('./utils/gameSummary');
+const { rollD20 } = require('./utils/dice');
+const { recordGameActions } = require('./services/actionLogService');
+const { lazyRouter } = require('./utils/lazyLoad');
+markStartup('modules loaded');
 
 function commitTransientPlayerIds(state) {
     for (const teamKey of ['homeTeam', 'awayTeam']) {
@@ -60,6 +72,7 @@ const REPLACEMENT_PITCHER_CARD = {
 
 const app = express();
 const server = http.createServer(app);
+app.use(trackFirstResponse);
 
 const allowedOrigins = [process.env.FRONTEND_URL, "http://localhost:5173"];
 const corsOptions = {
@@ -82,6 +95,8 @@ const PORT = process.env.PORT || 3001;
 // Database connection moved to db.js
 module.exports.pool = pool;
 app.use(express.json());
+// Game actions are recorded with their dice rolls for headless replay (replay-game-actions.js):
+// each action route below runs recordGameActions right after authenticateToken.
 app.use('/images', express.static(path.join(__dirname, 'card_images')));
 //app.use('/team_logos', express.static(path.join(__dirname, 'team_logos')));
 
@@ -729,138 +744,6 @@ async function validateLineup(participant, newState, gameId, client) {
 }
 
 
-async function initializePitcherFatigue(gameId, client) {
-    const gameResult = await client.query('SELECT series_id, game_in_series FROM games WHERE game_id = $1', [gameId]);
-    const { series_id, game_in_series } = gameResult.rows[0];
-
-    if (!series_id || game_in_series < 2) {
-        return {}; // Not a series or game 1, no fatigue to carry over.
-    }
-
-    const finalPitcherStats = {};
-
-    // 1. Fetch all previous games in the series in chronological order
-    const prevGamesResult = await client.query(
-        'SELECT game_id, game_in_series FROM games WHERE series_id = $1 AND game_in_series < $2 ORDER BY game_in_series ASC',
-        [series_id, game_in_series]
-    );
-    const prevGames = prevGamesResult.rows;
-
-    // 2. Fetch all pitchers on the rosters (IP <= 3) to track their fatigue state
-    const participants = await client.query('SELECT user_id, roster_id FROM game_participants WHERE game_id = $1', [gameId]);
-    const allRelievers = [];
-
-    for (const participant of participants.rows) {
-        const rosterCardsResult = await client.query(
-            `SELECT cp.card_id, cp.ip FROM cards_player cp JOIN roster_cards rc ON cp.card_id = rc.card_id WHERE rc.roster_id = $1 AND cp.ip IS NOT NULL AND cp.ip <= 3`,
-            [participant.roster_id]
-        );
-        const relievers = rosterCardsResult.rows.map(r => ({ ...r, owner_user_id: participant.user_id }));
-        allRelievers.push(...relievers);
-    }
-
-    // 3. Initialize tracking map: { user_id_card_id: cumulativeFatigue }
-    const pitcherFatigueScore = {};
-    allRelievers.forEach(r => {
-        pitcherFatigueScore[`${r.owner_user_id}_${r.card_id}`] = 0;
-    });
-
-    // 4. Iterate through history
-    for (const prevGame of prevGames) {
-        // Get the final state of the previous game
-        const stateResult = await client.query('SELECT state_data FROM game_states WHERE game_id = $1 ORDER BY turn_number DESC LIMIT 1', [prevGame.game_id]);
-        const finalState = stateResult.rows.length > 0 ? stateResult.rows[0].state_data : null;
-
-        if (!finalState) continue;
-
-        const stats = finalState.pitcherStats || {};
-
-        // FIX: Build a card_id -> owner_user_id map for this previous game
-        // so the plain card_id fallback only applies to the correct team.
-        const cardOwnerInPrevGame = {};
-        const prevParticipants = await client.query(
-            'SELECT user_id, roster_id FROM game_participants WHERE game_id = $1',
-            [prevGame.game_id]
-        );
-        for (const pp of prevParticipants.rows) {
-            const cardsResult = await client.query(
-                'SELECT card_id FROM roster_cards WHERE roster_id = $1',
-                [pp.roster_id]
-            );
-            cardsResult.rows.forEach(c => {
-                if (!cardOwnerInPrevGame[c.card_id]) {
-                    cardOwnerInPrevGame[c.card_id] = [];
-                }
-                cardOwnerInPrevGame[c.card_id].push(pp.user_id);
-            });
-        }
-
-        // Process game event for each reliever
-        allRelievers.forEach(reliever => {
-            const pKey = `${reliever.owner_user_id}_${reliever.card_id}`;
-
-            // FIX: Try composite key first. If not found, only fall back to plain
-            // card_id if this reliever's owner actually had the card in that game.
-            let pStats = stats[pKey];
-            if (!pStats) {
-                const ownedByThisUser = cardOwnerInPrevGame[reliever.card_id]?.includes(reliever.owner_user_id);
-                if (ownedByThisUser) {
-                    pStats = stats[reliever.card_id];
-                }
-            }
-
-            // Did they pitch?
-            const pitchedInnings = (pStats && pStats.innings_pitched) ? pStats.innings_pitched.length : 0;
-            const facedBatters = (pStats && pStats.batters_faced > 0);
-            const runs = (pStats && pStats.runs) || 0;
-            const pitchedWhileTired = (pStats && pStats.pitchedWhileTired) || false;
-
-            if (pitchedInnings > 0 || facedBatters) {
-                const runPenalty = pitchedWhileTired ? Math.floor(runs / 3) : 0;
-                const fatigueToAdd = Math.max(pitchedInnings, (facedBatters ? 1 : 0)) + runPenalty;
-                pitcherFatigueScore[pKey] = (pitcherFatigueScore[pKey] || 0) + fatigueToAdd;
-            } else {
-                // Did not pitch -> Recovery
-                pitcherFatigueScore[pKey] = Math.max(0, (pitcherFatigueScore[pKey] || 0) - 1);
-            }
-        });
-
-        // Process Travel Day (After Game 2 and After Game 5)
-        if (prevGame.game_in_series === 2 || prevGame.game_in_series === 5) {
-            allRelievers.forEach(reliever => {
-                const pKey = `${reliever.owner_user_id}_${reliever.card_id}`;
-                pitcherFatigueScore[pKey] = Math.max(0, (pitcherFatigueScore[pKey] || 0) - 1);
-            });
-        }
-    }
-
-    // 5. Calculate Final Modifiers for Current Game
-    allRelievers.forEach(reliever => {
-        const pKey = `${reliever.owner_user_id}_${reliever.card_id}`;
-        const score = pitcherFatigueScore[pKey] || 0;
-        const allowedBuffer = Math.max(0, reliever.ip - 1);
-
-        const penalty = Math.max(0, score - allowedBuffer);
-        const isBufferUsed = (score > 0 && penalty === 0);
-
-        if (penalty > 0 || isBufferUsed) {
-            finalPitcherStats[pKey] = {
-                runs: 0,
-                innings_pitched: [],
-                fatigue_modifier: -penalty,
-                isBufferUsed: isBufferUsed
-            };
-
-            // FIX: Removed the backward-compat alias that wrote to plain card_id.
-            // All downstream code (getEffectiveControl, processRosterFatigue) already
-            // checks composite key first via the ownerUserId fallback pattern, so
-            // the plain key is no longer needed and was causing cross-team contamination.
-        }
-    });
-
-    return finalPitcherStats;
-}
-
 async function createInningChangeEvent(gameId, finalState, userId, turnNumber, client) {
     const participants = await client.query('SELECT * from game_participants WHERE game_id = $1', [gameId]);
     const game = await client.query('SELECT home_team_user_id FROM games WHERE game_id = $1', [gameId]);
@@ -941,6 +824,12 @@ async function handleSeriesProgression(gameId, client, finalState) {
     const gameAwayParticipant = participantsResult.rows.find(p => p.user_id !== game_home_user_id);
     const gameAwayUserId = gameAwayParticipant.user_id;
 
+    // 1b. Record this game's pitcher usage for the rest of the series (rotation + fatigue).
+    // The final game_state is inserted after this runs, so use finalState's stats directly.
+    await recordPitcherUsage(client, gameId, finalState.pitcherStats || {});
+    // ...and its entry in the series summary the series page reads, once the final state commits.
+    afterGameCompleted(client, gameId, 'series summary', db => recordGameSummary(db, gameId));
+
     // 2. Update series home/away users if it's the first game and not set yet.
     // FIX: Align series_home_user_id with whoever was actually home in Game 1,
     // since the creator may have lost the setup roll and been away.
@@ -955,17 +844,14 @@ async function handleSeriesProgression(gameId, client, finalState) {
 
     // 3. Recompute the series score from every completed game rather than blind-incrementing. This is
     // idempotent: replaying/re-completing a game (e.g. a dev snapshot restore) can't double-count, and
-    // a tally that drifted self-heals. The current game's final game_state may not be persisted yet, so
-    // use finalState for it and each other completed game's latest state.
+    // a tally that drifted self-heals. completeGame has already written this game's winning_side.
     const completedGamesRes = await client.query(`
-        SELECT g.game_id, g.home_team_user_id,
-               (SELECT gs.state_data->>'winningTeam' FROM game_states gs
-                 WHERE gs.game_id = g.game_id ORDER BY gs.turn_number DESC LIMIT 1) AS winning_side
+        SELECT g.game_id, g.home_team_user_id, g.winning_side
         FROM games g WHERE g.series_id = $1 AND g.status = 'completed'`, [series_id]);
     home_wins = 0;
     away_wins = 0;
     for (const g of completedGamesRes.rows) {
-        const side = Number(g.game_id) === Number(gameId) ? finalState.winningTeam : g.winning_side;
+        const side = g.winning_side;
         if (side !== 'home' && side !== 'away') continue;
         // A series has two participants, so the away user of any game is whichever isn't its home user.
         const gameAwayUser = g.home_team_user_id === series_home_user_id ? series_away_user_id : series_home_user_id;
@@ -1016,7 +902,8 @@ async function handleSeriesProgression(gameId, client, finalState) {
                 `UPDATE series_results SET
                     status = $1, result_source = $2,
                     winning_team_id = $3, winning_team_name = $4, winning_score = $5,
-                    losing_team_id = $6, losing_team_name = $7, losing_score = $8
+                    losing_team_id = $6, losing_team_name = $7, losing_score = $8,
+                    completed_at = now()
                  WHERE id = $9`,
                 [
                     update.status, update.result_source,
@@ -1025,6 +912,10 @@ async function handleSeriesProgression(gameId, client, finalState) {
                     series_result_id,
                 ]
             );
+
+            // The stored league standings/matrix are refreshed once this completion commits.
+            const seasonToRefresh = scheduledSeasonName;
+            afterGameCompleted(client, gameId, 'league aggregates', db => refreshSeasonAggregates(db, seasonToRefresh));
         }
     }
 
@@ -1129,7 +1020,8 @@ async function handleSeriesProgression(gameId, client, finalState) {
 
 // --- API Routes ---
 
-app.use('/api/dev', require('./routes/dev'));
+// The dev tools are rarely used, so they're loaded on their first request.
+app.use('/api/dev', lazyRouter(() => require('./routes/dev')));
 app.use('/api/draft', require('./routes/draft'));
 app.use('/api/league', require('./routes/league'));
 app.use('/api/classic', require('./routes/classic'));
@@ -1137,7 +1029,14 @@ app.use('/api/teams', require('./routes/teams'));
 
 // Global captaincy data for client-side card badges: per-team-season captains,
 // current captains, Faces, and Core Squad members, plus team colors/logos.
-app.get('/api/captaincies', authenticateToken, async (req, res) => {
+// Cached against the captaincy document being served (it's recomputed in the background, so
+// the data_versions key can run ahead of it) and the teams table.
+const captaincyResponseCache = cacheByDataVersion('captaincies', {
+    tables: ['teams'],
+    version: () => require('./services/captaincyService').servedCaptaincyVersion(),
+    max: 2,
+});
+app.get('/api/captaincies', authenticateToken, captaincyResponseCache, async (req, res) => {
     try {
         const { getCaptaincies } = require('./services/captaincyService');
         const data = await getCaptaincies();
@@ -1322,6 +1221,7 @@ app.post('/api/my-roster', authenticateToken, async (req, res) => {
                 const isFinished = finishedRes.rows.length > 0;
 
                 if (!isFinished) {
+                    const { checkTeamHasPlayed } = require('./services/seasonRolloverService');
                     const hasPlayed = await checkTeamHasPlayed(pool, userId, seasonName);
                     if (hasPlayed) {
                         return res.status(403).json({ message: "Roster is locked because your team has already played a game this season." });
@@ -1361,6 +1261,7 @@ app.post('/api/my-roster', authenticateToken, async (req, res) => {
         const existingRoster = await client.query(existingRosterQuery, existingRosterParams);
         let rosterId;
         let oldCards = [];
+        let draftTurn = null;
 
         if (existingRoster.rows.length > 0) {
             rosterId = existingRoster.rows[0].roster_id;
@@ -1421,7 +1322,8 @@ app.post('/api/my-roster', authenticateToken, async (req, res) => {
                         [state.season_name, roundName, state.active_team_id, id, state.current_pick_number]
                     );
                 }
-                io.emit('draft-updated');
+                draftTurn = { seasonName: state.season_name, teamId: state.active_team_id };
+                io.to('draft').emit('draft-updated');
             }
         } else {
             // Not a draft turn. Check if we need to send a roster update email (League only).
@@ -1502,6 +1404,14 @@ app.post('/api/my-roster', authenticateToken, async (req, res) => {
         
         await client.query('COMMIT');
         res.status(201).json({ message: 'Roster saved successfully!' });
+
+        if (draftTurn) {
+            try {
+                await syncDraftTeam(client, draftTurn.seasonName, draftTurn.teamId);
+            } catch (e) {
+                console.error('Draft recommendation sync error:', e);
+            }
+        }
     } catch (error) {
         await client.query('ROLLBACK');
         console.error('Roster save error:', error);
@@ -1513,7 +1423,7 @@ app.post('/api/my-roster', authenticateToken, async (req, res) => {
 
 // POST /api/games/:gameId/lineup (This is where the bug was)
 // in server.js
-app.post('/api/games/:gameId/lineup', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/lineup', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   const userId = req.user.userId;
   const { battingOrder, startingPitcher } = req.body;
@@ -1751,7 +1661,7 @@ function validatePitcherSubstitution(gameState, playerOutCard, playerOutId, star
     return { isValid: true };
 }
 
-app.post('/api/games/:gameId/substitute', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/substitute', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   const { playerInId, playerOutId, position, lineupIndex } = req.body;
   const userId = req.user.userId;
@@ -2206,7 +2116,7 @@ const stateResult = await client.query('SELECT * FROM game_states WHERE game_id
 });
 
 // SWAP DEFENSIVE POSITIONS
-app.post('/api/games/:gameId/swap-positions', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/swap-positions', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   const { playerAId, playerBId } = req.body;
   const userId = req.user.userId;
@@ -2288,7 +2198,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
 });
 
 // SET DEFENSIVE STRATEGY (e.g., Infield In)
-app.post('/api/games/:gameId/set-defense', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/set-defense', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   const { infieldIn } = req.body; // Expecting { infieldIn: true } or { infieldIn: false }
   const client = await pool.connect();
@@ -2601,24 +2511,30 @@ app.get('/api/series/:id', authenticateToken, async (req, res) => {
     if (awayUser == null) awayUser = allUsers.find(u => u !== homeUser) ?? null;
 
     const gamesRes = await pool.query(
-      `SELECT game_id, game_in_series, status, home_team_user_id, completed_at, created_at
+      `SELECT game_id, game_in_series, status, home_team_user_id, completed_at, created_at,
+              home_score, away_score, final_inning
        FROM games WHERE series_id = $1 ORDER BY game_in_series ASC`,
       [id]
     );
     const gameIds = gamesRes.rows.map(g => g.game_id);
 
     // Batched up front so the games loop makes no per-game DB round-trips:
-    //  - latest state per game (scores, linescore, decisions, HR)
+    //  - completed games from the stored series summary (scores, linescore, decisions, HR)
+    //  - latest state for games still in progress
     //  - participants (probable-SP matchup on not-yet-played games)
+    const completedGames = gamesRes.rows.filter(g => g.status === 'completed');
+    const summary = await loadSeriesSummary(pool, id, completedGames);
     const stateByGame = {};
     const partsByGame = {};
-    if (gameIds.length) {
+    const liveIds = gamesRes.rows.filter(g => g.status === 'in_progress').map(g => g.game_id);
+    if (liveIds.length) {
       const stRes = await pool.query(`
         SELECT DISTINCT ON (game_id) game_id, state_data
         FROM game_states WHERE game_id = ANY($1)
-        ORDER BY game_id, turn_number DESC`, [gameIds]);
+        ORDER BY game_id, turn_number DESC`, [liveIds]);
       for (const r of stRes.rows) stateByGame[r.game_id] = r.state_data;
-
+    }
+    if (gameIds.length) {
       const prRes = await pool.query(
         'SELECT game_id, user_id, lineup FROM game_participants WHERE game_id = ANY($1)', [gameIds]);
       for (const r of prRes.rows) (partsByGame[r.game_id] = partsByGame[r.game_id] || []).push(r);
@@ -2631,7 +2547,18 @@ app.get('/api/series/:id', authenticateToken, async (req, res) => {
       const gAwayUser = allUsers.find(u => u !== gHomeUser) ?? (gHomeUser === homeUser ? awayUser : homeUser);
 
       let homeScore = null, awayScore = null, inning = null, linescore = null, decisionsRaw = null, hrRaw = null;
-      if (g.status === 'in_progress' || g.status === 'completed') {
+      if (g.status === 'completed') {
+        const entry = summary.games[g.game_id];
+        homeScore = g.home_score;
+        awayScore = g.away_score;
+        inning = g.final_inning;
+        if (entry) {
+          if (homeScore == null) { homeScore = entry.home_score; awayScore = entry.away_score; inning = entry.inning; }
+          linescore = entry.linescore;
+          hrRaw = entry.home_runs;
+          decisionsRaw = entry.decisions;
+        }
+      } else if (g.status === 'in_progress') {
         const d = stateByGame[g.game_id];
         if (d) {
           homeScore = d.homeScore ?? null;
@@ -2639,18 +2566,10 @@ app.get('/api/series/:id', authenticateToken, async (req, res) => {
           inning = d.inning ?? null;
           linescore = computeLinescore(d.atBatLog);
           hrRaw = computeHomeRuns(d.atBatLog);
-          Object.keys(hrRaw).forEach(cid => { const n = parseInt(cid); if (n) nameCardIds.add(n); });
-          // Innings pitched (outs) per pitcher, for the W-must-go-5 / save-3-innings rules.
-          const outsByKey = {};
-          for (const [k, v] of Object.entries(d.pitcherStats || {})) {
-            outsByKey[normalizeKey(k)] = (v && v.outs_recorded != null) ? v.outs_recorded : ((v && v.innings_pitched) ? v.innings_pitched.length * 3 : 0);
-          }
-          if (g.status === 'completed') {
-            decisionsRaw = computePitchingDecisions(d.atBatLog || [], { away: { user_id: gAwayUser }, home: { user_id: gHomeUser } }, outsByKey);
-            Object.keys(decisionsRaw).forEach(k => { const cid = parseInt(cardIdOf(k)); if (cid) nameCardIds.add(cid); });
-          }
         }
       }
+      if (hrRaw) Object.keys(hrRaw).forEach(cid => { const n = parseInt(cid); if (n) nameCardIds.add(n); });
+      if (decisionsRaw) Object.keys(decisionsRaw).forEach(k => { const cid = parseInt(cardIdOf(k)); if (cid) nameCardIds.add(cid); });
       // Not-yet-played game: if the players have set their lineups, surface the starting-pitcher matchup.
       let probableSP = null;
       if (g.status === 'pending' || g.status === 'lineups') {
@@ -2779,88 +2698,50 @@ app.get('/api/series/:id', authenticateToken, async (req, res) => {
 });
 
 // SERIES BOX-SCORE DATA: lean box-score inputs for one series' completed games.
-// Returns a shared card pool + per-game { atBatLog, pitcherStats, home/away user_id, starting
-// pitchers } so the client can rebuild each game's box score with the same buildBoxScore() and fold
-// them into a cumulative series box score. Mirrors GET /api/league/leaders-data — we deliberately do
-// NOT reuse getAndProcessGameData here (it re-reads every card + the full event log per game); this
-// ships only what the box score needs, in a handful of set-based queries.
+// Returns a shared card pool + per-game { precomputed batting/pitching lines, pitcher decisions,
+// home/away user_id, starting pitchers } from the stored series summary (written as each game
+// completes, see services/seriesSummaryService.js), which the client names and folds into a
+// cumulative series box score. No game state is read or shipped.
 app.get('/api/series/:id/box-score-data', authenticateToken, async (req, res) => {
   const { id } = req.params;
-  const client = await pool.connect();
   try {
-    // Completed games in this series.
-    const gamesRes = await client.query(
-      `SELECT game_id, home_team_user_id FROM games WHERE series_id = $1 AND status = 'completed'`,
+    const gamesRes = await pool.query(
+      `SELECT game_id, game_in_series, completed_at FROM games
+       WHERE series_id = $1 AND status = 'completed' ORDER BY game_in_series ASC`,
       [id]
     );
-    const gameIds = gamesRes.rows.map(r => r.game_id);
-    if (gameIds.length === 0) return res.json({ series_id: id, games: [], cards: [], teams: {} });
-
-    const homeByGame = {};
-    for (const r of gamesRes.rows) homeByGame[r.game_id] = r.home_team_user_id;
-
-    // Participants → the away user per game (non-home participant), the full user set, and the
-    // starting pitcher card_id per side (from lineup.startingPitcher, as getAndProcessGameData reads).
-    const partRes = await client.query(
-      'SELECT game_id, user_id, lineup FROM game_participants WHERE game_id = ANY($1)', [gameIds]);
-    const usersByGame = {};
-    const spByGameUser = {};
-    const userSet = new Set();
-    for (const r of partRes.rows) {
-      (usersByGame[r.game_id] = usersByGame[r.game_id] || []).push(r.user_id);
-      userSet.add(r.user_id);
-      const sp = r.lineup && r.lineup.startingPitcher != null ? parseInt(r.lineup.startingPitcher) : null;
-      spByGameUser[`${r.game_id}_${r.user_id}`] = Number.isNaN(sp) ? null : sp;
-    }
-
-    // Latest state per game (atBatLog + pitcherStats live in the newest game_state).
-    const stateRes = await client.query(`
-      SELECT DISTINCT ON (game_id) game_id, state_data
-      FROM game_states WHERE game_id = ANY($1)
-      ORDER BY game_id, turn_number DESC`, [gameIds]);
-    const stateByGame = {};
-    for (const r of stateRes.rows) stateByGame[r.game_id] = r.state_data;
+    if (gamesRes.rows.length === 0) return res.json({ series_id: id, games: [], cards: [], teams: {} });
 
-    // Teams (for display + colors) keyed by user_id.
-    const teamsRes = await client.query(
-      'SELECT user_id, team_id, city, name, abbreviation, logo_url, primary_color FROM teams WHERE user_id = ANY($1)',
-      [[...userSet]]);
-    const teams = {};
-    for (const t of teamsRes.rows) teams[t.user_id] = t;
-
-    // Shared card pool: union of every roster used in this series (names + full cards for the modal).
-    const rostersRes = await client.query('SELECT roster_data FROM game_rosters WHERE game_id = ANY($1)', [gameIds]);
-    const cardMap = new Map();
-    for (const row of rostersRes.rows) {
-      for (const c of row.roster_data || []) {
-        if (c && c.card_id != null && !cardMap.has(c.card_id)) cardMap.set(c.card_id, c);
-      }
-    }
+    const summary = await loadSeriesSummary(pool, id, gamesRes.rows);
 
     const games = [];
-    for (const gid of gameIds) {
-      const state = stateByGame[gid];
-      if (!state || !Array.isArray(state.atBatLog) || state.atBatLog.length === 0) continue;
-      const homeUserId = homeByGame[gid];
-      const awayUserId = (usersByGame[gid] || []).find(u => u !== homeUserId);
+    const userSet = new Set();
+    for (const g of gamesRes.rows) {
+      const entry = summary.games[g.game_id];
+      if (!entry || !entry.linescore) continue; // no plays recorded
+      userSet.add(entry.home_user_id);
+      userSet.add(entry.away_user_id);
       games.push({
-        game_id: gid,
-        homeUserId,
-        awayUserId,
-        startingPitchers: {
-          home: spByGameUser[`${gid}_${homeUserId}`] ?? null,
-          away: spByGameUser[`${gid}_${awayUserId}`] ?? null,
-        },
-        state: { atBatLog: state.atBatLog, pitcherStats: state.pitcherStats || {} },
+        game_id: g.game_id,
+        homeUserId: entry.home_user_id,
+        awayUserId: entry.away_user_id,
+        startingPitchers: entry.starting_pitchers,
+        box: entry.box,
+        decisions: entry.decisions,
       });
     }
 
-    res.json({ series_id: id, games, cards: [...cardMap.values()], teams });
+    // Teams (for display + colors) keyed by user_id.
+    const teamsRes = await pool.query(
+      'SELECT user_id, team_id, city, name, abbreviation, logo_url, primary_color FROM teams WHERE user_id = ANY($1)',
+      [[...userSet].filter(u => u != null)]);
+    const teams = {};
+    for (const t of teamsRes.rows) teams[t.user_id] = t;
+
+    res.json({ series_id: id, games, cards: Object.values(summary.cards || {}), teams });
   } catch (error) {
     console.error('Error building series box-score data:', error);
     res.status(500).json({ message: 'Server error building series box-score data.' });
-  } finally {
-    client.release();
   }
 });
 
@@ -2871,7 +2752,8 @@ app.get('/api/games', authenticateToken, async (req, res) => {
   try {
     // Filter out games that are hidden for this user
     const gamesResult = await pool.query(
-      `SELECT g.game_id, g.status, g.current_turn_user_id, g.home_team_user_id, g.game_in_series, g.created_at, g.completed_at, g.series_id
+      `SELECT g.game_id, g.status, g.current_turn_user_id, g.home_team_user_id, g.game_in_series, g.created_at, g.completed_at, g.series_id,
+              g.winning_side, g.home_score, g.away_score, g.final_inning
        FROM games g JOIN game_participants gp ON g.game_id = gp.game_id 
        WHERE gp.user_id = $1 AND (gp.is_hidden IS FALSE OR gp.is_hidden IS NULL)
        ORDER BY g.created_at DESC`,
@@ -2915,7 +2797,10 @@ app.get('/api/games', authenticateToken, async (req, res) => {
         }
 
         let gameState = null;
-        if (game.status === 'in_progress' || game.status === 'completed') {
+        if (game.status === 'completed' && game.home_score != null) {
+            // The scorecard only shows the final score for finished games.
+            gameState = { homeScore: game.home_score, awayScore: game.away_score, inning: game.final_inning, winningTeam: game.winning_side, gameOver: true };
+        } else if (game.status === 'in_progress' || game.status === 'completed') {
             const stateResult = await pool.query(
                 'SELECT state_data FROM game_states WHERE game_id = $1 ORDER BY turn_number DESC LIMIT 1',
                 [game.game_id]
@@ -2957,7 +2842,8 @@ app.get('/api/games', authenticateToken, async (req, res) => {
 });
 
 // GET ALL POINT SETS
-app.get('/api/point-sets', authenticateToken, async (req, res) => {
+const pointSetsResponseCache = cacheByDataVersion('point-sets', { tables: ['point_sets'], max: 2 });
+app.get('/api/point-sets', authenticateToken, pointSetsResponseCache, async (req, res) => {
   try {
     // created_at is a bulk-insert timestamp for most sets, so sort by the season the
     // set actually represents (newest first). "M/D Season" names need the year, which
@@ -2987,58 +2873,65 @@ app.get('/api/point-sets', authenticateToken, async (req, res) => {
   }
 });
 
+// Compressed /api/cards/player snapshots (one per point set in use) and ownership documents.
+const cardCatalogSnapshots = createSnapshotCache(8);
+const cardOwnershipSnapshots = createSnapshotCache(2);
+
 // GET ALL PLAYER CARDS (now with points from a specific set)
+// Served from per-point-set snapshots: static card fields + points, serialized and compressed
+// once per card_catalog version. Ownership is volatile and ships separately (/api/cards/ownership)
+// so a roster move doesn't invalidate the whole card pool. Repeat loads are a 304 with no DB work.
 app.get('/api/cards/player', authenticateToken, async (req, res) => {
-    const { point_set_id } = req.query;
+    const pointSetId = parseInt(req.query.point_set_id, 10);
 
-    if (!point_set_id) {
+    if (!Number.isInteger(pointSetId)) {
         return res.status(400).json({ message: 'A point_set_id is required.' });
     }
 
     try {
-        const query = `
-            SELECT DISTINCT ON (cp.card_id)
-                cp.*,
-                ppv.points,
-                t.team_id as owned_by_team_id,
-                t.logo_url as owned_by_team_logo,
-                t.name as owned_by_team_name
-            FROM cards_player cp
-            LEFT JOIN player_point_values ppv ON cp.card_id = ppv.card_id AND ppv.point_set_id = $1
-            LEFT JOIN roster_cards rc ON cp.card_id = rc.card_id
-            LEFT JOIN rosters r ON rc.roster_id = r.roster_id AND r.roster_type = 'league'
-            LEFT JOIN users u ON r.user_id = u.user_id
-            LEFT JOIN teams t ON u.team_id = t.team_id
-            ORDER BY cp.display_name;
-        `;
-        // Note: DISTINCT ON requires ORDER BY to start with the DISTINCT columns.
-        // We modify ORDER BY to ensure valid SQL.
-        const distinctQuery = `
-            SELECT DISTINCT ON (cp.display_name, cp.card_id)
-                cp.*,
-                ppv.points,
-                t.team_id as owned_by_team_id,
-                t.logo_url as owned_by_team_logo,
-                t.name as owned_by_team_name,
-                t.city as owned_by_team_city
-            FROM cards_player cp
-            LEFT JOIN player_point_values ppv ON cp.card_id = ppv.card_id AND ppv.point_set_id = $1
-            LEFT JOIN roster_cards rc ON cp.card_id = rc.card_id
-            LEFT JOIN rosters r ON rc.roster_id = r.roster_id AND r.roster_type = 'league'
-            LEFT JOIN users u ON r.user_id = u.user_id
-            LEFT JOIN teams t ON u.team_id = t.team_id
-            ORDER BY cp.display_name, cp.card_id, t.team_id;
-        `;
-
-        const allCardsResult = await pool.query(distinctQuery, [point_set_id]);
-        const processedCards = processPlayers(allCardsResult.rows);
-        res.json(processedCards);
+        const version = await getDataVersion('card_catalog');
+        await serveSnapshot(req, res, cardCatalogSnapshots, `catalog-${pointSetId}-v${version}`, async () => {
+            const allCardsResult = await pool.query(`
+                SELECT cp.*, ppv.points
+                FROM cards_player cp
+                LEFT JOIN player_point_values ppv ON cp.card_id = ppv.card_id AND ppv.point_set_id = $1
+                ORDER BY cp.display_name, cp.card_id
+            `, [pointSetId]);
+            return processPlayers(allCardsResult.rows);
+        });
     } catch (error) {
         console.error('Error fetching player cards with points:', error);
         res.status(500).json({ message: 'Server error fetching player cards.' });
     }
 });
 
+// GET LEAGUE CARD OWNERSHIP ({ version, owners: { card_id: { team_id, logo_url, name, city } } })
+// The volatile half of the card catalog, versioned by roster changes. A card on more than one
+// league roster is credited to the lowest team_id, as the combined query used to.
+app.get('/api/cards/ownership', authenticateToken, async (req, res) => {
+    try {
+        const version = await getDataVersion('roster_ownership');
+        await serveSnapshot(req, res, cardOwnershipSnapshots, `ownership-v${version}`, async () => {
+            const ownersResult = await pool.query(`
+                SELECT DISTINCT ON (rc.card_id) rc.card_id, t.team_id, t.logo_url, t.name, t.city
+                FROM roster_cards rc
+                JOIN rosters r ON rc.roster_id = r.roster_id AND r.roster_type = 'league'
+                JOIN users u ON r.user_id = u.user_id
+                JOIN teams t ON u.team_id = t.team_id
+                ORDER BY rc.card_id, t.team_id
+            `);
+            const owners = {};
+            ownersResult.rows.forEach(o => {
+                owners[o.card_id] = { team_id: o.team_id, logo_url: o.logo_url, name: o.name, city: o.city };
+            });
+            return { version, owners };
+        });
+    } catch (error) {
+        console.error('Error fetching card ownership:', error);
+        res.status(500).json({ message: 'Server error fetching card ownership.' });
+    }
+});
+
 // GET A PLAYER'S LEAGUE HISTORY (season-by-season usage + honors)
 app.get('/api/players/:cardId/league-history', authenticateToken, async (req, res) => {
     const cardId = parseInt(req.params.cardId, 10);
@@ -3084,20 +2977,15 @@ app.get('/api/players/:cardId/league-history', authenticateToken, async (req, re
         ]);
         const currentTeams = teamsRes.rows;
         const series = seriesRes.rows;
-        const { findTeamForRecord } = require('./utils/standingsUtils');
+        const { getFranchiseIndex } = require('./utils/franchiseIndex');
 
         const LEAGUE_DIAMONDS = ['Golden Spaceship', 'Wooden Spoon'];
         const isPhantom = (n) => (n || '').includes('Phantoms');
 
         // Resolve any historical team name to its current franchise identity (handles
-        // renames/aliases like San Diego→Boston, Fargo/NY South→Los Angeles), cached.
-        const fCache = {};
-        const fInfo = (name, id) => {
-            const ck = `${name || ''}|${id || ''}`;
-            if (fCache[ck]) return fCache[ck];
-            const t = findTeamForRecord(name, id, currentTeams);
-            return (fCache[ck] = { key: t.team_id ? `ID-${t.team_id}` : `NAME-${(t.name || '').trim()}`, name: t.name });
-        };
+        // renames/aliases like San Diego→Boston, Fargo/NY South→Los Angeles).
+        const franchiseIndex = getFranchiseIndex(currentTeams);
+        const fInfo = (name, id) => franchiseIndex.keyFor(name, id);
 
         // Per-season, per-franchise W-L + era name, kept separately for league play and
         // the Classic (a parallel competition); plus which franchise took each diamond.
@@ -3372,17 +3260,12 @@ app.get('/api/players/league-stats', authenticateToken, async (req, res) => {
         ]);
         const currentTeams = teamsRes.rows;
         const series = seriesRes.rows;
-        const { findTeamForRecord } = require('./utils/standingsUtils');
+        const { getFranchiseIndex } = require('./utils/franchiseIndex');
         const isPhantom = (n) => (n || '').includes('Phantoms');
         const LEAGUE_DIAMONDS = ['Golden Spaceship', 'Wooden Spoon'];
 
-        const fCache = {};
-        const fInfo = (name, id) => {
-            const ck = `${name || ''}|${id || ''}`;
-            if (fCache[ck]) return fCache[ck];
-            const t = findTeamForRecord(name, id, currentTeams);
-            return (fCache[ck] = { key: t.team_id ? `ID-${t.team_id}` : `NAME-${(t.name || '').trim()}`, name: t.name });
-        };
+        const franchiseIndex = getFranchiseIndex(currentTeams);
+        const fInfo = (name, id) => franchiseIndex.keyFor(name, id);
 
         // Per-season franchise regular-season W-L (league only) and diamond winners.
         const leagueFr = {};
@@ -3602,11 +3485,12 @@ app.post('/api/games', authenticateToken, async (req, res) => {
     try {
         await client.query('BEGIN');
         let gameId;
+        let launchedSeasonName = null;
 
         if (series_result_id) {
             // Lock the scheduled row so two owners can't both launch the same matchup at once.
             const schedRes = await client.query(
-                `SELECT id, round, style, status, winning_team_id, losing_team_id
+                `SELECT id, season_name, round, style, status, winning_team_id, losing_team_id
                  FROM series_results WHERE id = $1 FOR UPDATE`,
                 [series_result_id]
             );
@@ -3615,6 +3499,7 @@ app.post('/api/games', authenticateToken, async (req, res) => {
                 return res.status(404).json({ message: 'Scheduled series not found.' });
             }
             const sched = schedRes.rows[0];
+            launchedSeasonName = sched.season_name;
 
             // The launcher must be one of the two teams in this scheduled matchup.
             const teamRes = await client.query('SELECT team_id FROM users WHERE user_id = $1', [userId]);
@@ -3663,6 +3548,8 @@ app.post('/api/games', authenticateToken, async (req, res) => {
         await client.query(`INSERT INTO game_participants (game_id, user_id, roster_id, home_or_away, league_designation) VALUES ($1, $2, $3, $4, $5)`, [gameId, userId, roster_id, home_or_away, league_designation]);
 
         await client.query('COMMIT');
+        // The League page deep-links a launched series; refresh its stored season summary. Best-effort.
+        if (launchedSeasonName) refreshSeasonAggregates(pool, launchedSeasonName);
         io.emit('games-updated');
         res.status(201).json({ message: 'Game created and waiting for an opponent.', gameId: gameId });
     } catch (error) {
@@ -3675,7 +3562,7 @@ app.post('/api/games', authenticateToken, async (req, res) => {
 });
 
 // SET UP GAME DETAILS (HOME TEAM, DH RULE)
-app.post('/api/games/:gameId/setup', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/setup', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   const { homeTeamUserId, useDh } = req.body;
 
@@ -3776,7 +3663,7 @@ app.get('/api/games/:gameId/setup', authenticateToken, async (req, res) => {
 });
 
 // ROLL FOR HOME TEAM CHOICE
-app.post('/api/games/:gameId/roll', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/roll', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   const userId = req.user.userId;
 
@@ -3789,7 +3676,7 @@ app.post('/api/games/:gameId/roll', authenticateToken, async (req, res) => {
 
     // Generate and store the roll if the user hasn't rolled yet
     if (!rolls[userId]) {
-        rolls[userId] = Math.floor(Math.random() * 20) + 1;
+        rolls[userId] = rollD20();
     }
 
     await client.query('UPDATE games SET setup_rolls = $1 WHERE game_id = $2', [rolls, gameId]);
@@ -3808,7 +3695,7 @@ app.post('/api/games/:gameId/roll', authenticateToken, async (req, res) => {
   }
 });
 
-app.post('/api/games/:gameId/declare-home', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/declare-home', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   const { homeTeamUserId } = req.body;
   try {
@@ -3827,7 +3714,7 @@ app.post('/api/games/:gameId/declare-home', authenticateToken, async (req, res)
   }
 });
 
-app.post('/api/games/:gameId/join', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/join', authenticateToken, recordGameActions, async (req, res) => {
     const { gameId } = req.params;
     const { roster_id } = req.body;
     const joiningUserId = req.user.userId;
@@ -3916,9 +3803,7 @@ async function getAndProcessGameData(gameId, dbClient) {
       if (series && game.status === 'completed') {
           try {
               const prevGamesResult = await dbClient.query(`
-                  SELECT g.game_id, g.home_team_user_id,
-                         (SELECT state_data->>'winningTeam' FROM game_states gs WHERE gs.game_id = g.game_id ORDER BY turn_number DESC LIMIT 1) as winning_team,
-                         (SELECT user_id FROM game_participants gp WHERE gp.game_id = g.game_id AND gp.user_id != g.home_team_user_id LIMIT 1) as away_team_user_id
+                  SELECT g.game_id, g.winning_user_id
                   FROM games g
                   WHERE g.series_id = $1 AND g.game_in_series <= $2 AND g.status = 'completed'
               `, [game.series_id, game.game_in_series]);
@@ -3927,7 +3812,8 @@ async function getAndProcessGameData(gameId, dbClient) {
               let histAwayWins = 0;
 
               for (const row of prevGamesResult.rows) {
-                  const winnerId = row.winning_team === 'home' ? row.home_team_user_id : row.away_team_user_id;
+                  const winnerId = row.winning_user_id;
+                  if (winnerId == null) continue;
                   if (winnerId === series.series_home_user_id) {
                       histHomeWins++;
                   } else {
@@ -4103,7 +3989,7 @@ app.get('/api/games/:gameId', authenticateToken, async (req, res) => {
 });
 
 // in server.js
-app.post('/api/games/:gameId/set-action', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/set-action', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   const { action } = req.body;
   const userId = req.user.userId;
@@ -4162,7 +4048,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
       if (action === 'bunt') {
           outcome = 'BUNT';
       } else { // 'swing'
-          swingRoll = Math.floor(Math.random() * 20) + 1;
+          swingRoll = rollD20();
           chartHolder = advantage === 'pitcher' ? pitcher : batter;
           for (const range in chartHolder.chart_data) {
               const [min, max] = range.split('-').map(Number);
@@ -4234,11 +4120,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
 
       // --- NEW: Check for Game Over ---
       if (finalState.gameOver) {
-        const updateResult = await client.query(
-          `UPDATE games SET status = 'completed', completed_at = NOW() WHERE game_id = $1 AND status != 'completed'`,
-          [gameId]
-        );
-        if (updateResult.rowCount > 0) {
+        if (await completeGame(client, gameId, finalState)) {
             await handleSeriesProgression(gameId, client, finalState);
         }
       }
@@ -4258,7 +4140,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
   }
 });
 
-app.post('/api/games/:gameId/pitch', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/pitch', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   const { action } = req.body;
   const userId = req.user.userId;
@@ -4343,18 +4225,14 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
         }
 
         if (finalState.gameOver) {
-            const updateResult = await client.query(
-                `UPDATE games SET status = 'completed', completed_at = NOW() WHERE game_id = $1 AND status != 'completed'`,
-                [gameId]
-            );
-            if (updateResult.rowCount > 0) {
+            if (await completeGame(client, gameId, finalState)) {
                 await handleSeriesProgression(gameId, client, finalState);
             }
         } else {
             await client.query('UPDATE games SET current_turn_user_id = $1 WHERE game_id = $2', [0, gameId]);
         }
     } else {
-        const pitchRoll = Math.floor(Math.random() * 20) + 1;
+        const pitchRoll = rollD20();
 
         // --- THIS IS THE FIX: Calculate controlPenalty directly in this route ---
         let controlPenalty = 0;
@@ -4413,7 +4291,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
             if (finalState.currentAtBat.batterAction === 'bunt') {
                 outcome = 'BUNT';
             } else {
-                swingRoll = Math.floor(Math.random() * 20) + 1;
+                swingRoll = rollD20();
                 chartHolder = advantage === 'pitcher' ? pitcher : batter;
                 for (const range in chartHolder.chart_data) {
                     const [min, max] = range.split('-').map(Number);
@@ -4489,11 +4367,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
 
             // --- NEW: Check for Game Over ---
             if (finalState.gameOver) {
-              const updateResult = await client.query(
-                `UPDATE games SET status = 'completed', completed_at = NOW() WHERE game_id = $1 AND status != 'completed'`,
-                [gameId]
-              );
-              if (updateResult.rowCount > 0) {
+              if (await completeGame(client, gameId, finalState)) {
                   await handleSeriesProgression(gameId, client, finalState);
               }
             }
@@ -4514,7 +4388,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
   }
 });
 
-app.post('/api/games/:gameId/swing', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/swing', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   const client = await pool.connect();
   try {
@@ -4542,7 +4416,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
 });
 
 // in server.js
-app.post('/api/games/:gameId/next-hitter', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/next-hitter', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   const userId = req.user.userId;
   const client = await pool.connect();
@@ -4777,7 +4651,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
 // in server.js
 
 // NEW ENDPOINT for Infield In Defense Choice
-app.post('/api/games/:gameId/resolve-infield-in-defense-choice', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/resolve-infield-in-defense-choice', authenticateToken, recordGameActions, async (req, res) => {
     const { gameId } = req.params;
     const { throwHome } = req.body; // true or false
     const userId = req.user.userId;
@@ -4803,7 +4677,7 @@ app.post('/api/games/:gameId/resolve-infield-in-defense-choice', authenticateTok
         if (throwHome) {
             const infieldDefense = await getInfieldDefense(defensiveTeam);
             const runnerSpeed = getSpeedValue(runnerOnThird);
-            const d20Roll = Math.floor(Math.random() * 20) + 1;
+            const d20Roll = rollD20();
             const defenseTotal = infieldDefense + d20Roll;
             const isSafe = runnerSpeed >= defenseTotal;
 
@@ -4894,11 +4768,7 @@ app.post('/api/games/:gameId/resolve-infield-in-defense-choice', authenticateTok
         }
 
         if (newState.gameOver) {
-              const updateResult = await client.query(
-                `UPDATE games SET status = 'completed', completed_at = NOW() WHERE game_id = $1 AND status != 'completed'`,
-                [gameId]
-              );
-              if (updateResult.rowCount > 0) {
+              if (await completeGame(client, gameId, newState)) {
                   await handleSeriesProgression(gameId, client, newState);
               }
         }
@@ -4923,7 +4793,7 @@ app.post('/api/games/:gameId/resolve-infield-in-defense-choice', authenticateTok
     }
 });
 
-app.post('/api/games/:gameId/reset-rolls', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/reset-rolls', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   try {
     // Set the setup_rolls column back to an empty object
@@ -4938,7 +4808,7 @@ app.post('/api/games/:gameId/reset-rolls', authenticateToken, async (req, res) =
   }
 });
 
-app.post('/api/games/:gameId/declare-home', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/declare-home', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   const { homeTeamUserId } = req.body;
   
@@ -4960,7 +4830,7 @@ app.post('/api/games/:gameId/declare-home', authenticateToken, async (req, res)
   }
 });
 
-app.post('/api/games/:gameId/initiate-steal', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/initiate-steal', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   const { decisions } = req.body;
   const userId = req.user.userId;
@@ -5086,11 +4956,7 @@ if (newState.pendingStealAttempt && requestedBases.length === 1) {
         }
 
         if (newState.gameOver) {
-              const updateResult = await client.query(
-                `UPDATE games SET status = 'completed', completed_at = NOW() WHERE game_id = $1 AND status != 'completed'`,
-                [gameId]
-              );
-              if (updateResult.rowCount > 0) {
+              if (await completeGame(client, gameId, newState)) {
                   await handleSeriesProgression(gameId, client, newState);
               }
         } else if (newState.outs >= 3) {
@@ -5123,7 +4989,7 @@ if (newState.pendingStealAttempt && requestedBases.length === 1) {
   }
 });
 
-app.post('/api/games/:gameId/resolve-steal', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/resolve-steal', authenticateToken, recordGameActions, async (req, res) => {
   const { gameId } = req.params;
   const { throwToBase } = req.body;
   const userId = req.user.userId;
@@ -5231,7 +5097,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
                 const runner = originalBases[baseMap[fromBase]];
                 if (!runner) continue;
                 if (fromBase === contestedFromBase) {
-                    const d20Roll = Math.floor(Math.random() * 20) + 1;
+                    const d20Roll = rollD20();
                     const defenseTotal = catcherArm + d20Roll;
                     let runnerSpeed = getSpeedValue(runner);
                     let penalty = 0;
@@ -5292,11 +5158,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
         }
 
         if (newState.gameOver) {
-              const updateResult = await client.query(
-                `UPDATE games SET status = 'completed', completed_at = NOW() WHERE game_id = $1 AND status != 'completed'`,
-                [gameId]
-              );
-              if (updateResult.rowCount > 0) {
+              if (await completeGame(client, gameId, newState)) {
                   await handleSeriesProgression(gameId, client, newState);
               }
         } else if (newState.outs >= 3) {
@@ -5331,7 +5193,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
 });
 
 
-app.post('/api/games/:gameId/submit-decisions', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/submit-decisions', authenticateToken, recordGameActions, async (req, res) => {
     const { gameId } = req.params;
     const { decisions } = req.body;
     const client = await pool.connect();
@@ -5438,11 +5300,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
             }
 
             if (newState.gameOver) {
-              const updateResult = await client.query(
-                `UPDATE games SET status = 'completed', completed_at = NOW() WHERE game_id = $1 AND status != 'completed'`,
-                [gameId]
-              );
-              if (updateResult.rowCount > 0) {
+              if (await completeGame(client, gameId, newState)) {
                   await handleSeriesProgression(gameId, client, newState);
               }
             } else if (newState.outs >= 3) {
@@ -5516,7 +5374,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
     }
 });
 
-app.post('/api/games/:gameId/resolve-throw', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/resolve-throw', authenticateToken, recordGameActions, async (req, res) => {
     const { gameId } = req.params;
     const { throwTo } = req.body;
     const userId = req.user.userId;
@@ -5605,7 +5463,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
             const contestedRunner = contestedDecision.runner;
 
             const { type } = newState.currentPlay;
-            const d20Roll = Math.floor(Math.random() * 20) + 1;
+            const d20Roll = rollD20();
             const baseSpeed = parseInt(getSpeedValue(contestedRunner), 10);
             let speed = baseSpeed;
             let penalty = 0;
@@ -5710,11 +5568,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
         }
 
         if (newState.gameOver) {
-              const updateResult = await client.query(
-                `UPDATE games SET status = 'completed', completed_at = NOW() WHERE game_id = $1 AND status != 'completed'`,
-                [gameId]
-              );
-              if (updateResult.rowCount > 0) {
+              if (await completeGame(client, gameId, newState)) {
                   await handleSeriesProgression(gameId, client, newState);
               }
         } else if (newState.outs >= 3) {
@@ -5752,7 +5606,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
 });
 
 // NEW ENDPOINT for Infield In Ground Ball Choice
-app.post('/api/games/:gameId/resolve-infield-in-gb', authenticateToken, async (req, res) => {
+app.post('/api/games/:gameId/resolve-infield-in-gb', authenticateToken, recordGameActions, async (req, res) => {
     const { gameId } = req.params;
     const { sendRunner } = req.body; // true or false
     const userId = req.user.userId;
@@ -5835,11 +5689,7 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
             if (newState.winningTeam === 'home' && !newState.isTopInning && newState.homeScore > newState.awayScore && !events.some(e => e.includes('WALK-OFF'))) {
                  events.push(`WALK-OFF!`);
             }
-            const updateResult = await client.query(
-              `UPDATE games SET status = 'completed', completed_at = NOW() WHERE game_id = $1 AND status != 'completed'`,
-              [gameId]
-            );
-            if (updateResult.rowCount > 0) {
+            if (await completeGame(client, gameId, newState)) {
                 await handleSeriesProgression(gameId, client, newState);
             }
         } else if (newState.outs >= 3) {
@@ -5878,85 +5728,6 @@ await client.query('SELECT game_id FROM games WHERE game_id = $1 FOR UPDATE', [g
 });
 
 
-// --- HELPER: Determines pitcher availability for a series game ---
-async function getPitcherAvailability(gameId, userId, dbClient) {
-    const participantResult = await dbClient.query(
-      `SELECT roster_id FROM game_participants WHERE game_id = $1 AND user_id = $2`,
-      [gameId, userId]
-    );
-
-    if (participantResult.rows.length === 0) {
-      return { mandatoryPitcherId: null, unavailablePitcherIds: [] };
-    }
-    const rosterId = participantResult.rows[0].roster_id;
-
-    let mandatoryPitcherId = null;
-    let unavailablePitcherIds = [];
-    const gameDetailsResult = await dbClient.query('SELECT series_id, game_in_series FROM games WHERE game_id = $1', [gameId]);
-
-    if (gameDetailsResult.rows.length > 0) {
-        const { series_id, game_in_series } = gameDetailsResult.rows[0];
-
-        if (series_id && game_in_series > 1) {
-            // Find recently used pitchers
-            const recentGames = [];
-            if (game_in_series > 1) recentGames.push(game_in_series - 1);
-            if (game_in_series > 2) recentGames.push(game_in_series - 2);
-            if (game_in_series > 3) recentGames.push(game_in_series - 3);
-
-            if (recentGames.length > 0) {
-                 const recentStartersResult = await dbClient.query(
-                    `SELECT (gp.lineup ->> 'startingPitcher')::int as pitcher_id
-                     FROM game_participants gp
-                     JOIN games g ON g.game_id = gp.game_id
-                     WHERE g.series_id = $1 AND gp.user_id = $2::int AND g.game_in_series = ANY($3::int[]) AND gp.lineup IS NOT NULL`,
-                    [series_id, userId, recentGames]
-                );
-                unavailablePitcherIds = recentStartersResult.rows.map(r => r.pitcher_id).filter(id => id);
-            }
-
-            // Determine mandatory pitcher for games 4+
-            if (game_in_series > 3) {
-                if (game_in_series === 4) {
-                    const previousStartersResult = await dbClient.query(
-                        `SELECT (gp.lineup ->> 'startingPitcher')::int as pitcher_id
-                         FROM game_participants gp
-                         JOIN games g ON g.game_id = gp.game_id
-                         WHERE g.series_id = $1 AND gp.user_id = $2 AND g.game_in_series IN (1, 2, 3) AND gp.lineup IS NOT NULL`,
-                        [series_id, userId]
-                    );
-                    const previousStarterIds = previousStartersResult.rows.map(r => r.pitcher_id);
-
-                    const rosterSPsResult = await dbClient.query(
-                        `SELECT card_id FROM roster_cards WHERE roster_id = $1 AND assignment = 'SP'`,
-                        [rosterId]
-                    );
-                    const rosterSPIds = rosterSPsResult.rows.map(r => r.card_id);
-
-                    const game4Starter = rosterSPIds.find(id => !previousStarterIds.includes(id));
-                    if (game4Starter) {
-                        mandatoryPitcherId = game4Starter;
-                    }
-                } else { // Games 5, 6, 7
-                    const sourceGameNumber = game_in_series - 4;
-                    const sourceGameStarterResult = await dbClient.query(
-                        `SELECT (gp.lineup ->> 'startingPitcher')::int as pitcher_id
-                         FROM game_participants gp
-                         JOIN games g ON g.game_id = gp.game_id
-                         WHERE g.series_id = $1 AND gp.user_id = $2 AND g.game_in_series = $3`,
-                        [series_id, userId, sourceGameNumber]
-                    );
-                    if (sourceGameStarterResult.rows.length > 0) {
-                        mandatoryPitcherId = sourceGameStarterResult.rows[0].pitcher_id;
-                    }
-                }
-            }
-        }
-    }
-    return { mandatoryPitcherId, unavailablePitcherIds };
-}
-
-
 // GET A USER'S PARTICIPANT INFO FOR A SPECIFIC GAME
 // in server.js
 app.get('/api/games/:gameId/my-roster', authenticateToken, async (req, res) => {
@@ -6163,7 +5934,10 @@ app.get('/api/games/:gameId/opponent-roster', authenticateToken, async (req, res
         WHERE rc.roster_id = $1
     `, [opponent.roster_id, effectivePointSetId]);
 
-    res.json({ cards: processPlayers(rosterCardsResult.rows) });
+    // Expected line vs the league from the matchup matrix (see matchup_matrix.py), if built.
+    const cards = processPlayers(rosterCardsResult.rows);
+    cards.forEach(card => { card.matchup = matchupFor(card); });
+    res.json({ cards });
 
   } catch (error) {
     console.error(`Error fetching opponent roster for game ${gameId}:`, error);
@@ -6189,6 +5963,13 @@ io.on('connection', (socket) => {
   socket.on('join-game-room', (gameId) => {
     socket.join(gameId);
   });
+  // The draft page's live board (see DRAFT_ROOM in routes/draft.js).
+  socket.on('join-draft-room', () => {
+    socket.join('draft');
+  });
+  socket.on('leave-draft-room', () => {
+    socket.leave('draft');
+  });
   socket.on('choice-made', (data) => {
     socket.to(data.gameId).emit('choice-updated', { homeTeamUserId: data.homeTeamUserId });
   });
@@ -6201,26 +5982,49 @@ io.on('connection', (socket) => {
 });
 
 // --- SERVER STARTUP ---
+// Only the database check can stop startup, and it runs while the server starts listening. The
+// cron jobs, the data version listener, the SMTP check and the optional warm-up
+// (services/startupWarmup.js) start after that, so none of them delays the first request.
+// Phase timings and time-to-first-response are logged (utils/startupProfile.js).
 async function startServer() {
+  markStartup('routes registered');
   console.log('Attempting to connect to database...');
-  try {
-    await pool.query('SELECT NOW()');
+  const databaseReady = pool.query('SELECT NOW()').then(() => {
+    markStartup('database ready');
     console.log('✅ Database connection successful!');
-
-    // Start Cron Jobs
-    startDraftMonitor();
-    startPhantomMonitor();
-
-    // Verify Email Connection
-    verifyConnection();
-
-    server.listen(PORT, () => {
-      console.log(`Server is running on http://localhost:${PORT}`);
-    });
+  });
+  const listening = new Promise((resolve) => server.listen(PORT, resolve)).then(() => {
+    markStartup('listening');
+    console.log(`Server is running on http://localhost:${PORT}`);
+  });
+  try {
+    await Promise.all([databaseReady, listening]);
   } catch (error) {
     console.error('❌ DATABASE CONNECTION FAILED:', error.message);
     console.error(error.stack);
     process.exit(1);
   }
+  logStartup();
+
+  setImmediate(async () => {
+    // Start Cron Jobs
+    require('./jobs/draftMonitor').startDraftMonitor();
+    require('./jobs/phantomMonitor').startPhantomMonitor();
+    startDataVersionListener();
+
+    // Verify Email Connection
+    require('./services/emailService').verifyConnection();
+    markStartup('background jobs started');
+
+    if (process.env.STARTUP_WARMUP && process.env.STARTUP_WARMUP !== 'false') {
+      await require('./services/startupWarmup').warmUp(server.address().port);
+      logStartup();
+    }
+  });
 }
-startServer();
\ No newline at end of file
+// Required rather than run (replay-game-actions.js), the app is served by the caller instead.
+module.exports.app = app;
+module.exports.server = server;
+if (require.main === module) {
+  startServer();
+}
\ No newline at end of file
@@ -0,0 +1,99 @@
+// Records every game action so the game can be re-run headlessly (replay-game-actions.js).
+//
+// recordGameActions sits on each game action route (POST /api/games/:gameId/<action>), after
+// authenticateToken, so nothing runs for a request that isn't signed in. It makes sure the game has a
+// start point (its rows just before the first recorded action, see gameSnapshotService), runs
+// the handler under a dice context (utils/dice.js) and, once a successful response has gone out,
+// appends { action, user, body, rolls } to game_actions. Failed requests roll back, so they
+// aren't recorded. Inserts are chained so ids follow the order responses went out, which is the
+// order the handlers committed in.
+//
+// In replay mode (enableReplay, only ever called by the replayer) nothing is recorded; instead
+// a request's rolls are taken from its x-replay-rolls header.
+
+const { pool } = require('../db');
+const { withDice } = require('../utils/dice');
+const { captureGameSnapshot } = require('./gameSnapshotService');
+
+const REPLAY_ROLLS_HEADER = 'x-replay-rolls';
+const REPLAY_ID_HEADER = 'x-replay-id';
+
+let replayHandler = null;
+// Games whose start point is stored (or being stored), so the check costs one query per game per
+// process, and two concurrent first actions can't both capture one. Kept in recently-used order and
+// bounded: a game that drops out (finished, or idle while others are played) just pays the
+// check again if it ever takes another action.
+const MAX_START_POINTS = 500;
+const startPoints = new Map();
+let writes = Promise.resolve();
+
+// Puts this process in replay mode. onFinished(replayId, { status, unusedRolls }) is called as
+// each replayed request finishes.
+function enableReplay(onFinished) {
+    replayHandler = onFinished;
+}
+
+function ensureStartPoint(gameId) {
+    const known = startPoints.get(gameId);
+    if (known) {
+        startPoints.delete(gameId);
+        startPoints.set(gameId, known);
+    } else {
+        const stored = (async () => {
+            const existing = await pool.query('SELECT 1 FROM game_action_starts WHERE game_id = $1', [gameId]);
+            if (existing.rows.length > 0) return;
+            const snapshot = await captureGameSnapshot(pool, gameId);
+            if (!snapshot) return; // No such game; the handler answers 404.
+            await pool.query(
+                'INSERT INTO game_action_starts (game_id, snapshot) VALUES ($1, $2) ON CONFLICT (game_id) DO NOTHING',
+                [gameId, JSON.stringify(snapshot)]
+            );
+        })().catch((error) => {
+            // Try again on the next action rather than blocking play.
+            startPoints.delete(gameId);
+            console.error(`[actionLog] Could not store the start point of game ${gameId}:`, error.message);
+        });
+        startPoints.set(gameId, stored);
+        if (startPoints.size > MAX_START_POINTS) {
+            startPoints.delete(startPoints.keys().next().value);
+        }
+    }
+    return startPoints.get(gameId);
+}
+
+function recordAction(gameId, action, userId, body, rolls, status) {
+    const payload = body && Object.keys(body).length > 0 ? JSON.stringify(body) : null;
+    writes = writes
+        .then(() => pool.query(
+            'INSERT INTO game_actions (game_id, action, user_id, payload, rolls, status) VALUES ($1, $2, $3, $4, $5, $6)',
+            [gameId, action, userId, payload, rolls, status]
+        ))
+        .catch((error) => {
+            console.error(`[actionLog] Could not record ${action} for game ${gameId}:`, error.message);
+        });
+}
+
+function recordGameActions(req, res, next) {
+    const gameId = Number(req.params.gameId);
+    const action = req.path.split('/').pop();
+    if (req.method !== 'POST' || !req.user || !Number.isInteger(gameId) || !/^[a-z-]+$/.test(action)) {
+        return next();
+    }
+
+    if (replayHandler) {
+        const header = req.get(REPLAY_ROLLS_HEADER);
+        const context = { rolls: [], replay: header ? JSON.parse(header) : [] };
+        const replayId = req.get(REPLAY_ID_HEADER);
+        res.on('finish', () => replayHandler(replayId, { status: res.statusCode, unusedRolls: context.replay.length }));
+        return withDice(context, next);
+    }
+
+    const context = { rolls: [] };
+    res.on('finish', () => {
+        if (res.statusCode >= 400) return;
+        recordAction(gameId, action, req.user.userId, req.body, context.rolls, res.statusCode);
+    });
+    return ensureStartPoint(gameId).then(() => withDice(context, next));
+}
+
+module.exports = { recordGameActions, enableReplay, REPLAY_ROLLS_HEADER, REPLAY_ID_HEADER };
@@ -1,13 +1,23 @@
-// Loads the global data captaincy scoring needs and caches the computed result.
-// The inputs (historical rosters, series results, card points) change rarely, so a
-// short in-process TTL keeps team-page loads cheap without a manual invalidation hook.
+// Serves captaincy results from a stored document (captaincy_documents) tagged with the
+// 'captaincy' data version it was computed from (see the 20260721 migration). Requests never
+// wait on computeCaptaincies once a document exists: if the inputs (teams, series results,
+// historical rosters, point values) have changed since, the current document is returned and a
+// recompute runs in the background (stale-while-revalidate). Changes are noticed either by the
+// data_versions notification (recompute starts right away) or, if the listener is down, by the
+// version check on the next request.
+//
+// The document is shared by every server process: a worker that falls behind adopts the stored
+// copy if it's current, and an advisory lock keeps more than one worker from recomputing at once.
 
 const { pool } = require('../db');
 const { computeCaptaincies } = require('../utils/captaincyUtils');
+const { getDataVersion, onDataVersionChange } = require('./dataVersions');
 
-const TTL_MS = 5 * 60 * 1000;
-let cache = null;
-let cachedAt = 0;
+const VERSION_KEY = 'captaincy';
+const LOCK_KEY = 720210; // pg advisory lock id for the recompute
+
+let cache = null;        // { version, data }
+let refreshing = null;   // in-flight refresh promise
 
 async function loadAndCompute() {
   const [teamsRes, seriesRes, rostersRes, ppvRes] = await Promise.all([
@@ -36,11 +46,88 @@ async function loadAndCompute() {
   });
 }
 
+async function readStored(db) {
+  const res = await db.query('SELECT source_version, payload FROM captaincy_documents WHERE id = 1');
+  if (res.rows.length === 0) return null;
+  return { version: Number(res.rows[0].source_version), data: res.rows[0].payload };
+}
+
+// Brings the stored document up to `version`. Returns the document, or null if another worker
+// holds the recompute lock (it will store the result; we pick it up on a later refresh).
+async function recompute(version) {
+  const client = await pool.connect();
+  try {
+    const lock = await client.query('SELECT pg_try_advisory_lock($1) AS ok', [LOCK_KEY]);
+    if (!lock.rows[0].ok) return null;
+    try {
+      const stored = await readStored(client);
+      if (stored && stored.version >= version) return stored;
+
+      // Tagged with the version read before computing, so a change that lands mid-compute
+      // leaves the document behind and triggers another pass.
+      const data = await loadAndCompute();
+      await client.query(
+        `INSERT INTO captaincy_documents (id, source_version, payload, computed_at)
+         VALUES (1, $1, $2, now())
+         ON CONFLICT (id) DO UPDATE
+         SET source_version = EXCLUDED.source_version, payload = EXCLUDED.payload, computed_at = now()
+         WHERE captaincy_documents.source_version < EXCLUDED.source_version`,
+        [version, JSON.stringify(data)]
+      );
+      return { version, data };
+    } finally {
+      await client.query('SELECT pg_advisory_unlock($1)', [LOCK_KEY]);
+    }
+  } finally {
+    client.release();
+  }
+}
+
+function refresh(version) {
+  if (!refreshing) {
+    refreshing = recompute(version)
+      .then((doc) => {
+        if (doc && (!cache || doc.version >= cache.version)) cache = doc;
+      })
+      .catch((err) => console.error('[captaincy] refresh failed:', err))
+      .finally(() => { refreshing = null; });
+  }
+  return refreshing;
+}
+
 async function getCaptaincies({ force = false } = {}) {
-  if (!force && cache && Date.now() - cachedAt < TTL_MS) return cache;
-  cache = await loadAndCompute();
-  cachedAt = Date.now();
-  return cache;
+  const version = Number(await getDataVersion(VERSION_KEY));
+  if (!cache) {
+    const stored = await readStored(pool);
+    if (stored) cache = stored;
+  }
+
+  // Nothing to serve yet (first run after the migration) or an explicit rebuild: wait for it.
+  if (!cache || force) {
+    await refresh(version);
+    if (!cache || (force && cache.version < version)) {
+      // Another worker holds the lock; compute locally rather than make this request fail.
+      cache = { version, data: await loadAndCompute() };
+    }
+    return cache.data;
+  }
+
+  if (cache.version < version) refresh(version);
+  return cache.data;
+}
+
+// Start recomputing as soon as an input changes, so the next request already finds it done.
+onDataVersionChange((key) => {
+  if (key !== VERSION_KEY || !cache) return;
+  getDataVersion(VERSION_KEY)
+    .then((version) => { if (cache && cache.version < Number(version)) refresh(Number(version)); })
+    .catch((err) => console.error('[captaincy] version check failed:', err));
+});
+
+// Version of the document getCaptaincies() would serve right now (null before the first load),
+// for response caches that are tagged with what they were built from.
+function servedCaptaincyVersion() {
+  return cache ? String(cache.version) : null;
 }
 
 // Convenience slice for a single franchise (what the team page consumes).
@@ -56,4 +143,4 @@ async function getCaptaincyForTeam(teamId) {
   };
 }
 
-module.exports = { getCaptaincies, getCaptaincyForTeam };
+module.exports = { getCaptaincies, getCaptaincyForTeam, servedCaptaincyVersion };
@@ -0,0 +1,89 @@
+// In-process view of the data_versions counters (see the 20260717 migration).
+//
+// Versioned HTTP responses (card catalog snapshots, the ownership document) use these counters
+// as their ETags, so answering a conditional request must not cost a query. We keep the
+// counters in memory and LISTEN on the 'data_versions' channel: the triggers notify on every
+// change, which marks the cache stale so the next lookup re-reads the (tiny) table once.
+// If the listener is down the cache falls back to a short TTL, so a missed notification can
+// only ever serve a stale version for a few seconds.
+
+const { pool } = require('../db');
+
+const CHANNEL = 'data_versions';
+const TTL_WITH_LISTENER_MS = 5 * 60 * 1000;
+const TTL_WITHOUT_LISTENER_MS = 5 * 1000;
+const LISTENER_RETRY_MS = 30 * 1000;
+
+let versions = {};
+let loadedAt = 0;
+let loading = null;
+let listening = false;
+const changeListeners = [];
+
+function refresh() {
+    if (!loading) {
+        loading = pool.query('SELECT key, version FROM data_versions')
+            .then(res => {
+                versions = Object.fromEntries(res.rows.map(r => [r.key, String(r.version)]));
+                loadedAt = Date.now();
+            })
+            .finally(() => { loading = null; });
+    }
+    return loading;
+}
+
+/**
+ * Current version of a data_versions key, as a string. Served from memory; re-reads the table
+ * only after a change notification or when the cache is older than its TTL.
+ *
+ * @param {string} key - e.g. 'card_catalog', 'roster_ownership'
+ * @returns {Promise<string>}
+ */
+async function getDataVersion(key) {
+    const ttl = listening ? TTL_WITH_LISTENER_MS : TTL_WITHOUT_LISTENER_MS;
+    if (Date.now() - loadedAt > ttl) await refresh();
+    return versions[key] || '0';
+}
+
+// Holds one pool connection for LISTEN. Best-effort — on failure we retry and rely on the TTL.
+async function startDataVersionListener() {
+    let client;
+    const retry = () => {
+        listening = false;
+        setTimeout(startDataVersionListener, LISTENER_RETRY_MS);
+    };
+    try {
+        client = await pool.connect();
+        client.on('notification', msg => {
+            if (msg.channel !== CHANNEL) return;
+            loadedAt = 0;
+            changeListeners.forEach(fn => {
+                try {
+                    fn(msg.payload);
+                } catch (err) {
+                    console.error('[dataVersions] change listener failed:', err.message);
+                }
+            });
+        });
+        client.on('error', err => {
+            console.error('[dataVersions] listener connection lost:', err.message);
+            client.release(err);
+            retry();
+        });
+        await client.query(`LISTEN ${CHANNEL}`);
+        listening = true;
+        loadedAt = 0; // anything may have changed while we weren't listening
+    } catch (err) {
+        console.error('[dataVersions] could not start listener:', err.message);
+        if (client) client.release(err);
+        retry();
+    }
+}
+
+// Calls `fn(key)` whenever a data_versions key is bumped (only while the listener is up), for
+// caches that want to rebuild ahead of the next request rather than on it.
+function onDataVersionChange(fn) {
+    changeListeners.push(fn);
+}
+
+module.exports = { getDataVersion, startDataVersionListener, onDataVersionChange };
@@ -0,0 +1,74 @@
+// Keeps the live draft's recommendation board (utils/draftRecommendations.js) in memory. The
+// board is built on first use for a season from the Upcoming Season points (imported from
+// prices.csv) and the league rosters, then kept current by syncDraftTeam() after every pick or
+// add/drop turn, so a pick never triggers a full rebuild. A card catalog change (new points)
+// or a new draft drops the board and the next read builds it again.
+
+const { createDraftBoard } = require('../utils/draftRecommendations');
+const { getDataVersion } = require('./dataVersions');
+
+let current = null; // { seasonName, catalogVersion, board: Promise }
+
+async function loadBoard(db) {
+    const psRes = await db.query("SELECT point_set_id FROM point_sets WHERE name = 'Upcoming Season'");
+    const pointSetId = psRes.rows[0] ? psRes.rows[0].point_set_id : null;
+    const [cardsRes, rostersRes] = await Promise.all([
+        db.query(
+            `SELECT cp.card_id, cp.name, cp.display_name, cp.control, cp.ip, cp.on_base, cp.speed,
+                    cp.fielding_ratings, cp.chart_data, ppv.points
+             FROM cards_player cp
+             JOIN player_point_values ppv ON cp.card_id = ppv.card_id AND ppv.point_set_id = $1`,
+            [pointSetId]
+        ),
+        db.query(
+            `SELECT t.team_id, rc.card_id, rc.assignment
+             FROM teams t
+             JOIN rosters r ON r.user_id = t.user_id AND r.roster_type = 'league'
+             LEFT JOIN roster_cards rc ON rc.roster_id = r.roster_id`
+        )
+    ]);
+    const rosters = {};
+    rostersRes.rows.forEach(row => {
+        if (!rosters[row.team_id]) rosters[row.team_id] = [];
+        if (row.card_id !== null) rosters[row.team_id].push({ card_id: row.card_id, assignment: row.assignment });
+    });
+    return createDraftBoard({ cards: cardsRes.rows, rosters });
+}
+
+// The board for `seasonName`, building it if there isn't a current one.
+async function getDraftBoard(db, seasonName) {
+    const catalogVersion = await getDataVersion('card_catalog');
+    if (!current || current.seasonName !== seasonName || current.catalogVersion !== catalogVersion) {
+        const entry = { seasonName, catalogVersion, board: loadBoard(db) };
+        current = entry;
+        entry.board.catch(() => { if (current === entry) current = null; });
+    }
+    return current.board;
+}
+
+// Applies one team's roster after a pick or add/drop turn. Does nothing if no board is built
+// for the season yet; the first read will load the roster as it is.
+async function syncDraftTeam(db, seasonName, teamId) {
+    if (!current || current.seasonName !== seasonName) return null;
+    const board = await current.board;
+    const rosterRes = await db.query(
+        `SELECT rc.card_id, rc.assignment
+         FROM roster_cards rc
+         JOIN rosters r ON rc.roster_id = r.roster_id AND r.roster_type = 'league'
+         JOIN teams t ON t.user_id = r.user_id
+         WHERE t.team_id = $1`,
+        [teamId]
+    );
+    board.syncTeam(teamId, rosterRes.rows);
+    return board;
+}
+
+function invalidateDraftBoard() {
+    current = null;
+}
+
+module.exports = {
+    getDraftBoard,
+    syncDraftTeam,
+    invalidateDraftBoard,
+};
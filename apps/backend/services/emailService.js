@@ -1,4 +1,3 @@
-const nodemailer = require('nodemailer');
 const dns = require('dns').promises;
 const https = require('https');
 const { pool } = require('../db');
@@ -53,8 +52,13 @@ function getTransportConfig(overridePort = null) {
     return baseConfig;
 }
 
-// Initial transporter setup
-let transporter = nodemailer.createTransport(getTransportConfig());
+// SMTP transporter, created on first use: most processes never send mail, so nodemailer isn't
+// loaded at startup.
+let transporter = null;
+function getTransporter() {
+    if (!transporter) transporter = require('nodemailer').createTransport(getTransportConfig());
+    return transporter;
+}
 
 // NEW: Brevo (formerly Sendinblue) HTTP API Transport
 async function sendViaBrevo(to, subject, html) {
@@ -154,7 +158,7 @@ async function verifyConnection() {
 
     // 2. SMTP Connection Check
     try {
-        await transporter.verify();
+        await getTransporter().verify();
         console.log("✅ Email Service: SMTP Connection Established Successfully");
     } catch (error) {
         console.error(`❌ Email Service: Connection Failed on initial configuration! Error: ${error.message}`);
@@ -173,7 +177,7 @@ async function verifyConnection() {
             try {
                 // Passing 465 to getTransportConfig triggers the 'Gmail' service preset logic
                 const newConfig = getTransportConfig(465);
-                transporter = nodemailer.createTransport(newConfig);
+                transporter = require('nodemailer').createTransport(newConfig);
                 await transporter.verify();
                 console.log("✅ Email Service: SMTP Connection Established Successfully (Fallback Configuration)");
             } catch (fallbackError) {
@@ -248,7 +252,7 @@ async function sendEmail(to, subject, html) {
     };
 
     try {
-        const info = await transporter.sendMail(mailOptions);
+        const info = await getTransporter().sendMail(mailOptions);
         console.log("Message sent: %s", info.messageId);
     } catch (error) {
         console.error("Error sending email:", error);
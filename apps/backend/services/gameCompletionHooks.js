@@ -0,0 +1,71 @@
+// Runs follow-up work (stored aggregates, derived documents) once a game's completion has
+// actually committed.
+//
+// Game completion happens deep inside the action handlers' transactions
+// (handleSeriesProgression runs on their client before COMMIT), and a failed statement there
+// would abort the whole move. So derived work is queued on the transaction's client instead
+// and run, on the pool, as soon as that client's COMMIT succeeds. If the transaction rolls
+// back (or the COMMIT fails) the work is dropped.
+
+const { pool } = require('../db');
+
+// client -> tasks waiting for its current transaction to end
+const pendingByClient = new WeakMap();
+
+function runTask(gameId, label, task) {
+    setImmediate(async () => {
+        try {
+            await task(pool);
+        } catch (err) {
+            console.error(`[gameCompletion] ${label} failed for game ${gameId}:`, err.message);
+        }
+    });
+}
+
+// Watches `client` for the statement that ends its transaction, then puts it back as it was.
+// A client released without one drops the work along with the transaction.
+function watchTransactionEnd(client, pending) {
+    const { query, release } = client;
+    const restore = () => {
+        client.query = query;
+        client.release = release;
+        pendingByClient.delete(client);
+    };
+    client.release = function (...args) {
+        restore();
+        return release.apply(this, args);
+    };
+    client.query = function (text, ...rest) {
+        const statement = typeof text === 'string' ? text.trim().toUpperCase() : '';
+        if (statement !== 'COMMIT' && statement !== 'ROLLBACK') return query.call(this, text, ...rest);
+
+        restore();
+        const result = query.call(this, text, ...rest);
+        if (statement === 'COMMIT') {
+            Promise.resolve(result).then(
+                () => pending.forEach(p => runTask(p.gameId, p.label, p.task)),
+                () => {}
+            );
+        }
+        return result;
+    };
+}
+
+// Best-effort — never throws. `db` is the client whose open transaction completes the game (a
+// pool, or anything without an open transaction, counts as already committed); `task`
+// receives the pool.
+function afterGameCompleted(db, gameId, label, task) {
+    if (typeof db.release !== 'function') {
+        runTask(gameId, label, task);
+        return;
+    }
+    let pending = pendingByClient.get(db);
+    if (!pending) {
+        pending = [];
+        pendingByClient.set(db, pending);
+        watchTransactionEnd(db, pending);
+    }
+    pending.push({ gameId, label, task });
+}
+
+module.exports = { afterGameCompleted };
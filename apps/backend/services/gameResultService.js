@@ -0,0 +1,65 @@
+// Final-result columns on games (winning_side, winning_user_id, home/away_score, final_inning,
+// final_game_state_id; see the 20260719 migration).
+//
+// Every game-over path marks the game completed through completeGame, which writes the result
+// from the final state in the same UPDATE. Series tallies, the dashboard and the history pages
+// then read the columns instead of the game's newest game_state. The final game_state row is
+// inserted after the completion check, so its id is linked once the transaction commits.
+
+const { afterGameCompleted } = require('./gameCompletionHooks');
+
+// 'home' | 'away' | null. The engine sets winningTeam at game over; older states only have scores.
+function winningSideOf(state) {
+    if (!state) return null;
+    if (state.winningTeam === 'home' || state.winningTeam === 'away') return state.winningTeam;
+    if (state.homeScore > state.awayScore) return 'home';
+    if (state.awayScore > state.homeScore) return 'away';
+    return null;
+}
+
+const SET_RESULT = `
+    winning_side = $2::text,
+    winning_user_id = CASE $2::text
+        WHEN 'home' THEN games.home_team_user_id
+        WHEN 'away' THEN (SELECT gp.user_id FROM game_participants gp
+                          WHERE gp.game_id = games.game_id AND gp.user_id <> games.home_team_user_id LIMIT 1)
+    END,
+    home_score = $3,
+    away_score = $4,
+    final_inning = $5`;
+
+function resultParams(gameId, state) {
+    const int = (v) => (v == null || Number.isNaN(Number(v)) ? null : Number(v));
+    return [gameId, winningSideOf(state), int(state && state.homeScore), int(state && state.awayScore), int(state && state.inning)];
+}
+
+// Points final_game_state_id at the game's newest state (run once the final state has committed).
+async function linkFinalGameState(db, gameId) {
+    await db.query(`
+        UPDATE games SET final_game_state_id = (
+            SELECT gs.game_state_id FROM game_states gs
+            WHERE gs.game_id = $1 ORDER BY gs.turn_number DESC LIMIT 1)
+        WHERE game_id = $1`, [gameId]);
+}
+
+// Marks a game completed with its final result. Returns true when this call completed it (false if
+// it already was), which is when the caller runs handleSeriesProgression.
+async function completeGame(db, gameId, finalState) {
+    const res = await db.query(`
+        UPDATE games SET status = 'completed', completed_at = NOW(), ${SET_RESULT}
+        WHERE game_id = $1 AND status != 'completed'`, resultParams(gameId, finalState));
+    if (res.rowCount === 0) return false;
+    afterGameCompleted(db, gameId, 'final game state', pool => linkFinalGameState(pool, gameId));
+    return true;
+}
+
+// Rewrites a game's result columns from `state` (e.g. after a dev snapshot restore); a null state
+// clears them.
+async function recordFinalResult(db, gameId, state, finalGameStateId = null) {
+    await db.query(`
+        UPDATE games SET ${SET_RESULT}, final_game_state_id = $6
+        WHERE game_id = $1`,
+        [...resultParams(gameId, state), finalGameStateId]);
+}
+
+module.exports = { completeGame, recordFinalResult, linkFinalGameState, winningSideOf };
@@ -0,0 +1,110 @@
+// Capturing a game's rows and putting them back: the dev snapshot tools (routes/dev.js) and the
+// action log's replay start point (services/actionLogService.js, replay-game-actions.js).
+//
+// A snapshot holds the games row, its participants and rosters, the latest game_states row and
+// every game_event. Only the latest state is kept, so restoring one truncates the game's state
+// history to that point.
+
+const { recordFinalResult } = require('./gameResultService');
+
+/**
+ * Reads a game's rows in the snapshot shape.
+ * @returns {Promise<Object|null>} { game_data, participants_data, latest_state_data, events_data,
+ *   rosters_data }, or null if the game doesn't exist.
+ */
+async function captureGameSnapshot(client, gameId) {
+    const gameResult = await client.query('SELECT * FROM games WHERE game_id = $1', [gameId]);
+    if (gameResult.rows.length === 0) return null;
+
+    const participantsResult = await client.query('SELECT * FROM game_participants WHERE game_id = $1', [gameId]);
+    const stateResult = await client.query('SELECT * FROM game_states WHERE game_id = $1 ORDER BY turn_number DESC LIMIT 1', [gameId]);
+    const eventsResult = await client.query('SELECT * FROM game_events WHERE game_id = $1 ORDER BY event_id', [gameId]);
+    const rostersResult = await client.query('SELECT * FROM game_rosters WHERE game_id = $1', [gameId]);
+
+    const latestState = stateResult.rows[0] || null;
+    // Ensure nested JSON is parsed, not double-stringified
+    if (latestState && typeof latestState.state_data === 'string') {
+        latestState.state_data = JSON.parse(latestState.state_data);
+    }
+
+    return {
+        game_data: gameResult.rows[0],
+        participants_data: participantsResult.rows,
+        latest_state_data: latestState,
+        events_data: eventsResult.rows,
+        rosters_data: rostersResult.rows,
+    };
+}
+
+/**
+ * Replaces a game's rows with a snapshot's. Run it inside the caller's transaction.
+ * @returns {Promise<number|null>} The restored game_state_id, if the snapshot had a state.
+ */
+async function restoreGameSnapshot(client, gameId, snapshot) {
+    // 1. Clear existing game data
+    await client.query('DELETE FROM game_events WHERE game_id = $1', [gameId]);
+    await client.query('DELETE FROM game_states WHERE game_id = $1', [gameId]);
+    await client.query('DELETE FROM game_rosters WHERE game_id = $1', [gameId]);
+    await client.query('DELETE FROM game_participants WHERE game_id = $1', [gameId]);
+
+    // 2. Restore game table data (update existing record)
+    const gameData = snapshot.game_data;
+    await client.query(
+        `UPDATE games SET
+            status = $1,
+            completed_at = $2,
+            current_turn_user_id = $3,
+            home_team_user_id = $4,
+            use_dh = $5,
+            setup_rolls = $6
+         WHERE game_id = $7`,
+        [gameData.status, gameData.completed_at, gameData.current_turn_user_id, gameData.home_team_user_id, gameData.use_dh, gameData.setup_rolls, gameId]
+    );
+
+    // 3. Restore participants
+    for (const p of snapshot.participants_data) {
+        await client.query(
+            `INSERT INTO game_participants (game_id, user_id, roster_id, home_or_away, league_designation, lineup)
+             VALUES ($1, $2, $3, $4, $5, $6)`,
+            [p.game_id, p.user_id, p.roster_id, p.home_or_away, p.league_designation, JSON.stringify(p.lineup)]
+        );
+    }
+
+    // 4. Restore rosters
+    for (const r of snapshot.rosters_data) {
+        await client.query(
+            'INSERT INTO game_rosters (game_id, user_id, roster_data) VALUES ($1, $2, $3)',
+            [r.game_id, r.user_id, JSON.stringify(r.roster_data)]
+        );
+    }
+
+    // 5. Restore game state (only the latest one)
+    const state = snapshot.latest_state_data;
+    let restoredStateId = null;
+    if (state) {
+        const restored = await client.query(
+            'INSERT INTO game_states (game_id, turn_number, state_data, created_at) VALUES ($1, $2, $3, $4) RETURNING game_state_id',
+            [state.game_id, state.turn_number, JSON.stringify(state.state_data), state.created_at]
+        );
+        restoredStateId = restored.rows[0].game_state_id;
+    }
+    // The final-result columns follow the restored status and state.
+    if (gameData.status === 'completed' && state) {
+        await recordFinalResult(client, gameId, state.state_data, restoredStateId);
+    } else {
+        await recordFinalResult(client, gameId, null);
+    }
+
+    // 6. Restore game events
+    for (const e of snapshot.events_data) {
+        await client.query(
+            `INSERT INTO game_events (game_id, turn_number, user_id, event_type, log_message, timestamp)
+             VALUES ($1, $2, $3, $4, $5, $6)`,
+            [e.game_id, e.turn_number, e.user_id, e.event_type, e.log_message, e.timestamp]
+        );
+    }
+
+    return restoredStateId;
+}
+
+module.exports = { captureGameSnapshot, restoreGameSnapshot };
@@ -0,0 +1,281 @@
+// Maintains the stored League-page aggregates (league_aggregates) so /api/league/season-summary
+// and /api/league/matrix are a single indexed read instead of a calculateStandings pass over raw
+// series_results on every request.
+//
+// Per season we store three documents: 'summary' (standings + recent results, exactly what the
+// season view returns), 'matrix' (head-to-head cells) and 'partial' (the season's contribution
+// to the all-time table). The all-time 'summary'/'matrix' are merged from the per-season
+// partials/matrices, so a write only recomputes its own season plus a cheap merge, never the
+// whole history. Every write path that touches series_results calls refreshSeasonAggregates()
+// after it commits; `node rebuild-league-aggregates.js` rebuilds (and can verify) everything.
+//
+// The same refresh maintains the season's standings_history (cumulative records per date, see
+// buildStandingsHistory), which the as-of standings and race-chart reads below range over.
+
+const { pool } = require('../db');
+const { calculateStandings } = require('../utils/standingsUtils');
+const { getCachedOddsMap } = require('./playoffOddsService');
+const { schedulePlayoffsIfClinched } = require('./playoffSchedulingService');
+const {
+    mapRecentResult, buildMatrix, mergeMatrices,
+    buildSeasonPartial, mergeAllTimeStandings, mergeFinalSeries, buildStandingsHistory
+} = require('../utils/leagueAggregates');
+
+const ALL_TIME_SCOPE = '__all_time__';
+
+async function fetchTeams(db) {
+    return (await db.query('SELECT team_id, name, city, logo_url FROM teams')).rows;
+}
+
+// The same row sets the league routes used to build these views from. live_series_id links a row
+// to the in-app series that produced it (if any), so the League page can deep-link to it.
+async function fetchSeasonRows(db, seasonName) {
+    const [seasonRes, subsRes] = await Promise.all([
+        db.query(
+            `SELECT sr.*,
+                    (SELECT s.id FROM series s WHERE s.series_result_id = sr.id ORDER BY s.id DESC LIMIT 1) AS live_series_id
+             FROM series_results sr
+             WHERE sr.style IS DISTINCT FROM 'Classic' AND sr.season_name = $1
+             ORDER BY sr.date DESC`,
+            [seasonName]
+        ),
+        // Classic results are excluded above, but the all-time view credits their submarines too.
+        db.query(
+            `SELECT sr.*,
+                    (SELECT s.id FROM series s WHERE s.series_result_id = sr.id ORDER BY s.id DESC LIMIT 1) AS live_series_id
+             FROM series_results sr
+             WHERE sr.round = 'Silver Submarine' AND sr.season_name = $1
+             ORDER BY sr.date ASC`,
+            [seasonName]
+        )
+    ]);
+    return { seriesResults: seasonRes.rows, submarineRows: subsRes.rows };
+}
+
+async function storeAggregate(db, scope, kind, payload) {
+    await db.query(
+        `INSERT INTO league_aggregates (scope, kind, payload, updated_at)
+         VALUES ($1, $2, $3, now())
+         ON CONFLICT (scope, kind) DO UPDATE SET payload = $3, updated_at = now()`,
+        [scope, kind, JSON.stringify(payload)]
+    );
+}
+
+// Brings a season's standings_history in line with `history` (buildStandingsHistory rows).
+// Rows before the first date whose records changed are left as they are, keeping the odds stored
+// when each of those dates was the latest; from that date on (and always the latest date, which
+// carries the current odds) rows are rewritten in one statement, and dates that no longer have
+// games are dropped.
+async function storeStandingsHistory(db, seasonName, history) {
+    const daySignatures = (rows) => {
+        const sigs = new Map();
+        [...rows].sort((a, b) => (a.team_key < b.team_key ? -1 : a.team_key > b.team_key ? 1 : 0))
+            .forEach(r => sigs.set(r.as_of, (sigs.get(r.as_of) || '') + `${r.team_key}:${r.wins}-${r.losses};`));
+        return sigs;
+    };
+    const storedRes = await db.query(
+        `SELECT to_char(as_of, 'YYYY-MM-DD') AS as_of, team_key, wins, losses
+         FROM standings_history WHERE season_name = $1`,
+        [seasonName]
+    );
+    const built = daySignatures(history);
+    const stored = daySignatures(storedRes.rows);
+
+    const days = [...built.keys()].sort();
+    const latest = days[days.length - 1];
+    const firstChanged = [...new Set([...days, ...stored.keys()])].sort().find(d => built.get(d) !== stored.get(d));
+    const from = firstChanged && (!latest || firstChanged < latest) ? firstChanged : latest;
+    if (!from) return;
+
+    const rows = history.filter(r => r.as_of >= from);
+    await db.query(
+        `WITH incoming AS (
+             SELECT * FROM unnest($3::date[], $4::text[], $5::int[], $6::text[], $7::int[], $8::int[],
+                                  $9::real[], $10::real[], $11::real[])
+                 AS i(as_of, team_key, team_id, name, wins, losses, games_behind, spaceship_odds, spoon_odds)
+         ), upserted AS (
+             INSERT INTO standings_history
+                 (season_name, as_of, team_key, team_id, name, wins, losses, games_behind, spaceship_odds, spoon_odds)
+             SELECT $1, i.* FROM incoming i
+             ON CONFLICT (season_name, as_of, team_key) DO UPDATE SET
+                 team_id = EXCLUDED.team_id, name = EXCLUDED.name,
+                 wins = EXCLUDED.wins, losses = EXCLUDED.losses, games_behind = EXCLUDED.games_behind,
+                 spaceship_odds = EXCLUDED.spaceship_odds, spoon_odds = EXCLUDED.spoon_odds
+         )
+         DELETE FROM standings_history h
+         WHERE h.season_name = $1 AND h.as_of >= $2
+           AND NOT EXISTS (SELECT 1 FROM incoming i WHERE i.as_of = h.as_of AND i.team_key = h.team_key)`,
+        [
+            seasonName, from,
+            rows.map(r => r.as_of), rows.map(r => r.team_key), rows.map(r => r.team_id), rows.map(r => r.name),
+            rows.map(r => r.wins), rows.map(r => r.losses), rows.map(r => r.games_behind),
+            rows.map(r => r.spaceship_odds), rows.map(r => r.spoon_odds)
+        ]
+    );
+}
+
+// Builds and stores one season's three documents. Throws on failure (callers decide).
+async function buildSeason(db, seasonName, currentTeams) {
+    const { seriesResults, submarineRows } = await fetchSeasonRows(db, seasonName);
+
+    if (seriesResults.length === 0 && submarineRows.length === 0) {
+        // Season no longer has any rows (e.g. removed in dev) — drop it from the aggregates.
+        await db.query('DELETE FROM league_aggregates WHERE scope = $1', [seasonName]);
+        await db.query('DELETE FROM standings_history WHERE season_name = $1', [seasonName]);
+        return null;
+    }
+
+    const { odds, scenarios } = await getCachedOddsMap(db, seasonName, seriesResults, currentTeams);
+    const standings = calculateStandings(seriesResults, currentTeams, false, { precomputedOdds: odds });
+
+    // Backfill: a field that clinched without going through result entry (a phantom loss, a dev
+    // edit, a season from before auto-scheduling) gets its playoff series here. Idempotent; when it
+    // creates them the season's rows have changed, so build again from the new rows.
+    if (await schedulePlayoffsIfClinched(db, seasonName, { standings, seriesResults })) {
+        return buildSeason(db, seasonName, currentTeams);
+    }
+    const summary = {
+        standings,
+        recentResults: seriesResults.map(r => mapRecentResult(r, currentTeams, scenarios || {}))
+    };
+
+    await storeAggregate(db, seasonName, 'summary', summary);
+    await storeAggregate(db, seasonName, 'matrix', buildMatrix(seriesResults, currentTeams));
+    await storeAggregate(db, seasonName, 'partial', buildSeasonPartial(seasonName, seriesResults, submarineRows, currentTeams));
+    await storeStandingsHistory(db, seasonName, buildStandingsHistory(seriesResults, currentTeams, odds));
+    return summary;
+}
+
+// Re-merges the all-time documents from the stored per-season partials and matrices.
+async function buildAllTime(db, currentTeams) {
+    const res = await db.query(
+        `SELECT scope, kind, payload FROM league_aggregates
+         WHERE kind IN ('partial', 'matrix') AND scope <> $1`,
+        [ALL_TIME_SCOPE]
+    );
+    const partials = res.rows.filter(r => r.kind === 'partial').map(r => r.payload);
+    const matrices = res.rows.filter(r => r.kind === 'matrix').map(r => r.payload);
+
+    const summary = {
+        standings: mergeAllTimeStandings(partials, currentTeams),
+        recentResults: [],
+        finalSeries: mergeFinalSeries(partials)
+    };
+    await storeAggregate(db, ALL_TIME_SCOPE, 'summary', summary);
+    await storeAggregate(db, ALL_TIME_SCOPE, 'matrix', mergeMatrices(matrices));
+    return summary;
+}
+
+// Called after any write to a season's series_results rows (result entry, classic result, phantom
+// loss, in-app series progression, series launch). Best-effort — never throws into the caller;
+// a failed refresh is healed by the next write or a rebuild.
+async function refreshSeasonAggregates(db = pool, seasonName) {
+    if (!seasonName) return false;
+    try {
+        const currentTeams = await fetchTeams(db);
+        await buildSeason(db, seasonName, currentTeams);
+        await buildAllTime(db, currentTeams);
+        return true;
+    } catch (err) {
+        console.error(`[leagueAggregates] refresh failed for "${seasonName}":`, err.message);
+        return false;
+    }
+}
+
+// Full rebuild of every season and the all-time documents. Returns the seasons rebuilt.
+async function rebuildAllAggregates(db = pool) {
+    const currentTeams = await fetchTeams(db);
+    const seasonsRes = await db.query(
+        'SELECT DISTINCT season_name FROM series_results WHERE season_name IS NOT NULL'
+    );
+    const seasons = seasonsRes.rows.map(r => r.season_name);
+
+    // Drop documents for seasons that no longer exist before re-merging.
+    await db.query(
+        'DELETE FROM league_aggregates WHERE scope <> $1 AND NOT (scope = ANY($2::text[]))',
+        [ALL_TIME_SCOPE, seasons]
+    );
+    await db.query('DELETE FROM standings_history WHERE NOT (season_name = ANY($1::text[]))', [seasons]);
+    for (const seasonName of seasons) {
+        await buildSeason(db, seasonName, currentTeams);
+    }
+    await buildAllTime(db, currentTeams);
+    return seasons;
+}
+
+// Read path: one indexed lookup. A missing document (new season, never-built table) is built
+// on the spot and stored, so the table self-populates without a manual rebuild.
+async function getLeagueAggregate(db, scope, kind) {
+    const res = await db.query(
+        'SELECT payload FROM league_aggregates WHERE scope = $1 AND kind = $2',
+        [scope, kind]
+    );
+    if (res.rows.length > 0) return res.rows[0].payload;
+
+    if (scope === ALL_TIME_SCOPE) {
+        await rebuildAllAggregates(db);
+    } else {
+        const currentTeams = await fetchTeams(db);
+        const built = await buildSeason(db, scope, currentTeams);
+        if (!built) return null;
+        await buildAllTime(db, currentTeams);
+    }
+    const again = await db.query(
+        'SELECT payload FROM league_aggregates WHERE scope = $1 AND kind = $2',
+        [scope, kind]
+    );
+    return again.rows.length > 0 ? again.rows[0].payload : null;
+}
+
+const HISTORY_COLUMNS = `season_name, to_char(as_of, 'YYYY-MM-DD') AS as_of, team_key, team_id, name,
+                         wins, losses, games_behind, spaceship_odds, spoon_odds`;
+
+// Standings as they stood at the end of `asOf` ('YYYY-MM-DD'): the season's rows for the last
+// date with games on or before it, leader first. Empty before the season's first result.
+async function getStandingsAsOf(db, seasonName, asOf) {
+    const res = await db.query(
+        `SELECT ${HISTORY_COLUMNS}
+         FROM standings_history
+         WHERE season_name = $1
+           AND as_of = (SELECT max(as_of) FROM standings_history WHERE season_name = $1 AND as_of <= $2)
+         ORDER BY games_behind, wins DESC, team_key`,
+        [seasonName, asOf]
+    );
+    return res.rows;
+}
+
+// Race curves: every stored row for the given seasons (all seasons when `seasons` is null),
+// grouped per season into { dates, teams: [{ team_key, team_id, name, points: [...] }] } where
+// each team's points line up with `dates`.
+async function getStandingsHistory(db, seasons = null) {
+    const res = await db.query(
+        `SELECT ${HISTORY_COLUMNS}
+         FROM standings_history
+         WHERE $1::text[] IS NULL OR season_name = ANY($1::text[])
+         ORDER BY season_name, as_of, team_key`,
+        [seasons]
+    );
+    const bySeason = {};
+    res.rows.forEach(r => {
+        const season = bySeason[r.season_name] || (bySeason[r.season_name] = { dates: [], teams: {} });
+        if (season.dates[season.dates.length - 1] !== r.as_of) season.dates.push(r.as_of);
+        const team = season.teams[r.team_key] || (season.teams[r.team_key] = {
+            team_key: r.team_key, team_id: r.team_id, name: r.name, points: []
+        });
+        team.points.push({
+            wins: r.wins, losses: r.losses, gamesBehind: r.games_behind,
+            spaceshipOdds: r.spaceship_odds, spoonOdds: r.spoon_odds
+        });
+    });
+    Object.values(bySeason).forEach(season => { season.teams = Object.values(season.teams); });
+    return bySeason;
+}
+
+module.exports = {
+    ALL_TIME_SCOPE,
+    refreshSeasonAggregates,
+    rebuildAllAggregates,
+    getLeagueAggregate,
+    getStandingsAsOf,
+    getStandingsHistory
+};
@@ -0,0 +1,115 @@
+// Reads and writes the per-series pitcher usage ledger (series_pitcher_usage, see the
+// 20260716 migration and utils/pitcherUsage.js).
+//
+// handleSeriesProgression records each series game's usage inside the completion transaction,
+// so by the time the next game's lineup screen loads, its rotation and fatigue are one read of
+// the ledger rather than a replay of every earlier game. Games completed before the ledger
+// existed (games.pitcher_usage_recorded_at IS NULL) are backfilled from their latest
+// game_state the first time a later game needs them.
+
+const { buildUsageRows, pitcherAvailability, fatigueFromUsage } = require('../utils/pitcherUsage');
+
+// Writes (or rewrites — re-completing a game is idempotent) one game's ledger rows.
+// `pitcherStats` is the final state's pitcherStats; when omitted (backfill) it's read from the
+// game's latest game_state. No-op for non-series games.
+async function recordPitcherUsage(db, gameId, pitcherStats) {
+    const res = await db.query(`
+        SELECT g.series_id, g.game_in_series, gp.user_id,
+               (gp.lineup ->> 'startingPitcher')::int AS starting_pitcher,
+               ARRAY(SELECT rc.card_id FROM roster_cards rc WHERE rc.roster_id = gp.roster_id) AS card_ids,
+               CASE WHEN $2::boolean THEN
+                   (SELECT gs.state_data -> 'pitcherStats' FROM game_states gs
+                     WHERE gs.game_id = g.game_id ORDER BY gs.turn_number DESC LIMIT 1)
+               END AS latest_pitcher_stats
+        FROM games g
+        JOIN game_participants gp ON gp.game_id = g.game_id
+        WHERE g.game_id = $1
+    `, [gameId, pitcherStats === undefined]);
+    if (res.rows.length === 0 || !res.rows[0].series_id) return [];
+
+    const { series_id, game_in_series, latest_pitcher_stats } = res.rows[0];
+    const rows = buildUsageRows({
+        seriesId: series_id,
+        gameId: Number(gameId),
+        gameInSeries: game_in_series,
+        participants: res.rows,
+        pitcherStats: pitcherStats === undefined ? latest_pitcher_stats : pitcherStats
+    });
+
+    await db.query('DELETE FROM series_pitcher_usage WHERE game_id = $1', [gameId]);
+    if (rows.length > 0) {
+        const col = (k) => rows.map(r => r[k]);
+        await db.query(`
+            INSERT INTO series_pitcher_usage
+                (series_id, game_id, game_in_series, user_id, card_id, started,
+                 innings_pitched, batters_faced, runs, pitched_while_tired)
+            SELECT * FROM unnest($1::int[], $2::int[], $3::int[], $4::int[], $5::int[], $6::boolean[],
+                                 $7::int[], $8::int[], $9::int[], $10::boolean[])
+            ON CONFLICT (game_id, user_id, card_id) DO NOTHING
+        `, [
+            col('series_id'), col('game_id'), col('game_in_series'), col('user_id'), col('card_id'), col('started'),
+            col('innings_pitched'), col('batters_faced'), col('runs'), col('pitched_while_tired')
+        ]);
+    }
+    await db.query('UPDATE games SET pitcher_usage_recorded_at = NOW() WHERE game_id = $1', [gameId]);
+    return rows;
+}
+
+// The ledger as seen from game `gameId`: the game's series position, the usage rows of every
+// earlier game in its series, the relievers (IP <= 3) on both of its rosters, and (when `userId`
+// is given) that participant's roster SPs.
+// One indexed read; legacy games without a ledger yet are backfilled and the read repeated.
+async function loadPriorUsage(db, gameId, userId = null) {
+    const read = () => db.query(`
+        SELECT g.series_id, g.game_in_series,
+               (SELECT gp.roster_id FROM game_participants gp WHERE gp.game_id = g.game_id AND gp.user_id = $2) AS roster_id,
+               ARRAY(SELECT rc.card_id FROM game_participants gp
+                     JOIN roster_cards rc ON rc.roster_id = gp.roster_id
+                     WHERE gp.game_id = g.game_id AND gp.user_id = $2 AND rc.assignment = 'SP') AS roster_sp_ids,
+               ARRAY(SELECT pg.game_id FROM games pg
+                     WHERE pg.series_id = g.series_id AND pg.game_in_series < g.game_in_series
+                       AND pg.pitcher_usage_recorded_at IS NULL) AS unrecorded_game_ids,
+               COALESCE((SELECT json_agg(u) FROM series_pitcher_usage u
+                         WHERE u.series_id = g.series_id AND u.game_in_series < g.game_in_series), '[]') AS usage,
+               COALESCE((SELECT json_agg(json_build_object('owner_user_id', gp.user_id, 'card_id', cp.card_id, 'ip', cp.ip))
+                         FROM game_participants gp
+                         JOIN roster_cards rc ON rc.roster_id = gp.roster_id
+                         JOIN cards_player cp ON cp.card_id = rc.card_id
+                         WHERE gp.game_id = g.game_id AND cp.ip IS NOT NULL AND cp.ip <= 3), '[]') AS relievers
+        FROM games g
+        WHERE g.game_id = $1
+    `, [gameId, userId]);
+
+    let res = await read();
+    if (res.rows.length === 0) return null;
+    if (res.rows[0].series_id && res.rows[0].unrecorded_game_ids.length > 0) {
+        for (const priorGameId of res.rows[0].unrecorded_game_ids) {
+            await recordPitcherUsage(db, priorGameId);
+        }
+        res = await read();
+    }
+    return res.rows[0];
+}
+
+// Rotation rules for one participant of a series game (see pitcherAvailability).
+async function getPitcherAvailability(gameId, userId, db) {
+    const ledger = await loadPriorUsage(db, gameId, userId);
+    if (!ledger || ledger.roster_id === null) {
+        return { mandatoryPitcherId: null, unavailablePitcherIds: [] };
+    }
+    if (!ledger.series_id || ledger.game_in_series < 2) {
+        return { mandatoryPitcherId: null, unavailablePitcherIds: [] };
+    }
+    return pitcherAvailability(ledger.game_in_series, ledger.usage, userId, ledger.roster_sp_ids);
+}
+
+// Reliever fatigue carried into a series game (the initial state's pitcherStats).
+async function initializePitcherFatigue(gameId, db) {
+    const ledger = await loadPriorUsage(db, gameId);
+    if (!ledger || !ledger.series_id || ledger.game_in_series < 2) {
+        return {}; // Not a series or game 1, no fatigue to carry over.
+    }
+    return fatigueFromUsage(ledger.relievers, ledger.usage);
+}
+
+module.exports = { recordPitcherUsage, getPitcherAvailability, initializePitcherFatigue };
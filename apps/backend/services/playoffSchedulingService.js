@@ -36,7 +36,7 @@ async function stopOneSeries(db, sr) {
             homeGames: s.home_wins, awayGames: s.away_wins, isOver: true,
         });
         await db.query(
-            `UPDATE series_results SET status=$1, result_source=$2, winning_team_id=$3, winning_team_name=$4, winning_score=$5, losing_team_id=$6, losing_team_name=$7, losing_score=$8 WHERE id=$9`,
+            `UPDATE series_results SET status=$1, result_source=$2, winning_team_id=$3, winning_team_name=$4, winning_score=$5, losing_team_id=$6, losing_team_name=$7, losing_score=$8, completed_at=now() WHERE id=$9`,
             [update.status, update.result_source, update.winning_team_id, update.winning_team_name, update.winning_score, update.losing_team_id, update.losing_team_name, update.losing_score, sr.id]
         );
         await db.query(`UPDATE series SET status='completed' WHERE id = $1`, [s.id]);
@@ -48,7 +48,7 @@ async function stopOneSeries(db, sr) {
     } else {
         await db.query(
             `UPDATE series_results SET status='completed', result_source='auto', winning_score=0, losing_score=0,
-             notes='Not required — playoff seeds clinched' WHERE id = $1`,
+             notes='Not required — playoff seeds clinched', completed_at=now() WHERE id = $1`,
             [sr.id]
         );
     }
@@ -32,7 +32,8 @@ async function snapshotRosters(client, seasonName) {
 }
 
 /**
- * Generates empty series_results for the schedule.
+ * Generates empty series_results for the schedule: one row per pair of teams, home team first
+ * in `teamIds` order, inserted in a single statement.
  * @param {Object} client
  * @param {string} seasonName
  * @param {Array<number>} teamIds
@@ -40,30 +41,16 @@ async function snapshotRosters(client, seasonName) {
 async function generateSchedule(client, seasonName, teamIds) {
     if (!teamIds || teamIds.length < 2) return;
 
-    // Fetch team cities
-    const teamRes = await client.query(
-        `SELECT team_id, city FROM teams WHERE team_id = ANY($1)`,
-        [teamIds]
+    await client.query(
+        `INSERT INTO series_results (season_name, round, date, winning_team_id, losing_team_id, winning_team_name, losing_team_name, winning_score, losing_score, status)
+         SELECT $1, 'Regular Season', $2, home.team_id, away.team_id, ht.city, at.city, NULL, NULL, 'scheduled'
+         FROM unnest($3::int[]) WITH ORDINALITY AS home(team_id, ord)
+         JOIN unnest($3::int[]) WITH ORDINALITY AS away(team_id, ord) ON away.ord > home.ord
+         LEFT JOIN teams ht ON ht.team_id = home.team_id
+         LEFT JOIN teams at ON at.team_id = away.team_id
+         ORDER BY home.ord, away.ord`,
+        [seasonName, new Date(), teamIds]
     );
-    const teamCityMap = {};
-    teamRes.rows.forEach(r => teamCityMap[r.team_id] = r.city);
-
-    const matchups = [];
-    for (let i = 0; i < teamIds.length; i++) {
-        for (let j = i + 1; j < teamIds.length; j++) {
-            matchups.push({ home: teamIds[i], away: teamIds[j] });
-        }
-    }
-
-    const today = new Date(); // Use current date/time
-
-    for (const m of matchups) {
-        await client.query(
-            `INSERT INTO series_results (season_name, round, date, winning_team_id, losing_team_id, winning_team_name, losing_team_name, winning_score, losing_score, status)
-             VALUES ($1, 'Regular Season', $2, $3, $4, $5, $6, NULL, NULL, 'scheduled')`,
-            [seasonName, today, m.home, m.away, teamCityMap[m.home], teamCityMap[m.away]]
-        );
-    }
 }
 
 /**
@@ -103,45 +90,25 @@ async function rolloverPointSets(client, currentSeasonName) {
         prevSeasonName = sortedSeasons[idx + 1];
     }
 
-    // 4. Calculate Points
-    const basePointsRes = await client.query(
-        `SELECT card_id, points FROM player_point_values WHERE point_set_id = $1`,
-        [oldPointSetId]
+    // 4. Calculate Points (one INSERT ... SELECT over the old set):
+    //    on this season's rosters: +10 if also on the previous season's, else unchanged;
+    //    off them: -10; never below 10 for a card that has ever been rostered.
+    await client.query(
+        `INSERT INTO player_point_values (point_set_id, card_id, points)
+         SELECT $1, p.card_id, CASE WHEN p.ever_rostered THEN GREATEST(p.points, 10) ELSE p.points END
+         FROM (
+             SELECT ppv.card_id,
+                    ppv.points + CASE
+                        WHEN NOT EXISTS (SELECT 1 FROM historical_rosters hr WHERE hr.season = $3 AND hr.card_id = ppv.card_id) THEN -10
+                        WHEN EXISTS (SELECT 1 FROM historical_rosters hr WHERE hr.season = $4 AND hr.card_id = ppv.card_id) THEN 10
+                        ELSE 0
+                    END AS points,
+                    EXISTS (SELECT 1 FROM historical_rosters hr WHERE hr.card_id = ppv.card_id) AS ever_rostered
+             FROM player_point_values ppv
+             WHERE ppv.point_set_id = $2
+         ) p`,
+        [newPointSetId, oldPointSetId, currentSeasonName, prevSeasonName]
     );
-    const basePoints = {};
-    basePointsRes.rows.forEach(r => basePoints[r.card_id] = r.points);
-
-    async function getRosterIds(season) {
-        if (!season) return new Set();
-        const r = await client.query(`SELECT card_id FROM historical_rosters WHERE season = $1`, [season]);
-        return new Set(r.rows.map(row => row.card_id));
-    }
-
-    const currentRosterIds = await getRosterIds(currentSeasonName);
-    const prevRosterIds = await getRosterIds(prevSeasonName);
-    const allHistoryRes = await client.query(`SELECT DISTINCT card_id FROM historical_rosters`);
-    const allHistoryIds = new Set(allHistoryRes.rows.map(r => r.card_id));
-
-    for (const [cardIdStr, points] of Object.entries(basePoints)) {
-        const cardId = parseInt(cardIdStr);
-        let newPoints = points;
-        const isCurrent = currentRosterIds.has(cardId);
-        const isPrev = prevRosterIds.has(cardId);
-        const everRostered = allHistoryIds.has(cardId);
-
-        if (isCurrent) {
-            if (isPrev) newPoints += 10;
-        } else {
-            newPoints -= 10;
-        }
-
-        if (everRostered && newPoints < 10) newPoints = 10;
-
-        await client.query(
-            `INSERT INTO player_point_values (point_set_id, card_id, points) VALUES ($1, $2, $3)`,
-            [newPointSetId, cardId, newPoints]
-        );
-    }
 }
 
 /**
@@ -154,20 +121,16 @@ async function rolloverPointSets(client, currentSeasonName) {
 async function checkTeamHasPlayed(client, userId, seasonName) {
     if (!seasonName) return false;
 
-    // Get Team ID
-    const teamRes = await client.query('SELECT team_id FROM teams WHERE user_id = $1', [userId]);
-    if (teamRes.rows.length === 0) return false;
-    const teamId = teamRes.rows[0].team_id;
-
-    // Check for any completed game (score is not null)
+    // Any completed game (score is not null) by the user's team
     const gameRes = await client.query(
-        `SELECT 1 FROM series_results
-         WHERE season_name = $1
-           AND (winning_team_id = $2 OR losing_team_id = $2)
-           AND winning_score IS NOT NULL
-           AND style IS DISTINCT FROM 'Classic'
+        `SELECT 1 FROM series_results sr
+         JOIN teams t ON t.user_id = $2
+         WHERE sr.season_name = $1
+           AND (sr.winning_team_id = t.team_id OR sr.losing_team_id = t.team_id)
+           AND sr.winning_score IS NOT NULL
+           AND sr.style IS DISTINCT FROM 'Classic'
          LIMIT 1`,
-        [seasonName, teamId]
+        [seasonName, userId]
     );
 
     return gameRes.rows.length > 0;
@@ -181,33 +144,59 @@ async function checkTeamHasPlayed(client, userId, seasonName) {
  */
 async function checkAllTeamsPlayed(client, seasonName) {
     if (!seasonName) return false;
+    return (await seasonRolloverStatus(client, seasonName)).allPlayed;
+}
 
-    // Get all teams involved in this season
-    const teamsRes = await client.query(
-        `SELECT DISTINCT winning_team_id as id FROM series_results WHERE season_name = $1
-         UNION
-         SELECT DISTINCT losing_team_id as id FROM series_results WHERE season_name = $1`,
+/**
+ * Everything the rollover decision needs, in one query: whether every team in the season has
+ * finished a game, and whether the season's rosters and point set have already been rolled.
+ * @param {Object} client
+ * @param {string} seasonName
+ * @returns {Promise<{ allPlayed: boolean, rostersSnapshotted: boolean, pointSetExists: boolean }>}
+ */
+async function seasonRolloverStatus(client, seasonName) {
+    const res = await client.query(
+        `SELECT
+            COALESCE((
+                SELECT bool_and(played) FROM (
+                    SELECT bool_or(sr.winning_score IS NOT NULL) AS played
+                    FROM series_results sr
+                    CROSS JOIN LATERAL (VALUES (sr.winning_team_id), (sr.losing_team_id)) AS side(team_id)
+                    WHERE sr.season_name = $1 AND side.team_id IS NOT NULL
+                    GROUP BY side.team_id
+                ) team_played
+            ), false) AS all_played,
+            EXISTS (SELECT 1 FROM historical_rosters WHERE season = $1) AS rosters_snapshotted,
+            EXISTS (SELECT 1 FROM point_sets WHERE name = $1) AS point_set_exists`,
         [seasonName]
     );
-    const allTeams = teamsRes.rows.map(r => r.id).filter(id => id !== null);
-
-    if (allTeams.length === 0) return false;
-
-    // Check for teams that have NOT played (have NO finished games)
-    const unplayedRes = await client.query(
-        `SELECT team_id FROM (
-            SELECT unnest($1::int[]) as team_id
-         ) as t
-         WHERE NOT EXISTS (
-            SELECT 1 FROM series_results sr
-            WHERE sr.season_name = $2
-              AND (sr.winning_team_id = t.team_id OR sr.losing_team_id = t.team_id)
-              AND sr.winning_score IS NOT NULL
-         )`,
-        [allTeams, seasonName]
-    );
+    const row = res.rows[0];
+    return {
+        allPlayed: row.all_played,
+        rostersSnapshotted: row.rosters_snapshotted,
+        pointSetExists: row.point_set_exists,
+    };
+}
 
-    return unplayedRes.rows.length === 0;
+/**
+ * Rolls the season over once every team has played: snapshots the league rosters and rolls the
+ * point sets, each only if it hasn't happened yet. Call inside the transaction that recorded
+ * the result.
+ * @param {Object} client - Database client (transactional)
+ * @param {string} seasonName
+ * @returns {Promise<boolean>} whether the rollover ran
+ */
+async function rolloverSeasonIfComplete(client, seasonName) {
+    if (!seasonName) return false;
+    const status = await seasonRolloverStatus(client, seasonName);
+    if (!status.allPlayed || status.rostersSnapshotted) return false;
+
+    console.log(`Triggering Season Rollover for ${seasonName}...`);
+    await snapshotRosters(client, seasonName);
+    if (!status.pointSetExists) {
+        await rolloverPointSets(client, seasonName);
+    }
+    return true;
 }
 
 module.exports = {
@@ -215,5 +204,7 @@ module.exports = {
     generateSchedule,
     rolloverPointSets,
     checkTeamHasPlayed,
-    checkAllTeamsPlayed
+    checkAllTeamsPlayed,
+    seasonRolloverStatus,
+    rolloverSeasonIfComplete
 };
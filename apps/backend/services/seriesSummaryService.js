@@ -0,0 +1,123 @@
+// Reads and writes the per-series summary documents (series_summaries, see the 20260718
+// migration and utils/gameSummary.js).
+//
+// handleSeriesProgression queues recordGameSummary for each game once its completion commits, so
+// GET /api/series/:id and /box-score-data read one small row per series instead of every game's
+// final game_state (full atBatLog + pitcherStats). Games completed before the table existed, or
+// re-completed since their entry was written (completed_at no longer matches), are summarized
+// lazily the first time their series is read.
+
+const { buildGameSummary, cardIdOf } = require('../utils/gameSummary');
+
+// Card ids an entry names: box rows, decision and home-run pitchers/batters, starting pitchers.
+function cardIdsIn(entry) {
+    const ids = new Set();
+    for (const side of ['home', 'away']) {
+        for (const r of entry.box[side].batting) ids.add(Number(r.cardId));
+        for (const r of entry.box[side].pitching) ids.add(Number(r.cardId));
+        if (entry.starting_pitchers[side] != null) ids.add(Number(entry.starting_pitchers[side]));
+    }
+    Object.keys(entry.decisions).forEach(k => ids.add(Number(cardIdOf(k))));
+    Object.keys(entry.home_runs).forEach(cid => ids.add(Number(cid)));
+    return ids;
+}
+
+// Summarizes the given completed series games from their latest game_state and merges them into
+// their series' rows (existing entries for other games are kept). Non-series and unfinished
+// games are ignored. Returns the number of games written.
+async function recordGameSummaries(db, gameIds) {
+    if (!gameIds || gameIds.length === 0) return 0;
+    const gamesRes = await db.query(`
+        SELECT game_id, series_id, game_in_series, home_team_user_id, completed_at
+        FROM games
+        WHERE game_id = ANY($1) AND status = 'completed' AND series_id IS NOT NULL
+    `, [gameIds]);
+    if (gamesRes.rows.length === 0) return 0;
+    const ids = gamesRes.rows.map(g => g.game_id);
+
+    const [partRes, stateRes, rosterRes] = await Promise.all([
+        db.query('SELECT game_id, user_id, lineup FROM game_participants WHERE game_id = ANY($1)', [ids]),
+        db.query(`
+            SELECT DISTINCT ON (game_id) game_id, state_data
+            FROM game_states WHERE game_id = ANY($1)
+            ORDER BY game_id, turn_number DESC`, [ids]),
+        db.query('SELECT game_id, roster_data FROM game_rosters WHERE game_id = ANY($1)', [ids]),
+    ]);
+    const partsByGame = {};
+    for (const r of partRes.rows) (partsByGame[r.game_id] = partsByGame[r.game_id] || []).push(r);
+    const stateByGame = {};
+    for (const r of stateRes.rows) stateByGame[r.game_id] = r.state_data;
+    const rosterCardsByGame = {};
+    for (const r of rosterRes.rows) {
+        const map = (rosterCardsByGame[r.game_id] = rosterCardsByGame[r.game_id] || new Map());
+        for (const c of r.roster_data || []) if (c && c.card_id != null && !map.has(Number(c.card_id))) map.set(Number(c.card_id), c);
+    }
+
+    const bySeries = new Map();
+    for (const g of gamesRes.rows) {
+        const parts = partsByGame[g.game_id] || [];
+        const homeUserId = g.home_team_user_id;
+        const awayUserId = (parts.find(p => p.user_id !== homeUserId) || {}).user_id ?? null;
+        const spOf = (uid) => {
+            const p = parts.find(x => x.user_id === uid);
+            const sp = p && p.lineup && p.lineup.startingPitcher != null ? parseInt(p.lineup.startingPitcher) : null;
+            return Number.isNaN(sp) ? null : sp;
+        };
+        const entry = buildGameSummary({
+            gameId: g.game_id,
+            gameInSeries: g.game_in_series,
+            completedAt: g.completed_at,
+            homeUserId,
+            awayUserId,
+            startingPitchers: { home: spOf(homeUserId), away: spOf(awayUserId) },
+            state: stateByGame[g.game_id] || {},
+        });
+
+        let doc = bySeries.get(g.series_id);
+        if (!doc) { doc = { games: {}, cards: {} }; bySeries.set(g.series_id, doc); }
+        doc.games[g.game_id] = entry;
+        const roster = rosterCardsByGame[g.game_id] || new Map();
+        for (const cid of cardIdsIn(entry)) {
+            if (!doc.cards[cid] && roster.has(cid)) doc.cards[cid] = roster.get(cid);
+        }
+    }
+
+    for (const [seriesId, doc] of bySeries) {
+        await db.query(`
+            INSERT INTO series_summaries (series_id, games, cards, updated_at)
+            VALUES ($1, $2, $3, NOW())
+            ON CONFLICT (series_id) DO UPDATE
+            SET games = series_summaries.games || EXCLUDED.games,
+                cards = series_summaries.cards || EXCLUDED.cards,
+                updated_at = NOW()
+        `, [seriesId, JSON.stringify(doc.games), JSON.stringify(doc.cards)]);
+    }
+    return gamesRes.rows.length;
+}
+
+async function recordGameSummary(db, gameId) {
+    return recordGameSummaries(db, [gameId]);
+}
+
+// The series' summary document ({ games: { [game_id]: entry }, cards: { [card_id]: card } }).
+// `completedGames` are the series' completed games ({ game_id, completed_at }) as the caller
+// already has them; any without an up-to-date entry are summarized first.
+async function loadSeriesSummary(db, seriesId, completedGames) {
+    const read = async () => {
+        const res = await db.query('SELECT games, cards FROM series_summaries WHERE series_id = $1', [seriesId]);
+        return res.rows[0] || { games: {}, cards: {} };
+    };
+    let doc = await read();
+    const stale = (completedGames || []).filter(g => {
+        const entry = doc.games[g.game_id];
+        const completedAt = g.completed_at ? new Date(g.completed_at).toISOString() : null;
+        return !entry || entry.completed_at !== completedAt;
+    });
+    if (stale.length > 0) {
+        await recordGameSummaries(db, stale.map(g => g.game_id));
+        doc = await read();
+    }
+    return doc;
+}
+
+module.exports = { recordGameSummaries, recordGameSummary, loadSeriesSummary };
@@ -0,0 +1,57 @@
+// Optional warm-up after a cold start (STARTUP_WARMUP=1): requests what nearly every session
+// loads first, from the server itself, so the first real users don't pay for building the
+// card catalog snapshots, the captaincy document, the pool's connections and the handlers' first
+// (unoptimized) runs.
+//
+// It goes through HTTP on purpose: the requests hit the real handlers and fill the same caches
+// (utils/snapshotResponse.js, services/captaincyService.js) a user's request would. They carry
+// the warm-up header so they don't count as the startup's first response.
+
+const jwt = require('jsonwebtoken');
+const { WARMUP_HEADER, markStartup } = require('../utils/startupProfile');
+
+// The point sets the client picks by default (stores/auth.js fetchPointSets): 'Upcoming Season'
+// during a draft, else '8/4/25 Season', else the newest.
+const DEFAULT_POINT_SETS = ['Upcoming Season', '8/4/25 Season'];
+
+async function warmUp(port) {
+    const baseUrl = `http://127.0.0.1:${port}`;
+    const token = jwt.sign({ userId: null, warmup: true }, process.env.JWT_SECRET, { expiresIn: '5m' });
+    const results = [];
+
+    const get = async (path) => {
+        const started = Date.now();
+        try {
+            const res = await fetch(`${baseUrl}${path}`, {
+                headers: { authorization: `Bearer ${token}`, [WARMUP_HEADER]: '1', 'accept-encoding': 'br, gzip' },
+            });
+            const body = await res.arrayBuffer();
+            results.push(`${path} ${res.status} ${Date.now() - started} ms`);
+            return res.ok ? body : null;
+        } catch (error) {
+            results.push(`${path} failed: ${error.message}`);
+            return null;
+        }
+    };
+
+    const pointSetsBody = await get('/api/point-sets');
+    const pointSets = pointSetsBody ? JSON.parse(Buffer.from(pointSetsBody).toString()) : [];
+    const warmSets = new Set();
+    DEFAULT_POINT_SETS.forEach((name) => {
+        const set = pointSets.find(s => s.name === name);
+        if (set) warmSets.add(set.point_set_id);
+    });
+    if (pointSets.length > 0) warmSets.add(pointSets[0].point_set_id);
+
+    await Promise.all([
+        ...[...warmSets].map(id => get(`/api/cards/player?point_set_id=${id}`)),
+        get('/api/cards/ownership'),
+        get('/api/league/season-summary'),
+        get('/api/captaincies'),
+    ]);
+
+    markStartup('warmed up');
+    console.log(`[startup] Warm-up: ${results.join('; ')}`);
+}
+
+module.exports = { warmUp };
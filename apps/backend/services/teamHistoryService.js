@@ -0,0 +1,650 @@
+// Builds the team page payloads (/api/teams/:teamId/history and /:teamId/seasons/:seasonName).
+//
+// Both views run a fixed, small set of set-based queries no matter how many seasons a franchise
+// has: every per-season fact (records, trophies, awards, accolades) is derived in JS from the one
+// broad series_results read, and the roster/point lookups are single batched reads. Loaders take
+// any `db` with a pg-style query() (the pool, a checked-out client, or a counting wrapper — see
+// bench-team-history.js), so the query plan can be measured and regression-checked.
+
+const { sortSeasons, mapSeasonToPointSet } = require('../utils/seasonUtils');
+const { getMappedIds, getFranchiseAliases, getLogoForTeam, parseHistoricalIdentity } = require('../utils/franchiseUtils');
+const { getFranchiseIndex } = require('../utils/franchiseIndex');
+const { getCaptaincyForTeam } = require('./captaincyService');
+
+const POSITION_ORDER = {
+    'SP': 1, 'RP': 2, 'C': 3, '1B': 4, '2B': 5, 'SS': 6, '3B': 7,
+    'LF': 8, 'CF': 9, 'RF': 10, 'DH': 11, 'B': 12, 'BENCH': 12
+};
+
+const ORIGINAL_POINT_SET = 'Original Pts';
+
+const sortRosterPlayers = (players) => {
+    players.sort((a, b) => {
+        const getRank = (p) => {
+            const pos = p.position === 'BENCH' ? 'B' : p.position;
+            return POSITION_ORDER[pos] || 99;
+        };
+        const rankA = getRank(a);
+        const rankB = getRank(b);
+        if (rankA !== rankB) return rankA - rankB;
+        return (b.points || 0) - (a.points || 0);
+    });
+    return players;
+};
+
+// Classic rosters live in rosters/roster_cards, priced at Original Pts.
+const CLASSIC_ROSTER_SELECT = `
+    SELECT r.user_id, r.classic_id, c.name as classic_name,
+           cp.name as player_name, cp.display_name, cp.card_id, cp.image_url,
+           rc.assignment, cp.control, cp.ip, cp.fielding_ratings,
+           ppv.points
+    FROM rosters r
+    JOIN classics c ON r.classic_id = c.id
+    JOIN roster_cards rc ON r.roster_id = rc.roster_id
+    JOIN cards_player cp ON rc.card_id = cp.card_id
+    LEFT JOIN point_sets ps ON ps.name = 'Original Pts'
+    LEFT JOIN player_point_values ppv ON cp.card_id = ppv.card_id AND ppv.point_set_id = ps.point_set_id
+`;
+
+// Joins a Classic series_results row to the classic it was played in (via the two owners).
+const CLASSIC_RESULT_JOIN = `
+    FROM series_results sr
+    JOIN teams wt ON wt.team_id = sr.winning_team_id
+    JOIN teams lt ON lt.team_id = sr.losing_team_id
+    JOIN series s ON s.series_type = 'classic'
+        AND (
+            (s.series_home_user_id = wt.user_id AND s.series_away_user_id = lt.user_id)
+            OR (s.series_home_user_id = lt.user_id AND s.series_away_user_id = wt.user_id)
+        )
+    JOIN classics c ON c.id = s.classic_id
+`;
+
+function toClassicPlayer(r) {
+    const player = {
+        card_id: r.card_id,
+        name: r.player_name,
+        displayName: r.display_name || r.player_name,
+        position: r.assignment,
+        points: r.points,
+        assignment: r.assignment,
+        control: r.control,
+        ip: r.ip,
+        fielding_ratings: r.fielding_ratings,
+        image_url: r.image_url
+    };
+    // Re-derive position for pitchers (handles PITCHING_STAFF assignment)
+    if (r.control !== null) {
+        const derivedPos = Number(r.ip) > 3 ? 'SP' : 'RP';
+        player.position = derivedPos;
+        if (!player.assignment || player.assignment.includes('/') || player.assignment === 'PITCHING_STAFF') {
+            player.assignment = derivedPos;
+        }
+    } else {
+        if (!player.position) player.position = r.assignment;
+    }
+    return player;
+}
+
+function toHistoricalPlayer(r, pts) {
+    const player = {
+        card_id: r.card_id,
+        name: r.player_name,
+        displayName: r.display_name || r.card_name || r.player_name,
+        position: r.position,
+        points: pts,
+        assignment: r.position,
+        control: r.control,
+        ip: r.ip,
+        fielding_ratings: r.fielding_ratings,
+        image_url: r.image_url
+    };
+    if (r.control !== null) {
+        if (!player.position || player.position.includes('/')) {
+            player.position = r.ip > 3 ? 'SP' : 'RP';
+        }
+    }
+    return player;
+}
+
+// Applies a historical team name (e.g. "San Diego") to a display copy of the current team.
+function applyHistoricalIdentity(team, historicalName) {
+    team.logo_url = getLogoForTeam(historicalName, team.logo_url);
+    const identity = parseHistoricalIdentity(historicalName);
+    if (identity) {
+        team.city = identity.city;
+        if (identity.name) {
+            team.name = identity.name;
+        }
+    } else if (historicalName && historicalName !== `${team.city} ${team.name}` && historicalName !== team.city) {
+        // Fallback for unparsed historical names
+        team.display_format = '{full_name}';
+        team.city = '';
+        team.name = historicalName;
+    }
+}
+
+/**
+ * Fills null historical_rosters points from player_point_values in one read: the season's
+ * mapped point set (falling back to Original Pts when that set doesn't exist) for every card
+ * that needs it. Returns season -> card_id -> points.
+ */
+async function loadMissingPoints(db, rosterRows) {
+    const needing = rosterRows.filter(r => r.points === null && r.card_id);
+    const psNameBySeason = {};
+    needing.forEach(r => {
+        if (!(r.season in psNameBySeason)) psNameBySeason[r.season] = mapSeasonToPointSet(r.season);
+    });
+    const psNames = [...new Set(Object.values(psNameBySeason).filter(Boolean))];
+    if (needing.length === 0 || psNames.length === 0) return {};
+
+    // LEFT JOIN so a point set with no values for these cards still proves it exists
+    // (and therefore that we must not fall back to Original Pts for its seasons).
+    const res = await db.query(`
+        SELECT ps.name, ppv.card_id, ppv.points
+        FROM point_sets ps
+        LEFT JOIN player_point_values ppv
+            ON ppv.point_set_id = ps.point_set_id AND ppv.card_id = ANY($2::int[])
+        WHERE ps.name = ANY($1::text[])
+    `, [[...psNames, ORIGINAL_POINT_SET], [...new Set(needing.map(r => r.card_id))]]);
+
+    const valuesBySet = {}; // point set name -> card_id -> points
+    res.rows.forEach(row => {
+        if (!valuesBySet[row.name]) valuesBySet[row.name] = {};
+        if (row.card_id !== null) valuesBySet[row.name][row.card_id] = row.points;
+    });
+
+    const bySeason = {};
+    Object.entries(psNameBySeason).forEach(([season, psName]) => {
+        if (!psName) return;
+        const values = valuesBySet[psName] || valuesBySet[ORIGINAL_POINT_SET];
+        if (values) bySeason[season] = values;
+    });
+    return bySeason;
+}
+
+/**
+ * Everything the team page needs for one franchise. Returns null if the team doesn't exist.
+ *
+ * Query plan (constant in the number of seasons): teams, series_results, then in one round trip
+ * classic names / historical rosters / classic rosters, then at most one point-value read.
+ * Captaincy comes from its own TTL cache.
+ */
+async function loadTeamHistory(db, teamId) {
+    // 1. Current team (with owner) and every team for the franchise exclusion logic.
+    // This prevents fuzzy matches (e.g. "New York") from matching "New York South".
+    const teamsRes = await db.query(`
+        SELECT t.*, u.owner_first_name, u.owner_last_name
+        FROM teams t
+        LEFT JOIN users u ON t.user_id = u.user_id
+    `);
+    const team = teamsRes.rows.find(t => String(t.team_id) === String(teamId));
+    if (!team) return null;
+
+    const allTeams = teamsRes.rows.map(t => ({ team_id: t.team_id, city: t.city, name: t.name }));
+    const franchiseIndex = getFranchiseIndex(allTeams);
+    const currentTeamName = `${team.city} ${team.name}`;
+    const currentCity = team.city;
+
+    // 2. Season History from series_results with Name-Based Matching (and ID fallback)
+    // This solves the Prod vs Local ID mismatch by relying on the Team Name which is stable.
+    const namePattern = `%${team.name}%`; // e.g. "Boston", "New York"
+    const mappedIds = getMappedIds(teamId); // Helper for Prod vs Local ID mismatch
+    const aliases = getFranchiseAliases(team.name);
+    const searchPatterns = [namePattern, ...aliases.map(a => `%${a}%`)];
+
+    // Broad query: Grab everything that might be relevant based on ID or Name, then filter strictly
+    // in JS. Records, trophies, awards and accolades are all derived from these rows.
+    const historyRes = await db.query(`
+        SELECT season_name, round, date, winning_team_id, losing_team_id, winning_team_name, losing_team_name,
+               winning_score, losing_score, style, mva, lvsc, tgaoot
+        FROM series_results
+        WHERE (winning_team_id = ANY($2::int[]) OR losing_team_id = ANY($2::int[]) OR winning_team_name ILIKE ANY($1::text[]) OR losing_team_name ILIKE ANY($1::text[]))
+        ORDER BY date DESC
+    `, [searchPatterns, mappedIds]);
+
+    const seasonStats = {}; // season_name -> { wins, losses, rounds: [], teamNameUsed: string }
+    const classicStats = {}; // season_name -> { wins, losses, rounds: [], teamNameUsed: string }
+    const finalsBySeason = {}; // season_name -> round -> first (latest) row of that round
+
+    historyRes.rows.forEach(r => {
+        const season = r.season_name;
+        const isClassic = r.style === 'Classic';
+        const targetStats = isClassic ? classicStats : seasonStats;
+
+        if (r.round) {
+            const rounds = finalsBySeason[season] || (finalsBySeason[season] = {});
+            if (!rounds[r.round]) rounds[r.round] = r;
+        }
+
+        const isWinner = franchiseIndex.matches(r.winning_team_name, r.winning_team_id, team);
+        const isLoser = franchiseIndex.matches(r.losing_team_name, r.losing_team_id, team);
+
+        let relevantSide = null; // 'winner' or 'loser'
+        let teamNameUsed = null;
+
+        if (isWinner) {
+            relevantSide = 'winner';
+            teamNameUsed = r.winning_team_name;
+        } else if (isLoser) {
+            relevantSide = 'loser';
+            teamNameUsed = r.losing_team_name;
+        }
+
+        if (!relevantSide) return; // Skip this row
+
+        if (!targetStats[season]) {
+            targetStats[season] = {
+                season_name: season,
+                wins: 0,
+                losses: 0,
+                regularWins: 0,
+                regularLosses: 0,
+                postseasonWins: 0,
+                postseasonLosses: 0,
+                rounds: new Set(),
+                teamNameUsed: null
+            };
+        }
+
+        // Treat 'Round Robin' as Regular Season to fix 0-0 records issue
+        // Treat 'Semifinal' as Regular Season per user request
+        // Classics have no Regular Season round — count all their results in the regular record
+        const isPostseason = !isClassic && r.round && r.round !== 'Regular Season' && r.round !== 'Round Robin' && r.round !== 'Semifinal';
+
+        const w = relevantSide === 'winner' ? (r.winning_score || 0) : (r.losing_score || 0);
+        const l = relevantSide === 'winner' ? (r.losing_score || 0) : (r.winning_score || 0);
+        targetStats[season].wins += w;
+        targetStats[season].losses += l;
+        if (isPostseason) {
+            targetStats[season].postseasonWins += w;
+            targetStats[season].postseasonLosses += l;
+        } else {
+            targetStats[season].regularWins += w;
+            targetStats[season].regularLosses += l;
+        }
+
+        // Track the name used this season (if not set or update if we found one)
+        if (teamNameUsed) targetStats[season].teamNameUsed = teamNameUsed;
+
+        if (r.round) {
+            targetStats[season].rounds.add(r.round);
+        }
+    });
+
+    // MVA/LVSC/TGAOOT come from the trophy rows. They're only shown for a trophy this franchise
+    // won (or the spoon it holds), and those rows are necessarily in historyRes.
+    const seasonAwards = {};
+    historyRes.rows.forEach(r => {
+        const isAwardRow = r.round === 'Golden Spaceship' || r.round === 'Wooden Spoon' ||
+            (r.style === 'Classic' && r.round === 'Silver Submarine');
+        if (!isAwardRow) return;
+        if (!seasonAwards[r.season_name]) seasonAwards[r.season_name] = {};
+        if (r.mva) seasonAwards[r.season_name].mva = r.mva;
+        if (r.lvsc) seasonAwards[r.season_name].lvsc = r.lvsc;
+        if (r.tgaoot) seasonAwards[r.season_name].tgaoot = r.tgaoot;
+    });
+
+    // Convert stats to array
+    const processStats = (statsObj) => Object.values(statsObj).map(s => {
+        const total = s.regularWins + s.regularLosses;
+        const winPct = total > 0 ? (s.regularWins / total).toFixed(3).replace(/^0+/, '') : '.000';
+        const finals = finalsBySeason[s.season_name] || {};
+
+        let result = '-';
+
+        if (s.rounds.has('Golden Spaceship')) {
+            const spaceship = finals['Golden Spaceship'];
+            if (spaceship && franchiseIndex.matches(spaceship.winning_team_name, spaceship.winning_team_id, team)) {
+                result = `Champion (${s.postseasonWins}-${s.postseasonLosses})`;
+            } else if (spaceship) {
+                result = `Runner Up (${s.postseasonWins}-${s.postseasonLosses})`;
+            }
+        } else if (s.rounds.has('Playoffs') || s.rounds.has('Semi-Finals')) {
+            result = `Playoffs (${s.postseasonWins}-${s.postseasonLosses})`;
+        } else if (s.rounds.has('Silver Submarine')) {
+            // Use direct game scores to avoid the aggregated-0-0 bug
+            const subGame = finals['Silver Submarine'];
+            if (subGame) {
+                const weWon = franchiseIndex.matches(subGame.winning_team_name, subGame.winning_team_id, team);
+                const label = weWon ? 'Silver Submarine' : 'Silver Submarine Participant';
+                const w = weWon ? (subGame.winning_score ?? 0) : (subGame.losing_score ?? 0);
+                const l = weWon ? (subGame.losing_score ?? 0) : (subGame.winning_score ?? 0);
+                result = (w || l) ? `${label} (${w}-${l})` : label;
+            }
+        } else if (s.rounds.has('Wooden Spoon')) {
+            const spoonGame = finals['Wooden Spoon'];
+            if (spoonGame) {
+                const weHoldSpoon = franchiseIndex.matches(spoonGame.losing_team_name, spoonGame.losing_team_id, team);
+                const label = weHoldSpoon ? 'Wooden Spoon' : 'Wooden Spoon Participant';
+                const w = weHoldSpoon ? (spoonGame.losing_score ?? 0) : (spoonGame.winning_score ?? 0);
+                const l = weHoldSpoon ? (spoonGame.winning_score ?? 0) : (spoonGame.losing_score ?? 0);
+                result = (w || l) ? `${label} (${w}-${l})` : label;
+            }
+        }
+
+        const awards = seasonAwards[s.season_name] || {};
+        const wonChampionship = result.startsWith('Champion');
+        const holdsSpoon = result.startsWith('Wooden Spoon') && !result.includes('Participant');
+        const wonSilverSub = result.startsWith('Silver Submarine') && !result.includes('Participant');
+        const wonTrophy = wonChampionship || wonSilverSub;
+        return {
+            season: s.season_name,
+            wins: s.regularWins,
+            losses: s.regularLosses,
+            winPct,
+            result,
+            teamNameUsed: s.teamNameUsed,
+            mva: wonTrophy ? (awards.mva || null) : null,
+            lvsc: holdsSpoon ? (awards.lvsc || null) : null,
+            tgaoot: wonTrophy ? (awards.tgaoot || null) : null
+        };
+    });
+
+    const historyList = processStats(seasonStats);
+    const classicHistoryList = processStats(classicStats);
+
+    // Sort regular history for identity-history calculation (which walks historyList)
+    const regularSeasonNames = sortSeasons(historyList.map(h => h.season));
+    historyList.sort((a, b) => regularSeasonNames.indexOf(a.season) - regularSeasonNames.indexOf(b.season));
+
+    // Roster history is stored by team name: the current name, city, aliases and every
+    // name the franchise actually played under.
+    const namesUsed = new Set([currentTeamName, currentCity, ...aliases]);
+    historyList.forEach(h => {
+        if (h.teamNameUsed) namesUsed.add(h.teamNameUsed);
+    });
+
+    // 3. Independent batched reads, issued together.
+    const classicSeasonNamesForLookup = classicHistoryList.map(h => h.season).filter(Boolean);
+    const [classicNameRows, rosterRes, classicRosterRes] = await Promise.all([
+        // Human-readable classic names, joined through series -> classics
+        classicSeasonNamesForLookup.length > 0
+            ? db.query(`
+                SELECT DISTINCT ON (sr.season_name) sr.season_name, c.name AS classic_name
+                ${CLASSIC_RESULT_JOIN}
+                WHERE sr.style = 'Classic'
+                AND sr.season_name = ANY($1::text[])
+                ORDER BY sr.season_name, c.id
+            `, [classicSeasonNamesForLookup])
+                .then(r => r.rows)
+                // series table may not exist in all environments; fall back to season_name
+                .catch(() => [])
+            : [],
+        db.query(`
+            SELECT hr.*, cp.display_name, cp.name as card_name, cp.fielding_ratings, cp.control, cp.ip, cp.image_url
+            FROM historical_rosters hr
+            LEFT JOIN cards_player cp ON hr.card_id = cp.card_id
+            WHERE hr.team_name = ANY($1::text[])
+        `, [[...namesUsed]]),
+        team.user_id
+            ? db.query(`${CLASSIC_ROSTER_SELECT} WHERE r.roster_type = 'classic' AND r.user_id = $1`, [team.user_id])
+            : null
+    ]);
+
+    const classicNameMap = {};
+    classicNameRows.forEach(r => {
+        classicNameMap[r.season_name] = r.classic_name;
+    });
+
+    // Stamp classicName onto classicHistoryList so roster-matrix lookups can match by classic name
+    classicHistoryList.forEach(h => {
+        h.classicName = classicNameMap[h.season] || null;
+    });
+
+    // Build one combined chronologically-sorted list (regular + classic interleaved)
+    const allHistoryEntries = [
+        ...historyList.map(h => ({ ...h, isClassic: false })),
+        ...classicHistoryList.map(h => ({
+            ...h,
+            isClassic: true,
+            classicName: h.classicName,
+            originalSeason: h.season  // Preserved for URL params (season detail uses season_name, not classic name)
+        }))
+    ];
+    const sortedAllSeasonNames = sortSeasons([...new Set(allHistoryEntries.map(h => h.season))]);
+    allHistoryEntries.sort((a, b) => {
+        const idxA = sortedAllSeasonNames.indexOf(a.season);
+        const idxB = sortedAllSeasonNames.indexOf(b.season);
+        if (idxA !== idxB) return idxA - idxB;
+        return (a.isClassic ? 1 : 0) - (b.isClassic ? 1 : 0);
+    });
+
+    // IDENTITY HISTORY (Chronological): group consecutive seasons with the same team name.
+    // sortSeasons returns Newest First, so walk historyList in reverse (Oldest -> Newest).
+    const identityHistory = [];
+    let currentIdentity = null;
+    for (let i = historyList.length - 1; i >= 0; i--) {
+        const h = historyList[i];
+        const name = h.teamNameUsed || currentTeamName;
+
+        if (!currentIdentity || currentIdentity.name !== name) {
+            if (currentIdentity) identityHistory.push(currentIdentity);
+            currentIdentity = { name: name, start: h.season, end: h.season };
+        } else {
+            currentIdentity.end = h.season;
+        }
+    }
+    if (currentIdentity) identityHistory.push(currentIdentity);
+
+    // 4. Roster History, with missing points filled from the season's point set
+    const pointsBySeason = await loadMissingPoints(db, rosterRes.rows);
+    const rosterHistory = {};
+    rosterRes.rows.forEach(r => {
+        if (!rosterHistory[r.season]) rosterHistory[r.season] = [];
+
+        let pts = r.points;
+        if (pts === null && r.card_id) {
+            const found = (pointsBySeason[r.season] || {})[r.card_id];
+            if (found !== undefined) pts = found;
+        }
+        rosterHistory[r.season].push(toHistoricalPlayer(r, pts));
+    });
+
+    const formattedRosters = sortSeasons(Object.keys(rosterHistory)).map(season => ({
+        season: season,
+        players: sortRosterPlayers(rosterHistory[season])
+    }));
+
+    // 5. Classic Rosters, keyed by classic name
+    const formattedClassicRosters = [];
+    if (classicRosterRes) {
+        const classicRosterHistory = {};
+        classicRosterRes.rows.forEach(r => {
+            const seasonKey = r.classic_name || 'Classic';
+            if (!classicRosterHistory[seasonKey]) classicRosterHistory[seasonKey] = [];
+            classicRosterHistory[seasonKey].push(toClassicPlayer(r));
+        });
+        Object.keys(classicRosterHistory).forEach(season => {
+            formattedClassicRosters.push({ season: season, players: sortRosterPlayers(classicRosterHistory[season]) });
+        });
+        // Sort Classic Rosters descending by season/classic name
+        formattedClassicRosters.sort((a, b) => b.season.localeCompare(a.season));
+    }
+
+    // 6. Accolades: historyRes already holds every trophy row the old per-trophy queries
+    // matched (same id/name predicates), so filter it strictly instead of re-querying.
+    // Strict matching avoids "New York" grabbing "New York South" trophies.
+    const accolade = (round, isWinner) => historyRes.rows
+        .filter(r => r.round === round && (isWinner
+            ? franchiseIndex.matches(r.winning_team_name, r.winning_team_id, team)
+            : franchiseIndex.matches(r.losing_team_name, r.losing_team_id, team)))
+        .map(r => (isWinner
+            ? { season_name: r.season_name, date: r.date, winning_team_id: r.winning_team_id, winning_team_name: r.winning_team_name, round: r.round }
+            : { season_name: r.season_name, date: r.date, losing_team_id: r.losing_team_id, losing_team_name: r.losing_team_name, round: r.round }));
+
+    // Captaincy: per-season captains, current captain, Face of the Franchise, and
+    // per-player base scores (used to rank the score-based Core Squad on the client).
+    let captaincy = { captains: {}, currentCaptain: null, face: null, playerScores: { byCard: {}, byName: {} } };
+    try {
+        captaincy = await getCaptaincyForTeam(teamId);
+    } catch (capErr) {
+        console.error('Captaincy computation failed (non-fatal):', capErr);
+    }
+
+    return {
+        team,
+        history: allHistoryEntries,       // Combined sorted list with isClassic flag
+        classicHistory: classicHistoryList, // Kept separate for roster-matrix lookups
+        identityHistory: identityHistory.reverse(), // Send Newest -> Oldest for display
+        rosters: formattedRosters,
+        classicRosters: formattedClassicRosters,
+        captaincy,
+        accolades: {
+            spaceships: accolade('Golden Spaceship', true),
+            spoons: accolade('Wooden Spoon', false), // The spoon is held by the series loser
+            submarines: accolade('Silver Submarine', true)
+        }
+    };
+}
+
+/**
+ * One franchise's view of one season (regular or Classic). Returns null if the team doesn't exist.
+ *
+ * Query plan: teams, (Classic only) one classic-name resolution, then results and roster
+ * together, then at most one point-value read.
+ */
+async function loadTeamSeason(db, teamId, seasonName, type) {
+    const isClassic = type === 'Classic';
+
+    const teamsRes = await db.query('SELECT * FROM teams');
+    const currentTeam = teamsRes.rows.find(t => String(t.team_id) === String(teamId));
+    if (!currentTeam) return null;
+    // Create a copy for modification (display purposes)
+    const team = { ...currentTeam };
+    const allTeams = teamsRes.rows.map(t => ({ team_id: t.team_id, city: t.city, name: t.name, logo_url: t.logo_url }));
+    const franchiseIndex = getFranchiseIndex(allTeams);
+
+    // For Classic seasons, resolve classic name <-> underlying season_name bidirectionally.
+    // The URL uses the classic name (e.g. "Inaugural Classic") but series_results stores
+    // the regular season name (e.g. "Winter 2026") in season_name. A classic-name match wins.
+    let resultsSeasonName = seasonName;
+    let classicNameForRoster = seasonName;
+    if (isClassic) {
+        try {
+            const lookupRes = await db.query(`
+                SELECT sr.season_name, c.name AS classic_name, (c.name = $1) AS by_classic_name
+                ${CLASSIC_RESULT_JOIN}
+                WHERE sr.style = 'Classic' AND (c.name = $1 OR sr.season_name = $1)
+                ORDER BY by_classic_name DESC
+                LIMIT 1
+            `, [seasonName]);
+            const match = lookupRes.rows[0];
+            if (match && match.by_classic_name) resultsSeasonName = match.season_name;
+            else if (match) classicNameForRoster = match.classic_name;
+        } catch (_) { /* series table may not exist in some environments */ }
+    }
+
+    const [allResultsRes, rosterSourceRes] = await Promise.all([
+        db.query(`
+            SELECT sr.*,
+                   (SELECT s.id FROM series s WHERE s.series_result_id = sr.id ORDER BY s.id DESC LIMIT 1) AS live_series_id
+            FROM series_results sr
+            WHERE sr.season_name = $1
+            ORDER BY sr.date DESC
+        `, [resultsSeasonName]),
+        isClassic
+            ? db.query(`${CLASSIC_ROSTER_SELECT} WHERE c.name = $1 AND r.user_id = $2 AND r.roster_type = 'classic'`,
+                [classicNameForRoster, team.user_id])
+            : db.query(`
+                SELECT hr.*, cp.display_name, cp.name as card_name, cp.fielding_ratings, cp.control, cp.ip, cp.image_url
+                FROM historical_rosters hr
+                LEFT JOIN cards_player cp ON hr.card_id = cp.card_id
+                WHERE hr.season = $1
+            `, [seasonName])
+    ]);
+
+    // Historical identity from the first result this franchise took part in
+    const representativeGame = allResultsRes.rows.find(r =>
+        franchiseIndex.matches(r.winning_team_name, r.winning_team_id, currentTeam) ||
+        franchiseIndex.matches(r.losing_team_name, r.losing_team_id, currentTeam)
+    );
+    let historicalName = null;
+    if (representativeGame) {
+        historicalName = franchiseIndex.matches(representativeGame.winning_team_name, representativeGame.winning_team_id, currentTeam)
+            ? representativeGame.winning_team_name
+            : representativeGame.losing_team_name;
+    }
+    if (historicalName) applyHistoricalIdentity(team, historicalName);
+
+    let roster;
+    if (isClassic) {
+        roster = rosterSourceRes.rows.map(toClassicPlayer);
+    } else {
+        // Filter the season's rows down to this franchise
+        const rosterRows = rosterSourceRes.rows.filter(r => franchiseIndex.matches(r.team_name, null, currentTeam));
+
+        // Fall back to the roster's team name for the identity if no result named it
+        if (!historicalName && rosterRows.length > 0) applyHistoricalIdentity(team, rosterRows[0].team_name);
+
+        const pointsLookup = (await loadMissingPoints(db, rosterRows))[seasonName] || {};
+        roster = rosterRows.map(r => {
+            let pts = r.points;
+            if (pts === null && r.card_id && pointsLookup[r.card_id] !== undefined) {
+                pts = pointsLookup[r.card_id];
+            }
+            return toHistoricalPlayer(r, pts);
+        });
+    }
+
+    const results = [];
+    allResultsRes.rows.forEach(r => {
+        // FILTER BY STYLE
+        if (isClassic ? r.style !== 'Classic' : r.style === 'Classic') return;
+
+        const isWinner = franchiseIndex.matches(r.winning_team_name, r.winning_team_id, currentTeam);
+        const isLoser = franchiseIndex.matches(r.losing_team_name, r.losing_team_id, currentTeam);
+        if (!isWinner && !isLoser) return;
+
+        // A scheduled/unplayed series has no score yet, and its winning/losing slots are just the
+        // two participants — not an actual outcome. Blank the result and score so the row reads as
+        // an upcoming matchup rather than a phantom "null-null" loss.
+        const isUnplayed = r.winning_score == null || r.losing_score == null;
+        const opponentName = isWinner ? r.losing_team_name : r.winning_team_name;
+
+        // Use robust matching to find the correct current team, handling ID/Name mismatches
+        const opTeam = isWinner
+            ? franchiseIndex.resolve(r.losing_team_name, r.losing_team_id)
+            : franchiseIndex.resolve(r.winning_team_name, r.winning_team_id);
+        const opponentLogo = getLogoForTeam(opponentName, opTeam.team_id ? opTeam.logo_url : null);
+
+        results.push({
+            opponent: opponentName,
+            opponent_logo: opponentLogo,
+            result: isUnplayed ? '' : (isWinner ? 'W' : 'L'),
+            score: isUnplayed ? '' : `${r.winning_score}-${r.losing_score}`,
+            round: r.round,
+            date: r.date,
+            game_wins: isWinner ? r.winning_score : r.losing_score,
+            game_losses: isWinner ? r.losing_score : r.winning_score,
+            series_id: r.live_series_id,
+            mva: r.mva || null,
+            lvsc: r.lvsc || null
+        });
+    });
+
+    // Extract season-level awards; classics use Silver Submarine instead of Golden Spaceship
+    const spaceshipRow = allResultsRes.rows.find(r => r.round === 'Golden Spaceship');
+    const spoonRow = allResultsRes.rows.find(r => r.round === 'Wooden Spoon');
+    const subRow = allResultsRes.rows.find(r => r.round === 'Silver Submarine');
+
+    // Only surface awards for the team that won the corresponding trophy
+    const teamWonChampionship = spaceshipRow && franchiseIndex.matches(spaceshipRow.winning_team_name, spaceshipRow.winning_team_id, currentTeam);
+    const teamWonSilverSub = subRow && franchiseIndex.matches(subRow.winning_team_name, subRow.winning_team_id, currentTeam);
+    const teamHoldsSpoon = spoonRow && franchiseIndex.matches(spoonRow.losing_team_name, spoonRow.losing_team_id, currentTeam);
+
+    const awardSourceRow = teamWonChampionship ? spaceshipRow : (teamWonSilverSub ? subRow : null);
+
+    return {
+        team,
+        season: classicNameForRoster,
+        originalSeason: resultsSeasonName,
+        isClassic,
+        mva: awardSourceRow ? (awardSourceRow.mva || null) : null,
+        lvsc: teamHoldsSpoon ? (spoonRow.lvsc || null) : null,
+        tgaoot: awardSourceRow ? (awardSourceRow.tgaoot || null) : null,
+        roster,
+        results
+    };
+}
+
+module.exports = { loadTeamHistory, loadTeamSeason };
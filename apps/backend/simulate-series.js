@@ -139,7 +139,7 @@ async function main() {
       await client.query(
         `UPDATE series_results SET status=$1, result_source=$2,
            winning_team_id=$3, winning_team_name=$4, winning_score=$5,
-           losing_team_id=$6, losing_team_name=$7, losing_score=$8 WHERE id=$9`,
+           losing_team_id=$6, losing_team_name=$7, losing_score=$8, completed_at=now() WHERE id=$9`,
         [update.status, update.result_source, update.winning_team_id, update.winning_team_name, update.winning_score,
          update.losing_team_id, update.losing_team_name, update.losing_score, sr.id]);
       if (isOver) await client.query("UPDATE series SET status='completed' WHERE id=$1", [seriesId]);
@@ -0,0 +1,87 @@
+const EventEmitter = require('events');
+
+const mockInserts = [];
+const mockStarts = new Set();
+
+function mockQuery(sql, params) {
+    if (sql.includes('FROM game_action_starts')) return { rows: mockStarts.has(params[0]) ? [{}] : [] };
+    if (sql.includes('INSERT INTO game_action_starts')) {
+        mockStarts.add(params[0]);
+        return { rows: [] };
+    }
+    if (sql.includes('INSERT INTO game_actions')) {
+        mockInserts.push(params);
+        return { rows: [] };
+    }
+    if (sql.includes('FROM games')) return { rows: [{ game_id: params[0], status: 'in_progress' }] };
+    return { rows: [] };
+}
+
+jest.mock('../db', () => ({
+    pool: { query: async (sql, params) => mockQuery(sql, params) }
+}));
+
+const { rollD20, withDice } = require('../utils/dice');
+const { recordGameActions, enableReplay } = require('../services/actionLogService');
+
+const settle = () => new Promise(resolve => setTimeout(resolve, 0));
+
+// Runs a POST through the middleware; `handler` stands in for the endpoint.
+async function post(action, { status = 200, body = {}, headers = {}, user = { userId: 3 } } = {}, handler = () => {}) {
+    const req = {
+        method: 'POST',
+        params: { gameId: '7' },
+        path: `/api/games/7/${action}`,
+        body,
+        user,
+        get: name => headers[name],
+    };
+    const res = new EventEmitter();
+    res.statusCode = status;
+    let handled;
+    await recordGameActions(req, res, () => { handled = handler(); });
+    res.emit('finish');
+    await settle();
+    return handled;
+}
+
+describe('game action log', () => {
+    test('rollD20 records draws made under a context and replays recorded ones', () => {
+        const recorded = { rolls: [] };
+        const drawn = withDice(recorded, () => [rollD20(), rollD20(), rollD20()]);
+        expect(recorded.rolls).toEqual(drawn);
+        drawn.forEach(roll => expect(roll >= 1 && roll <= 20).toBe(true));
+
+        const replayed = withDice({ rolls: [], replay: [...drawn] }, () => [rollD20(), rollD20(), rollD20()]);
+        expect(replayed).toEqual(drawn);
+        expect(() => withDice({ replay: [] }, rollD20)).toThrow('Replay ran out of recorded rolls.');
+    });
+
+    test('records successful signed-in actions with their rolls, after storing the start point', async () => {
+        expect(await post('pitch', { user: null }, () => 'rejected')).toBe('rejected');
+        expect(mockStarts.has(7)).toBe(false);
+
+        const rolls = await post('pitch', { body: { action: 'pitch' } }, () => [rollD20(), rollD20()]);
+        await post('next-hitter');
+        await post('swing', { status: 409 }, () => rollD20());
+
+        expect(mockStarts.has(7)).toBe(true);
+        expect(mockInserts).toEqual([
+            [7, 'pitch', 3, JSON.stringify({ action: 'pitch' }), rolls, 200],
+            [7, 'next-hitter', 3, null, [], 200],
+        ]);
+    });
+
+    test('in replay mode, takes rolls from the request and records nothing', async () => {
+        const results = [];
+        enableReplay((replayId, result) => results.push({ replayId, ...result }));
+        mockInserts.length = 0;
+
+        const headers = { 'x-replay-rolls': '[4,17,9]', 'x-replay-id': 'a' };
+        const rolls = await post('pitch', { headers }, () => [rollD20(), rollD20()]);
+
+        expect(rolls).toEqual([4, 17]);
+        expect(results).toEqual([{ replayId: 'a', status: 200, unusedRolls: 1 }]);
+        expect(mockInserts).toEqual([]);
+    });
+});
@@ -0,0 +1,72 @@
+const { Writable } = require('stream');
+
+jest.mock('pg-copy-streams', () => ({ from: (sql) => ({ copySql: sql }) }));
+
+const { encodeCopyValue, encodeCopyRow, copyIntoStaging, swapFromStaging } = require('../utils/bulkLoad');
+
+// Records plain queries; a COPY gets a stream that collects what was written to it.
+function mockClient() {
+    const queries = [];
+    const copies = [];
+    return {
+        queries,
+        copies,
+        query: (q) => {
+            if (typeof q === 'string') {
+                queries.push(q);
+                return Promise.resolve({ rowCount: 0, rows: [] });
+            }
+            const copy = { sql: q.copySql, data: '' };
+            copies.push(copy);
+            return new Writable({ write(chunk, enc, cb) { copy.data += chunk; cb(); } });
+        }
+    };
+}
+
+describe('encodeCopyValue', () => {
+    test('null and undefined become the COPY null marker', () => {
+        expect(encodeCopyValue(null)).toBe('\\N');
+        expect(encodeCopyValue(undefined)).toBe('\\N');
+    });
+    test('numbers and plain strings pass through', () => {
+        expect(encodeCopyValue(42)).toBe('42');
+        expect(encodeCopyValue('Round Robin')).toBe('Round Robin');
+        expect(encodeCopyValue('')).toBe('');
+    });
+    test('backslashes, tabs and newlines are escaped', () => {
+        expect(encodeCopyValue('a\\b')).toBe('a\\\\b');
+        expect(encodeCopyValue('a\tb')).toBe('a\\tb');
+        expect(encodeCopyValue('line1\nline2\r')).toBe('line1\\nline2\\r');
+    });
+});
+
+describe('encodeCopyRow', () => {
+    test('joins values with tabs and terminates with a newline', () => {
+        expect(encodeCopyRow(['Spring 2025', 'Boston', null, 4]))
+            .toBe('Spring 2025\tBoston\t\\N\t4\n');
+    });
+});
+
+describe('staging', () => {
+    test('the staging table holds only the loaded columns, so omitted ids and timestamps use the live defaults', async () => {
+        const client = mockClient();
+        const columns = ['season_name', 'winning_team_name', 'winning_score'];
+        const staging = await copyIntoStaging(client, 'series_results', columns, [['Spring 2025', 'Boston', 4]]);
+
+        expect(staging).toBe('series_results_staging');
+        expect(client.queries[0]).toBe(
+            'CREATE TEMP TABLE series_results_staging ON COMMIT DROP AS ' +
+            'SELECT season_name, winning_team_name, winning_score FROM series_results WITH NO DATA'
+        );
+        expect(client.copies).toEqual([{
+            sql: 'COPY series_results_staging (season_name, winning_team_name, winning_score) FROM STDIN',
+            data: 'Spring 2025\tBoston\t4\n'
+        }]);
+
+        await swapFromStaging(client, 'series_results', columns);
+        expect(client.queries[2]).toBe(
+            'INSERT INTO series_results (season_name, winning_team_name, winning_score) ' +
+            'SELECT season_name, winning_team_name, winning_score FROM series_results_staging'
+        );
+    });
+});
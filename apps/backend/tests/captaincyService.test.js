@@ -0,0 +1,75 @@
+const mockDb = { version: '1', stored: null, computes: 0, writes: 0, locked: false };
+const mockListeners = [];
+
+function mockQuery(sql, params) {
+    if (sql.includes('pg_try_advisory_lock')) return { rows: [{ ok: !mockDb.locked }] };
+    if (sql.includes('pg_advisory_unlock')) return { rows: [] };
+    if (sql.includes('FROM captaincy_documents')) {
+        return { rows: mockDb.stored ? [{ source_version: mockDb.stored.version, payload: mockDb.stored.payload }] : [] };
+    }
+    if (sql.includes('INSERT INTO captaincy_documents')) {
+        mockDb.writes += 1;
+        if (!mockDb.stored || Number(mockDb.stored.version) < params[0]) {
+            mockDb.stored = { version: String(params[0]), payload: JSON.parse(params[1]) };
+        }
+        return { rows: [] };
+    }
+    if (sql.includes('FROM teams')) mockDb.computes += 1;
+    return { rows: [] };
+}
+
+jest.mock('../db', () => ({
+    pool: {
+        query: async (sql, params) => mockQuery(sql, params),
+        connect: async () => ({ query: async (sql, params) => mockQuery(sql, params), release: () => {} })
+    }
+}));
+jest.mock('../services/dataVersions', () => ({
+    getDataVersion: async () => mockDb.version,
+    onDataVersionChange: (fn) => mockListeners.push(fn)
+}));
+jest.mock('../utils/captaincyUtils', () => ({
+    computeCaptaincies: () => ({ captains: { 1: { SS: { card_id: mockDb.computes } } }, currentCaptains: {}, faces: {}, playerScores: {}, coreSquads: {} })
+}));
+
+const { getCaptaincies } = require('../services/captaincyService');
+
+const settle = () => new Promise(resolve => setTimeout(resolve, 0));
+
+describe('captaincy document', () => {
+    test('serves stored results and recomputes stale ones in the background', async () => {
+        // Nothing stored yet: the first request has to wait for the compute, which is stored.
+        const first = await getCaptaincies();
+        expect(first.captains[1].SS.card_id).toBe(1);
+        expect(mockDb.stored.version).toBe('1');
+
+        // Unchanged inputs: no recompute.
+        await getCaptaincies();
+        expect(mockDb.computes).toBe(1);
+
+        // Inputs changed: the request gets the current document straight away...
+        mockDb.version = '2';
+        const stale = await getCaptaincies();
+        expect(stale.captains[1].SS.card_id).toBe(1);
+        // ...and the background refresh lands for the next one.
+        await settle();
+        expect(mockDb.computes).toBe(2);
+        expect(mockDb.stored.version).toBe('2');
+        expect((await getCaptaincies()).captains[1].SS.card_id).toBe(2);
+
+        // A change notification starts the recompute before any request asks.
+        mockDb.version = '3';
+        mockListeners.forEach(fn => fn('captaincy'));
+        await settle();
+        await settle();
+        expect(mockDb.computes).toBe(3);
+
+        // Another worker already stored the newer version: adopt it rather than recompute.
+        mockDb.version = '4';
+        mockDb.stored = { version: '4', payload: { captains: { 1: { SS: { card_id: 99 } } } } };
+        await getCaptaincies();
+        await settle();
+        expect(mockDb.computes).toBe(3);
+        expect((await getCaptaincies()).captains[1].SS.card_id).toBe(99);
+    });
+});
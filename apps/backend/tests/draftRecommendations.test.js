@@ -0,0 +1,100 @@
+const { createDraftBoard, cardValue, slotsOf } = require('../utils/draftRecommendations');
+
+const hitter = (id, points, onBase, chart, fielding, extra = {}) => ({
+    card_id: id, name: `H${id}`, points, control: null, ip: null, on_base: onBase, speed: 15,
+    fielding_ratings: fielding, chart_data: chart, ...extra
+});
+const pitcher = (id, points, control, ip, chart) => ({
+    card_id: id, name: `P${id}`, points, control, ip, on_base: null, speed: null,
+    fielding_ratings: null, chart_data: chart
+});
+
+const GOOD_BAT = { '1-4': 'SO', '5-8': 'GB', '9-12': 'BB', '13-16': '1B', '17-18': '2B', '19-20': 'HR' };
+const WEAK_BAT = { '1-8': 'SO', '9-12': 'GB', '13-16': 'FB', '17-19': '1B', '20': '2B' };
+const GOOD_ARM = { '1-3': 'PU', '4-10': 'SO', '11-15': 'GB', '16-18': 'FB', '19-20': '1B' };
+const WEAK_ARM = { '1': 'PU', '2-4': 'SO', '5-8': 'GB', '9-10': 'FB', '11-14': 'BB', '15-18': '1B', '19-20': 'HR' };
+
+// A deterministic pool: every position several deep, a spread of quality and price.
+function makePool() {
+    const cards = [];
+    let id = 1;
+    const fields = [{ C: 3 }, { '1B': 1 }, { '2B': 3 }, { SS: 4 }, { '3B': 2 }, { LFRF: 1 }, { CF: 2 }];
+    for (let i = 0; i < 120; i++) {
+        const good = i % 3 !== 0;
+        cards.push(hitter(id++, 100 + (i * 37) % 500, 8 + (i % 6), good ? GOOD_BAT : WEAK_BAT, fields[i % fields.length]));
+    }
+    for (let i = 0; i < 60; i++) {
+        cards.push(pitcher(id++, 80 + (i * 53) % 520, 1 + (i % 5), i % 2 ? 7 : 1, i % 4 ? GOOD_ARM : WEAK_ARM));
+    }
+    return cards;
+}
+
+describe('card valuation', () => {
+    test('a better chart and on-base rate is worth more', () => {
+        expect(cardValue(hitter(1, 100, 12, GOOD_BAT, null))).toBeGreaterThan(cardValue(hitter(2, 100, 9, GOOD_BAT, null)));
+        expect(cardValue(hitter(1, 100, 10, GOOD_BAT, null))).toBeGreaterThan(cardValue(hitter(2, 100, 10, WEAK_BAT, null)));
+        expect(cardValue(pitcher(3, 100, 5, 7, GOOD_ARM))).toBeGreaterThan(cardValue(pitcher(4, 100, 2, 7, WEAK_ARM)));
+    });
+
+    test('slots map LFRF to both corners and pitchers by IP', () => {
+        expect(slotsOf(hitter(1, 100, 10, GOOD_BAT, { LFRF: 1, CF: 2 })).sort()).toEqual(['CF', 'LF', 'RF']);
+        expect(slotsOf(hitter(1, 100, 10, GOOD_BAT, null))).toEqual([]);
+        expect(slotsOf(pitcher(2, 100, 3, 7, GOOD_ARM))).toEqual(['SP']);
+        expect(slotsOf(pitcher(2, 100, 3, 1, GOOD_ARM))).toEqual(['RP']);
+    });
+});
+
+describe('createDraftBoard', () => {
+    test('cheaper cards with the same production rank higher', () => {
+        const board = createDraftBoard({
+            cards: [hitter(1, 400, 10, GOOD_BAT, { '1B': 1 }), hitter(2, 150, 10, GOOD_BAT, { '1B': 1 })],
+            rosters: { 1: [] }
+        });
+        expect(board.order(1)).toEqual([2, 1]);
+    });
+
+    test('roster fit favours the positions a team is missing', () => {
+        const cards = [hitter(1, 200, 10, GOOD_BAT, { C: 3 }), hitter(2, 200, 10, GOOD_BAT, { SS: 3 }), hitter(3, 100, 9, WEAK_BAT, { C: 1 })];
+        const board = createDraftBoard({ cards, rosters: { 1: [{ card_id: 3, assignment: 'C' }], 2: [] } });
+        expect(board.top(1, 1)[0].card_id).toBe(2);
+        expect(board.top(1, 1)[0].fit).toBe(1);
+        expect(board.summary(1).needs).not.toContain('C');
+    });
+
+    test('picked cards leave every board and dropped cards return', () => {
+        const board = createDraftBoard({ cards: makePool(), rosters: { 1: [], 2: [] } });
+        board.syncTeam(1, [{ card_id: 5, assignment: 'BENCH' }]);
+        expect(board.order(1)).not.toContain(5);
+        expect(board.order(2)).not.toContain(5);
+        board.syncTeam(1, []);
+        expect(board.order(2)).toContain(5);
+    });
+
+    test('incremental updates match a board built from scratch', () => {
+        const cards = makePool();
+        const rosters = { 1: [], 2: [{ card_id: 4, assignment: 'SS' }], 3: [] };
+        const board = createDraftBoard({ cards, rosters });
+
+        const moves = [
+            [1, [1, 7, 125]], [2, [4, 2, 130]], [3, [11, 150]],
+            [1, [1, 125, 30]], [2, [4, 2, 130, 17]], [3, [150, 11, 90, 160]]
+        ];
+        moves.forEach(([teamId, ids]) => {
+            rosters[teamId] = ids.map(id => ({ card_id: id, assignment: id > 120 ? 'PITCHING_STAFF' : 'BENCH' }));
+            board.syncTeam(teamId, rosters[teamId]);
+        });
+
+        const fresh = createDraftBoard({ cards, rosters });
+        [1, 2, 3].forEach(teamId => {
+            expect(board.order(teamId)).toEqual(fresh.order(teamId));
+            expect(board.top(teamId, 10)).toEqual(fresh.top(teamId, 10));
+        });
+    });
+
+    test('recommendations skip cards the team cannot afford', () => {
+        const cards = [hitter(1, 4900, 14, GOOD_BAT, { SS: 5 }), hitter(2, 300, 10, WEAK_BAT, { SS: 1 }), pitcher(3, 4600, 6, 7, GOOD_ARM)];
+        const board = createDraftBoard({ cards, rosters: { 1: [{ card_id: 3, assignment: 'PITCHING_STAFF' }] } });
+        expect(board.top(1).map(r => r.card_id)).toEqual([2]);
+        expect(board.summary(1).points_remaining).toBe(400);
+    });
+});
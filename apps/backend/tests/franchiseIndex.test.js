@@ -0,0 +1,78 @@
+const { matchesFranchise, getMappedIds } = require('../utils/franchiseUtils');
+const { getFranchiseIndex, cleanRecordName } = require('../utils/franchiseIndex');
+const { findTeamForRecord } = require('../utils/standingsUtils');
+
+const teams = [
+    { team_id: 1, name: 'Boston', city: 'Boston', logo_url: 'boston.png' },
+    { team_id: 2, name: 'Detroit', city: 'Detroit', logo_url: 'det.png' },
+    { team_id: 3, name: 'New York', city: 'New York', logo_url: 'ny.png' },
+    { team_id: 4, name: 'Ann Arbor', city: 'Ann Arbor', logo_url: 'aa.png' },
+    { team_id: 5, name: 'NY South', city: 'NY South', logo_url: 'nys.png' }
+];
+
+// The pre-index implementation: scan every team with matchesFranchise.
+const scan = (name, id) => {
+    const cleanName = cleanRecordName(name);
+    const matched = teams.find(t => matchesFranchise(cleanName, id, t, teams, getMappedIds(t.team_id)));
+    return matched ? matched.team_id : null;
+};
+
+describe('franchiseIndex', () => {
+    const records = [
+        ['Boston', 1], ['San Diego', null], ['San Diego', 5], ['Boston Boston', null],
+        ['New York', 3], ['New York', 5], ['NY South', 1], ['Fargo', 5], ['NYDC', null],
+        ['Laramie Lugnuts', 2], ['Cincinnati', null], ['Chicago', 4], ['Redwood City', null],
+        ['Phantoms', null], ['Somewhere Else', 3], ['', null], [null, null]
+    ];
+
+    test('resolves every record to the same team as the old scan', () => {
+        const index = getFranchiseIndex(teams);
+        records.forEach(([name, id]) => {
+            expect(index.resolve(name, id).team_id ?? null).toBe(scan(name, id));
+        });
+    });
+
+    test('findTeamForRecord returns a fresh, mutable copy', () => {
+        const a = findTeamForRecord('San Diego', null, teams);
+        a.extra = true;
+        const b = findTeamForRecord('San Diego', null, teams);
+        expect(b.team_id).toBe(1);
+        expect(b.displayName).toBe('San Diego');
+        expect(b.extra).toBeUndefined();
+    });
+
+    test('keyFor uses the standings key format', () => {
+        const index = getFranchiseIndex(teams);
+        expect(index.keyFor('San Diego', null).key).toBe('ID-1');
+        expect(index.keyFor('Phantoms', null)).toEqual({ key: 'NAME-Phantoms', name: 'Phantoms', team_id: null });
+    });
+
+    test('matches agrees with matchesFranchise for each team', () => {
+        const index = getFranchiseIndex(teams);
+        records.forEach(([name, id]) => {
+            teams.forEach(t => {
+                expect(index.matches(name, id, t)).toBe(
+                    !!name && matchesFranchise(name, id, t, teams, getMappedIds(t.team_id))
+                );
+            });
+        });
+    });
+
+    test('one index per team-set version', () => {
+        expect(getFranchiseIndex(teams.map(t => ({ ...t })))).toBe(getFranchiseIndex(teams));
+        const renamed = teams.map(t => (t.team_id === 4 ? { ...t, name: 'Chicago', city: 'Chicago' } : t));
+        expect(getFranchiseIndex(renamed)).not.toBe(getFranchiseIndex(teams));
+    });
+
+    test('repeat lookups with the same array skip the team-set version', () => {
+        const current = teams.map(t => ({ ...t }));
+        const index = getFranchiseIndex(current);
+        const stringify = jest.spyOn(JSON, 'stringify');
+        try {
+            expect(getFranchiseIndex(current)).toBe(index);
+            expect(stringify).not.toHaveBeenCalled();
+        } finally {
+            stringify.mockRestore();
+        }
+    });
+});
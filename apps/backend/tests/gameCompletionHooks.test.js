@@ -0,0 +1,52 @@
+const mockPool = { name: 'pool' };
+jest.mock('../db', () => ({ pool: mockPool }));
+
+const { afterGameCompleted } = require('../services/gameCompletionHooks');
+
+const tick = () => new Promise(resolve => setImmediate(resolve));
+
+// A pool client that records statements; COMMIT fails when `failCommit` is set.
+function mockClient({ failCommit = false } = {}) {
+    const statements = [];
+    return {
+        statements,
+        release: () => {},
+        query: async (sql) => {
+            statements.push(sql);
+            if (sql === 'COMMIT' && failCommit) throw new Error('could not serialize access');
+            return { rows: [], rowCount: 0 };
+        }
+    };
+}
+
+describe('afterGameCompleted', () => {
+    test('runs queued work on the pool once the transaction commits, and drops it on rollback', async () => {
+        const ran = [];
+        const committed = mockClient();
+        await committed.query('BEGIN');
+        afterGameCompleted(committed, 7, 'summary', db => ran.push(['summary', db]));
+        afterGameCompleted(committed, 7, 'aggregates', db => ran.push(['aggregates', db]));
+        await committed.query('UPDATE games SET status = $1');
+        await tick();
+        expect(ran).toHaveLength(0);
+
+        await committed.query('COMMIT');
+        await tick();
+        expect(ran).toEqual([['summary', mockPool], ['aggregates', mockPool]]);
+
+        // The client goes back to normal: a later transaction on it doesn't replay the work.
+        await committed.query('BEGIN');
+        await committed.query('COMMIT');
+        await tick();
+        expect(ran).toHaveLength(2);
+
+        const rolledBack = mockClient();
+        afterGameCompleted(rolledBack, 8, 'summary', () => ran.push('rolled back'));
+        await rolledBack.query('ROLLBACK');
+        const failed = mockClient({ failCommit: true });
+        afterGameCompleted(failed, 9, 'summary', () => ran.push('failed commit'));
+        await failed.query('COMMIT').catch(() => {});
+        await tick();
+        expect(ran).toHaveLength(2);
+    });
+});
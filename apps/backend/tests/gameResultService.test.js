@@ -0,0 +1,49 @@
+const mockQueued = [];
+jest.mock('../services/gameCompletionHooks', () => ({
+    afterGameCompleted: (db, gameId, label, task) => mockQueued.push({ db, gameId, label, task })
+}));
+
+const { completeGame, winningSideOf } = require('../services/gameResultService');
+
+function fakeDb(rowCount) {
+    const calls = [];
+    return { calls, query: async (sql, params) => { calls.push({ sql, params }); return { rowCount, rows: [] }; } };
+}
+
+describe('winningSideOf', () => {
+    test('prefers the engine\'s winningTeam', () => {
+        expect(winningSideOf({ winningTeam: 'away', homeScore: 5, awayScore: 3 })).toBe('away');
+    });
+
+    test('falls back to the score for older states', () => {
+        expect(winningSideOf({ homeScore: 4, awayScore: 2 })).toBe('home');
+        expect(winningSideOf({ homeScore: 2, awayScore: 2 })).toBeNull();
+        expect(winningSideOf(null)).toBeNull();
+    });
+});
+
+describe('completeGame', () => {
+    beforeEach(() => { mockQueued.length = 0; });
+
+    test('writes the final result with the status change and links the final state after commit', async () => {
+        const db = fakeDb(1);
+        const done = await completeGame(db, 12, { winningTeam: 'home', homeScore: 6, awayScore: 1, inning: 9 });
+        expect(done).toBe(true);
+        expect(db.calls).toHaveLength(1);
+        expect(db.calls[0].sql).toContain("status = 'completed'");
+        expect(db.calls[0].params).toEqual([12, 'home', 6, 1, 9]);
+        expect(mockQueued).toHaveLength(1);
+        expect(mockQueued[0].db).toBe(db);
+
+        const later = fakeDb(1);
+        await mockQueued[0].task(later);
+        expect(later.calls[0].sql).toContain('final_game_state_id');
+        expect(later.calls[0].params).toEqual([12]);
+    });
+
+    test('an already-completed game is left alone', async () => {
+        const db = fakeDb(0);
+        expect(await completeGame(db, 12, { winningTeam: 'home', homeScore: 6, awayScore: 1, inning: 9 })).toBe(false);
+        expect(mockQueued).toHaveLength(0);
+    });
+});
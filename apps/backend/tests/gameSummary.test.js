@@ -0,0 +1,84 @@
+const { computeBoxLines, buildGameSummary } = require('../utils/gameSummary');
+
+// Away user 4 bats first against home pitcher 5_900; home user 5 bats against away pitcher 4_800.
+const AWAY = 4;
+const HOME = 5;
+function pa(overrides) {
+    return { inning: 1, ab: 1, h: 0, bb: 0, so: 0, hr: 0, rbi: 0, scoredRunnerIds: [], ...overrides };
+}
+
+const state = {
+    homeScore: 1,
+    awayScore: 2,
+    inning: 2,
+    atBatLog: [
+        pa({ batterTeam: 'away', batterId: 11, pitcherKey: '5_900', h: 1, hr: 1, rbi: 1, scoredRunnerIds: [11] }),
+        pa({ batterTeam: 'away', batterId: 12, pitcherKey: '5_900', so: 1 }),
+        pa({ batterTeam: 'home', batterId: 21, pitcherKey: '4_800', ab: 0, bb: 1 }),
+        pa({ batterTeam: 'home', batterId: 22, pitcherKey: '4_800', h: 1, rbi: 1, scoredRunnerIds: [21] }),
+        pa({ inning: 2, batterTeam: 'away', batterId: 11, pitcherKey: '5_901', h: 1, rbi: 1, scoredRunnerIds: [12] }),
+        pa({ inning: 2, batterTeam: 'home', batterId: 21, pitcherKey: '4_800' }),
+    ],
+    pitcherStats: {
+        '5_900': { outs_recorded: 5, runs: 1, batters_faced: 2 },
+        '5_901': { outs_recorded: 1, runs: 1, batters_faced: 1 },
+        '4_800': { outs_recorded: 6, runs: 1, batters_faced: 3 },
+    },
+    stealLog: [{ runnerId: 12, side: 'away', success: true }],
+};
+
+describe('computeBoxLines', () => {
+    test('folds batting lines per card, with runs and steals', () => {
+        const box = computeBoxLines(state, AWAY);
+        const b11 = box.away.batting.find(r => r.cardId === 11);
+        expect(b11).toMatchObject({ ab: 2, h: 2, hr: 1, rbi: 2, r: 1 });
+        expect(box.away.batting.find(r => r.cardId === 12)).toMatchObject({ so: 1, sb: 1, r: 1 });
+        expect(box.home.batting.map(r => r.cardId)).toEqual([21, 22]);
+    });
+
+    test('takes IP/R/BF from pitcherStats and H/BB/SO from the log', () => {
+        const box = computeBoxLines(state, AWAY);
+        expect(box.home.pitching.map(r => r.pitcherKey)).toEqual(['5_900', '5_901']);
+        expect(box.home.pitching[0]).toMatchObject({ cardId: 900, outs: 5, r: 1, bf: 2, h: 1, so: 1 });
+        expect(box.away.pitching[0]).toMatchObject({ cardId: 800, outs: 6, r: 1, bf: 3, h: 1, bb: 1 });
+    });
+
+    test('splits legacy bare-key pitcherStats shared by both teams', () => {
+        const legacy = {
+            atBatLog: [
+                pa({ batterTeam: 'away', batterId: 11, pitcherKey: '5_700' }),
+                pa({ batterTeam: 'home', batterId: 21, pitcherKey: '4_700' }),
+                pa({ batterTeam: 'home', batterId: 22, pitcherKey: '4_700' }),
+            ],
+            pitcherStats: { 700: { outs_recorded: 3, runs: 0, batters_faced: 3 } },
+        };
+        const box = computeBoxLines(legacy, AWAY);
+        expect(box.home.pitching[0]).toMatchObject({ outs: 1, bf: 1 });
+        expect(box.away.pitching[0]).toMatchObject({ outs: 2, bf: 2 });
+    });
+});
+
+describe('buildGameSummary', () => {
+    test('packs the score, linescore, decisions and box lines of a completed game', () => {
+        const entry = buildGameSummary({
+            gameId: '7', gameInSeries: 2, completedAt: '2026-07-01T00:00:00Z',
+            homeUserId: HOME, awayUserId: AWAY, startingPitchers: { home: 900, away: 800 }, state,
+        });
+        expect(entry).toMatchObject({
+            game_id: 7, game_in_series: 2, completed_at: '2026-07-01T00:00:00.000Z',
+            home_score: 1, away_score: 2, inning: 2, starting_pitchers: { home: 900, away: 800 },
+        });
+        expect(entry.linescore).toMatchObject({ away: [1, 1], home: [1, 0], awayRuns: 2, homeRuns: 1 });
+        expect(entry.home_runs).toEqual({ 11: { count: 1, side: 'away' } });
+        expect(entry.decisions['4_800']).toContain('W');
+        expect(entry.decisions['5_901']).toContain('L');
+        expect(entry.box.away.batting.length).toBe(2);
+    });
+
+    test('a game with no plays has no linescore and empty lines', () => {
+        const entry = buildGameSummary({ gameId: 1, homeUserId: HOME, awayUserId: AWAY, state: {} });
+        expect(entry.linescore).toBeNull();
+        expect(entry.decisions).toEqual({});
+        expect(entry.box.home).toEqual({ batting: [], pitching: [] });
+    });
+});
@@ -0,0 +1,90 @@
+const { calculateStandings, buildSeasonModel } = require('../utils/standingsUtils');
+const {
+    buildMatrix, mergeMatrices, buildSeasonPartial, mergeAllTimeStandings, mergeFinalSeries,
+    buildStandingsHistory, playedOn
+} = require('../utils/leagueAggregates');
+
+const teams = [
+    { team_id: 1, name: 'Boston', city: 'Boston', logo_url: 'boston.png' },
+    { team_id: 2, name: 'Detroit', city: 'Detroit', logo_url: 'det.png' },
+    { team_id: 3, name: 'New York', city: 'New York', logo_url: 'ny.png' },
+    { team_id: 4, name: 'Ann Arbor', city: 'Ann Arbor', logo_url: 'aa.png' }
+];
+
+const row = (season, round, w, ws, l, ls, date, extra = {}) => ({
+    id: `${season}-${round}-${w}-${l}`, season_name: season, round, date,
+    winning_team_name: w, winning_team_id: null, winning_score: ws,
+    losing_team_name: l, losing_team_id: null, losing_score: ls, ...extra
+});
+
+const rows = [
+    row('Spring 2025', 'Round Robin', 'Boston', 4, 'Detroit', 3, '2025-03-01'),
+    row('Spring 2025', 'Round Robin', 'New York', 5, 'Ann Arbor', 2, '2025-03-02'),
+    row('Spring 2025', 'Round Robin', 'Laramie', 4, 'New York', 1, '2025-03-03'),
+    row('Spring 2025', 'Round Robin', 'Phantoms', 2, 'Ann Arbor', 0, '2025-03-04'),
+    row('Spring 2025', 'Golden Spaceship', 'Boston', 4, 'New York', 2, '2025-03-10'),
+    row('Spring 2025', 'Wooden Spoon', 'Ann Arbor', 4, 'Detroit', 1, '2025-03-11'),
+    row('Fall 2025', 'Round Robin', 'San Diego', 4, 'Chicago', 3, '2025-08-01'),
+    row('Fall 2025', 'Round Robin', 'Detroit', 6, 'New York', 1, '2025-08-02'),
+    row('Fall 2025', 'Round Robin', 'Boston', null, 'Ann Arbor', null, '2025-08-03'),
+    row('Fall 2025', 'Golden Spaceship', 'Detroit', 4, 'Boston', 3, '2025-08-10')
+];
+const subs = [row('Fall 2025', 'Silver Submarine', 'New York', 4, 'Ann Arbor', 0, '2025-09-01', { style: 'Classic' })];
+
+const bySeason = (season) => rows.filter(r => r.season_name === season);
+const partials = ['Spring 2025', 'Fall 2025'].map(s =>
+    buildSeasonPartial(s, bySeason(s), subs.filter(r => r.season_name === s), teams));
+
+describe('leagueAggregates', () => {
+    test('merged season partials reproduce the all-time standings', () => {
+        const expected = calculateStandings(rows, teams, true);
+        expected.forEach(s => { s.submarines = s.team_id === 3 ? 1 : 0; }); // the route's submarine recount
+        const merged = mergeAllTimeStandings(partials, teams);
+
+        expect(merged).toHaveLength(expected.length);
+        expected.forEach(e => {
+            const m = merged.find(x => x.team_id === e.team_id);
+            ['wins', 'losses', 'phantomLosses', 'seasonsPlayed', 'totalRank', 'avgFinish', 'spaceships',
+                'submarines', 'spoons', 'spaceshipAppearances', 'spoonAppearances', 'winPctDisplay', 'name']
+                .forEach(f => expect(m[f]).toEqual(e[f]));
+        });
+    });
+
+    test('merged season matrices equal the matrix over every row', () => {
+        const merged = mergeMatrices(['Spring 2025', 'Fall 2025'].map(s => buildMatrix(bySeason(s), teams)));
+        expect(merged).toEqual(buildMatrix(rows, teams));
+    });
+
+    test('final series list is every season\'s finals in date order', () => {
+        const finals = mergeFinalSeries(partials);
+        expect(finals.map(f => f.round)).toEqual(['Golden Spaceship', 'Wooden Spoon', 'Golden Spaceship', 'Silver Submarine']);
+        expect(finals[3].winner_name).toBe('New York');
+    });
+
+    test('standings history is the season model over each day\'s prefix of played results', () => {
+        // A generated schedule stamps every row with the draft day; completed_at says when it was played.
+        const season = bySeason('Spring 2025').map(r => ({ ...r, date: '2025-02-20', completed_at: new Date(`${r.date}T20:00:00`) }));
+        const odds = { 'ID-1': { spaceshipOdds: 1, spoonOdds: 0 } };
+        const history = buildStandingsHistory(season, teams, odds);
+
+        const dates = [...new Set(history.map(h => h.as_of))];
+        expect(dates).toEqual(['2025-03-01', '2025-03-02', '2025-03-03', '2025-03-04']);
+        dates.forEach(date => {
+            const { teamStats } = buildSeasonModel(season.filter(r => playedOn(r) <= date), teams);
+            Object.entries(teamStats).forEach(([key, t]) => {
+                const h = history.find(x => x.as_of === date && x.team_key === key);
+                expect([h.wins, h.losses]).toEqual([t.wins, t.losses]);
+            });
+        });
+
+        const last = history.filter(h => h.as_of === '2025-03-04');
+        // Laramie is Detroit's earlier identity: Detroit leads at 7-5, Ann Arbor trails at 2-7.
+        expect(Object.fromEntries(last.map(h => [h.team_key, h.games_behind])))
+            .toEqual({ 'ID-1': 0.5, 'ID-2': 0, 'ID-3': 1, 'ID-4': 3.5 });
+        expect(last.find(h => h.team_key === 'ID-1').spaceship_odds).toBe(1);
+        expect(history.filter(h => h.spaceship_odds !== null)).toHaveLength(1);
+
+        // Rows that predate completed_at fall back to their schedule date.
+        expect(playedOn({ date: '2025-02-20', completed_at: null })).toBe('2025-02-20');
+    });
+});
@@ -0,0 +1,82 @@
+jest.mock('../services/emailService', () => ({
+    sendPhantomWarningEmail: async () => {},
+    sendPhantomLossesEmail: async () => {}
+}));
+jest.mock('../services/leagueAggregateService', () => ({
+    refreshSeasonAggregates: async () => {}
+}));
+
+const { applyPhantomLosses, projectPhantomLosses } = require('../jobs/phantomMonitor');
+const { generateSchedule, rolloverSeasonIfComplete } = require('../services/seasonRolloverService');
+
+// Mock db that records every query and answers the phantom season query with `ledger` (one row
+// per team) and the rollover status query with `status`.
+function mockDb({ ledger = [], status = {} } = {}) {
+    const queries = [];
+    const db = {
+        query: (sql, params) => {
+            queries.push({ sql, params });
+            if (sql.includes('WITH season AS')) {
+                return Promise.resolve({
+                    rows: ledger.map(t => ({ season_name: 'S1', draft_date: new Date(2026, 2, 1), is_over: false, ...t }))
+                });
+            }
+            if (sql.includes('AS all_played')) return Promise.resolve({ rows: [status] });
+            if (/RETURNING point_set_id/.test(sql)) return Promise.resolve({ rowCount: 1, rows: [{ point_set_id: 5 }] });
+            return Promise.resolve({ rows: [] });
+        }
+    };
+    return { db, queries };
+}
+
+const ledger = [
+    { team_id: 1, city: 'Austin', logo_url: 'a.png', played: 4, phantom_losses: 0 },
+    { team_id: 2, city: 'Boston', logo_url: 'b.png', played: 2, phantom_losses: 1 },
+    { team_id: 3, city: 'Chicago', logo_url: 'c.png', played: 0, phantom_losses: 0 },
+];
+
+describe('league maintenance batches', () => {
+    test('phantom losses are worked out from one ledger query and charged in one insert', async () => {
+        const { db, queries } = mockDb({ ledger });
+        const result = await applyPhantomLosses(db, new Date(2026, 6, 1));
+
+        expect(result.required).toBe(4);
+        expect(result.assignments.map(a => [a.teamId, a.count])).toEqual([[2, 1], [3, 4]]);
+        expect(queries).toHaveLength(2);
+        const [, insert] = queries;
+        expect(insert.sql).toContain('unnest(');
+        expect(insert.params.slice(2, 5)).toEqual([[2, 3], ['Boston', 'Chicago'], [1, 4]]);
+        expect(insert.params[5][0]).toBe('Auto-assigned phantom loss: 4 series required by this point in the season.');
+
+        const dry = mockDb({ ledger });
+        await applyPhantomLosses(dry.db, new Date(2026, 6, 1), { dryRun: true });
+        expect(dry.queries).toHaveLength(1);
+    });
+
+    test('projects every team against the cadence owed by a future date', async () => {
+        const { db, queries } = mockDb({ ledger });
+        const projection = await projectPhantomLosses(db, new Date(2026, 8, 15));
+
+        expect(projection.required).toBe(6);
+        expect(projection.markDate).toEqual(new Date(2026, 8, 1));
+        expect(projection.teams.map(t => [t.teamId, t.owed, t.shortfall])).toEqual([[1, 6, 2], [2, 6, 3], [3, 6, 6]]);
+        expect(queries).toHaveLength(1);
+    });
+
+    test('the schedule is one insert and the rollover only runs once every team has played', async () => {
+        const { db, queries } = mockDb();
+        await generateSchedule(db, 'S2', [4, 2, 9]);
+        expect(queries).toHaveLength(1);
+        expect(queries[0].params[2]).toEqual([4, 2, 9]);
+
+        const waiting = mockDb({ status: { all_played: false, rosters_snapshotted: false, point_set_exists: false } });
+        expect(await rolloverSeasonIfComplete(waiting.db, 'S1')).toBe(false);
+        expect(waiting.queries).toHaveLength(1);
+
+        const done = mockDb({ status: { all_played: true, rosters_snapshotted: false, point_set_exists: false } });
+        expect(await rolloverSeasonIfComplete(done.db, 'S1')).toBe(true);
+        const sql = done.queries.map(q => q.sql);
+        expect(sql.some(q => q.includes('INSERT INTO historical_rosters'))).toBe(true);
+        expect(sql.filter(q => q.includes('INSERT INTO player_point_values'))).toHaveLength(1);
+    });
+});
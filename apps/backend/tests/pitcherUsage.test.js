@@ -0,0 +1,80 @@
+const { buildUsageRows, pitcherAvailability, fatigueFromUsage } = require('../utils/pitcherUsage');
+
+const usage = (gameInSeries, userId, cardId, extra = {}) => ({
+    series_id: 1, game_id: 100 + gameInSeries, game_in_series: gameInSeries, user_id: userId, card_id: cardId,
+    started: false, innings_pitched: 0, batters_faced: 0, runs: 0, pitched_while_tired: false, ...extra
+});
+
+describe('buildUsageRows', () => {
+    const participants = [
+        { user_id: 7, starting_pitcher: '11', card_ids: [11, 20, 21, 30] },
+        { user_id: 8, starting_pitcher: 50, card_ids: [50, 20] }
+    ];
+
+    test('records starters and anyone who pitched, preferring composite stat keys', () => {
+        const rows = buildUsageRows({
+            seriesId: 1, gameId: 101, gameInSeries: 1, participants,
+            pitcherStats: {
+                '7_11': { innings_pitched: [1, 2, 3, 4, 5, 6], batters_faced: 25, runs: 3 },
+                '8_20': { innings_pitched: [7], batters_faced: 4, runs: 2, pitchedWhileTired: true },
+                20: { innings_pitched: [8, 9], batters_faced: 6 },
+                21: { innings_pitched: [], batters_faced: 1 }
+            }
+        });
+        const byKey = Object.fromEntries(rows.map(r => [`${r.user_id}_${r.card_id}`, r]));
+
+        expect(Object.keys(byKey).sort()).toEqual(['7_11', '7_20', '7_21', '8_20', '8_50']);
+        expect(byKey['7_11']).toMatchObject({ started: true, innings_pitched: 6, batters_faced: 25, runs: 3 });
+        expect(byKey['8_20']).toMatchObject({ started: false, innings_pitched: 1, pitched_while_tired: true });
+        expect(byKey['7_20']).toMatchObject({ innings_pitched: 2, batters_faced: 6 });
+        expect(byKey['7_21']).toMatchObject({ innings_pitched: 0, batters_faced: 1 });
+        expect(byKey['8_50']).toMatchObject({ started: true, innings_pitched: 0 });
+    });
+});
+
+describe('pitcherAvailability', () => {
+    const starts = [usage(1, 7, 11, { started: true }), usage(2, 7, 12, { started: true }),
+        usage(3, 7, 13, { started: true }), usage(4, 7, 14, { started: true }),
+        usage(1, 8, 99, { started: true }), usage(2, 7, 30, { innings_pitched: 2 })];
+
+    test('starters of the last three games are unavailable', () => {
+        expect(pitcherAvailability(3, starts, 7).unavailablePitcherIds).toEqual([12, 11]);
+        expect(pitcherAvailability(5, starts, 7)).toEqual({ mandatoryPitcherId: 11, unavailablePitcherIds: [14, 13, 12] });
+    });
+
+    test('game 4 goes to the first rostered SP who has not started', () => {
+        expect(pitcherAvailability(4, starts, 7, [11, 13, 14, 15]).mandatoryPitcherId).toBe(14);
+        expect(pitcherAvailability(4, starts, 8, [99]).mandatoryPitcherId).toBe(null);
+    });
+
+    test('games 5-7 repeat the starter from four games back', () => {
+        expect(pitcherAvailability(6, starts, 7).mandatoryPitcherId).toBe(12);
+        expect(pitcherAvailability(7, starts, 7).mandatoryPitcherId).toBe(13);
+    });
+});
+
+describe('fatigueFromUsage', () => {
+    const relievers = [{ owner_user_id: 7, card_id: 30, ip: 1 }, { owner_user_id: 7, card_id: 31, ip: 2 }];
+    // Each game has its starters, so a game with no reliever work still counts as a rest day.
+    const starters = [1, 2, 3].map(g => usage(g, 7, 10 + g, { started: true }));
+
+    test('pitching adds fatigue, rest and travel days recover it', () => {
+        const rows = [...starters, usage(1, 7, 30, { innings_pitched: 1, batters_faced: 3 })];
+        // Game 1: 1, game 2: rest -> 0, travel day -> 0.
+        expect(fatigueFromUsage(relievers, rows.filter(r => r.game_in_series <= 2))).toEqual({});
+    });
+
+    test('leftover fatigue beyond the buffer becomes a control penalty', () => {
+        const rows = [
+            ...starters,
+            usage(2, 7, 30, { innings_pitched: 2, batters_faced: 7, runs: 6, pitched_while_tired: true }),
+            usage(3, 7, 31, { innings_pitched: 0, batters_faced: 1 })
+        ];
+        // Reliever 30: game 2 -> 2 + 2 (tired, 6 runs), travel -> 3, game 3 rest -> 2; buffer 0.
+        // Reliever 31: game 3 faced a batter -> 1; buffer 1 absorbs it.
+        expect(fatigueFromUsage(relievers, rows)).toEqual({
+            '7_30': { runs: 0, innings_pitched: [], fatigue_modifier: -2, isBufferUsed: false },
+            '7_31': { runs: 0, innings_pitched: [], fatigue_modifier: -0, isBufferUsed: true }
+        });
+    });
+});
@@ -0,0 +1,44 @@
+const { summarizePlan, checkPlan } = require('../utils/queryPlans');
+
+// Trimmed EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) output: a join reading series_results by index
+// and series by sequential scan.
+const explain = [{
+    Plan: {
+        'Node Type': 'Nested Loop',
+        'Total Cost': 120.5,
+        'Shared Hit Blocks': 40,
+        'Shared Read Blocks': 2,
+        Plans: [
+            { 'Node Type': 'Index Scan', 'Relation Name': 'series_results', 'Total Cost': 20.1 },
+            { 'Node Type': 'Seq Scan', 'Relation Name': 'series', 'Total Cost': 90.2 },
+        ],
+    },
+    'Planning Time': 0.4,
+    'Execution Time': 1.7,
+}];
+
+const opts = { tableRows: { series: 50000, series_results: 200000 }, minRows: 10000, maxGrowth: 2 };
+
+describe('query plan checks', () => {
+    test('summarizes cost, timings, buffers and sequentially scanned tables', () => {
+        const summary = summarizePlan(explain);
+        expect(summary).toMatchObject({ totalCost: 120.5, planningMs: 0.4, executionMs: 1.7, sharedHit: 40, sharedRead: 2 });
+        expect(summary.seqScans).toEqual(['series']);
+        expect(summary.nodes).toEqual(['Nested Loop', 'Index Scan on series_results', 'Seq Scan on series']);
+    });
+
+    test('flags sequential scans of large tables unless allowed', () => {
+        const summary = summarizePlan(explain);
+        expect(checkPlan(summary, null, opts)).toEqual(['sequential scan on series (~50000 rows)']);
+        expect(checkPlan(summary, null, { ...opts, allowSeqScan: ['series'] })).toEqual([]);
+        expect(checkPlan(summary, null, { ...opts, tableRows: { series: 500 } })).toEqual([]);
+    });
+
+    test('flags cost growth over the baseline', () => {
+        const summary = { ...summarizePlan(explain), seqScans: [] };
+        expect(checkPlan(summary, { totalCost: 100 }, opts)).toEqual([]);
+        expect(checkPlan(summary, { totalCost: 50 }, opts)).toEqual([
+            'cost 120.5 is 2.41x the baseline 50.0 (limit 2x)',
+        ]);
+    });
+});
@@ -0,0 +1,94 @@
+const EventEmitter = require('events');
+const zlib = require('zlib');
+
+const mockVersions = {};
+jest.mock('../services/dataVersions', () => ({
+    getDataVersion: async (key) => mockVersions[key] || '0'
+}));
+
+const cacheByDataVersion = require('../middleware/cacheByDataVersion');
+
+// Runs one GET through the middleware; `handler` stands in for the endpoint.
+function get(middleware, handler, { path = '/season-summary', query = {}, headers = {}, userId = 1 } = {}) {
+    const req = { baseUrl: '/api/league', path, params: {}, query, headers, user: { userId }, acceptsEncodings: () => 'gzip' };
+    const res = new EventEmitter();
+    res.statusCode = 200;
+    res.headers = {};
+    res.headersSent = false;
+    res.set = (k, v) => { if (typeof k === 'object') Object.assign(res.headers, k); else res.headers[k] = v; return res; };
+    res.status = (code) => { res.statusCode = code; return res; };
+    res.end = (body) => { res.body = body; res.headersSent = true; res.emit('close'); return res; };
+    res.json = (body) => res.end(JSON.stringify(body));
+    return middleware(req, res, () => handler(req, res)).then(() => res);
+}
+
+const payload = (res) => JSON.parse(res.headers['Content-Encoding'] === 'gzip' ? zlib.gunzipSync(res.body) : res.body);
+
+describe('cacheByDataVersion', () => {
+    test('serves repeat requests from the cache until a source table changes', async () => {
+        const cache = cacheByDataVersion('summary', { tables: ['series_results'] });
+        const handler = jest.fn(async (req, res) => res.json({ season: req.query.season, n: handler.mock.calls.length }));
+
+        const [first, concurrent] = await Promise.all([
+            get(cache, handler, { query: { season: 'S1' } }),
+            get(cache, handler, { query: { season: 'S1' } }),
+        ]);
+        expect(handler).toHaveBeenCalledTimes(1);
+        expect(payload(first)).toEqual({ season: 'S1', n: 1 });
+        expect(payload(concurrent)).toEqual({ season: 'S1', n: 1 });
+
+        const reload = await get(cache, handler, { query: { season: 'S1' }, headers: { 'if-none-match': first.headers.ETag } });
+        expect(reload.statusCode).toBe(304);
+        await get(cache, handler, { query: { season: 'S1' } });
+        expect(handler).toHaveBeenCalledTimes(1);
+
+        await get(cache, handler, { query: { season: 'S2' } });
+        expect(handler).toHaveBeenCalledTimes(2);
+
+        mockVersions['table:series_results'] = '2';
+        const changed = await get(cache, handler, { query: { season: 'S1' }, headers: { 'if-none-match': first.headers.ETag } });
+        expect(changed.statusCode).toBe(200);
+        expect(changed.headers.ETag).not.toBe(first.headers.ETag);
+        expect(payload(changed)).toEqual({ season: 'S1', n: 3 });
+    });
+
+    test('errors are not cached, per-user payloads are kept apart and a null version skips the cache', async () => {
+        let status = 404;
+        const handler = jest.fn(async (req, res) => res.status(status).json({ user: req.user.userId }));
+        const cache = cacheByDataVersion('state', { tables: ['classics'], perUser: true });
+
+        expect((await get(cache, handler)).statusCode).toBe(404);
+        status = 200;
+        const mine = await get(cache, handler);
+        const theirs = await get(cache, handler, { userId: 2 });
+        expect(handler).toHaveBeenCalledTimes(3);
+        expect(payload(mine)).toEqual({ user: 1 });
+        expect(payload(theirs)).toEqual({ user: 2 });
+        expect(mine.headers.ETag).not.toBe(theirs.headers.ETag);
+
+        let served = null;
+        const uncached = cacheByDataVersion('captaincies', { tables: ['teams'], version: () => served });
+        await get(uncached, handler);
+        await get(uncached, handler);
+        expect(handler).toHaveBeenCalledTimes(5);
+        served = '7';
+        await get(uncached, handler);
+        await get(uncached, handler);
+        expect(handler).toHaveBeenCalledTimes(6);
+    });
+
+    test('routes sharing one instance are cached apart', async () => {
+        const cache = cacheByDataVersion('standings', { tables: ['standings_history'] });
+        const history = jest.fn(async (req, res) => res.json({ route: 'history' }));
+        const asOf = jest.fn(async (req, res) => res.json({ route: 'as-of' }));
+        const query = { season: 'S1', asOf: '2025-03-01' };
+
+        const first = await get(cache, history, { path: '/standings-history', query });
+        const second = await get(cache, asOf, { path: '/standings-as-of', query, headers: { 'if-none-match': first.headers.ETag } });
+        expect(second.statusCode).toBe(200);
+        expect(payload(first)).toEqual({ route: 'history' });
+        expect(payload(second)).toEqual({ route: 'as-of' });
+        expect(second.headers.ETag).not.toBe(first.headers.ETag);
+        expect(asOf).toHaveBeenCalledTimes(1);
+    });
+});
@@ -0,0 +1,65 @@
+const zlib = require('zlib');
+const { etagFor, isNotModified, createSnapshotCache, serveSnapshot } = require('../utils/snapshotResponse');
+
+const fakeReq = (headers = {}, accepts = 'br') => ({ headers, acceptsEncodings: () => accepts });
+const fakeRes = () => {
+    const res = { statusCode: null, headers: {}, body: null };
+    res.set = (k, v) => { if (typeof k === 'object') Object.assign(res.headers, k); else res.headers[k] = v; return res; };
+    res.status = (code) => { res.statusCode = code; return res; };
+    res.end = (body) => { res.body = body; return res; };
+    return res;
+};
+
+describe('snapshotResponse', () => {
+    test('ETags are strong and differ per encoding', () => {
+        expect(etagFor('catalog-3-v9', 'identity')).toBe('"catalog-3-v9"');
+        expect(etagFor('catalog-3-v9', 'br')).toBe('"catalog-3-v9-br"');
+    });
+
+    test('If-None-Match matches any listed (or weak-prefixed) tag', () => {
+        expect(isNotModified(fakeReq({ 'if-none-match': '"a", W/"catalog-3-v9-br"' }), '"catalog-3-v9-br"')).toBe(true);
+        expect(isNotModified(fakeReq({ 'if-none-match': '"catalog-3-v8-br"' }), '"catalog-3-v9-br"')).toBe(false);
+        expect(isNotModified(fakeReq(), '"x"')).toBe(false);
+    });
+
+    test('concurrent misses share one build and bodies round-trip through every encoding', async () => {
+        const cache = createSnapshotCache(2);
+        const build = jest.fn(async () => [{ card_id: 1, name: 'Ace' }]);
+        const [a, b] = await Promise.all([cache.get('t1', build), cache.get('t1', build)]);
+
+        expect(build).toHaveBeenCalledTimes(1);
+        expect(a).toBe(b);
+        expect(JSON.parse(a.identity)).toEqual([{ card_id: 1, name: 'Ace' }]);
+        expect(JSON.parse(zlib.gunzipSync(a.gzip))).toEqual([{ card_id: 1, name: 'Ace' }]);
+        expect(JSON.parse(zlib.brotliDecompressSync(a.br))).toEqual([{ card_id: 1, name: 'Ace' }]);
+    });
+
+    test('least recently used snapshots are evicted', async () => {
+        const cache = createSnapshotCache(2);
+        await cache.get('a', () => 1);
+        await cache.get('b', () => 2);
+        await cache.get('a', () => 1);
+        await cache.get('c', () => 3);
+        const rebuild = jest.fn(() => 2);
+        await cache.get('b', rebuild);
+        expect(rebuild).toHaveBeenCalledTimes(1);
+        expect(cache.size()).toBe(2);
+    });
+
+    test('a current client copy is answered 304 without building', async () => {
+        const cache = createSnapshotCache(2);
+        const build = jest.fn(async () => ({ owners: {} }));
+        const res = fakeRes();
+        await serveSnapshot(fakeReq({ 'if-none-match': '"ownership-v4-br"' }), res, cache, 'ownership-v4', build);
+
+        expect(res.statusCode).toBe(304);
+        expect(res.headers.ETag).toBe('"ownership-v4-br"');
+        expect(build).toHaveBeenCalledTimes(0);
+
+        const fresh = fakeRes();
+        await serveSnapshot(fakeReq({}, 'gzip'), fresh, cache, 'ownership-v4', build);
+        expect(fresh.statusCode).toBe(200);
+        expect(fresh.headers['Content-Encoding']).toBe('gzip');
+        expect(JSON.parse(zlib.gunzipSync(fresh.body))).toEqual({ owners: {} });
+    });
+});
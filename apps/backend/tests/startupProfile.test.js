@@ -0,0 +1,37 @@
+const EventEmitter = require('events');
+const { WARMUP_HEADER, markStartup, trackFirstResponse, startupReport } = require('../utils/startupProfile');
+const { lazyRouter } = require('../utils/lazyLoad');
+
+function request(url, headers = {}) {
+    const req = { method: 'GET', originalUrl: url, get: name => headers[name] };
+    const res = new EventEmitter();
+    res.statusCode = 200;
+    trackFirstResponse(req, res, () => {});
+    res.emit('finish');
+}
+
+describe('startup profile', () => {
+    test('records phases and the first response that is not the warm-up', () => {
+        markStartup('listening');
+        request('/api/point-sets', { [WARMUP_HEADER]: '1' });
+        expect(startupReport().firstResponse).toBeNull();
+
+        request('/api/league/season-summary?season=x');
+        request('/api/games');
+        const report = startupReport();
+        expect(report.phases.map(p => p.name)).toEqual(['listening']);
+        expect(report.firstResponse).toMatchObject({ method: 'GET', path: '/api/league/season-summary', status: 200 });
+        expect(report.firstResponse.ms).toBeGreaterThanOrEqual(report.phases[0].ms);
+    });
+
+    test('lazyRouter loads its router once, on the first request', () => {
+        const handled = [];
+        const load = jest.fn(() => (req) => handled.push(req));
+        const middleware = lazyRouter(load);
+        expect(load).not.toHaveBeenCalled();
+        middleware('a');
+        middleware('b');
+        expect(load).toHaveBeenCalledTimes(1);
+        expect(handled).toEqual(['a', 'b']);
+    });
+});
@@ -0,0 +1,98 @@
+jest.mock('../services/captaincyService', () => ({
+    getCaptaincyForTeam: async () => ({ captains: {}, currentCaptain: null, face: null, playerScores: { byCard: {}, byName: {} } })
+}));
+
+const { loadTeamHistory, loadTeamSeason } = require('../services/teamHistoryService');
+
+const teams = [
+    { team_id: 1, name: 'Boston', city: 'Boston', logo_url: 'boston.png', user_id: null },
+    { team_id: 2, name: 'Detroit', city: 'Detroit', logo_url: 'det.png', user_id: null }
+];
+
+const seasonName = (i) => `Season ${i}`;
+
+// Each season: Boston beats Detroit 4-2 in the round robin and 4-3 in the Golden Spaceship,
+// and carries two roster rows whose points must come from Original Pts.
+function buildLeague(seasonCount) {
+    const results = [];
+    const rosters = [];
+    for (let i = 1; i <= seasonCount; i++) {
+        const s = seasonName(i);
+        const base = { season_name: s, style: null, winning_team_id: null, losing_team_id: null, mva: null, lvsc: null, tgaoot: null };
+        results.push({ ...base, id: i * 10, round: 'Round Robin', date: `2020-01-${i}`,
+            winning_team_name: 'Boston', winning_score: 4, losing_team_name: 'Detroit', losing_score: 2 });
+        results.push({ ...base, id: i * 10 + 1, round: 'Golden Spaceship', date: `2020-02-${i}`, mva: `MVA ${i}`,
+            winning_team_name: 'Boston', winning_score: 4, losing_team_name: 'Detroit', losing_score: 3 });
+        rosters.push({ season: s, team_name: 'Boston', player_name: 'Ace', card_id: 10, position: 'SP', points: null, control: 5, ip: 7 });
+        rosters.push({ season: s, team_name: 'Boston', player_name: 'Slugger', card_id: 11, position: 'LF', points: 300, control: null, ip: null });
+    }
+    return { results, rosters };
+}
+
+// Minimal pg stand-in that answers by query shape and records every statement.
+function fakeDb(league) {
+    const queries = [];
+    return {
+        queries,
+        query: async (sql, params = []) => {
+            queries.push(sql);
+            if (/FROM teams/.test(sql) && !/series_results/.test(sql)) return { rows: teams };
+            if (/ILIKE ANY/.test(sql)) return { rows: [...league.results].reverse() };
+            if (/FROM series_results sr\s+WHERE sr.season_name = \$1/.test(sql)) {
+                return { rows: league.results.filter(r => r.season_name === params[0]) };
+            }
+            if (/historical_rosters/.test(sql)) {
+                return { rows: league.rosters.filter(r => (/hr.season = \$1/.test(sql) ? r.season === params[0] : params[0].includes(r.team_name))) };
+            }
+            if (/FROM point_sets ps/.test(sql)) {
+                return { rows: params[0].includes('Original Pts') ? [{ name: 'Original Pts', card_id: 10, points: 50 }] : [] };
+            }
+            return { rows: [] };
+        }
+    };
+}
+
+describe('teamHistoryService', () => {
+    test('history query count does not grow with the number of seasons', async () => {
+        const small = fakeDb(buildLeague(2));
+        const large = fakeDb(buildLeague(40));
+        await loadTeamHistory(small, 1);
+        const history = await loadTeamHistory(large, 1);
+
+        expect(large.queries.length).toBe(small.queries.length);
+        expect(large.queries.length).toBeLessThan(6);
+        expect(history.history).toHaveLength(40);
+        expect(history.accolades.spaceships).toHaveLength(40);
+        expect(history.accolades.spoons).toHaveLength(0);
+    });
+
+    test('history records, trophies and awards are derived from the one results read', async () => {
+        const history = await loadTeamHistory(fakeDb(buildLeague(3)), 1);
+        const season = history.history.find(h => h.season === 'Season 2');
+        expect(season).toMatchObject({ wins: 4, losses: 2, result: 'Champion (4-3)', mva: 'MVA 2', isClassic: false });
+
+        const runnerUp = (await loadTeamHistory(fakeDb(buildLeague(3)), 2)).history.find(h => h.season === 'Season 2');
+        expect(runnerUp).toMatchObject({ wins: 2, losses: 4, result: 'Runner Up (3-4)', mva: null });
+    });
+
+    test('missing roster points fall back to Original Pts in a single read', async () => {
+        const db = fakeDb(buildLeague(3));
+        const history = await loadTeamHistory(db, 1);
+        const players = history.rosters.find(r => r.season === 'Season 3').players;
+        expect(players.map(p => [p.name, p.points])).toEqual([['Ace', 50], ['Slugger', 300]]);
+        expect(db.queries.filter(q => /point_sets/.test(q))).toHaveLength(1);
+    });
+
+    test('season view query count is flat and unknown teams return null', async () => {
+        const small = fakeDb(buildLeague(2));
+        const large = fakeDb(buildLeague(40));
+        const a = await loadTeamSeason(small, 1, 'Season 1');
+        const b = await loadTeamSeason(large, 1, 'Season 1');
+        expect(large.queries.length).toBe(small.queries.length);
+        expect(b).toEqual(a);
+        expect(b.results.map(r => r.result)).toEqual(['W', 'W']);
+        expect(b.roster.find(p => p.name === 'Ace').points).toBe(50);
+
+        expect(await loadTeamSeason(fakeDb(buildLeague(1)), 99, 'Season 1')).toBe(null);
+    });
+});
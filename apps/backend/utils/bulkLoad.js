@@ -0,0 +1,110 @@
+// Bulk-load helpers for the offline ingest scripts (ingest-historical-data.js,
+// import-all-points.js). Rows are parsed and validated in memory, streamed
+// into a per-transaction staging table with COPY FROM STDIN, and then swapped
+// into the live table in a single statement pair at the very end. The live
+// table is only locked for the swap itself, and because everything runs
+// inside the caller's transaction readers either see the old contents or the
+// new contents - never a half-empty table mid-truncate. copyRows is also used
+// on its own to append straight into live tables (generate-synthetic-league.js).
+const { Readable } = require('stream');
+const { pipeline } = require('stream/promises');
+const { from: copyFrom } = require('pg-copy-streams');
+
+/**
+ * Encodes a single value for PostgreSQL's COPY text format.
+ * @param {*} value
+ * @returns {string}
+ */
+function encodeCopyValue(value) {
+    if (value === null || value === undefined) return '\\N';
+    return String(value)
+        .replace(/\\/g, '\\\\')
+        .replace(/\t/g, '\\t')
+        .replace(/\n/g, '\\n')
+        .replace(/\r/g, '\\r');
+}
+
+/**
+ * Encodes one row (an array of values, in column order) as a COPY text line.
+ * @param {Array<*>} row
+ * @returns {string}
+ */
+function encodeCopyRow(row) {
+    return row.map(encodeCopyValue).join('\t') + '\n';
+}
+
+/**
+ * Returns true if the given table exists in the current search path.
+ * @param {object} client - A connected pg client.
+ * @param {string} table
+ * @returns {Promise<boolean>}
+ */
+async function tableExists(client, table) {
+    const res = await client.query('SELECT to_regclass($1) AS oid', [table]);
+    return res.rows[0].oid !== null;
+}
+
+/**
+ * Creates a temporary staging table holding just `columns` of `table` and
+ * streams `rows` into it with COPY FROM STDIN. The staging table is dropped
+ * on commit, so this must be called inside a transaction.
+ * @param {object} client - A connected pg client with an open transaction.
+ * @param {string} table - The live table the staging table mirrors.
+ * @param {string[]} columns - The columns present in each row, in order.
+ * @param {Array<Array<*>>} rows
+ * @returns {Promise<string>} The staging table name.
+ */
+async function copyIntoStaging(client, table, columns, rows) {
+    const staging = `${table}_staging`;
+    // Only the loaded columns, with their types: a LIKE copy would keep the live table's NOT NULL
+    // id/created_at columns without their defaults (copying those would burn the live sequence),
+    // and every COPY that leaves them out would fail. The swap fills them in from the live defaults.
+    await client.query(
+        `CREATE TEMP TABLE ${staging} ON COMMIT DROP AS SELECT ${columns.join(', ')} FROM ${table} WITH NO DATA`
+    );
+
+    await copyRows(client, staging, columns, rows);
+    return staging;
+}
+
+/**
+ * Streams `rows` straight into `table` with COPY FROM STDIN. `rows` may be any
+ * iterable (e.g. a generator), so large loads never have to be materialized.
+ * @param {object} client - A connected pg client.
+ * @param {string} table
+ * @param {string[]} columns - The columns present in each row, in order.
+ * @param {Iterable<Array<*>>} rows
+ * @returns {Promise<void>}
+ */
+async function copyRows(client, table, columns, rows) {
+    const copySql = `COPY ${table} (${columns.join(', ')}) FROM STDIN`;
+    const source = Readable.from((function* () {
+        for (const row of rows) yield encodeCopyRow(row);
+    })());
+    await pipeline(source, client.query(copyFrom(copySql)));
+}
+
+/**
+ * Replaces the contents of `table` with the contents of its staging table.
+ * @param {object} client - A connected pg client with an open transaction.
+ * @param {string} table
+ * @param {string[]} columns
+ * @returns {Promise<number>} The number of rows swapped in.
+ */
+async function swapFromStaging(client, table, columns) {
+    const cols = columns.join(', ');
+    await client.query(`TRUNCATE TABLE ${table} RESTART IDENTITY`);
+    const res = await client.query(
+        `INSERT INTO ${table} (${cols}) SELECT ${cols} FROM ${table}_staging`
+    );
+    return res.rowCount;
+}
+
+module.exports = {
+    encodeCopyValue,
+    encodeCopyRow,
+    tableExists,
+    copyRows,
+    copyIntoStaging,
+    swapFromStaging,
+};
@@ -14,10 +14,10 @@
 //   - after the franchise's first uniquely-determined captain: by highest card points,
 //     then alphabetically.
 //
-// All franchise identity (historical names / relocations) goes through findTeamForRecord
-// so this matches the rest of the app exactly.
+// All franchise identity (historical names / relocations) goes through the same franchise
+// index as findTeamForRecord so this matches the rest of the app exactly.
 
-const { findTeamForRecord } = require('./standingsUtils');
+const { getFranchiseIndex } = require('./franchiseIndex');
 
 const RING_W = 5;
 const MVA_W = 2;
@@ -28,14 +28,12 @@ const normName = (n) =>
   (n || '').toLowerCase().replace(/\([^)]*\)/g, ' ').replace(/[^a-z0-9 ]/g, '').replace(/\s+/g, ' ').trim();
 
 function computeCaptaincies({ teams, series, rosters, cardPoints = {} }) {
-  // ---- franchise mapping (cached) ----
-  const fCache = {};
+  // ---- franchise mapping (O(1) via the shared franchise index) ----
+  const franchiseIndex = getFranchiseIndex(teams);
   const F = (name, id) => {
-    const k = `${name || ''}|${id || ''}`;
-    if (fCache[k] !== undefined) return fCache[k];
-    const t = findTeamForRecord(name, id, teams);
+    const t = franchiseIndex.keyFor(name, id);
     const phantom = (t.name || '').includes('Phantoms');
-    return (fCache[k] = phantom || !t.team_id ? null : t.team_id);
+    return phantom || !t.team_id ? null : t.team_id;
   };
 
   // ---- chronological season order from series dates ----
@@ -0,0 +1,32 @@
+// Every d20 the game rolls goes through rollD20, so a request's rolls can be recorded and later
+// replayed exactly (services/actionLogService.js).
+//
+// The recording context is per request (AsyncLocalStorage), so concurrent games don't see each
+// other's rolls. Outside a context — scripts, tests — rollD20 is just Math.random.
+
+const { AsyncLocalStorage } = require('async_hooks');
+
+const diceContext = new AsyncLocalStorage();
+
+// Runs fn with a dice context. `rolls` collects every roll made under it; if `replay` is given,
+// rolls are taken from it in order instead of being drawn.
+function withDice(context, fn) {
+    return diceContext.run(context, fn);
+}
+
+function rollD20() {
+    const context = diceContext.getStore();
+    let roll;
+    if (context && context.replay) {
+        if (context.replay.length === 0) {
+            throw new Error('Replay ran out of recorded rolls.');
+        }
+        roll = context.replay.shift();
+    } else {
+        roll = Math.floor(Math.random() * 20) + 1;
+    }
+    if (context && context.rolls) context.rolls.push(roll);
+    return roll;
+}
+
+module.exports = { withDice, rollD20, diceContext };
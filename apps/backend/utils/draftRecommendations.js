@@ -0,0 +1,379 @@
+// Ranked draft boards: for each team, every available card ordered by how much it would help
+// that team right now. A card's score blends four parts:
+//
+//   value      - what the card does on the field (chart + on-base/control, IP for starters),
+//                scaled 0..1 within its role (hitter / SP / RP)
+//   per point  - value divided by its Upcoming Season points, scaled the same way
+//   scarcity   - how thin the pool of good players at the card's positions has become compared
+//                with the number of teams that still need one
+//   fit        - whether the team still has a hole at one of the card's positions
+//
+// Value and value-per-point never change during a draft, so they're computed once. After a pick
+// (or an add/drop turn) syncTeam() moves the changed cards in or out of the pool, recomputes
+// scarcity for just the positions those cards play and the picking team's needs, and re-slots
+// only the cards whose score moved. Nothing is rescored from scratch.
+//
+// Pure and DB-free; services/draftRecommendationService.js loads the cards and keeps the board.
+
+const FIELD_POSITIONS = ['C', '1B', '2B', 'SS', '3B', 'LF', 'CF', 'RF'];
+const STARTERS_NEEDED = 4;
+const RELIEVERS_WANTED = 3;
+const POINT_CAP = 5000;
+
+const WEIGHTS = { value: 0.35, perPoint: 0.3, scarcity: 0.15, fit: 0.2 };
+
+// Expected bases per plate appearance for each chart outcome (outs are 0).
+const OUTCOME_BASES = { BB: 1, '1B': 1, '1B+': 1.2, '2B': 2, '3B': 3, HR: 4 };
+const OUT_OUTCOMES = ['PU', 'SO', 'GB', 'FB'];
+// League-typical numbers used to turn on-base/control into an advantage rate.
+const TYPICAL_CONTROL = 3;
+const TYPICAL_ON_BASE = 9;
+
+function rangeCount(rangeStr) {
+    return String(rangeStr).split(',').reduce((sum, part) => {
+        const [lo, hi] = part.split('-').map(n => parseInt(n, 10));
+        if (Number.isNaN(lo)) return sum;
+        return sum + ((Number.isNaN(hi) ? lo : hi) - lo + 1);
+    }, 0);
+}
+
+function chartShares(chart) {
+    const shares = {};
+    Object.entries(chart || {}).forEach(([range, outcome]) => {
+        shares[outcome] = (shares[outcome] || 0) + rangeCount(range) / 20;
+    });
+    return shares;
+}
+
+function clamp01(x) {
+    return Math.max(0, Math.min(1, x));
+}
+
+function isPitcher(card) {
+    return card.control !== null && card.control !== undefined;
+}
+
+function roleOf(card) {
+    if (!isPitcher(card)) return 'H';
+    return Number(card.ip) > 3 ? 'SP' : 'RP';
+}
+
+// Positions a card can fill on a league roster. LFRF ratings cover both corners; a hitter with
+// no ratings can only DH, which every hitter can do, so it has no scarce position.
+function slotsOf(card) {
+    const role = roleOf(card);
+    if (role !== 'H') return [role];
+    const slots = new Set();
+    Object.keys(card.fielding_ratings || {}).forEach(key => {
+        if (key === 'LFRF') { slots.add('LF'); slots.add('RF'); }
+        else if (FIELD_POSITIONS.includes(key)) slots.add(key);
+    });
+    return [...slots];
+}
+
+// Hitters: bases per PA when they have the advantage, weighted by how often they get it, plus a
+// nudge for speed. Pitchers: out rate on their own chart weighted the same way; starters scale by
+// IP since they cover more of the game.
+function cardValue(card) {
+    const shares = chartShares(card.chart_data);
+    if (!isPitcher(card)) {
+        const advantage = clamp01((Number(card.on_base) - TYPICAL_CONTROL) / 20);
+        const bases = Object.entries(OUTCOME_BASES).reduce((sum, [o, b]) => sum + (shares[o] || 0) * b, 0);
+        return advantage * bases + (Number(card.speed) || 0) * 0.002;
+    }
+    const advantage = clamp01((20 - (TYPICAL_ON_BASE - Number(card.control))) / 20);
+    const outs = OUT_OUTCOMES.reduce((sum, o) => sum + (shares[o] || 0), 0);
+    const outRate = advantage * outs + (1 - advantage) * 0.3;
+    return roleOf(card) === 'SP' ? outRate * (Number(card.ip) || 0) : outRate;
+}
+
+// Min-max scale `key` within each role, writing the result to `out`.
+function scaleByRole(entries, key, out) {
+    const bounds = {};
+    entries.forEach(e => {
+        const b = bounds[e.role] || (bounds[e.role] = { min: Infinity, max: -Infinity });
+        b.min = Math.min(b.min, e[key]);
+        b.max = Math.max(b.max, e[key]);
+    });
+    entries.forEach(e => {
+        const { min, max } = bounds[e.role];
+        e[out] = max > min ? (e[key] - min) / (max - min) : 0.5;
+    });
+}
+
+function median(values) {
+    if (values.length === 0) return 0;
+    const sorted = values.slice().sort((a, b) => a - b);
+    return sorted[Math.floor(sorted.length / 2)];
+}
+
+// Board order: score descending, then card_id so ties are stable.
+function before(a, b) {
+    return a.score > b.score || (a.score === b.score && a.id < b.id);
+}
+
+function findIndex(list, item) {
+    let lo = 0;
+    let hi = list.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (before(list[mid], item)) lo = mid + 1;
+        else hi = mid;
+    }
+    return lo;
+}
+
+/**
+ * @param {object} input
+ * @param {Array<object>} input.cards - Cards with Upcoming Season `points` (cards_player columns).
+ * @param {object} input.rosters - team_id -> [{ card_id, assignment }] for every league team.
+ */
+function createDraftBoard({ cards, rosters }) {
+    const entries = new Map();
+    cards.forEach(card => {
+        const points = Number(card.points);
+        if (!Number.isFinite(points)) return;
+        const value = cardValue(card);
+        entries.set(Number(card.card_id), {
+            id: Number(card.card_id),
+            name: card.display_name || card.name,
+            role: roleOf(card),
+            slots: slotsOf(card),
+            points,
+            value,
+            perPoint: value / Math.max(points, 10),
+        });
+    });
+    const all = [...entries.values()];
+    scaleByRole(all, 'value', 'valueIndex');
+    scaleByRole(all, 'perPoint', 'perPointIndex');
+    all.forEach(e => { e.base = WEIGHTS.value * e.valueIndex + WEIGHTS.perPoint * e.perPointIndex; });
+
+    // "Good" players at a position are those at or above their role's median value.
+    const floors = {};
+    ['H', 'SP', 'RP'].forEach(role => { floors[role] = median(all.filter(e => e.role === role).map(e => e.valueIndex)); });
+    const isQuality = e => e.valueIndex >= floors[e.role];
+
+    const owner = new Map();           // card_id -> team_id for rostered cards
+    const teams = new Map();           // team_id -> { cards: Map(card_id -> assignment), needs, board, scores }
+    const qualityLeft = {};            // slot -> good players still available
+    const teamsNeeding = {};           // slot -> teams with a need there
+    const scarcity = {};               // slot -> 0..1
+    [...FIELD_POSITIONS, 'SP', 'RP'].forEach(slot => { qualityLeft[slot] = 0; teamsNeeding[slot] = 0; });
+
+    function needsFor(team) {
+        const needs = {};
+        const covered = new Set();
+        let starters = 0;
+        let relievers = 0;
+        team.cards.forEach((assignment, id) => {
+            const e = entries.get(id);
+            if (!e) return;
+            if (e.role === 'SP') starters += 1;
+            else if (e.role === 'RP') relievers += 1;
+            else e.slots.forEach(s => covered.add(s));
+        });
+        FIELD_POSITIONS.forEach(s => { needs[s] = covered.has(s) ? 0 : 1; });
+        needs.SP = Math.max(0, STARTERS_NEEDED - starters) / STARTERS_NEEDED;
+        needs.RP = Math.max(0, RELIEVERS_WANTED - relievers) / RELIEVERS_WANTED;
+        return needs;
+    }
+
+    // Bench hitters count a fifth of their points against the cap, as in submit-turn.
+    function pointsFor(team) {
+        let total = 0;
+        team.cards.forEach((assignment, id) => {
+            const e = entries.get(id);
+            if (!e) return;
+            total += (assignment === 'BENCH' && e.role === 'H') ? Math.round(e.points / 5) : e.points;
+        });
+        return total;
+    }
+
+    function scarcityOf(slot) {
+        const demand = teamsNeeding[slot];
+        return demand === 0 ? 0 : demand / (demand + qualityLeft[slot]);
+    }
+
+    function cardScarcity(e) {
+        return e.slots.reduce((m, s) => Math.max(m, scarcity[s]), 0);
+    }
+
+    function cardFit(e, team) {
+        return e.slots.reduce((m, s) => Math.max(m, team.needs[s] || 0), 0);
+    }
+
+    function scoreFor(e, team) {
+        return e.base + WEIGHTS.scarcity * cardScarcity(e) + WEIGHTS.fit * cardFit(e, team);
+    }
+
+    function place(team, e) {
+        const item = { id: e.id, score: scoreFor(e, team) };
+        team.board.splice(findIndex(team.board, item), 0, item);
+        team.scores.set(e.id, item.score);
+    }
+
+    function unplace(team, id) {
+        const score = team.scores.get(id);
+        if (score === undefined) return;
+        team.board.splice(findIndex(team.board, { id, score }), 1);
+        team.scores.delete(id);
+    }
+
+    // Rescores `changed` on one team's board: the moved cards are pulled out, sorted on their
+    // own and merged back, one pass over the board instead of a splice per card.
+    function reslot(team, changed) {
+        const moved = [];
+        changed.forEach(e => {
+            if (!team.scores.has(e.id)) return;
+            const score = scoreFor(e, team);
+            if (team.scores.get(e.id) !== score) moved.push({ id: e.id, score });
+        });
+        if (moved.length === 0) return;
+        const movedIds = new Set(moved.map(item => item.id));
+        moved.sort((a, b) => (before(a, b) ? -1 : 1));
+        const merged = [];
+        let i = 0;
+        team.board.forEach(item => {
+            if (movedIds.has(item.id)) return;
+            while (i < moved.length && before(moved[i], item)) merged.push(moved[i++]);
+            merged.push(item);
+        });
+        while (i < moved.length) merged.push(moved[i++]);
+        team.board = merged;
+        moved.forEach(item => team.scores.set(item.id, item.score));
+    }
+
+    function adjustNeeds(team, delta) {
+        Object.entries(team.needs).forEach(([slot, need]) => { if (need > 0) teamsNeeding[slot] += delta; });
+    }
+
+    // --- Initial build ---
+    Object.entries(rosters || {}).forEach(([teamId, rows]) => {
+        const team = { cards: new Map(), needs: null, board: [], scores: new Map() };
+        rows.forEach(r => {
+            team.cards.set(Number(r.card_id), r.assignment || null);
+            owner.set(Number(r.card_id), Number(teamId));
+        });
+        team.needs = needsFor(team);
+        adjustNeeds(team, 1);
+        teams.set(Number(teamId), team);
+    });
+    all.forEach(e => {
+        if (!owner.has(e.id) && isQuality(e)) e.slots.forEach(s => { qualityLeft[s] += 1; });
+    });
+    Object.keys(qualityLeft).forEach(slot => { scarcity[slot] = scarcityOf(slot); });
+    teams.forEach(team => {
+        all.forEach(e => {
+            if (!owner.has(e.id)) team.board.push({ id: e.id, score: scoreFor(e, team) });
+        });
+        team.board.sort((a, b) => (before(a, b) ? -1 : before(b, a) ? 1 : 0));
+        team.board.forEach(item => team.scores.set(item.id, item.score));
+    });
+
+    /**
+     * Brings one team's roster up to date after a pick or an add/drop turn. Cards that left the
+     * pool come off every board, dropped cards go back on, and only cards at positions whose
+     * scarcity or the team's need changed are rescored.
+     *
+     * @param {number} teamId
+     * @param {Array<{card_id, assignment}>} rows - The team's full roster after the change.
+     */
+    function syncTeam(teamId, rows) {
+        teamId = Number(teamId);
+        let team = teams.get(teamId);
+        if (!team) {
+            team = { cards: new Map(), needs: needsFor({ cards: new Map() }), board: [], scores: new Map() };
+            adjustNeeds(team, 1);
+            all.forEach(e => { if (!owner.has(e.id)) place(team, e); });
+            teams.set(teamId, team);
+        }
+        const next = new Map(rows.map(r => [Number(r.card_id), r.assignment || null]));
+        const added = [...next.keys()].filter(id => !team.cards.has(id));
+        const dropped = [...team.cards.keys()].filter(id => !next.has(id));
+
+        const touched = new Set();
+        added.forEach(id => {
+            owner.set(id, teamId);
+            const e = entries.get(id);
+            if (!e) return;
+            teams.forEach(t => unplace(t, id));
+            if (isQuality(e)) e.slots.forEach(s => { qualityLeft[s] -= 1; touched.add(s); });
+        });
+        dropped.forEach(id => {
+            owner.delete(id);
+            const e = entries.get(id);
+            if (e && isQuality(e)) e.slots.forEach(s => { qualityLeft[s] += 1; touched.add(s); });
+        });
+
+        const oldNeeds = team.needs;
+        adjustNeeds(team, -1);
+        team.cards = next;
+        team.needs = needsFor(team);
+        adjustNeeds(team, 1);
+        const needChanged = new Set(Object.keys(team.needs).filter(s => team.needs[s] !== oldNeeds[s]));
+        needChanged.forEach(s => touched.add(s));
+
+        touched.forEach(slot => { scarcity[slot] = scarcityOf(slot); });
+
+        const changed = all.filter(e => !owner.has(e.id) && e.slots.some(s => touched.has(s)));
+        teams.forEach(t => reslot(t, changed));
+        dropped.forEach(id => {
+            const e = entries.get(id);
+            if (!e || owner.has(id)) return;
+            teams.forEach(t => { if (!t.scores.has(id)) place(t, e); });
+        });
+    }
+
+    function describe(team, id) {
+        const e = entries.get(id);
+        return {
+            card_id: id,
+            name: e.name,
+            position: e.role === 'H' ? (e.slots.join('/') || 'DH') : e.role,
+            points: e.points,
+            value: Number(e.valueIndex.toFixed(3)),
+            value_per_point: Number(e.perPointIndex.toFixed(3)),
+            scarcity: Number(cardScarcity(e).toFixed(3)),
+            fit: Number(cardFit(e, team).toFixed(3)),
+            score: Number(team.scores.get(id).toFixed(4)),
+        };
+    }
+
+    /**
+     * The team's best available cards, skipping any that would push it past the point cap.
+     */
+    function top(teamId, limit = 25) {
+        const team = teams.get(Number(teamId));
+        if (!team) return [];
+        const room = POINT_CAP - pointsFor(team);
+        const out = [];
+        for (const item of team.board) {
+            if (out.length >= limit) break;
+            if (entries.get(item.id).points <= room) out.push(describe(team, item.id));
+        }
+        return out;
+    }
+
+    function summary(teamId) {
+        const team = teams.get(Number(teamId));
+        if (!team) return null;
+        const points = pointsFor(team);
+        const needs = Object.keys(team.needs).filter(s => team.needs[s] > 0);
+        return { points, points_remaining: POINT_CAP - points, needs };
+    }
+
+    // Board order for a team (card_ids), for tests and debugging.
+    function order(teamId) {
+        const team = teams.get(Number(teamId));
+        return team ? team.board.map(item => item.id) : [];
+    }
+
+    return { syncTeam, top, summary, order };
+}
+
+module.exports = {
+    createDraftBoard,
+    cardValue,
+    slotsOf,
+};
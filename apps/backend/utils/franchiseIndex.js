@@ -0,0 +1,177 @@
+// Precomputed franchise resolver.
+//
+// findTeamForRecord used to scan every current team with matchesFranchise (which itself
+// scans every other team for its exclusion logic) for every series_results row it was
+// handed. The answer only depends on the record's (name, id) and the set of current
+// teams, so we build one index per team-set version and answer each distinct record
+// from a hash map. The index is seeded up front with every name a record can
+// realistically carry (current names/cities, ALIASES, parseHistoricalIdentity combos,
+// each with and without each mapped id); anything else is resolved once with the
+// original scan and memoized, so results are identical to the old path.
+
+const { matchesFranchise, getMappedIds, getLogoForTeam, getFranchiseAliases, parseHistoricalIdentity } = require('./franchiseUtils');
+
+// Indexes for the last few distinct team sets. Teams almost never change, so this is
+// effectively one entry; the bound just keeps a test run or a rename from leaking.
+const MAX_INDEXES = 4;
+const indexesByVersion = new Map();
+// findTeamForRecord asks for the index several times per series row, always with the same
+// array, so the index is remembered per array and only a new array pays for teamSetVersion.
+// Team rows are read-only once handed over: pass a new array (as every caller does when it
+// re-reads teams) rather than editing rows in place.
+const indexesByArray = new WeakMap();
+
+// Handles "Boston Boston" -> "Boston" (doubled names from older sheet exports).
+function cleanRecordName(name) {
+    let cleanName = name || '';
+    const parts = cleanName.split(' ');
+    if (parts.length > 1 && parts.length % 2 === 0) {
+        const mid = parts.length / 2;
+        const firstHalf = parts.slice(0, mid).join(' ');
+        const secondHalf = parts.slice(mid).join(' ');
+        if (firstHalf === secondHalf) {
+            cleanName = firstHalf;
+        }
+    }
+    return cleanName;
+}
+
+// matchesFranchise treats any falsy id as "no id", so they share one key.
+const idKey = (id) => (id ? String(id) : '');
+
+/**
+ * Identifies a set of current teams. The whole row is part of the version (callers
+ * select different column sets, and resolved records carry every column), and so is
+ * the order, because the first matching team wins exactly as with Array.find.
+ *
+ * @param {Array<object>} currentTeams
+ * @returns {string}
+ */
+function teamSetVersion(currentTeams) {
+    return JSON.stringify(currentTeams);
+}
+
+function buildIndex(currentTeams) {
+    const resolved = new Map(); // "<cleanName>|<id>" -> resolved team object (shared, frozen)
+    const memberships = new Map(); // "<cleanName>|<id>|<team_id>" -> boolean
+    const identities = new Map(); // name -> parseHistoricalIdentity(name)
+
+    const resolveScan = (cleanName, id) => {
+        const matched = currentTeams.find(t => {
+            // matchesFranchise handles Aliases, ID mapping, and Exclusion logic
+            return matchesFranchise(cleanName, id, t, currentTeams, getMappedIds(t.team_id));
+        });
+
+        if (matched) {
+            return Object.freeze({
+                ...matched,
+                displayName: cleanName,
+                logo_url: getLogoForTeam(cleanName, matched.logo_url)
+            });
+        }
+
+        return Object.freeze({
+            team_id: null,
+            name: cleanName,
+            city: '',
+            logo_url: getLogoForTeam(cleanName, null),
+            displayName: cleanName
+        });
+    };
+
+    /**
+     * Resolves a historical (name, id) pair to its current franchise. The returned
+     * object is shared between callers and frozen; copy it before mutating.
+     */
+    const resolve = (name, id) => {
+        const cleanName = cleanRecordName(name);
+        const k = `${cleanName}|${idKey(id)}`;
+        let hit = resolved.get(k);
+        if (!hit) {
+            hit = resolveScan(cleanName, id);
+            resolved.set(k, hit);
+        }
+        return hit;
+    };
+
+    /**
+     * Franchise key in the standings format ("ID-<id>" / "NAME-<name>"), plus the
+     * resolved current name.
+     */
+    const keyCache = new Map();
+    const keyFor = (name, id) => {
+        const k = `${name || ''}|${idKey(id)}`;
+        let hit = keyCache.get(k);
+        if (!hit) {
+            const t = resolve(name, id);
+            hit = { key: t.team_id ? `ID-${t.team_id}` : `NAME-${(t.name || '').trim()}`, name: t.name, team_id: t.team_id };
+            keyCache.set(k, hit);
+        }
+        return hit;
+    };
+
+    /**
+     * Memoized matchesFranchise(name, id, team, currentTeams, getMappedIds(team.team_id)).
+     * Unlike resolve(), this asks "does the record belong to this team" rather than
+     * "which team is first to claim it", which is what the per-team history views use.
+     */
+    const matches = (name, id, team) => {
+        if (!name) return false;
+        const k = `${name}|${idKey(id)}|${team.team_id}`;
+        let hit = memberships.get(k);
+        if (hit === undefined) {
+            hit = matchesFranchise(name, id, team, currentTeams, getMappedIds(team.team_id));
+            memberships.set(k, hit);
+        }
+        return hit;
+    };
+
+    const identityFor = (name) => {
+        if (!identities.has(name)) identities.set(name, parseHistoricalIdentity(name));
+        return identities.get(name);
+    };
+
+    // Seed every name a record can realistically carry, with and without each id.
+    const seedNames = new Set();
+    currentTeams.forEach(t => {
+        [t.name, t.city, t.city && t.name ? `${t.city} ${t.name}` : null].forEach(n => n && seedNames.add(n));
+        [...getFranchiseAliases(t.name), ...getFranchiseAliases(t.city)].forEach(a => {
+            seedNames.add(a);
+            const identity = identityFor(a);
+            if (identity && identity.name) seedNames.add(`${identity.city} ${identity.name}`);
+        });
+    });
+    const seedIds = [null, ...new Set(currentTeams.flatMap(t => getMappedIds(t.team_id)))];
+    seedNames.forEach(n => seedIds.forEach(id => keyFor(n, id)));
+
+    return { resolve, keyFor, matches, identityFor, size: () => resolved.size };
+}
+
+/**
+ * Returns the franchise index for a set of current teams, building it on first use.
+ *
+ * @param {Array<object>} currentTeams - Rows from the teams table.
+ * @returns {{resolve: Function, keyFor: Function, matches: Function, identityFor: Function, size: Function}}
+ */
+function getFranchiseIndex(currentTeams) {
+    const known = indexesByArray.get(currentTeams);
+    if (known) return known;
+
+    const version = teamSetVersion(currentTeams);
+    let index = indexesByVersion.get(version);
+    if (!index) {
+        index = buildIndex(currentTeams);
+        indexesByVersion.set(version, index);
+        if (indexesByVersion.size > MAX_INDEXES) {
+            indexesByVersion.delete(indexesByVersion.keys().next().value);
+        }
+    }
+    indexesByArray.set(currentTeams, index);
+    return index;
+}
+
+module.exports = {
+    cleanRecordName,
+    teamSetVersion,
+    getFranchiseIndex
+};
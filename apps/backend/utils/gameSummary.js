@@ -117,4 +117,164 @@ function computePitchingDecisions(atBatLog, teams, outsByKey = {}) {
   return out;
 }
 
-module.exports = { computeLinescore, computePitchingDecisions, computeHomeRuns, normalizeKey, cardIdOf };
+// Compact per-side batting/pitching lines for one game -> { away: { batting, pitching }, home }.
+// The counting-stat half of the frontend's buildBoxScore (apps/frontend/src/utils/boxScore.js,
+// keep the two in sync): batting from the atBatLog (+ stealLog), pitching IP/R/BF from the
+// authoritative pitcherStats with H/BB/SO overlaid from the atBatLog, including the legacy
+// bare-card-id pitcherStats handling. No names, display strings or advantage splits — this feeds
+// the stored series summaries, and the client names and formats rows itself.
+function parsePitcherKey(key) {
+  const parts = String(key).split('_');
+  if (parts.length < 2) return { ownerId: null, cardId: null };
+  return { ownerId: parts[0], cardId: Number(parts[parts.length - 1]) };
+}
+function normalizedPitcherKey(key) {
+  const { ownerId, cardId } = parsePitcherKey(key);
+  if (ownerId == null || cardId == null || Number.isNaN(cardId)) return null;
+  return `${ownerId}_${cardId}`;
+}
+
+function computeBoxLines(state, awayUserId) {
+  const log = Array.isArray(state && state.atBatLog) ? state.atBatLog : [];
+  const pitcherStats = (state && state.pitcherStats) || {};
+  const ownerTeam = (owner) => (String(owner) === String(awayUserId) ? 'away' : 'home');
+  const zero = () => ({ outs: 0, runs: 0, bf: 0 });
+
+  const runsByRunner = new Map();
+  for (const e of log) {
+    for (const id of e.scoredRunnerIds || []) runsByRunner.set(id, (runsByRunner.get(id) || 0) + 1);
+  }
+
+  const liveByPitcher = new Map();
+  const liveByCardId = new Map();
+  for (const rawKey of Object.keys(pitcherStats)) {
+    const v = pitcherStats[rawKey] || {};
+    const outs = v.outs_recorded || 0, runs = v.runs || 0, bf = v.batters_faced || 0;
+    const norm = normalizedPitcherKey(rawKey);
+    if (norm) {
+      const cur = liveByPitcher.get(norm) || zero();
+      cur.outs += outs; cur.runs += runs; cur.bf += bf;
+      liveByPitcher.set(norm, cur);
+    }
+    const cardId = String(rawKey).includes('_') ? parsePitcherKey(rawKey).cardId : Number(rawKey);
+    if (cardId != null && !Number.isNaN(cardId)) {
+      const c = liveByCardId.get(cardId) || zero();
+      c.outs += outs; c.runs += runs; c.bf += bf;
+      liveByCardId.set(cardId, c);
+    }
+  }
+
+  const batting = { away: new Map(), home: new Map() };
+  const pitching = { away: new Map(), home: new Map() };
+  const logByKey = new Map();
+  const keysByCardId = new Map();
+  for (const e of log) {
+    if (e.batterId != null) {
+      const map = batting[e.batterTeam === 'home' ? 'home' : 'away'];
+      let row = map.get(e.batterId);
+      if (!row) { row = { ab: 0, h: 0, doubles: 0, triples: 0, hr: 0, rbi: 0, bb: 0, so: 0, sb: 0, cs: 0 }; map.set(e.batterId, row); }
+      row.ab += e.ab || 0; row.h += e.h || 0; row.doubles += e.double || 0; row.triples += e.triple || 0;
+      row.hr += e.hr || 0; row.rbi += e.rbi || 0; row.bb += e.bb || 0; row.so += e.so || 0;
+    }
+    if (e.pitcherKey) {
+      const map = pitching[ownerTeam(parsePitcherKey(e.pitcherKey).ownerId)];
+      let row = map.get(e.pitcherKey);
+      if (!row) { row = { bf: 0, h: 0, bb: 0, so: 0 }; map.set(e.pitcherKey, row); }
+      row.bf += 1; row.h += e.h || 0; row.bb += e.bb || 0; row.so += e.so || 0;
+
+      const norm = normalizedPitcherKey(e.pitcherKey);
+      if (norm) {
+        const reached = (e.h || 0) > 0 || (e.bb || 0) > 0;
+        const lg = logByKey.get(norm) || zero();
+        lg.outs += reached ? 0 : (e.outcome === 'DP' ? 2 : 1);
+        lg.runs += (e.scoredRunnerIds || []).length;
+        lg.bf += 1;
+        logByKey.set(norm, lg);
+        const cid = parsePitcherKey(norm).cardId;
+        if (!keysByCardId.has(cid)) keysByCardId.set(cid, new Set());
+        keysByCardId.get(cid).add(norm);
+      }
+    }
+  }
+
+  // Legacy bare-key pitcherStats shared by both teams: split by the log, reconciled to the total.
+  const splitByKey = new Map();
+  for (const [cardId, keys] of keysByCardId) {
+    const merged = liveByCardId.get(cardId);
+    const keyArr = [...keys];
+    if (keys.size < 2 || !merged || keyArr.some(k => liveByPitcher.has(k))) continue;
+    const parts = keyArr.map(k => ({ key: k, ...(logByKey.get(k) || zero()) }));
+    for (const stat of ['outs', 'runs', 'bf']) {
+      const residual = (merged[stat] || 0) - parts.reduce((n, q) => n + q[stat], 0);
+      if (residual) {
+        const top = parts.reduce((a, b) => (b[stat] >= a[stat] ? b : a));
+        top[stat] = Math.max(0, top[stat] + residual);
+      }
+    }
+    for (const q of parts) splitByKey.set(q.key, { outs: q.outs, runs: q.runs, bf: q.bf });
+  }
+
+  for (const st of Array.isArray(state && state.stealLog) ? state.stealLog : []) {
+    if (st == null || st.runnerId == null) continue;
+    const map = batting[st.side === 'home' ? 'home' : 'away'];
+    let row = map.get(st.runnerId);
+    if (!row) { row = { ab: 0, h: 0, doubles: 0, triples: 0, hr: 0, rbi: 0, bb: 0, so: 0, sb: 0, cs: 0 }; map.set(st.runnerId, row); }
+    if (st.success) row.sb += 1; else row.cs += 1;
+  }
+
+  const side = (s) => {
+    const battingRows = [...batting[s]].map(([cardId, b]) => ({ cardId, ...b, r: runsByRunner.get(cardId) || 0 }));
+    const keys = [...pitching[s].keys()];
+    const seen = new Set(keys);
+    for (const [normKey, live] of liveByPitcher) {
+      if (seen.has(normKey) || ownerTeam(parsePitcherKey(normKey).ownerId) !== s) continue;
+      if (live.outs > 0 || live.runs > 0 || live.bf > 0) { keys.push(normKey); seen.add(normKey); }
+    }
+    const pitchingRows = keys.map((key) => {
+      const { cardId } = parsePitcherKey(key);
+      const norm = normalizedPitcherKey(key) || key;
+      const p = pitching[s].get(key) || { bf: 0, h: 0, bb: 0, so: 0 };
+      const live = liveByPitcher.get(norm) || splitByKey.get(norm) || liveByCardId.get(cardId) || zero();
+      return { cardId, pitcherKey: key, outs: live.outs, bf: live.bf || p.bf, h: p.h, r: live.runs, er: live.runs, bb: p.bb, so: p.so };
+    });
+    return { batting: battingRows, pitching: pitchingRows };
+  };
+  return { away: side('away'), home: side('home') };
+}
+
+// One completed game's entry in its series summary (see services/seriesSummaryService.js):
+// everything the series page and the cumulative series box score show for it, so neither has to
+// read the game's state again. `startingPitchers` is { home, away } card ids.
+function buildGameSummary({ gameId, gameInSeries, completedAt, homeUserId, awayUserId, startingPitchers, state }) {
+  const log = (state && state.atBatLog) || [];
+  // Innings pitched (outs) per pitcher, for the W-must-go-5 / save-3-innings rules.
+  const outsByKey = {};
+  for (const [k, v] of Object.entries((state && state.pitcherStats) || {})) {
+    outsByKey[normalizeKey(k)] = (v && v.outs_recorded != null) ? v.outs_recorded : ((v && v.innings_pitched) ? v.innings_pitched.length * 3 : 0);
+  }
+  return {
+    game_id: Number(gameId),
+    game_in_series: gameInSeries,
+    completed_at: completedAt ? new Date(completedAt).toISOString() : null,
+    home_user_id: homeUserId,
+    away_user_id: awayUserId,
+    home_score: state && state.homeScore != null ? state.homeScore : null,
+    away_score: state && state.awayScore != null ? state.awayScore : null,
+    inning: state && state.inning != null ? state.inning : null,
+    starting_pitchers: startingPitchers || { home: null, away: null },
+    linescore: computeLinescore(log),
+    home_runs: computeHomeRuns(log),
+    decisions: computePitchingDecisions(log, { away: { user_id: awayUserId }, home: { user_id: homeUserId } }, outsByKey),
+    box: computeBoxLines(state, awayUserId),
+  };
+}
+
+module.exports = {
+  computeLinescore,
+  computePitchingDecisions,
+  computeHomeRuns,
+  computeBoxLines,
+  buildGameSummary,
+  normalizeKey,
+  cardIdOf,
+};
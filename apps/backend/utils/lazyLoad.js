@@ -0,0 +1,13 @@
+// Deferring rarely used route modules until they're needed, so loading them (and everything they
+// require) isn't part of every cold start. See the startup notes in server.js.
+
+// An Express middleware that requires its router on the first request it sees.
+function lazyRouter(load) {
+    let router = null;
+    return (req, res, next) => {
+        if (!router) router = load();
+        return router(req, res, next);
+    };
+}
+
+module.exports = { lazyRouter };
@@ -0,0 +1,358 @@
+// Pure builders for the stored League-page aggregates (see services/leagueAggregateService.js).
+//
+// Everything here works on one season's rows at a time. The all-time table is not computed
+// from raw series_results any more: each season stores a small "partial" (its contribution to
+// every franchise's all-time line) and the all-time standings / matrix / finals list are merged
+// from those. Editing one result therefore only rebuilds that season plus a cheap merge.
+
+const { findTeamForRecord, buildSeasonModel, seriesState } = require('./standingsUtils');
+
+const POSTSEASON_ROUNDS = ['Golden Spaceship', 'Wooden Spoon', 'Silver Submarine'];
+
+const isPhantomTeam = (t) => (t.name || '').includes('Phantoms') || (t.displayName || '').includes('Phantoms');
+const statsKey = (t) => (t.team_id ? `ID-${t.team_id}` : `NAME-${t.name}`);
+
+// Row shape for the season view's "Recent Results" list.
+function mapRecentResult(r, currentTeams, scenarios = {}) {
+    const hasScore = r.winning_score !== null && r.losing_score !== null;
+    const winner = findTeamForRecord(r.winning_team_name, r.winning_team_id, currentTeams);
+    const loser = findTeamForRecord(r.losing_team_name, r.losing_team_id, currentTeams);
+
+    return {
+        id: r.id,
+        date: r.date,
+        round: r.round,
+        style: r.style,
+        status: r.status, // 'scheduled' | 'in_progress' | 'completed' — drives result-line rendering
+        winning_team_id: r.winning_team_id,
+        losing_team_id: r.losing_team_id,
+        winner: r.winning_team_name,
+        loser: r.losing_team_name,
+        winner_name: winner.displayName,
+        loser_name: loser.displayName,
+
+        winner_logo: winner.logo_url,
+        loser_logo: loser.logo_url,
+        score: hasScore ? `${r.winning_score}-${r.losing_score}` : null,
+        winning_score: r.winning_score, // Passed for sorting
+        losing_score: r.losing_score, // Passed for sorting
+        series_id: r.live_series_id, // linked in-app series (null if entered offline)
+        mva: r.mva,
+        lvsc: r.lvsc,
+        // Per-win-count spaceship/spoon outlook for this upcoming series (null when the
+        // result changes nothing / season decided). See computePlayoffScenarios.
+        scenarios: scenarios[r.id] || null
+    };
+}
+
+// Row shape for the all-time view's "Final Series" list.
+function mapFinalSeries(r, currentTeams) {
+    const hasScore = r.winning_score !== null && r.losing_score !== null;
+    const winner = findTeamForRecord(r.winning_team_name, r.winning_team_id, currentTeams);
+    const loser = findTeamForRecord(r.losing_team_name, r.losing_team_id, currentTeams);
+    return {
+        id: r.id,
+        date: r.date,
+        round: r.round,
+        season: r.season_name,
+        winner_name: winner.displayName,
+        loser_name: loser.displayName,
+        winner_city: winner.city || winner.displayName,
+        loser_city: loser.city || loser.displayName,
+        winner_logo: winner.logo_url,
+        loser_logo: loser.logo_url,
+        score: hasScore ? `${r.winning_score}-${r.losing_score}` : null,
+        series_id: r.live_series_id, // linked in-app series (null if entered offline)
+        mva: r.mva,
+        lvsc: r.lvsc
+    };
+}
+
+// Head-to-head game totals, keyed "ID-<id>"/"NAME-<name>" -> { id, name, opponents: { key: { wins, losses } } }.
+function buildMatrix(rows, currentTeams) {
+    const matrix = {};
+    rows.forEach(row => {
+        const wScore = row.winning_score || 0;
+        const lScore = row.losing_score || 0;
+
+        const winner = findTeamForRecord(row.winning_team_name, row.winning_team_id, currentTeams);
+        const loser = findTeamForRecord(row.losing_team_name, row.losing_team_id, currentTeams);
+
+        const wKey = statsKey(winner);
+        const lKey = statsKey(loser);
+
+        // For Matrix, we usually use Current Names for consistency, especially All-Time
+        const wName = winner.team_id ? winner.city : winner.name;
+        const lName = loser.team_id ? loser.city : loser.name;
+
+        if (!matrix[wKey]) matrix[wKey] = { id: wKey, name: wName, opponents: {} };
+        if (!matrix[lKey]) matrix[lKey] = { id: lKey, name: lName, opponents: {} };
+
+        if (!matrix[wKey].opponents[lKey]) matrix[wKey].opponents[lKey] = { wins: 0, losses: 0 };
+        if (!matrix[lKey].opponents[wKey]) matrix[lKey].opponents[wKey] = { wins: 0, losses: 0 };
+
+        matrix[wKey].opponents[lKey].wins += wScore;
+        matrix[wKey].opponents[lKey].losses += lScore;
+
+        matrix[lKey].opponents[wKey].wins += lScore;
+        matrix[lKey].opponents[wKey].losses += wScore;
+    });
+    return matrix;
+}
+
+// Cell-wise sum of several matrices (e.g. every season's) into one.
+function mergeMatrices(matrices) {
+    const merged = {};
+    matrices.forEach(m => {
+        Object.values(m || {}).forEach(entry => {
+            if (!merged[entry.id]) merged[entry.id] = { id: entry.id, name: entry.name, opponents: {} };
+            Object.entries(entry.opponents).forEach(([opp, cell]) => {
+                const target = merged[entry.id].opponents[opp] || (merged[entry.id].opponents[opp] = { wins: 0, losses: 0 });
+                target.wins += cell.wins;
+                target.losses += cell.losses;
+            });
+        });
+    });
+    return merged;
+}
+
+const emptyLine = () => ({
+    wins: 0, losses: 0, phantomLosses: 0, rank: null,
+    spaceships: 0, spoons: 0, spaceshipAppearances: 0, spoonAppearances: 0
+});
+
+// One season's contribution to the all-time table. `seasonRows` are that season's
+// non-Classic rows; `submarineRows` are its Silver Submarine rows of ANY style (the
+// all-time view credits Classic submarines too). Mirrors the all-time branch of
+// calculateStandings, restricted to a single season.
+function buildSeasonPartial(seasonName, seasonRows, submarineRows, currentTeams) {
+    const teams = {}; // team_id -> line
+    const line = (teamId) => teams[teamId] || (teams[teamId] = emptyLine());
+
+    const resolved = seasonRows.map(s => ({
+        s,
+        w: findTeamForRecord(s.winning_team_name, s.winning_team_id, currentTeams),
+        l: findTeamForRecord(s.losing_team_name, s.losing_team_id, currentTeams)
+    }));
+
+    // 1. W-L (all rounds) and this season's regular-season ranking inputs
+    const regular = {};
+    resolved.forEach(({ s, w, l }) => {
+        if (s.winning_score === null) return;
+        const wPh = isPhantomTeam(w);
+        const lPh = isPhantomTeam(l);
+        // Count a side only if it's a real, matched franchise whose opponent is either another
+        // matched franchise or the Phantoms (see calculateStandings).
+        const winnerCounts = !wPh && w.team_id && (lPh || l.team_id);
+        const loserCounts = !lPh && l.team_id && (wPh || w.team_id);
+        const isRegular = !POSTSEASON_ROUNDS.includes(s.round);
+
+        if (winnerCounts) {
+            const t = line(w.team_id);
+            t.wins += s.winning_score;
+            t.losses += s.losing_score;
+            if (isRegular) {
+                const r = regular[w.team_id] || (regular[w.team_id] = { wins: 0, losses: 0 });
+                r.wins += s.winning_score;
+                r.losses += s.losing_score;
+            }
+        }
+        if (loserCounts) {
+            const t = line(l.team_id);
+            t.losses += s.winning_score;
+            t.wins += s.losing_score;
+            if (wPh) t.phantomLosses += s.winning_score;
+            if (isRegular) {
+                const r = regular[l.team_id] || (regular[l.team_id] = { wins: 0, losses: 0 });
+                r.losses += s.winning_score;
+                r.wins += s.losing_score;
+            }
+        }
+    });
+
+    // 2. Finish (rank) within the season
+    Object.keys(regular)
+        .map(tid => {
+            const r = regular[tid];
+            const total = r.wins + r.losses;
+            return { teamId: parseInt(tid, 10), wins: r.wins, winPct: total > 0 ? r.wins / total : 0.5 };
+        })
+        .sort((a, b) => b.winPct - a.winPct || b.wins - a.wins)
+        .forEach((t, i) => { line(t.teamId).rank = i + 1; });
+
+    // 3. Trophies & appearances (submarines come from submarineRows below)
+    resolved.forEach(({ s, w, l }) => {
+        if (isPhantomTeam(w) || isPhantomTeam(l)) return;
+        if (!w.team_id || !l.team_id) return;
+        const wl = line(w.team_id);
+        const ll = line(l.team_id);
+        if (s.round === 'Golden Spaceship') {
+            wl.spaceshipAppearances++;
+            ll.spaceshipAppearances++;
+            wl.spaceships++;
+        } else if (s.round === 'Wooden Spoon') {
+            wl.spoonAppearances++;
+            ll.spoonAppearances++;
+            ll.spoons++;
+        }
+    });
+
+    const submarines = {};
+    submarineRows.forEach(sub => {
+        const w = findTeamForRecord(sub.winning_team_name, sub.winning_team_id, currentTeams);
+        if (w.team_id) submarines[w.team_id] = (submarines[w.team_id] || 0) + 1;
+    });
+
+    const finals = [
+        ...seasonRows.filter(r => r.round === 'Golden Spaceship' || r.round === 'Wooden Spoon'),
+        ...submarineRows
+    ].map(r => mapFinalSeries(r, currentTeams));
+
+    return { season: seasonName, teams, submarines, finals };
+}
+
+// All-time standings (same shape as calculateStandings(..., true)) merged from season partials.
+function mergeAllTimeStandings(partials, currentTeams) {
+    const totals = {};
+    partials.forEach(p => {
+        Object.entries(p.teams).forEach(([tid, t]) => {
+            const teamId = parseInt(tid, 10);
+            if (!totals[teamId]) {
+                const repTeam = currentTeams.find(ct => ct.team_id === teamId) || { name: 'Unknown', team_id: teamId };
+                totals[teamId] = {
+                    team_id: repTeam.team_id,
+                    name: repTeam.name,
+                    logo_url: repTeam.logo_url,
+                    wins: 0,
+                    losses: 0,
+                    phantomLosses: 0,
+                    seasonsPlayed: 0,
+                    totalRank: 0,
+                    spaceships: 0,
+                    submarines: 0,
+                    spoons: 0,
+                    spaceshipAppearances: 0,
+                    spoonAppearances: 0
+                };
+            }
+            const a = totals[teamId];
+            a.wins += t.wins;
+            a.losses += t.losses;
+            a.phantomLosses += t.phantomLosses;
+            a.spaceships += t.spaceships;
+            a.spoons += t.spoons;
+            a.spaceshipAppearances += t.spaceshipAppearances;
+            a.spoonAppearances += t.spoonAppearances;
+            if (t.rank !== null) {
+                a.totalRank += t.rank;
+                a.seasonsPlayed++;
+            }
+        });
+    });
+    // Submarines only credit franchises that otherwise appear in the table.
+    partials.forEach(p => {
+        Object.entries(p.submarines || {}).forEach(([tid, n]) => {
+            if (totals[tid]) totals[tid].submarines += n;
+        });
+    });
+
+    const standings = Object.values(totals).map(t => {
+        const totalGames = t.wins + t.losses;
+        const winPct = totalGames > 0 ? (t.wins / totalGames) : 0.5;
+        const avgFinish = t.seasonsPlayed > 0 ? (t.totalRank / t.seasonsPlayed).toFixed(1) : '-';
+        const teamObj = currentTeams.find(ct => ct.team_id === t.team_id);
+        return {
+            ...t,
+            name: teamObj ? teamObj.city : t.name,
+            winPct,
+            winPctDisplay: winPct.toFixed(3).replace(/^0+/, ''),
+            avgFinish,
+            isFranchise: true
+        };
+    });
+    standings.sort((a, b) => b.winPct - a.winPct || b.wins - a.wins || a.team_id - b.team_id);
+    return standings;
+}
+
+function mergeFinalSeries(partials) {
+    return partials
+        .flatMap(p => p.finals || [])
+        .sort((a, b) => new Date(a.date) - new Date(b.date));
+}
+
+// 'YYYY-MM-DD' (server-local) for a DATE or TIMESTAMPTZ value; node-pg hands both back as Dates,
+// a DATE at local midnight.
+const dateKey = (d) => (d instanceof Date
+    ? `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}-${String(d.getDate()).padStart(2, '0')}`
+    : String(d).slice(0, 10));
+
+// The day a result's games were played: completed_at (set whenever a result is recorded, see the
+// 20260726 migration), falling back to the schedule date for rows that never had one.
+const playedOn = (s) => dateKey(s.completed_at || s.date);
+
+// One season's standings history: for every day games were played, each team's cumulative
+// record and games behind the leader as of the end of that day. Counts games the same way
+// buildSeasonModel does (postseason excluded, an in-progress series' games so far, phantom
+// losses against the real team), so the last date matches the season standings. `latestOdds`
+// (the playoff odds cache's map) is attached to the last date only — odds for earlier dates are
+// whatever was stored when that date was the latest.
+function buildStandingsHistory(seriesResults, currentTeams, latestOdds = null) {
+    const { teamStats } = buildSeasonModel(seriesResults, currentTeams);
+    const keys = Object.keys(teamStats);
+    const totals = {};
+    keys.forEach(k => { totals[k] = { wins: 0, losses: 0 }; });
+
+    const byDate = {};
+    seriesResults.forEach(s => {
+        if (POSTSEASON_ROUNDS.includes(s.round) || seriesState(s) === 'scheduled') return;
+        const w = findTeamForRecord(s.winning_team_name, s.winning_team_id, currentTeams);
+        const l = findTeamForRecord(s.losing_team_name, s.losing_team_id, currentTeams);
+        const day = playedOn(s);
+        (byDate[day] || (byDate[day] = [])).push({
+            wKey: isPhantomTeam(w) ? null : statsKey(w),
+            lKey: isPhantomTeam(l) ? null : statsKey(l),
+            wScore: s.winning_score || 0,
+            lScore: s.losing_score || 0
+        });
+    });
+
+    const days = Object.keys(byDate).sort();
+    const rows = [];
+    days.forEach((day, i) => {
+        byDate[day].forEach(({ wKey, lKey, wScore, lScore }) => {
+            if (wKey && totals[wKey]) { totals[wKey].wins += wScore; totals[wKey].losses += lScore; }
+            if (lKey && totals[lKey]) { totals[lKey].wins += lScore; totals[lKey].losses += wScore; }
+        });
+        const lead = Math.max(...keys.map(k => totals[k].wins - totals[k].losses));
+        const isLatest = i === days.length - 1;
+        keys.forEach(k => {
+            const { wins, losses } = totals[k];
+            const odds = isLatest && latestOdds ? latestOdds[k] : null;
+            rows.push({
+                as_of: day,
+                team_key: k,
+                team_id: teamStats[k].team_id || null,
+                name: teamStats[k].name,
+                wins,
+                losses,
+                games_behind: (lead - (wins - losses)) / 2,
+                spaceship_odds: odds && odds.spaceshipOdds !== undefined ? odds.spaceshipOdds : null,
+                spoon_odds: odds && odds.spoonOdds !== undefined ? odds.spoonOdds : null
+            });
+        });
+    });
+    return rows;
+}
+
+module.exports = {
+    mapRecentResult,
+    mapFinalSeries,
+    buildMatrix,
+    mergeMatrices,
+    buildSeasonPartial,
+    mergeAllTimeStandings,
+    mergeFinalSeries,
+    dateKey,
+    playedOn,
+    buildStandingsHistory
+};
@@ -0,0 +1,33 @@
+// Per-card matchup summaries exported by `python matchup_matrix.py build`
+// (matchups/matchup_summaries.json): each hitter's expected OBP/SLG/OPS against the league's
+// pitchers and each pitcher's against the league's hitters. Cards are keyed "set_name|card_number".
+// The file is optional; without it lookups return null and the scouting views show no matchup.
+
+const fs = require('fs');
+const path = require('path');
+
+const SUMMARY_PATH = path.join(__dirname, '..', 'matchups', 'matchup_summaries.json');
+
+let summaries;
+
+function loadSummaries() {
+    if (summaries !== undefined) return summaries;
+    try {
+        summaries = JSON.parse(fs.readFileSync(SUMMARY_PATH, 'utf8'));
+    } catch (e) {
+        if (e.code !== 'ENOENT') console.error('Could not read matchup summaries:', e);
+        summaries = null;
+    }
+    return summaries;
+}
+
+// { obp, slg, ops } for a cards_player row, from the hitter or pitcher side as appropriate.
+function matchupFor(card) {
+    const data = loadSummaries();
+    if (!data || !card) return null;
+    const side = card.control !== null && card.control !== undefined ? data.pitchers : data.hitters;
+    const entry = side && side[`${card.set_name}|${card.card_number}`];
+    return entry ? { obp: entry.obp, slg: entry.slg, ops: entry.ops } : null;
+}
+
+module.exports = { matchupFor };
@@ -0,0 +1,130 @@
+// Pure helpers for the per-series pitcher usage ledger (series_pitcher_usage). The ledger holds
+// one row per pitcher that started or pitched in each completed series game; server.js folds
+// these rows into the pitching-rotation rules and reliever fatigue for the next game. Kept free
+// of the DB so the rules can be unit-tested; services/pitcherUsageService.js reads and writes
+// the rows.
+
+// Ledger rows for one finished game. `participants` are that game's sides:
+// { user_id, starting_pitcher, card_ids } (card_ids = the side's roster in that game).
+// `pitcherStats` is the final state's pitcherStats. A pitcher's stats are looked up under the
+// composite "<user>_<card>" key first, then the plain card_id key — the plain key only ever
+// counts for a side that actually had the card, so it can't leak to the other team.
+function buildUsageRows({ seriesId, gameId, gameInSeries, participants, pitcherStats }) {
+    const stats = pitcherStats || {};
+    const rows = [];
+    participants.forEach(p => {
+        const starter = p.starting_pitcher != null ? Number(p.starting_pitcher) : null;
+        const cardIds = new Set((p.card_ids || []).map(Number));
+        if (starter !== null) cardIds.add(starter);
+
+        cardIds.forEach(cardId => {
+            const pStats = stats[`${p.user_id}_${cardId}`] || stats[cardId] || null;
+            const inningsPitched = (pStats && pStats.innings_pitched) ? pStats.innings_pitched.length : 0;
+            const battersFaced = (pStats && pStats.batters_faced) || 0;
+            const started = cardId === starter;
+            if (!started && inningsPitched === 0 && battersFaced <= 0) return;
+
+            rows.push({
+                series_id: seriesId,
+                game_id: gameId,
+                game_in_series: gameInSeries,
+                user_id: p.user_id,
+                card_id: cardId,
+                started,
+                innings_pitched: inningsPitched,
+                batters_faced: battersFaced,
+                runs: (pStats && pStats.runs) || 0,
+                pitched_while_tired: !!(pStats && pStats.pitchedWhileTired)
+            });
+        });
+    });
+    return rows;
+}
+
+// Rotation rules for `userId` in game `gameInSeries` of a series, from the ledger rows of the
+// earlier games. Starters of the previous three games are unavailable; game 4 must go to the
+// first rostered SP who hasn't started yet; games 5-7 repeat the starter from four games back.
+function pitcherAvailability(gameInSeries, usageRows, userId, rosterSpIds = []) {
+    const starterByGame = {};
+    usageRows.forEach(r => {
+        if (r.started && Number(r.user_id) === Number(userId)) starterByGame[r.game_in_series] = r.card_id;
+    });
+
+    const unavailablePitcherIds = [1, 2, 3]
+        .map(back => gameInSeries - back)
+        .filter(g => g >= 1 && starterByGame[g])
+        .map(g => starterByGame[g]);
+
+    let mandatoryPitcherId = null;
+    if (gameInSeries === 4) {
+        const previousStarterIds = [1, 2, 3].map(g => starterByGame[g]);
+        mandatoryPitcherId = rosterSpIds.find(id => !previousStarterIds.includes(id)) || null;
+    } else if (gameInSeries > 4) {
+        mandatoryPitcherId = starterByGame[gameInSeries - 4] || null;
+    }
+    return { mandatoryPitcherId, unavailablePitcherIds };
+}
+
+// Carried-over reliever fatigue for the next game. `relievers` are the current game's relievers
+// ({ owner_user_id, card_id, ip }); `usageRows` are the ledger rows of the earlier games. Games
+// with no ledger rows never got a state and are skipped entirely, as before. Pitching adds
+// max(innings, 1 if they faced a batter) plus a run penalty when pitching tired; sitting a game
+// recovers one point, and so do the travel days after games 2 and 5.
+function fatigueFromUsage(relievers, usageRows) {
+    const byGame = new Map(); // game_id -> { gameInSeries, usage: Map("<user>_<card>" -> row) }
+    usageRows.forEach(r => {
+        if (!byGame.has(r.game_id)) byGame.set(r.game_id, { gameInSeries: r.game_in_series, usage: new Map() });
+        byGame.get(r.game_id).usage.set(`${r.user_id}_${r.card_id}`, r);
+    });
+    const games = [...byGame.entries()]
+        .sort(([idA, a], [idB, b]) => a.gameInSeries - b.gameInSeries || idA - idB)
+        .map(([, g]) => g);
+
+    const score = {};
+    relievers.forEach(r => { score[`${r.owner_user_id}_${r.card_id}`] = 0; });
+
+    games.forEach(game => {
+        relievers.forEach(reliever => {
+            const pKey = `${reliever.owner_user_id}_${reliever.card_id}`;
+            const u = game.usage.get(pKey);
+            const pitchedInnings = u ? u.innings_pitched : 0;
+            const facedBatters = !!(u && u.batters_faced > 0);
+
+            if (pitchedInnings > 0 || facedBatters) {
+                const runPenalty = u.pitched_while_tired ? Math.floor(u.runs / 3) : 0;
+                score[pKey] += Math.max(pitchedInnings, (facedBatters ? 1 : 0)) + runPenalty;
+            } else {
+                score[pKey] = Math.max(0, score[pKey] - 1);
+            }
+        });
+
+        // Travel Day (After Game 2 and After Game 5)
+        if (game.gameInSeries === 2 || game.gameInSeries === 5) {
+            relievers.forEach(reliever => {
+                const pKey = `${reliever.owner_user_id}_${reliever.card_id}`;
+                score[pKey] = Math.max(0, score[pKey] - 1);
+            });
+        }
+    });
+
+    // Final modifiers: a reliever may carry (ip - 1) fatigue for free; beyond that it's a penalty.
+    const finalPitcherStats = {};
+    relievers.forEach(reliever => {
+        const pKey = `${reliever.owner_user_id}_${reliever.card_id}`;
+        const allowedBuffer = Math.max(0, reliever.ip - 1);
+        const penalty = Math.max(0, score[pKey] - allowedBuffer);
+        const isBufferUsed = (score[pKey] > 0 && penalty === 0);
+
+        if (penalty > 0 || isBufferUsed) {
+            finalPitcherStats[pKey] = {
+                runs: 0,
+                innings_pitched: [],
+                fatigue_modifier: -penalty,
+                isBufferUsed: isBufferUsed
+            };
+        }
+    });
+    return finalPitcherStats;
+}
+
+module.exports = { buildUsageRows, pitcherAvailability, fatigueFromUsage };
@@ -0,0 +1,68 @@
+// Reading EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) output for the query plan regression check
+// (check-query-plans.js). Plans are reduced to a small summary (planner cost, timings, buffers and
+// the relations read by sequential scan) so they can be stored as a baseline and compared on the
+// next run. Cost is the planner's estimate, so it only moves when the plan or the statistics do;
+// timings are reported but never fail the check.
+
+// Calls fn on every node of a plan tree, parents first.
+function walkPlan(node, fn) {
+    if (!node) return;
+    fn(node);
+    (node.Plans || []).forEach(child => walkPlan(child, fn));
+}
+
+/**
+ * Summarizes the JSON returned by EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON).
+ * @param {Array|Object} explain - The "QUERY PLAN" value (an array holding one entry) or the entry.
+ * @returns {{ totalCost: number, planningMs: number|null, executionMs: number|null,
+ *             sharedHit: number, sharedRead: number, nodes: string[], seqScans: string[] }}
+ */
+function summarizePlan(explain) {
+    const entry = Array.isArray(explain) ? explain[0] : explain;
+    const root = entry.Plan;
+    const nodes = [];
+    const seqScans = new Set();
+    walkPlan(root, (node) => {
+        nodes.push(node['Relation Name'] ? `${node['Node Type']} on ${node['Relation Name']}` : node['Node Type']);
+        if (node['Node Type'] === 'Seq Scan' && node['Relation Name']) seqScans.add(node['Relation Name']);
+    });
+    return {
+        totalCost: root['Total Cost'],
+        planningMs: entry['Planning Time'] ?? null,
+        executionMs: entry['Execution Time'] ?? null,
+        // The root's buffer counts include everything below it.
+        sharedHit: root['Shared Hit Blocks'] || 0,
+        sharedRead: root['Shared Read Blocks'] || 0,
+        nodes,
+        seqScans: [...seqScans].sort(),
+    };
+}
+
+/**
+ * Checks one query's plan summary against the rules and its baseline.
+ * @param {Object} summary - From summarizePlan.
+ * @param {Object|null} baseline - The summary stored for this query, if any.
+ * @param {Object} opts
+ * @param {Object<string, number>} opts.tableRows - Estimated rows per table (pg_class.reltuples).
+ * @param {number} opts.minRows - Sequential scans of tables smaller than this are fine.
+ * @param {number} opts.maxGrowth - Largest allowed ratio of cost to the baseline cost.
+ * @param {string[]} [opts.allowSeqScan] - Tables this query is expected to read in full.
+ * @returns {string[]} Failure messages (empty if the plan is fine).
+ */
+function checkPlan(summary, baseline, { tableRows, minRows, maxGrowth, allowSeqScan = [] }) {
+    const failures = [];
+    summary.seqScans.forEach((table) => {
+        const rows = tableRows[table] || 0;
+        if (rows >= minRows && !allowSeqScan.includes(table)) {
+            failures.push(`sequential scan on ${table} (~${Math.round(rows)} rows)`);
+        }
+    });
+    // Floor the baseline at 1 so trivially cheap plans don't trip on rounding.
+    if (baseline && summary.totalCost > Math.max(baseline.totalCost, 1) * maxGrowth) {
+        failures.push(`cost ${summary.totalCost.toFixed(1)} is ${(summary.totalCost / Math.max(baseline.totalCost, 1)).toFixed(2)}x ` +
+            `the baseline ${baseline.totalCost.toFixed(1)} (limit ${maxGrowth}x)`);
+    }
+    return failures;
+}
+
+module.exports = { walkPlan, summarizePlan, checkPlan };
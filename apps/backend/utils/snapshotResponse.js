@@ -0,0 +1,103 @@
+// Serving precomputed, precompressed JSON documents with strong ETags.
+//
+// A snapshot is a JSON body serialized once and compressed once (gzip + brotli), cached under a
+// tag that already encodes its data version (e.g. "catalog-7-v42"). Because the tag is known
+// before any data is loaded, a conditional request whose If-None-Match still matches is answered
+// 304 without building or even looking up the snapshot.
+
+const zlib = require('zlib');
+const { promisify } = require('util');
+
+const gzip = promisify(zlib.gzip);
+const brotli = promisify(zlib.brotliCompress);
+
+const ENCODINGS = ['br', 'gzip', 'identity'];
+
+// Preferred encoding the client accepts ('identity' if it accepts neither).
+function pickEncoding(req) {
+    return (req.acceptsEncodings && req.acceptsEncodings(...ENCODINGS)) || 'identity';
+}
+
+// Strong ETags must differ between encodings of the same document.
+function etagFor(tag, encoding) {
+    return encoding === 'identity' ? `"${tag}"` : `"${tag}-${encoding}"`;
+}
+
+function isNotModified(req, etag) {
+    const header = req.headers['if-none-match'];
+    if (!header) return false;
+    if (header.trim() === '*') return true;
+    return header.split(',').some(t => t.trim().replace(/^W\//, '') === etag);
+}
+
+async function compressSnapshot(body) {
+    const identity = Buffer.from(JSON.stringify(body));
+    const [gz, br] = await Promise.all([
+        gzip(identity, { level: zlib.constants.Z_BEST_COMPRESSION }),
+        brotli(identity, {
+            params: {
+                [zlib.constants.BROTLI_PARAM_MODE]: zlib.constants.BROTLI_MODE_TEXT,
+                [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+                [zlib.constants.BROTLI_PARAM_SIZE_HINT]: identity.length,
+            }
+        })
+    ]);
+    return { identity, gzip: gz, br };
+}
+
+/**
+ * A small LRU of compressed snapshots keyed by tag. Concurrent misses for the same tag share
+ * one build; a failed build is not cached.
+ *
+ * @param {number} max - Snapshots to keep.
+ */
+function createSnapshotCache(max) {
+    const entries = new Map(); // tag -> Promise<{ identity, gzip, br }>
+    return {
+        get(tag, build) {
+            let entry = entries.get(tag);
+            if (entry) {
+                entries.delete(tag); // refresh LRU position
+            } else {
+                entry = Promise.resolve().then(build).then(compressSnapshot);
+                entry.catch(() => entries.delete(tag));
+            }
+            entries.set(tag, entry);
+            while (entries.size > max) entries.delete(entries.keys().next().value);
+            return entry;
+        },
+        size: () => entries.size,
+    };
+}
+
+/**
+ * Answers a request from a snapshot cache: 304 if the client's copy is current, otherwise the
+ * precompressed body in the best encoding the client accepts. `build` returns the JSON body
+ * and only runs on a cache miss.
+ */
+async function serveSnapshot(req, res, cache, tag, build) {
+    const encoding = pickEncoding(req);
+    const etag = etagFor(tag, encoding);
+    res.set({
+        ETag: etag,
+        'Cache-Control': 'private, no-cache',
+        Vary: 'Accept-Encoding',
+    });
+    if (isNotModified(req, etag)) {
+        return res.status(304).end();
+    }
+
+    const snapshot = await cache.get(tag, build);
+    res.set('Content-Type', 'application/json; charset=utf-8');
+    if (encoding !== 'identity') res.set('Content-Encoding', encoding);
+    return res.status(200).end(snapshot[encoding]);
+}
+
+module.exports = {
+    pickEncoding,
+    etagFor,
+    isNotModified,
+    compressSnapshot,
+    createSnapshotCache,
+    serveSnapshot
+};
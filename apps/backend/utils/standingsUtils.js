@@ -1,4 +1,4 @@
-const { matchesFranchise, getMappedIds, getLogoForTeam } = require('./franchiseUtils');
+const { getFranchiseIndex } = require('./franchiseIndex');
 
 // Default number of Monte Carlo iterations for spaceship/spoon odds. These odds are
 // normally precomputed off the request path (see services/playoffOddsService.js), so
@@ -15,40 +15,11 @@ const isPhantom = (team) => {
     return (team.name || '').includes('Phantoms') || (team.displayName || '').includes('Phantoms');
 };
 
-// Helper to find the matching current team for a historical record
+// Helper to find the matching current team for a historical record. Resolution goes
+// through the per-team-set franchise index (utils/franchiseIndex.js); callers get their
+// own copy so they are free to decorate it.
 const findTeamForRecord = (name, id, currentTeams) => {
-    // 1. Clean the name (Handle "Boston Boston" -> "Boston")
-    let cleanName = name || '';
-    const parts = cleanName.split(' ');
-    if (parts.length > 1 && parts.length % 2 === 0) {
-        const mid = parts.length / 2;
-        const firstHalf = parts.slice(0, mid).join(' ');
-        const secondHalf = parts.slice(mid).join(' ');
-        if (firstHalf === secondHalf) {
-            cleanName = firstHalf;
-        }
-    }
-
-    const matched = currentTeams.find(t => {
-        // matchesFranchise handles Aliases, ID mapping, and Exclusion logic
-        return matchesFranchise(cleanName, id, t, currentTeams, getMappedIds(t.team_id));
-    });
-
-    if (matched) {
-        return {
-            ...matched,
-            displayName: cleanName,
-            logo_url: getLogoForTeam(cleanName, matched.logo_url)
-        };
-    }
-
-    return {
-        team_id: null,
-        name: cleanName,
-        city: '',
-        logo_url: getLogoForTeam(cleanName, null),
-        displayName: cleanName
-    };
+    return { ...getFranchiseIndex(currentTeams).resolve(name, id) };
 };
 
 // A regular-season series is a fixed 7 games (record = total game wins). Used to size the "remaining"
@@ -804,4 +775,4 @@ function computePlayoffScenarios(seriesResults, currentTeams) {
     return out;
 }
 
-module.exports = { calculateStandings, findTeamForRecord, computePlayoffScenarios, buildSeasonModel };
+module.exports = { calculateStandings, findTeamForRecord, computePlayoffScenarios, buildSeasonModel, seriesState };
@@ -0,0 +1,95 @@
+// Startup profiling for server.js: when the process finished loading modules, reached the
+// database, started listening and answered its first request, logged as it happens and served
+// at /api/dev/startup.
+//
+// Times are milliseconds since the process started (performance.now() counts from the process's
+// time origin, so Node's own bootstrap is included). With STARTUP_PROFILE=1 server.js also times
+// each of its top-level requires (including everything they require in turn) until the first
+// response, and the slowest are part of the report.
+
+const Module = require('module');
+const { performance } = require('perf_hooks');
+
+// Requests the warm-up makes to its own server carry this header, so they don't count as the
+// first response.
+const WARMUP_HEADER = 'x-startup-warmup';
+
+const phases = [];
+let firstResponse = null;
+let requireTimes = null;
+let originalLoad = null;
+
+const now = () => Math.round(performance.now());
+
+function markStartup(name) {
+    phases.push({ name, ms: now() });
+}
+
+function phaseMs(name) {
+    const phase = phases.find(p => p.name === name);
+    return phase ? phase.ms : null;
+}
+
+function profileRequires() {
+    if (originalLoad) return;
+    originalLoad = Module._load;
+    requireTimes = [];
+    let depth = 0;
+    Module._load = function timedLoad(request, ...rest) {
+        const started = performance.now();
+        depth++;
+        try {
+            return originalLoad.call(this, request, ...rest);
+        } finally {
+            depth--;
+            if (depth === 0) requireTimes.push({ module: request, ms: performance.now() - started });
+        }
+    };
+}
+
+function stopProfilingRequires() {
+    if (!originalLoad) return;
+    Module._load = originalLoad;
+    originalLoad = null;
+}
+
+// Express middleware (mount it first): records the first response that isn't the warm-up's.
+function trackFirstResponse(req, res, next) {
+    if (firstResponse || req.get(WARMUP_HEADER)) return next();
+    res.on('finish', () => {
+        if (firstResponse) return;
+        const listening = phaseMs('listening');
+        firstResponse = { method: req.method, path: req.originalUrl.split('?')[0], status: res.statusCode, ms: now() };
+        console.log(`[startup] First response (${firstResponse.method} ${firstResponse.path} ${firstResponse.status}) ` +
+            `at ${firstResponse.ms} ms${listening != null ? `, ${firstResponse.ms - listening} ms after listening` : ''}`);
+        stopProfilingRequires();
+    });
+    next();
+}
+
+function startupReport() {
+    const slowestRequires = (requireTimes || [])
+        .slice()
+        .sort((a, b) => b.ms - a.ms)
+        .slice(0, 10)
+        .map(r => ({ module: r.module, ms: Math.round(r.ms) }));
+    return { phases: phases.slice(), firstResponse, slowestRequires };
+}
+
+// One line per call: every phase so far.
+function logStartup() {
+    console.log(`[startup] ${phases.map(p => `${p.name} ${p.ms} ms`).join(', ')}`);
+    if (requireTimes && requireTimes.length > 0) {
+        const slowest = startupReport().slowestRequires.slice(0, 5).map(r => `${r.module} ${r.ms} ms`);
+        console.log(`[startup] Slowest requires: ${slowest.join(', ')}`);
+    }
+}
+
+module.exports = {
+    WARMUP_HEADER,
+    markStartup,
+    profileRequires,
+    trackFirstResponse,
+    startupReport,
+    logStartup,
+};
@@ -0,0 +1,81 @@
+// apps/frontend/src/composables/useVirtualWindow.js
+
+import { ref, computed, watch, onMounted, onUnmounted, onUpdated, unref } from 'vue';
+
+/**
+ * Windowed rendering for long, fixed-height row lists. Only the rows in (or near) the viewport
+ * are rendered; two spacers of `padTop`/`padBottom` pixels stand in for the rest so the scroll
+ * height stays right.
+ *
+ *   const { start, end, padTop, padBottom } = useVirtualWindow(listRef, () => rows.value.length, {
+ *       scroller: scrollRef,       // element that scrolls; omit to follow the window
+ *       rowSelector: '.player-row',
+ *   });
+ *   // render rows.slice(start, end) between the two spacers
+ *
+ * The row height starts at `rowHeight` and is re-measured from the rendered rows after each
+ * update, so it tracks CSS changes without configuration.
+ *
+ * @param {Ref<HTMLElement>} listRef - Element that contains the spacers and rows.
+ * @param {() => number} count - Total number of rows.
+ */
+export function useVirtualWindow(listRef, count, { scroller = null, rowSelector, rowHeight = 36, overscan = 8 } = {}) {
+    const height = ref(rowHeight);
+    const offset = ref(0);     // how far the list's top has scrolled above the viewport top
+    const viewport = ref(window.innerHeight);
+
+    let frame = null;
+    function update() {
+        frame = null;
+        const list = unref(listRef);
+        if (!list) return;
+        const el = unref(scroller);
+        const top = el ? el.getBoundingClientRect().top : 0;
+        offset.value = Math.max(0, top - list.getBoundingClientRect().top);
+        viewport.value = el ? el.clientHeight : window.innerHeight;
+    }
+    function schedule() {
+        if (frame === null) frame = requestAnimationFrame(update);
+    }
+
+    function measure() {
+        const list = unref(listRef);
+        if (!list || !rowSelector) return;
+        const rows = list.querySelectorAll(rowSelector);
+        if (rows.length < 2) return;
+        const first = rows[0].getBoundingClientRect();
+        const last = rows[rows.length - 1].getBoundingClientRect();
+        const measured = (last.bottom - first.top) / rows.length;
+        if (measured > 0 && Math.abs(measured - height.value) > 0.5) height.value = measured;
+    }
+
+    const total = computed(() => count());
+    const start = computed(() => Math.min(total.value, Math.max(0, Math.floor(offset.value / height.value) - overscan)));
+    const end = computed(() => Math.min(total.value, Math.ceil((offset.value + viewport.value) / height.value) + overscan));
+    const padTop = computed(() => start.value * height.value);
+    const padBottom = computed(() => Math.max(0, (total.value - end.value) * height.value));
+
+    let target = null;
+    function bind() {
+        if (target) target.removeEventListener('scroll', schedule);
+        target = unref(scroller) || window;
+        target.addEventListener('scroll', schedule, { passive: true });
+        schedule();
+    }
+
+    onMounted(() => {
+        bind();
+        window.addEventListener('resize', schedule, { passive: true });
+    });
+    onUpdated(measure);
+    onUnmounted(() => {
+        if (target) target.removeEventListener('scroll', schedule);
+        window.removeEventListener('resize', schedule);
+        if (frame !== null) cancelAnimationFrame(frame);
+    });
+    // The scroller may be rendered conditionally (e.g. behind a loading state).
+    watch(() => unref(scroller), bind, { flush: 'post' });
+    watch(total, schedule);
+
+    return { start, end, padTop, padBottom };
+}
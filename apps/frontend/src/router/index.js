@@ -1,23 +1,30 @@
 // src/router/index.js
 import { createRouter, createWebHistory } from 'vue-router'
 import { useAuthStore } from '@/stores/auth'
-import LoginView from '../views/LoginView.vue'
-import DashboardView from '../views/DashboardView.vue'
-import RosterBuilderView from '../views/RosterBuilderView.vue'
-import GameView from '../views/GameView.vue'
-import SetLineupView from '../views/SetLineupView.vue';
-import RegisterView from '../views/RegisterView.vue';
-import GameSetupView from '../views/GameSetupView.vue';
-import DevToolView from '../views/DevToolView.vue'
-import LeagueView from '../views/LeagueView.vue'
-import DraftView from '../views/DraftView.vue'
-import OfficialRulesView from '../views/OfficialRulesView.vue'
-import ClassicView from '../views/ClassicView.vue'
-import TeamPageView from '../views/TeamPageView.vue'
-import TeamSeasonView from '../views/TeamSeasonView.vue' // <-- IMPORT NEW VIEW
-import PlayersView from '../views/PlayersView.vue'
-import SeriesView from '../views/SeriesView.vue'
-import DevSeriesView from '../views/DevSeriesView.vue'
+
+// Every view is its own lazily loaded chunk, so the login page doesn't download GameView and
+// friends. Loaders are kept by name so views can warm the route a user is likely to open next
+// (see prefetchRoutes below); a module import only ever fetches once, so prefetching and then
+// navigating costs nothing extra.
+const views = {
+  login: () => import('../views/LoginView.vue'),
+  register: () => import('../views/RegisterView.vue'),
+  dashboard: () => import('../views/DashboardView.vue'),
+  'roster-builder': () => import('../views/RosterBuilderView.vue'),
+  league: () => import('../views/LeagueView.vue'),
+  draft: () => import('../views/DraftView.vue'),
+  players: () => import('../views/PlayersView.vue'),
+  classic: () => import('../views/ClassicView.vue'),
+  'team-page': () => import('../views/TeamPageView.vue'),
+  'team-season-page': () => import('../views/TeamSeasonView.vue'),
+  series: () => import('../views/SeriesView.vue'),
+  game: () => import('../views/GameView.vue'),
+  'game-setup': () => import('../views/GameSetupView.vue'),
+  'set-lineup': () => import('../views/SetLineupView.vue'),
+  'dev-tool': () => import('../views/DevToolView.vue'),
+  'dev-series': () => import('../views/DevSeriesView.vue'),
+  'official-rules': () => import('../views/OfficialRulesView.vue'),
+}
 
 const router = createRouter({
   history: createWebHistory(import.meta.env.BASE_URL),
@@ -25,101 +32,101 @@ const router = createRouter({
     {
       path: '/login',
       name: 'login',
-      component: LoginView
+      component: views.login
     },
     {
       path: '/register',
       name: 'register',
-      component: RegisterView
+      component: views.register
     },
     {
       path: '/dashboard',
       name: 'dashboard',
-      component: DashboardView,
+      component: views.dashboard,
       meta: { requiresAuth: true }
     },
     {
       path: '/roster-builder',
       name: 'roster-builder',
-      component: RosterBuilderView,
+      component: views['roster-builder'],
       meta: { requiresAuth: true }
     },
     {
       path: '/league',
       name: 'league',
-      component: LeagueView,
+      component: views.league,
       meta: { requiresAuth: true }
     },
     {
       path: '/draft',
       name: 'draft',
-      component: DraftView,
+      component: views.draft,
       meta: { requiresAuth: true }
     },
     {
       path: '/players',
       name: 'players',
-      component: PlayersView,
+      component: views.players,
       meta: { requiresAuth: true }
     },
     {
       path: '/classic',
       name: 'classic',
-      component: ClassicView,
+      component: views.classic,
       meta: { requiresAuth: true }
     },
     {
       path: '/teams/:teamId',
       name: 'team-page',
-      component: TeamPageView,
+      component: views['team-page'],
       meta: { requiresAuth: true }
     },
     {
       path: '/teams/:teamId/seasons/:seasonName', // <-- NEW ROUTE
       name: 'team-season-page',
-      component: TeamSeasonView,
+      component: views['team-season-page'],
       meta: { requiresAuth: true }
     },
     {
       path: '/series/:id',
       name: 'series',
-      component: SeriesView,
+      component: views.series,
       meta: { requiresAuth: true }
     },
     {
       path: '/game/:id',
       name: 'game',
-      component: GameView,
+      component: views.game,
       meta: { requiresAuth: true }
     },
     {
       path: '/game/:id/setup',
       name: 'game-setup',
-      component: GameSetupView,
+      component: views['game-setup'],
       meta: { requiresAuth: true }
     },
     {
       path: '/game/:id/lineup',
       name: 'set-lineup',
-      component: SetLineupView,
+      component: views['set-lineup'],
       meta: { requiresAuth: true }
     },
     {
       path: '/dev-tool/:id',
       name: 'dev-tool',
-      component: DevToolView,
+      component: views['dev-tool'],
       meta: { requiresAuth: true }
     },
     {
       path: '/dev/series',
       name: 'dev-series',
-      component: DevSeriesView,
+      component: views['dev-series'],
       meta: { requiresAuth: true }
     },
     {
       path: '/official-rules',
       name: 'official-rules',
-      component: OfficialRulesView,
+      component: views['official-rules'],
       meta: { requiresAuth: true }
     },
     {
@@ -141,4 +148,11 @@ router.beforeEach((to, from, next) => {
   }
 });
 
+// Starts downloading the given routes' chunks when the browser is idle, without navigating.
+export function prefetchRoutes(names) {
+  const load = () => names.forEach((name) => views[name]?.().catch(() => {}))
+  if ('requestIdleCallback' in window) window.requestIdleCallback(load, { timeout: 2000 })
+  else setTimeout(load, 200)
+}
+
 export default router
@@ -0,0 +1,35 @@
+// The full card pool for a point set, with league ownership merged in.
+//
+// The server ships these as two versioned documents: the static catalog
+// (/api/cards/player, large, changes only when cards or points change) and the
+// ownership map (/api/cards/ownership, small, changes on every roster move). Both
+// carry strong ETags with Cache-Control: no-cache, so the browser revalidates each
+// load with one conditional request and reuses its cached copy on a 304.
+import { apiClient } from './api';
+
+// Stamps the owned_by_team_* fields the views read onto each card.
+export function applyOwnership(players, ownership) {
+    const owners = (ownership && ownership.owners) || {};
+    players.forEach(p => {
+        const o = owners[p.card_id];
+        p.owned_by_team_id = o ? o.team_id : null;
+        p.owned_by_team_logo = o ? o.logo_url : null;
+        p.owned_by_team_name = o ? o.name : null;
+        p.owned_by_team_city = o ? o.city : null;
+    });
+    return players;
+}
+
+// Resolves to the merged card list; throws if the catalog itself can't be loaded.
+// Missing ownership just leaves every card unowned.
+export async function fetchPlayerCatalog(pointSetId) {
+    const [cardsRes, ownersRes] = await Promise.all([
+        apiClient(`/api/cards/player?point_set_id=${pointSetId}`),
+        apiClient('/api/cards/ownership').catch(() => null)
+    ]);
+    if (!cardsRes.ok) throw new Error('Failed to fetch player cards');
+
+    const players = await cardsRes.json();
+    const ownership = ownersRes && ownersRes.ok ? await ownersRes.json() : null;
+    return applyOwnership(players, ownership);
+}
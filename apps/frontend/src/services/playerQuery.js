@@ -0,0 +1,71 @@
+// Search/filter/sort over the card pool in a Web Worker, so typing in a player search box never
+// blocks a frame on the full list. The views keep their filter state and send it as a query; the
+// worker answers with card_ids in display order and the view renders only the visible window.
+//
+// Only the latest query's answer is delivered; an answer overtaken by a newer keystroke is
+// dropped. Where workers aren't available the same index runs on the main thread.
+import { toRaw } from 'vue';
+import { buildPlayerIndex, setIndexStats, queryPlayerIndex } from '@/utils/playerIndex';
+
+// Strips Vue proxies so the cards can be structured-cloned into the worker.
+function plain(value) {
+    const raw = toRaw(value);
+    return Array.isArray(raw) ? raw.map(toRaw) : raw;
+}
+
+function createInlineBackend(deliver) {
+    let index = buildPlayerIndex([]);
+    return {
+        post(msg) {
+            if (msg.type === 'load') index = buildPlayerIndex(msg.players, msg.stats);
+            else if (msg.type === 'stats') setIndexStats(index, msg.stats);
+            else if (msg.type === 'query') {
+                const ids = queryPlayerIndex(index, msg.query);
+                queueMicrotask(() => deliver({ seq: msg.seq, ids }));
+            }
+        },
+        terminate() {},
+    };
+}
+
+function createWorkerBackend(deliver) {
+    const worker = new Worker(new URL('../workers/playerQuery.worker.js', import.meta.url), { type: 'module' });
+    worker.onmessage = ({ data }) => deliver(data);
+    return {
+        post: (msg) => worker.postMessage(msg),
+        terminate: () => worker.terminate(),
+    };
+}
+
+/**
+ * @param {string} view - 'roster-builder' | 'players' (selects the filter and sort rules).
+ * @param {(ids: Array) => void} onResult - Receives card_ids, in order, for the latest query.
+ */
+export function createPlayerQuery(view, onResult) {
+    let seq = 0;
+    const deliver = (data) => { if (data.seq === seq) onResult(data.ids); };
+
+    let backend;
+    try {
+        backend = typeof Worker === 'undefined' ? createInlineBackend(deliver) : createWorkerBackend(deliver);
+    } catch (e) {
+        console.error('Player search worker unavailable, filtering on the main thread:', e);
+        backend = createInlineBackend(deliver);
+    }
+
+    return {
+        load(players, stats) {
+            backend.post({ type: 'load', players: plain(players || []), stats: plain(stats || {}) });
+        },
+        setStats(stats) {
+            backend.post({ type: 'stats', stats: plain(stats || {}) });
+        },
+        run(query) {
+            seq += 1;
+            backend.post({ type: 'query', seq, query: { ...query, view } });
+        },
+        dispose() {
+            backend.terminate();
+        },
+    };
+}
@@ -2,6 +2,7 @@ import { defineStore } from 'pinia'
 import { ref, computed, watch } from 'vue'
 import router from '@/router'
 import { apiClient, sessionExpiredFlag } from '../services/api'
+import { fetchPlayerCatalog } from '../services/cardCatalog'
 
 export const useAuthStore = defineStore('auth', () => {
   const token = ref(localStorage.getItem('token') || null);
@@ -213,11 +214,7 @@ export const useAuthStore = defineStore('auth', () => {
   async function fetchAllPlayers(pointSetId) {
     if (!token.value || !pointSetId) return;
     try {
-      const response = await apiClient(`/api/cards/player?point_set_id=${pointSetId}`);
-      if (!response.ok) throw new Error('Failed to fetch player cards');
-
-      const players = await response.json();
-      allPlayers.value = players;
+      allPlayers.value = await fetchPlayerCatalog(pointSetId);
     } catch (error) {
       console.error('Failed to fetch players:', error);
       allPlayers.value = [];
@@ -1,8 +1,8 @@
 import { defineStore } from 'pinia';
-import { ref, computed } from 'vue';
+import { ref, shallowRef, computed, toRaw } from 'vue';
 import { useAuthStore } from './auth';
 import { calculateDisplayGameState } from '../utils/gameState';
-import { buildBoxScore } from '../utils/boxScore';
+import { shareStructure } from '../utils/structuralSharing';
 import { apiClient } from '../services/api'; // Import apiClient
 
 export const useGameStore = defineStore('game', () => {
@@ -12,16 +12,27 @@ export const useGameStore = defineStore('game', () => {
   // Highest game_state_id applied from a socket snapshot, used to drop stale/duplicate emits.
   const lastAppliedStateId = ref(0);
   const nextGameId = ref(null);
-  const gameEvents = ref([]);
+  // The event log and the rosters are large and only ever replaced whole (never mutated in
+  // place), so they're shallow: Vue doesn't proxy every event and card.
+  const gameEvents = shallowRef([]);
   const batter = ref(null);
   const pitcher = ref(null);
   const lineups = ref({ home: null, away: null });
   const nextLineupIsSet = ref(false);
-  const rosters = ref({ home: [], away: [] });
+  const rosters = shallowRef({ home: [], away: [] });
   const teams = ref({ home: null, away: null });
   const setupState = ref(null);
   const playerSelectedForSwap = ref(null);
   const snapshots = ref([]);
+  // Bumped for every game payload applied, changed or not, for watchers that must run per update.
+  const updateSeq = ref(0);
+
+  // Game payloads are complete copies of the game; merge each one into what we hold with
+  // structural sharing (utils/structuralSharing.js) so the parts that didn't change keep their
+  // identity and the components reading them don't re-render.
+  function mergeInto(target, incoming) {
+    target.value = shareStructure(toRaw(target.value), incoming);
+  }
 
 async function swapPlayerPositions(gameId, playerAId, playerBId) {
   const auth = useAuthStore();
@@ -53,20 +64,21 @@ async function fetchGame(gameId) {
       
       const data = await response.json();
 
-      game.value = data.game;
+      mergeInto(game, data.game);
       if (data.nextGameId) {
         nextGameId.value = data.nextGameId;
       }
       
-      series.value = data.series;
-      gameState.value = data.gameState ? data.gameState.state_data : null;
-      gameEvents.value = data.gameEvents;
+      mergeInto(series, data.series);
+      mergeInto(gameState, data.gameState ? data.gameState.state_data : null);
+      mergeInto(gameEvents, data.gameEvents);
       
-      batter.value = data.batter;
-      pitcher.value = data.pitcher;
-      lineups.value = data.lineups;
-      rosters.value = data.rosters;
-      teams.value = data.teams;
+      mergeInto(batter, data.batter);
+      mergeInto(pitcher, data.pitcher);
+      mergeInto(lineups, data.lineups);
+      mergeInto(rosters, data.rosters);
+      mergeInto(teams, data.teams);
+      updateSeq.value++;
     } catch (error) {
       console.error(error);
     }
@@ -629,16 +641,17 @@ if (gameState.value?.pendingStealAttempt && !gameState.value?.lastStealResult &&
       return;
     }
     if (incomingStateId != null) lastAppliedStateId.value = incomingStateId;
-    if (data.game) game.value = data.game;
+    if (data.game) mergeInto(game, data.game);
     if (data.nextGameId) nextGameId.value = data.nextGameId;
-    if (data.series) series.value = data.series;
-    if (data.gameEvents) gameEvents.value = data.gameEvents;
-    if (data.batter !== undefined) batter.value = data.batter;
-    if (data.pitcher !== undefined) pitcher.value = data.pitcher;
-    if (data.lineups) lineups.value = data.lineups;
-    if (data.rosters) rosters.value = data.rosters;
-    if (data.teams) teams.value = data.teams;
-    if (data.gameState) gameState.value = data.gameState.state_data;
+    if (data.series) mergeInto(series, data.series);
+    if (data.gameEvents) mergeInto(gameEvents, data.gameEvents);
+    if (data.batter !== undefined) mergeInto(batter, data.batter);
+    if (data.pitcher !== undefined) mergeInto(pitcher, data.pitcher);
+    if (data.lineups) mergeInto(lineups, data.lineups);
+    if (data.rosters) mergeInto(rosters, data.rosters);
+    if (data.teams) mergeInto(teams, data.teams);
+    if (data.gameState) mergeInto(gameState, data.gameState.state_data);
+    updateSeq.value++;
 }
 
   function resetGameState() {
@@ -1081,10 +1094,19 @@ if (gameState.value?.inningEndedOnCaughtStealing &&
   // atBatLog in state_data. Spoiler-safe: while this viewer is still hiding the latest outcome,
   // the most recent plate appearance is dropped so the box score matches the (also reveal-gated)
   // linescore and game log.
+  //
+  // GlobalNav puts this store in the entry chunk, so the builder is imported on first use rather
+  // than statically; the computed re-runs once the module arrives.
+  const buildBoxScore = shallowRef(null);
+  let boxScoreImport = null;
   const boxScore = computed(() => {
     const state = gameState.value;
     if (!state || !Array.isArray(state.atBatLog) || state.atBatLog.length === 0) return null;
-    return buildBoxScore(state, lineups.value, rosters.value, teams.value, { hideLastPA: isOutcomeHidden.value });
+    if (!buildBoxScore.value) {
+      boxScoreImport ||= import('../utils/boxScore').then((m) => { buildBoxScore.value = m.buildBoxScore; });
+      return null;
+    }
+    return buildBoxScore.value(state, lineups.value, rosters.value, teams.value, { hideLastPA: isOutcomeHidden.value });
   });
 
   return {
@@ -1122,6 +1144,7 @@ if (gameState.value?.inningEndedOnCaughtStealing &&
     displayOuts,
     displayGameState,
     snapshots,
+    updateSeq,
     // Actions
     fetchGame,
     submitBaserunningDecisions,
@@ -0,0 +1,270 @@
+// apps/frontend/src/utils/playerIndex.js
+
+import { getLastName } from './playerUtils';
+
+// Search/filter/sort over the full card pool, shared by RosterBuilderView and PlayersView.
+//
+// buildPlayerIndex() flattens each card once into a record holding everything the filters and
+// comparators read (lower-cased search text, position tokens, chart-outcome widths, last names),
+// so a query never re-derives them. Sorted orderings are cached per sort key; a query walks the
+// cached order and keeps the rows that pass, so changing a filter or typing in the search box is
+// a single linear scan with no sorting. Typing that extends the previous search only rescans the
+// previous result.
+//
+// Pure and DOM-free: it runs inside workers/playerQuery.worker.js, or on the main thread where
+// workers aren't available.
+
+export const CHART_OUTCOMES = ['PU', 'SO', 'GB', 'FB', 'BB', '1B', '1B+', '2B', '3B', 'HR'];
+
+const ZERO_STATS = { wins: 0, losses: 0, spaceships: 0, submarines: 0, spoons: 0, mvas: 0, lvscs: 0, tgaoots: 0, seasonsByTeam: {}, totalSeasons: 0 };
+
+// Total number of die-roll results an outcome covers, e.g. "5-14" -> 10, "13" -> 1.
+function rangeCount(rangeStr) {
+    if (!rangeStr) return 0;
+    return String(rangeStr).split(',').reduce((sum, part) => {
+        const [lo, hi] = part.split('-').map(n => parseInt(n, 10));
+        if (Number.isNaN(lo)) return sum;
+        const high = Number.isNaN(hi) ? lo : hi;
+        return sum + (high - lo + 1);
+    }, 0);
+}
+
+function chartWidths(p) {
+    const widths = {};
+    if (!p.chart_data) return widths;
+    for (const [range, outcome] of Object.entries(p.chart_data)) {
+        widths[outcome] = (widths[outcome] || 0) + rangeCount(range);
+    }
+    return widths;
+}
+
+function toRecord(p) {
+    const pitcher = p.control !== null && p.control !== undefined;
+    const label = p.displayName || p.name || '';
+    return {
+        id: p.card_id,
+        // Roster builder matches either name; the players table matches the label it shows.
+        allText: `${(p.name || '').toLowerCase()}\n${(p.displayName || '').toLowerCase()}`,
+        labelText: label.toLowerCase(),
+        pitcher,
+        hasControl: p.control !== null,
+        displayPosition: p.displayPosition || '',
+        positionTokens: (p.displayPosition || '').split(',').map(t => t.trim()),
+        fieldingKeys: p.fielding_ratings ? Object.keys(p.fielding_ratings) : [],
+        fielding: p.fielding_ratings || null,
+        points: Number(p.points) || 0,
+        onBase: pitcher ? null : p.on_base,
+        speed: pitcher ? null : Number(p.speed),
+        control: pitcher ? p.control : null,
+        ip: pitcher ? p.ip : null,
+        ownerId: p.owned_by_team_id || null,
+        setName: p.set_name || '',
+        team: p.team || '',
+        chart: chartWidths(p),
+        lastName: getLastName(label),
+        // RosterBuilderView's tie-breaks (lower-cased last, then first name, then full name).
+        lastNameLower: getLastName(p.displayName).toLowerCase(),
+        firstNameLower: (p.displayName || '').split(' ')[0].toLowerCase(),
+        displayName: p.displayName || '',
+    };
+}
+
+/**
+ * @param {Array<object>} players - Cards as returned by /api/cards/player.
+ * @param {object} [stats] - /api/players/league-stats `stats`, keyed by card_id.
+ */
+export function buildPlayerIndex(players, stats = {}) {
+    return {
+        records: players.map(p => toRecord(p)),
+        stats,
+        orderings: new Map(),
+        last: null,
+    };
+}
+
+// League stats only affect the players table's lg_* sorts and its seasons filter.
+export function setIndexStats(index, stats) {
+    index.stats = stats || {};
+    index.orderings.clear();
+    index.last = null;
+}
+
+// --- RosterBuilderView ---
+
+function compareRosterBuilder(a, b) {
+    const pointsDiff = b.points - a.points;
+    if (pointsDiff !== 0) return pointsDiff;
+    const lastNameDiff = a.lastNameLower.localeCompare(b.lastNameLower);
+    if (lastNameDiff !== 0) return lastNameDiff;
+    const firstNameDiff = a.firstNameLower.localeCompare(b.firstNameLower);
+    if (firstNameDiff !== 0) return firstNameDiff;
+    return a.displayName.localeCompare(b.displayName);
+}
+
+function rosterBuilderFilter(q) {
+    const exclude = new Set(q.excludeIds || []);
+    const pos = q.position || 'ALL';
+    return (r) => {
+        if (exclude.has(r.id)) return false;
+        if (pos === 'ALL') return true;
+        if (pos === 'SP') return r.displayPosition === 'SP';
+        if (pos === 'RP') return r.displayPosition === 'RP';
+        if (pos === 'P') return r.hasControl;
+        if (pos === 'DH') return r.displayPosition === 'DH';
+        if (pos === 'LF/RF') return r.fieldingKeys.includes('LF') || r.fieldingKeys.includes('RF') || r.fieldingKeys.includes('LFRF');
+        return r.fieldingKeys.includes(pos);
+    };
+}
+
+// --- PlayersView ---
+
+function statsFor(index, r) { return index.stats[r.id] || ZERO_STATS; }
+function wpct(s) { const t = s.wins + s.losses; return t ? s.wins / t : 0; }
+
+function fieldingAt(r, pos) {
+    if (!r.fielding) return null;
+    const key = (pos === 'LF' || pos === 'RF') ? 'LFRF' : pos;
+    const v = r.fielding[key];
+    return v === undefined ? null : v;
+}
+
+// The rating at the filtered position when one is chosen, else the highest rating.
+function fieldingSortValue(r, pos) {
+    if (pos !== 'ALL') return fieldingAt(r, pos);
+    const vals = r.fielding ? Object.values(r.fielding) : [];
+    return vals.length ? Math.max(...vals) : null;
+}
+
+// Missing values always sink to the bottom regardless of sort direction.
+function nullsLast(a, b, dir) {
+    const aNull = a === null || a === undefined || Number.isNaN(a);
+    const bNull = b === null || b === undefined || Number.isNaN(b);
+    if (aNull && bNull) return 0;
+    if (aNull) return dir === 'asc' ? Infinity : -Infinity;
+    if (bNull) return dir === 'asc' ? -Infinity : Infinity;
+    return a - b;
+}
+
+function comparePlayersBy(index, a, b, key, dir, pos) {
+    if (key.startsWith('lg_')) {
+        const sa = statsFor(index, a), sb = statsFor(index, b);
+        if (key === 'lg_wins') return sa.wins - sb.wins;
+        if (key === 'lg_wpct') return wpct(sa) - wpct(sb);
+        if (key === 'lg_seasons') return sa.totalSeasons - sb.totalSeasons;
+        if (key.startsWith('lg_team_')) { const tid = key.slice(8); return (sa.seasonsByTeam[tid] || 0) - (sb.seasonsByTeam[tid] || 0); }
+        return (sa[key.slice(3)] || 0) - (sb[key.slice(3)] || 0);
+    }
+    if (CHART_OUTCOMES.includes(key)) return (a.chart[key] || 0) - (b.chart[key] || 0);
+    switch (key) {
+        case 'name': return a.lastName.localeCompare(b.lastName);
+        case 'team': return a.team.localeCompare(b.team);
+        case 'pos': return a.displayPosition.localeCompare(b.displayPosition);
+        case 'set': return a.setName.localeCompare(b.setName);
+        case 'points': return a.points - b.points;
+        case 'on_base': return nullsLast(a.onBase, b.onBase, dir);
+        case 'speed': return nullsLast(a.speed, b.speed, dir);
+        case 'control': return nullsLast(a.control, b.control, dir);
+        case 'ip': return nullsLast(a.ip, b.ip, dir);
+        case 'fielding': return nullsLast(fieldingSortValue(a, pos), fieldingSortValue(b, pos), dir);
+        default: return 0;
+    }
+}
+
+function playsPosition(r, pos) {
+    return r.positionTokens.some(t => (t === 'LF/RF' ? (pos === 'LF' || pos === 'RF') : t === pos));
+}
+
+// Min/max range test; an unset bound is ignored, and a missing value fails any active bound.
+function passesRange(value, [min, max] = []) {
+    const hasMin = min !== '' && min != null;
+    const hasMax = max !== '' && max != null;
+    if (!hasMin && !hasMax) return true;
+    if (value == null || Number.isNaN(value)) return false;
+    if (hasMin && value < Number(min)) return false;
+    if (hasMax && value > Number(max)) return false;
+    return true;
+}
+
+function playersFilter(q, index) {
+    const type = q.playerType || 'ALL';
+    const pos = q.position || 'ALL';
+    const ranges = q.ranges || {};
+    const showHitterCols = type !== 'PITCHERS';
+    const showPitcherCols = type !== 'HITTERS';
+    return (r) => {
+        if (type === 'HITTERS' && r.pitcher) return false;
+        if (type === 'PITCHERS' && !r.pitcher) return false;
+        if (pos !== 'ALL' && !playsPosition(r, pos)) return false;
+        if (q.team != null && q.team !== 'ALL' && r.ownerId !== q.team) return false;
+        if (q.set && q.set !== 'ALL' && r.setName !== q.set) return false;
+        if (q.owned === 'OWNED' && !r.ownerId) return false;
+        if (q.owned === 'FREE' && r.ownerId) return false;
+        if (q.viewMode === 'card') {
+            if (!passesRange(r.points, ranges.pts)) return false;
+            if (showHitterCols) {
+                if (!passesRange(r.onBase, ranges.ob)) return false;
+                if (!passesRange(r.speed, ranges.spd)) return false;
+            }
+            if (showPitcherCols) {
+                if (!passesRange(r.control, ranges.ctrl)) return false;
+                if (!passesRange(r.ip, ranges.ip)) return false;
+            }
+        } else if (q.viewMode === 'league') {
+            if (!passesRange(statsFor(index, r).totalSeasons, ranges.sz)) return false;
+        }
+        return true;
+    };
+}
+
+// --- QUERY ---
+
+function ordering(index, q) {
+    const isPlayers = q.view === 'players';
+    const dir = q.sortDir === 'asc' ? 'asc' : 'desc';
+    // Only the fielding sort depends on the position filter.
+    const key = isPlayers ? `players|${q.sortKey}|${dir}|${q.sortKey === 'fielding' ? q.position : ''}` : 'roster-builder';
+    let order = index.orderings.get(key);
+    if (!order) {
+        const records = index.records.slice();
+        if (isPlayers) {
+            const sign = dir === 'asc' ? 1 : -1;
+            records.sort((a, b) => {
+                const cmp = comparePlayersBy(index, a, b, q.sortKey, dir, q.position || 'ALL');
+                if (cmp !== 0) return cmp * sign;
+                return a.lastName.localeCompare(b.lastName);
+            });
+        } else {
+            records.sort(compareRosterBuilder);
+        }
+        order = records;
+        index.orderings.set(key, order);
+    }
+    return order;
+}
+
+/**
+ * Runs a view's search/filter/sort against the index.
+ *
+ * @param {object} index - From buildPlayerIndex().
+ * @param {object} q - `{ view: 'roster-builder', search, position, excludeIds }` or
+ *   `{ view: 'players', search, viewMode, playerType, position, team, set, owned, ranges, sortKey, sortDir }`.
+ * @returns {Array} card_ids in display order.
+ */
+export function queryPlayerIndex(index, q) {
+    const search = (q.search || '').toLowerCase();
+    const shape = JSON.stringify({ ...q, search: undefined });
+    const field = q.view === 'players' ? 'labelText' : 'allText';
+
+    // Extending the previous search can only remove rows, so rescan the previous result.
+    const last = index.last;
+    let rows;
+    if (last && last.shape === shape && last.search && search.startsWith(last.search)) {
+        rows = last.rows.filter(r => r[field].includes(search));
+    } else {
+        const passes = q.view === 'players' ? playersFilter(q, index) : rosterBuilderFilter(q);
+        rows = ordering(index, q).filter(r => (!search || r[field].includes(search)) && passes(r));
+    }
+
+    index.last = { shape, search, rows };
+    return rows.map(r => r.id);
+}
@@ -2,13 +2,16 @@
 // batting + pitching line per player, for each of the two series teams.
 //
 // Each game's home/away side is mapped to the *series* team by user_id (the physical home team
-// alternates game to game, so we can't group by the per-game 'home'/'away' key). Per-game box
-// scores come from the same buildBoxScore() used everywhere else, so the aggregate stays consistent
-// with what each game shows on its own. Pitcher W/L/S come from the same computePitchingDecisions()
-// the live box score uses, tallied across games.
+// alternates game to game, so we can't group by the per-game 'home'/'away' key). Per-game lines and
+// pitcher W/L/S are precomputed on the server when the game completes (utils/gameSummary.js on the
+// backend, the same fold as buildBoxScore() and computePitchingDecisions()) and stored in the series
+// summary, so this only names the rows and adds them up.
 
-import { buildBoxScore, formatIp } from './boxScore';
-import { computePitchingDecisions, normalizeKey } from './pitchingDecisions';
+import { formatIp } from './boxScore';
+import { normalizeKey } from './pitchingDecisions';
+import { formatNameShort } from './playerUtils';
+
+const REPLACEMENT_NAMES = { '-1': 'Replacement Hitter', '-2': 'Replacement Pitcher' };
 
 // ".310" / "1.021" — three decimals, leading zero dropped only for sub-1.000 values (OPS can exceed 1).
 const fmt3 = (x) => (x == null ? '—' : x.toFixed(3).replace(/^0\./, '.'));
@@ -73,19 +76,37 @@ function finalizeSide(batMap, pitMap) {
   return { batting, pitching, totals, pitchingTotals: pTotals };
 }
 
-// Build one lean game's per-side box score + pitching decisions, or null if the game has no plays
-// yet. `game` is a lean entry from GET /api/series/:id/box-score-data
-// ({ homeUserId, awayUserId, state:{atBatLog,pitcherStats}, startingPitchers }); `cards` is the
-// shared card pool. As in aggregateLeaguePlayers, buildBoxScore only reads rosters to name cards and
-// maps sides by user_id, so the shared pool as both sides works and the log decides home/away.
-function boxFromGame(game, cards) {
-  const state = game?.state;
-  if (!state || !Array.isArray(state.atBatLog) || state.atBatLog.length === 0) return null;
-  const rosters = { home: cards, away: cards };
-  const teams = { home: { user_id: game.homeUserId }, away: { user_id: game.awayUserId } };
-  const box = buildBoxScore(state, {}, rosters, teams);
-  const decisions = computePitchingDecisions(state.atBatLog, teams, box);
-  return { box, decisions };
+// Names a precomputed box line from the shared card pool (as buildBoxScore names its rows).
+function nameRow(row, cardsById) {
+  const replacement = REPLACEMENT_NAMES[String(row.cardId)];
+  const card = cardsById.get(row.cardId);
+  const name = replacement || (card && (card.displayName || card.name)) || null;
+  return {
+    ...row,
+    name: name || `#${row.cardId}`,
+    shortName: replacement || (name ? formatNameShort(name) : `#${row.cardId}`),
+  };
+}
+
+// One lean game's per-side box lines (named) + pitching decisions, or null if the game has no
+// lines. `game` is an entry from GET /api/series/:id/box-score-data
+// ({ homeUserId, awayUserId, box:{home,away}, decisions, startingPitchers }).
+function boxFromGame(game, cardsById) {
+  const lines = game?.box;
+  if (!lines) return null;
+  const side = (s) => ({
+    batting: (lines[s]?.batting || []).map((r) => nameRow(r, cardsById)),
+    pitching: (lines[s]?.pitching || []).map((r) => nameRow(r, cardsById)),
+  });
+  const box = { home: side('home'), away: side('away') };
+  if (box.home.batting.length + box.away.batting.length === 0) return null;
+  return { box, decisions: game.decisions || {} };
+}
+
+function indexCards(cards) {
+  const map = new Map();
+  for (const c of cards || []) if (c && c.card_id != null && !map.has(c.card_id)) map.set(c.card_id, c);
+  return map;
 }
 
 // Fold one game side (home/away in that game's own frame) into the running batting/pitching maps.
@@ -113,7 +134,7 @@ function foldGameSide(box, decisions, gameSide, starterId, batMap, pitMap) {
  * Fold a list of lean completed-game entries into a two-team cumulative box score.
  *
  * @param {Array<object>} games     lean entries from GET /api/series/:id/box-score-data
- *                                   ({ homeUserId, awayUserId, state:{atBatLog,pitcherStats}, startingPitchers })
+ *                                   ({ homeUserId, awayUserId, box, decisions, startingPitchers })
  * @param {Array<object>} cards     shared card pool (for naming), from the same payload
  * @param {string|number} homeUserId  series home team's user_id
  * @param {string|number} awayUserId  series away team's user_id
@@ -122,10 +143,11 @@ function foldGameSide(box, decisions, gameSide, starterId, batMap, pitMap) {
 export function aggregateSeriesBoxScore(games, cards, homeUserId, awayUserId) {
   const bat = { home: new Map(), away: new Map() };
   const pit = { home: new Map(), away: new Map() };
+  const cardsById = indexCards(cards);
   let gamesCounted = 0;
 
   for (const game of games || []) {
-    const built = boxFromGame(game, cards);
+    const built = boxFromGame(game, cardsById);
     if (!built) continue;
     gamesCounted += 1;
 
@@ -161,10 +183,11 @@ export function aggregateSeriesBoxScore(games, cards, homeUserId, awayUserId) {
 export function aggregateTeamBoxScore(games, cards, userId) {
   const bat = new Map();
   const pit = new Map();
+  const cardsById = indexCards(cards);
   let gamesCounted = 0;
 
   for (const game of games || []) {
-    const built = boxFromGame(game, cards);
+    const built = boxFromGame(game, cardsById);
     if (!built) continue;
     const gameSide = String(game.homeUserId) === String(userId) ? 'home'
       : String(game.awayUserId) === String(userId) ? 'away' : null;
@@ -0,0 +1,50 @@
+// Structural sharing for the game payloads the store receives (socket 'game-updated' snapshots
+// and GET /api/games/:id). Every payload is a complete copy of the game, but between two of them
+// only a few fields usually change: the outs, the bases, one new event at the end of the log.
+//
+// shareStructure(prev, next) returns `next` with every subtree that is deep-equal to the one at
+// the same place in `prev` replaced by prev's object, and `prev` itself if nothing changed at
+// all. Unchanged parts keep their identity, so computed properties reading them return the same
+// value and Vue skips the components that depend on them instead of re-rendering (and
+// re-laying out) the whole game view on every update.
+//
+// `next` must be a freshly parsed payload that nothing else holds: it's reused in place rather
+// than copied. `prev` must be a raw object (toRaw), not a reactive proxy.
+
+function isPlainObject(value) {
+  if (value === null || typeof value !== 'object') return false;
+  const proto = Object.getPrototypeOf(value);
+  return proto === Object.prototype || proto === null;
+}
+
+export function shareStructure(prev, next) {
+  if (Object.is(prev, next)) return prev;
+
+  if (Array.isArray(prev) && Array.isArray(next)) {
+    // Compared by index: the event log and the at-bat log only grow at the end, so their
+    // existing entries all carry over.
+    let same = prev.length === next.length;
+    for (let i = 0; i < next.length; i++) {
+      if (i >= prev.length) break;
+      next[i] = shareStructure(prev[i], next[i]);
+      if (next[i] !== prev[i]) same = false;
+    }
+    return same ? prev : next;
+  }
+
+  if (isPlainObject(prev) && isPlainObject(next)) {
+    const keys = Object.keys(next);
+    let same = keys.length === Object.keys(prev).length;
+    for (const key of keys) {
+      if (!Object.prototype.hasOwnProperty.call(prev, key)) {
+        same = false;
+        continue;
+      }
+      next[key] = shareStructure(prev[key], next[key]);
+      if (next[key] !== prev[key]) same = false;
+    }
+    return same ? prev : next;
+  }
+
+  return next;
+}
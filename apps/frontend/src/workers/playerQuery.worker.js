@@ -0,0 +1,18 @@
+// apps/frontend/src/workers/playerQuery.worker.js
+
+// Holds one view's player index off the main thread (see utils/playerIndex.js and
+// services/playerQuery.js). Messages are handled in order, so a query always sees the
+// most recently loaded cards.
+import { buildPlayerIndex, setIndexStats, queryPlayerIndex } from '../utils/playerIndex';
+
+let index = buildPlayerIndex([]);
+
+self.onmessage = ({ data }) => {
+    if (data.type === 'load') {
+        index = buildPlayerIndex(data.players, data.stats);
+    } else if (data.type === 'stats') {
+        setIndexStats(index, data.stats);
+    } else if (data.type === 'query') {
+        self.postMessage({ seq: data.seq, ids: queryPlayerIndex(index, data.query) });
+    }
+};
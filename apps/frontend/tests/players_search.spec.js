@@ -0,0 +1,64 @@
+import { test, expect } from '@playwright/test';
+
+// A full-size card pool: enough rows that rendering them all, or filtering on the main thread,
+// would show up as long tasks while typing.
+const CARD_COUNT = 3000;
+const NAMES = ['Alex Rodriguez', 'Pedro Martinez', 'Barry Bonds', 'Randy Johnson', 'Ivan Rodriguez', 'Chan Ho Park'];
+const cards = Array.from({ length: CARD_COUNT }, (_, i) => {
+  const pitcher = i % 3 === 0;
+  return {
+    card_id: i + 1,
+    name: NAMES[i % NAMES.length],
+    displayName: `${NAMES[i % NAMES.length]} (${i})`,
+    points: (i * 37) % 600,
+    control: pitcher ? 4 : null,
+    ip: pitcher ? 6 : null,
+    on_base: pitcher ? null : 10,
+    speed: pitcher ? null : 15,
+    displayPosition: pitcher ? 'SP' : 'SS',
+    fielding_ratings: pitcher ? null : { SS: 2 },
+    set_name: 'Base',
+    team: 'NYY',
+    chart_data: { '1-5': 'SO', '6-20': '1B' }
+  };
+});
+
+test.describe('Players list', () => {
+
+  test.beforeEach(async ({ page }) => {
+    await page.route('**/api/point-sets', async route => route.fulfill({ status: 200, body: JSON.stringify([{ point_set_id: 1, name: '8/4/25 Season' }]) }));
+    await page.route('**/api/cards/player**', async route => route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(cards) }));
+    await page.route('**/api/cards/ownership', async route => route.fulfill({ status: 200, body: JSON.stringify({ version: '1', owners: {} }) }));
+    await page.route('**/api/players/league-stats', async route => route.fulfill({ status: 200, body: JSON.stringify({ stats: {}, franchises: [] }) }));
+
+    await page.goto('http://localhost:5173/');
+    await page.evaluate(() => {
+        localStorage.setItem('token', 'fake-token');
+        localStorage.setItem('user', JSON.stringify({ userId: 1, team: { team_id: 1 } }));
+    });
+  });
+
+  test('renders only a window of rows from the full pool', async ({ page }) => {
+    await page.goto('http://localhost:5173/players');
+    await expect(page.locator('.results-count')).toHaveText(`${CARD_COUNT} players`);
+
+    const rendered = await page.locator('.players-table tbody tr.player-row').count();
+    expect(rendered).toBeGreaterThan(0);
+    expect(rendered).toBeLessThan(200);
+  });
+
+  test('search narrows the list without long tasks while typing', async ({ page }) => {
+    await page.goto('http://localhost:5173/players');
+    await expect(page.locator('.results-count')).toHaveText(`${CARD_COUNT} players`);
+
+    await page.evaluate(() => {
+        window.__longTasks = 0;
+        new PerformanceObserver(list => { window.__longTasks += list.getEntries().length; }).observe({ type: 'longtask' });
+    });
+    await page.locator('.search-input').pressSequentially('rodriguez', { delay: 30 });
+
+    await expect(page.locator('.results-count')).toHaveText(`${CARD_COUNT / 3} players`);
+    await expect(page.locator('.players-table tbody tr.player-row').first()).toContainText('Rodriguez');
+    expect(await page.evaluate(() => window.__longTasks)).toBe(0);
+  });
+});
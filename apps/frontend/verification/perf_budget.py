@@ -0,0 +1,214 @@
+import os
+import sys
+import gzip
+import json
+import time
+import argparse
+import subprocess
+import urllib.request
+from playwright.sync_api import sync_playwright
+
+# Per-route performance budget: fails (exit 1) when a view's initial JS or its
+# time-to-interactive goes over the limits in perf_budget.json.
+#
+#   npm run build && python verification/perf_budget.py
+#   python verification/perf_budget.py --build --cpu-throttle 4
+#   python verification/perf_budget.py --skip-tti        # sizes only, no browser
+#
+# Initial JS comes from the Vite manifest (build.manifest in vite.config.js): the
+# entry chunk plus the route's view chunk plus everything either statically
+# imports, gzipped. Lazily imported chunks (other views, prefetches, the box score
+# builder) don't count. TTI is measured in headless Chromium against `vite
+# preview` with every API call mocked, so it reflects our bundle, not the backend.
+
+# Constants
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIST_DIR = os.path.join(FRONTEND_DIR, "dist")
+MANIFEST_PATH = os.path.join(DIST_DIR, ".vite", "manifest.json")
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_budget.json")
+PREVIEW_PORT = 4173
+QUIET_WINDOW_MS = 500
+
+MOCK_USER = {
+    "userId": 1,
+    "username": "User1",
+    "owner": "User1",
+    "team": { "team_id": 1, "id": 1, "city": "City A", "name": "Team A", "logo_url": "", "primary_color": "#002D72", "secondary_color": "#FFFFFF" }
+}
+
+# Records long tasks from the very start of the page so TTI can be taken as the
+# end of the last one (or DOMContentLoaded, if there were none).
+LONG_TASK_OBSERVER = """
+    window.__longTasks = [];
+    new PerformanceObserver((list) => {
+        for (const e of list.getEntries()) window.__longTasks.push(e.startTime + e.duration);
+    }).observe({ type: 'longtask', buffered: true });
+"""
+
+AUTH_INIT = """
+    localStorage.setItem('token', 'fake-token');
+    localStorage.setItem('user', JSON.stringify(%s));
+""" % json.dumps(MOCK_USER)
+
+
+def load_budget():
+    with open(BUDGET_PATH) as f:
+        budget = json.load(f)
+    routes = {}
+    for name, route in budget["routes"].items():
+        routes[name] = { **budget["default"], **route }
+    return routes
+
+
+def static_closure(manifest, key, seen):
+    if key in seen:
+        return
+    seen.add(key)
+    for dep in manifest[key].get("imports", []):
+        static_closure(manifest, dep, seen)
+
+
+def gzip_kb(path):
+    with open(path, "rb") as f:
+        return len(gzip.compress(f.read(), compresslevel=9)) / 1024
+
+
+def initial_js_sizes(routes):
+    if not os.path.exists(MANIFEST_PATH):
+        sys.exit(f"No Vite manifest at {MANIFEST_PATH}; run `npm run build` first (or pass --build).")
+    with open(MANIFEST_PATH) as f:
+        manifest = json.load(f)
+
+    entry = next(k for k, v in manifest.items() if v.get("isEntry"))
+    sizes = {}
+    for name, route in routes.items():
+        if route["view"] not in manifest:
+            sys.exit(f"{name}: {route['view']} is not in the manifest (is the route still lazily loaded?)")
+        chunks = set()
+        static_closure(manifest, entry, chunks)
+        static_closure(manifest, route["view"], chunks)
+        files = { manifest[k]["file"] for k in chunks if manifest[k]["file"].endswith(".js") }
+        sizes[name] = sum(gzip_kb(os.path.join(DIST_DIR, f)) for f in files)
+    return sizes
+
+
+def setup_mock_data(page):
+    # Every view fetches on mount; answer everything with an empty payload so the
+    # measurement doesn't depend on a backend. Views render their empty states.
+    def fulfill(route):
+        url = route.request.url
+        if "/api/auth/me" in url:
+            body = MOCK_USER
+        elif "/api/point-sets" in url:
+            body = [{ "point_set_id": 1, "name": "Season 1" }]
+        else:
+            body = []
+        route.fulfill(status=200, content_type="application/json", body=json.dumps(body))
+
+    page.route("**/api/**", fulfill)
+    page.route("**/socket.io/**", lambda route: route.abort())
+    page.route("**/images/**", lambda route: route.abort())
+
+
+def start_preview():
+    proc = subprocess.Popen(
+        ["npx", "vite", "preview", "--port", str(PREVIEW_PORT), "--strictPort"],
+        cwd=FRONTEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://localhost:{PREVIEW_PORT}"
+    for _ in range(60):
+        try:
+            urllib.request.urlopen(url, timeout=1)
+            return proc, url
+        except Exception:
+            time.sleep(0.5)
+    proc.terminate()
+    sys.exit("vite preview did not start")
+
+
+def measure_tti(browser, base_url, route, cpu_throttle):
+    context = browser.new_context()
+    context.add_init_script(LONG_TASK_OBSERVER)
+    if route.get("auth", True):
+        context.add_init_script(AUTH_INIT)
+    page = context.new_page()
+    setup_mock_data(page)
+    if cpu_throttle > 1:
+        cdp = context.new_cdp_session(page)
+        cdp.send("Emulation.setCPUThrottlingRate", { "rate": cpu_throttle })
+
+    page.goto(f"{base_url}{route['path']}", wait_until="networkidle")
+    # The route's component must actually have rendered into #app.
+    page.wait_for_function("document.querySelector('#app') && document.querySelector('#app').children.length > 0")
+    # Wait for a quiet window with no new long tasks before reading the result.
+    last_count = -1
+    while True:
+        count = page.evaluate("window.__longTasks.length")
+        if count == last_count:
+            break
+        last_count = count
+        page.wait_for_timeout(QUIET_WINDOW_MS)
+
+    tti = page.evaluate("""() => {
+        const nav = performance.getEntriesByType('navigation')[0];
+        return Math.max(nav.domContentLoadedEventEnd, ...window.__longTasks);
+    }""")
+    context.close()
+    return tti
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check per-route JS size and TTI budgets.")
+    parser.add_argument("--build", action="store_true", help="run `npm run build` first")
+    parser.add_argument("--skip-tti", action="store_true", help="only check initial JS sizes")
+    parser.add_argument("--url", default=os.environ.get("FRONTEND_URL"), help="measure against a running server instead of starting `vite preview`")
+    parser.add_argument("--cpu-throttle", type=float, default=1, help="Chromium CPU slowdown factor, e.g. 4 for a mid-range phone")
+    parser.add_argument("--only", help="comma-separated route names")
+    args = parser.parse_args()
+
+    routes = load_budget()
+    if args.only:
+        routes = { k: v for k, v in routes.items() if k in args.only.split(",") }
+
+    if args.build:
+        subprocess.run(["npm", "run", "build"], cwd=FRONTEND_DIR, check=True)
+
+    sizes = initial_js_sizes(routes)
+    ttis = {}
+    if not args.skip_tti:
+        proc, base_url = (None, args.url) if args.url else start_preview()
+        try:
+            with sync_playwright() as p:
+                browser = p.chromium.launch(headless=True)
+                for name, route in routes.items():
+                    ttis[name] = measure_tti(browser, base_url, route, args.cpu_throttle)
+                browser.close()
+        finally:
+            if proc:
+                proc.terminate()
+
+    failures = []
+    print(f"{'route':<18} {'initial JS (gz)':>20} {'TTI':>20}")
+    for name, route in routes.items():
+        js_cell = f"{sizes[name]:.1f} / {route['initial_js_kb']} KB"
+        if sizes[name] > route["initial_js_kb"]:
+            failures.append(f"{name}: initial JS {sizes[name]:.1f} KB > {route['initial_js_kb']} KB")
+            js_cell += " !"
+        tti_cell = "-"
+        if name in ttis:
+            tti_cell = f"{ttis[name]:.0f} / {route['tti_ms']} ms"
+            if ttis[name] > route["tti_ms"]:
+                failures.append(f"{name}: TTI {ttis[name]:.0f} ms > {route['tti_ms']} ms")
+                tti_cell += " !"
+        print(f"{name:<18} {js_cell:>20} {tti_cell:>20}")
+
+    if failures:
+        print("\nOver budget:")
+        for f in failures:
+            print(f"  {f}")
+        sys.exit(1)
+    print("\nAll routes within budget.")
+
+
+if __name__ == "__main__":
+    main()
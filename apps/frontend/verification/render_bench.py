@@ -0,0 +1,329 @@
+import os
+import sys
+import copy
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import urllib.request
+from playwright.sync_api import sync_playwright
+
+# Render benchmark for the game view: replays a long game's updates through the
+# game store (the same updateGameData the socket 'game-updated' handler calls)
+# and measures, per update, the main-thread scripting, style and layout time
+# Chromium spends until the next frame has been laid out.
+#
+#   python verification/render_bench.py                         # synthetic 9-inning game
+#   python verification/render_bench.py --innings 15 --cpu-throttle 4
+#   python verification/render_bench.py --updates game-1234.json --out render.json
+#   python verification/render_bench.py --baseline render.json --max-slowdown 1.5
+#
+# --updates takes a JSON array of GET /api/games/:id payloads in the order they
+# were received. Without it a game is synthesized: four updates per plate
+# appearance (pitch, swing and reveal, one player ready, next hitter), with
+# runners, runs, the event log and the at-bat log growing as they do in play.
+#
+# The store is reached through window.pinia, which main.js only exposes in
+# development builds, so this runs against the Vite dev server (started here
+# unless --url is given). Absolute numbers include Vue's development-mode
+# checks; compare runs against each other, not against production.
+
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEV_PORT = 5173
+METRICS = { "script_ms": "ScriptDuration", "style_ms": "RecalcStyleDuration", "layout_ms": "LayoutDuration" }
+
+AUTH_INIT = """
+    localStorage.setItem('token', 'bench-token');
+    localStorage.setItem('user', JSON.stringify({ userId: 1, username: 'bench-user' }));
+"""
+
+# Applies update `i` and resolves once the resulting frame has been laid out.
+APPLY_UPDATE = """async (i) => {
+    const store = window.pinia._s.get('game');
+    const started = performance.now();
+    store.updateGameData(JSON.parse(window.__benchUpdates[i]));
+    await new Promise((resolve) => requestAnimationFrame(() => setTimeout(resolve, 0)));
+    return performance.now() - started;
+}"""
+
+
+# --- synthetic game ------------------------------------------------------------
+
+OUTCOMES = ["SO", "GB", "1B", "FB", "BB", "2B", "GB", "HR", "PU", "1B", "SO", "3B"]
+
+
+def player(card_id, name, **extra):
+    return { "card_id": card_id, "name": name, "displayName": name, "display_name": name, "image_url": "", **extra }
+
+
+def lineup(prefix, first_id):
+    positions = ["C", "1B", "2B", "SS", "3B", "LF", "CF", "RF", "DH"]
+    return [{ "player": player(first_id + i, f"{prefix}{i}", position=pos, speed=12), "position": pos }
+            for i, pos in enumerate(positions)]
+
+
+def empty_at_bat(batter, pitcher):
+    return {
+        "batter": batter, "pitcher": pitcher, "batterAction": None, "pitcherAction": None,
+        "pitchRollResult": None, "swingRollResult": None,
+        "basesBeforePlay": { "first": None, "second": None, "third": None },
+        "outsBeforePlay": 0, "homeScoreBeforePlay": 0, "awayScoreBeforePlay": 0,
+    }
+
+
+def synthesize_game(innings):
+    home_pitcher = player(110, "H-P", control=4, chart_data={}, ip=7)
+    away_pitcher = player(210, "A-P", control=3, chart_data={}, ip=7)
+    lineups = {
+        "home": { "battingOrder": lineup("H", 100), "startingPitcher": home_pitcher },
+        "away": { "battingOrder": lineup("A", 200), "startingPitcher": away_pitcher },
+    }
+    rosters = {
+        side: [entry["player"] for entry in lineups[side]["battingOrder"]] + [lineups[side]["startingPitcher"]]
+        for side in ("home", "away")
+    }
+    state = {
+        "inning": 1, "isTopInning": True, "outs": 0, "homeScore": 0, "awayScore": 0,
+        "bases": { "first": None, "second": None, "third": None },
+        "isBetweenHalfInningsAway": False, "isBetweenHalfInningsHome": False,
+        "homePlayerReadyForNext": False, "awayPlayerReadyForNext": False,
+        "homeDefensiveRatings": { "catcherArm": 0, "infieldDefense": 0, "outfieldDefense": 0 },
+        "awayDefensiveRatings": { "catcherArm": 0, "infieldDefense": 0, "outfieldDefense": 0 },
+        "homeTeam": { "userId": 2, "battingOrderPosition": 0, "used_player_ids": [] },
+        "awayTeam": { "userId": 1, "battingOrderPosition": 0, "used_player_ids": [] },
+        "pitcherStats": {}, "atBatLog": [], "currentPlay": None, "lastCompletedAtBat": None,
+    }
+    events = [{ "event_type": "system", "log_message": '<div class="inning-change-message"><b>Top 1st</b></div>' }]
+    base = {
+        "game": { "game_id": 1, "id": 1, "status": "in_progress", "home_team_user_id": 2, "away_team_user_id": 1,
+                  "game_in_series": 1, "series_id": 1, "home_team_id": 1, "away_team_id": 2 },
+        "series": { "series_type": "exhibition" },
+        "teams": {
+            "away": { "team_id": 20, "abbreviation": "AWY", "city": "Away", "logo_url": "" },
+            "home": { "team_id": 10, "abbreviation": "HOM", "city": "Home", "logo_url": "" },
+        },
+        "lineups": lineups,
+        "rosters": rosters,
+    }
+
+    updates = []
+    state_id = 0
+
+    def emit():
+        nonlocal state_id
+        state_id += 1
+        offense = "away" if state["isTopInning"] else "home"
+        batter = state["currentAtBat"]["batter"]
+        pitcher = lineups["home" if offense == "away" else "away"]["startingPitcher"]
+        updates.append({
+            **copy.deepcopy(base),
+            "gameState": { "game_state_id": state_id, "state_data": copy.deepcopy(state) },
+            "gameEvents": copy.deepcopy(events),
+            "batter": batter, "pitcher": pitcher,
+        })
+
+    def next_batter():
+        offense = "away" if state["isTopInning"] else "home"
+        team = state["awayTeam" if offense == "away" else "homeTeam"]
+        batter = lineups[offense]["battingOrder"][team["battingOrderPosition"]]["player"]
+        pitcher = lineups["home" if offense == "away" else "away"]["startingPitcher"]
+        state["currentAtBat"] = empty_at_bat(batter, pitcher)
+
+    def advance(bases_moved, batter):
+        runs = 0
+        runners = [state["bases"]["third"], state["bases"]["second"], state["bases"]["first"]]
+        new = { "first": None, "second": None, "third": None }
+        for idx, runner in enumerate(runners):
+            if runner is None:
+                continue
+            to = (3 - idx) + bases_moved
+            if to >= 4:
+                runs += 1
+            else:
+                new[["first", "second", "third"][to - 1]] = runner
+        if bases_moved >= 4:
+            runs += 1
+        else:
+            new[["first", "second", "third"][bases_moved - 1]] = batter
+        state["bases"] = new
+        return runs
+
+    outcome_index = 0
+    next_batter()
+    while state["inning"] <= innings:
+        at_bat = state["currentAtBat"]
+        offense = "away" if state["isTopInning"] else "home"
+        team = state["awayTeam" if offense == "away" else "homeTeam"]
+
+        at_bat["pitcherAction"] = "pitch"
+        emit()
+
+        outcome = OUTCOMES[outcome_index % len(OUTCOMES)]
+        outcome_index += 1
+        at_bat.update({
+            "batterAction": "swing",
+            "pitchRollResult": { "roll": 1 + outcome_index % 20, "advantage": "batter" if outcome_index % 2 else "pitcher" },
+            "swingRollResult": { "roll": 1 + (outcome_index * 7) % 20, "outcome": outcome, "batter": at_bat["batter"] },
+            "basesBeforePlay": copy.deepcopy(state["bases"]), "outsBeforePlay": state["outs"],
+            "homeScoreBeforePlay": state["homeScore"], "awayScoreBeforePlay": state["awayScore"],
+        })
+        moved = { "1B": 1, "BB": 1, "2B": 2, "3B": 3, "HR": 4 }.get(outcome)
+        runs = advance(moved, at_bat["batter"]) if moved else 0
+        if not moved:
+            state["outs"] += 1
+        state["awayScore" if offense == "away" else "homeScore"] += runs
+        name = at_bat["batter"]["displayName"]
+        events.append({ "event_type": "game_event", "log_message": f"{name}: {outcome}" + (f", {runs} run(s) score" if runs else "") })
+        state["atBatLog"].append({
+            "batterId": at_bat["batter"]["card_id"], "pitcherId": at_bat["pitcher"]["card_id"], "outcome": outcome,
+            "inning": state["inning"], "isTopInning": state["isTopInning"], "runs": runs, "advantage": at_bat["pitchRollResult"]["advantage"],
+        })
+        emit()
+
+        state["homePlayerReadyForNext"] = True
+        emit()
+
+        state["lastCompletedAtBat"] = copy.deepcopy(at_bat)
+        state["homePlayerReadyForNext"] = False
+        team["battingOrderPosition"] = (team["battingOrderPosition"] + 1) % 9
+        if state["outs"] >= 3:
+            state.update({ "outs": 0, "bases": { "first": None, "second": None, "third": None } })
+            if state["isTopInning"]:
+                state["isTopInning"] = False
+                label = f"Bottom {state['inning']}"
+            else:
+                state["isTopInning"] = True
+                state["inning"] += 1
+                label = f"Top {state['inning']}"
+            events.append({ "event_type": "system", "log_message": f'<div class="inning-change-message"><b>{label}</b></div>' })
+        next_batter()
+        emit()
+
+    return updates
+
+
+# --- measurement -----------------------------------------------------------------
+
+def start_dev_server():
+    proc = subprocess.Popen(
+        ["npx", "vite", "--port", str(DEV_PORT), "--strictPort"],
+        cwd=FRONTEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://localhost:{DEV_PORT}"
+    for _ in range(60):
+        try:
+            urllib.request.urlopen(url, timeout=1)
+            return proc, url
+        except Exception:
+            time.sleep(0.5)
+    proc.terminate()
+    sys.exit("vite dev server did not start")
+
+
+def read_metrics(cdp):
+    values = { m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"] }
+    return { key: values.get(name, 0) * 1000 for key, name in METRICS.items() }
+
+
+def run(browser, base_url, updates, cpu_throttle):
+    context = browser.new_context()
+    context.add_init_script(AUTH_INIT)
+    page = context.new_page()
+
+    first = json.dumps(updates[0])
+    page.route("**/api/**", lambda route: route.fulfill(status=200, content_type="application/json", body="{}"))
+    page.route("**/api/games/1", lambda route: route.fulfill(status=200, content_type="application/json", body=first))
+    page.route("**/socket.io/**", lambda route: route.abort())
+    page.route("**/images/**", lambda route: route.abort())
+
+    page.goto(f"{base_url}/game/1", wait_until="domcontentloaded")
+    page.wait_for_selector(".linescore-table")
+    page.evaluate("(u) => { window.__benchUpdates = u; }", [json.dumps(u) for u in updates])
+
+    cdp = context.new_cdp_session(page)
+    cdp.send("Performance.enable")
+    if cpu_throttle > 1:
+        cdp.send("Emulation.setCPUThrottlingRate", { "rate": cpu_throttle })
+
+    samples = []
+    for i in range(1, len(updates)):
+        before = read_metrics(cdp)
+        frame_ms = page.evaluate(APPLY_UPDATE, i)
+        after = read_metrics(cdp)
+        samples.append({ "frame_ms": frame_ms, **{ k: after[k] - before[k] for k in METRICS } })
+    context.close()
+    return samples
+
+
+def summarize(samples):
+    summary = {}
+    for key in ["frame_ms", *METRICS]:
+        values = sorted(s[key] for s in samples)
+        summary[key] = {
+            "p50": statistics.median(values),
+            "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+            "max": values[-1],
+            "total": sum(values),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the game view's per-update render cost.")
+    parser.add_argument("--updates", help="JSON array of GET /api/games/:id payloads to replay")
+    parser.add_argument("--innings", type=int, default=9, help="length of the synthetic game")
+    parser.add_argument("--url", default=os.environ.get("FRONTEND_URL"), help="use a running dev server instead of starting one")
+    parser.add_argument("--cpu-throttle", type=float, default=1, help="Chromium CPU slowdown factor, e.g. 4 for a mid-range phone")
+    parser.add_argument("--out", help="write the summary (and per-update samples) to this JSON file")
+    parser.add_argument("--baseline", help="summary JSON from an earlier run to compare p50s against")
+    parser.add_argument("--max-slowdown", type=float, default=1.5, help="fail when a p50 exceeds the baseline's by this factor")
+    args = parser.parse_args()
+
+    if args.updates:
+        with open(args.updates) as f:
+            updates = json.load(f)
+    else:
+        updates = synthesize_game(args.innings)
+    if len(updates) < 2:
+        sys.exit("Need at least two updates to replay.")
+
+    proc, base_url = (None, args.url) if args.url else start_dev_server()
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            samples = run(browser, base_url, updates, args.cpu_throttle)
+            browser.close()
+    finally:
+        if proc:
+            proc.terminate()
+
+    summary = summarize(samples)
+    print(f"{len(samples)} updates replayed\n")
+    print(f"{'per update':<12} {'p50':>9} {'p95':>9} {'max':>9} {'total':>10}")
+    for key, s in summary.items():
+        print(f"{key:<12} {s['p50']:>7.2f}ms {s['p95']:>7.2f}ms {s['max']:>7.2f}ms {s['total']:>8.0f}ms")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({ "updates": len(samples), "summary": summary, "samples": samples }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["summary"]
+        failures = []
+        for key, s in summary.items():
+            base = baseline.get(key, {}).get("p50")
+            # Sub-millisecond medians are mostly timer noise; don't gate on them.
+            if base and max(base, s["p50"]) >= 1 and s["p50"] > base * args.max_slowdown:
+                failures.append(f"{key}: p50 {s['p50']:.2f} ms vs {base:.2f} ms baseline")
+        if failures:
+            print("\nSlower than the baseline:")
+            for f in failures:
+                print(f"  {f}")
+            sys.exit(1)
+        print("\nWithin the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,22 @@ export default defineConfig({
       }
     }
   },
+  build: {
+    // dist/.vite/manifest.json maps each view to its chunks; verification/perf_budget.py reads it.
+    manifest: true,
+    rollupOptions: {
+      output: {
+        // The stats helpers are shared by GameView, LeagueView, SeriesView and TeamSeasonView.
+        // Give them stable chunks of their own so they are cached once rather than folded into
+        // whichever view Rollup happens to pick.
+        manualChunks(id) {
+          if (/src\/utils\/(boxScore|pitchingDecisions)\.js$/.test(id)) return 'box-score'
+          if (id.endsWith('src/utils/seriesBoxScore.js')) return 'series-box-score'
+          if (id.endsWith('src/utils/leagueLeaders.js')) return 'league-leaders'
+        },
+      },
+    },
+  },
   resolve: {
     alias: {
       '@': fileURLToPath(new URL('./src', import.meta.url))